@@ -3,6 +3,8 @@ import FINE.utils as utils
 import pandas as pd
 import ast
 import inspect
+import json
+import os
 import time
 import warnings
 
@@ -17,45 +19,36 @@ except ImportError:
     warnings.warn('Matplotlib.pyplot could not be imported.')
 
 
-def writeOptimizationOutputToExcel(esM, 
-                                   outputFileName='scenarioOutput', 
-                                   optSumOutputLevel=2, 
-                                   optValOutputLevel=1):
+def getOptimizationOutputTables(esM, optSumOutputLevel=2, optValOutputLevel=1):
     """
-    Write optimization output to an Excel file.
+    Group the optimization output of each modeling class into tables. The optimization summary is returned in the
+    table '<modeling class>OptSummary_<dimension>', the time-dependent optimal values in the tables
+    '<modeling class>_TDoptVar_1dim' and '<modeling class>_TDoptVar_2dim' and the time-independent optimal values in
+    the table '<modeling class>_TIoptVar_<dimension>' (where <modeling class> is the name of the modeling class
+    without the 'Model' ending). Empty tables are not returned.
 
     :param esM: EnergySystemModel instance in which the optimized model is hold
     :type esM: EnergySystemModel instance
 
-    :param outputFileName: name of the Excel output file (without .xlsx ending)
-        |br| * the default value is 'scenarioOutput'
-    :type outputFileName: string
-
-    :param optSumOutputLevel: output level of the optimization summary (see EnergySystemModel). Either an integer
-        (0,1,2) which holds for all model classes or a dictionary with model class names as keys and an integer
-        (0,1,2) for each key (e.g. {'StorageModel':1,'SourceSinkModel':1,...}
+    :param optSumOutputLevel: output level of the optimization summary (see writeOptimizationOutputToExcel)
         |br| * the default value is 2
     :type optSumOutputLevel: int (0,1,2) or dict
 
-    :param optValOutputLevel: output level of the optimal values. Either an integer (0,1) which holds for all
-        model classes or a dictionary with model class names as keys and an integer (0,1) for each key
-        (e.g. {'StorageModel':1,'SourceSinkModel':1,...}
-        - 0: all values are kept.
-        - 1: Lines containing only zeroes are dropped.
+    :param optValOutputLevel: output level of the optimal values (see writeOptimizationOutputToExcel)
         |br| * the default value is 1
     :type optValOutputLevel: int (0,1) or dict
-    """
-    utils.output('\nWriting output to Excel... ', esM.verbose, 0)
-    _t = time.time()
-    writer = pd.ExcelWriter(outputFileName + '.xlsx')
 
+    :return: dictionary with the table names as keys and the tables as values
+    :rtype: dict of pandas DataFrames
+    """
+    tables = {}
     for name in esM.componentModelingDict.keys():
         utils.output('\tProcessing ' + name + ' ...', esM.verbose, 0)
         oL = optSumOutputLevel
         oL_ = oL[name] if type(oL) == dict else oL
         optSum = esM.getOptimizationSummary(name, outputLevel=oL_)
         if not optSum.empty:
-            optSum.to_excel(writer, name[:-5] + 'OptSummary_' + esM.componentModelingDict[name].dimension)
+            tables[name[:-5] + 'OptSummary_' + esM.componentModelingDict[name].dimension] = optSum
 
         data = esM.componentModelingDict[name].getOptimalValues()
         oL = optValOutputLevel
@@ -78,14 +71,14 @@ def writeOptimizationOutputToExcel(esM,
             if oL_ == 1:
                 dfTD1dim = dfTD1dim.loc[((dfTD1dim != 0) & (~dfTD1dim.isnull())).any(axis=1)]
             if not dfTD1dim.empty:
-                dfTD1dim.to_excel(writer, name[:-5] + '_TDoptVar_1dim')
+                tables[name[:-5] + '_TDoptVar_1dim'] = dfTD1dim
         if dataTD2dim:
             names = ['Variable', 'Component', 'LocationIn', 'LocationOut']
             dfTD2dim = pd.concat(dataTD2dim, keys=indexTD2dim, names=names)
             if oL_ == 1:
                 dfTD2dim = dfTD2dim.loc[((dfTD2dim != 0) & (~dfTD2dim.isnull())).any(axis=1)]
             if not dfTD2dim.empty:
-                dfTD2dim.to_excel(writer, name[:-5] + '_TDoptVar_2dim')
+                tables[name[:-5] + '_TDoptVar_2dim'] = dfTD2dim
         if dataTI:
             if esM.componentModelingDict[name].dimension == '1dim':
                 names = ['Variable type', 'Component']
@@ -95,7 +88,63 @@ def writeOptimizationOutputToExcel(esM,
             if oL_ == 1:
                 dfTI = dfTI.loc[((dfTI != 0) & (~dfTI.isnull())).any(axis=1)]
             if not dfTI.empty:
-                dfTI.to_excel(writer, name[:-5] + '_TIoptVar_' + esM.componentModelingDict[name].dimension)
+                tables[name[:-5] + '_TIoptVar_' + esM.componentModelingDict[name].dimension] = dfTI
+    return tables
+
+
+def getOptimizationOutputMetadata(esM):
+    """
+    Return the order of the (typical) periods and, if the time series data was segmented, the number of time steps
+    per segment of each typical period. Both are stored as metadata together with the columnar optimization output.
+
+    :param esM: EnergySystemModel instance in which the optimized model is hold
+    :type esM: EnergySystemModel instance
+
+    :return: dictionary with the keys 'periodsOrder' (list) and 'timeStepsPerSegment' (dictionary with the typical
+        periods as keys and lists with the number of time steps per segment as values, or None)
+    :rtype: dict
+    """
+    metadata = {'periodsOrder': [int(p) for p in esM.periodsOrder], 'timeStepsPerSegment': None}
+    if esM.segmentation:
+        metadata['timeStepsPerSegment'] = {str(p): [int(n) for n in esM.timeStepsPerSegment[p]]
+                                           for p in esM.typicalPeriods}
+    return metadata
+
+
+def writeOptimizationOutputToExcel(esM, 
+                                   outputFileName='scenarioOutput', 
+                                   optSumOutputLevel=2, 
+                                   optValOutputLevel=1):
+    """
+    Write optimization output to an Excel file.
+
+    :param esM: EnergySystemModel instance in which the optimized model is hold
+    :type esM: EnergySystemModel instance
+
+    :param outputFileName: name of the Excel output file (without .xlsx ending)
+        |br| * the default value is 'scenarioOutput'
+    :type outputFileName: string
+
+    :param optSumOutputLevel: output level of the optimization summary (see EnergySystemModel). Either an integer
+        (0,1,2) which holds for all model classes or a dictionary with model class names as keys and an integer
+        (0,1,2) for each key (e.g. {'StorageModel':1,'SourceSinkModel':1,...}
+        |br| * the default value is 2
+    :type optSumOutputLevel: int (0,1,2) or dict
+
+    :param optValOutputLevel: output level of the optimal values. Either an integer (0,1) which holds for all
+        model classes or a dictionary with model class names as keys and an integer (0,1) for each key
+        (e.g. {'StorageModel':1,'SourceSinkModel':1,...}
+        - 0: all values are kept.
+        - 1: Lines containing only zeroes are dropped.
+        |br| * the default value is 1
+    :type optValOutputLevel: int (0,1) or dict
+    """
+    utils.output('\nWriting output to Excel... ', esM.verbose, 0)
+    _t = time.time()
+    writer = pd.ExcelWriter(outputFileName + '.xlsx')
+
+    for sheetName, df in getOptimizationOutputTables(esM, optSumOutputLevel, optValOutputLevel).items():
+        df.to_excel(writer, sheetName)
 
     periodsOrder = pd.DataFrame([esM.periodsOrder], index=['periodsOrder'], columns=esM.periods)
     periodsOrder.to_excel(writer, 'Misc')
@@ -111,6 +160,105 @@ def writeOptimizationOutputToExcel(esM,
     utils.output('Done. (%.4f' % (time.time() - _t) + ' sec)', esM.verbose, 0)
 
 
+def writeOptimizationOutputToParquet(esM,
+                                     outputDirectory='scenarioOutput',
+                                     optSumOutputLevel=2,
+                                     optValOutputLevel=1):
+    """
+    Write optimization output to Parquet files (requires the pyarrow python package). The output is grouped like in
+    writeOptimizationOutputToExcel and each group is written to the file '<group>.parquet' in the output directory
+    (see getOptimizationOutputTables). The periods order and the segment durations are stored as metadata under the
+    key 'FINE' in each file (see getOptimizationOutputMetadata). Compared to an Excel file, writing and reading is
+    considerably faster and the number of time steps is not limited by the maximum number of columns.
+
+    :param esM: EnergySystemModel instance in which the optimized model is hold
+    :type esM: EnergySystemModel instance
+
+    :param outputDirectory: name of the directory to which the Parquet files are written
+        |br| * the default value is 'scenarioOutput'
+    :type outputDirectory: string
+
+    :param optSumOutputLevel: output level of the optimization summary (see writeOptimizationOutputToExcel)
+        |br| * the default value is 2
+    :type optSumOutputLevel: int (0,1,2) or dict
+
+    :param optValOutputLevel: output level of the optimal values (see writeOptimizationOutputToExcel)
+        |br| * the default value is 1
+    :type optValOutputLevel: int (0,1) or dict
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    utils.output('\nWriting output to Parquet... ', esM.verbose, 0)
+    _t = time.time()
+    os.makedirs(outputDirectory, exist_ok=True)
+    metadata = json.dumps(getOptimizationOutputMetadata(esM)).encode()
+
+    for tableName, df in getOptimizationOutputTables(esM, optSumOutputLevel, optValOutputLevel).items():
+        # Parquet requires string column names
+        df = df.astype(float)
+        df.columns = df.columns.astype(str)
+        table = pa.Table.from_pandas(df)
+        table = table.replace_schema_metadata({**table.schema.metadata, b'FINE': metadata})
+        pq.write_table(table, os.path.join(outputDirectory, tableName + '.parquet'))
+    utils.output('Done. (%.4f' % (time.time() - _t) + ' sec)', esM.verbose, 0)
+
+
+def writeOptimizationOutputToHDF5(esM,
+                                  outputFileName='scenarioOutput',
+                                  optSumOutputLevel=2,
+                                  optValOutputLevel=1):
+    """
+    Write optimization output to an HDF5 file (requires the tables python package). The output is grouped like in
+    writeOptimizationOutputToExcel and each group is written to the dataset '<group>' in the file (see
+    getOptimizationOutputTables). The periods order and the segment durations are stored as attributes of the root
+    node of the file (see getOptimizationOutputMetadata). Compared to an Excel file, writing and reading is
+    considerably faster and the number of time steps is not limited by the maximum number of columns.
+
+    :param esM: EnergySystemModel instance in which the optimized model is hold
+    :type esM: EnergySystemModel instance
+
+    :param outputFileName: name of the HDF5 output file (without .h5 ending)
+        |br| * the default value is 'scenarioOutput'
+    :type outputFileName: string
+
+    :param optSumOutputLevel: output level of the optimization summary (see writeOptimizationOutputToExcel)
+        |br| * the default value is 2
+    :type optSumOutputLevel: int (0,1,2) or dict
+
+    :param optValOutputLevel: output level of the optimal values (see writeOptimizationOutputToExcel)
+        |br| * the default value is 1
+    :type optValOutputLevel: int (0,1) or dict
+    """
+    utils.output('\nWriting output to HDF5... ', esM.verbose, 0)
+    _t = time.time()
+    with pd.HDFStore(outputFileName + '.h5', mode='w') as store:
+        for tableName, df in getOptimizationOutputTables(esM, optSumOutputLevel, optValOutputLevel).items():
+            store.put(tableName, df.astype(float), format='fixed')
+        for key, value in getOptimizationOutputMetadata(esM).items():
+            setattr(store.root._v_attrs, key, json.dumps(value))
+    utils.output('Done. (%.4f' % (time.time() - _t) + ' sec)', esM.verbose, 0)
+
+
+def writeProfileToJSON(esM, outputFileName='profile'):
+    """
+    Write the profile of the last optimization run (run times of the build, solve and postprocess phases and, if
+    the optimization problem was declared with profile=True, the number of variables, constraints and nonzeros
+    created in each build phase) together with the build, solve and run times to a JSON file.
+
+    :param esM: EnergySystemModel instance in which the optimized model is hold
+    :type esM: EnergySystemModel instance
+
+    :param outputFileName: name of the JSON output file (without .json ending)
+        |br| * the default value is 'profile'
+    :type outputFileName: string
+    """
+    data = {key: esM.solverSpecs[key] for key in ['solver', 'hasTSA', 'buildtime', 'solvetime', 'runtime',
+                                                 'loadtime', 'savedLoadtime', 'profile']}
+    with open(outputFileName + '.json', 'w') as f:
+        json.dump(data, f, indent=4)
+
+
 def readEnergySystemModelFromExcel(fileName='scenarioInput.xlsx', engine='openpyxl'):
     """
     Read energy system model from excel file.
@@ -267,6 +415,107 @@ def readOptimizationOutputFromExcel(esM, fileName='scenarioOutput.xlsx', engine=
     return esM
 
 
+def setOptimizationOutputTables(esM, tables):
+    """
+    Set the optimization output of an energy system model from tables which were grouped by
+    getOptimizationOutputTables (e.g. after reading them from Parquet or HDF5 files).
+
+    :param esM: EnergySystemModel instance which includes the setting of the optimized model
+    :type esM: EnergySystemModel instance
+
+    :param tables: dictionary with the table names as keys and the tables as values
+    :type tables: dict of pandas DataFrames
+
+    :return: esM - an EnergySystemModel class instance
+    """
+    # Check if the optimization output matches the given energy system model (sufficient condition)
+    tableNames = {mdl: [tableName for tableName in tables if tableName.split('_')[0] in
+                        [mdl[0:-5] + 'OptSummary', mdl[0:-5]]] for mdl in esM.componentModelingDict}
+    if not all(tableNames.values()) or sum(len(names) for names in tableNames.values()) != len(tables):
+        raise ValueError('Loaded Output does not match the given energy system model.')
+    compList = [comp for tableName, df in tables.items() if 'OptSummary' in tableName
+                for comp in df.index.get_level_values(0).unique()]
+    if not set(compList) <= set(esM.componentNames.keys()):
+        raise ValueError('Loaded Output does not match the given energy system model.')
+
+    # set attributes of esM
+    for mdl, names in tableNames.items():
+        esM.componentModelingDict[mdl]._pendingOptimalValues = None
+        for tableName in names:
+            df = tables[tableName]
+            if 'OptSummary' in tableName:
+                setattr(esM.componentModelingDict[mdl], 'optSummary', df)
+            else:
+                for var in df.index.get_level_values(0).unique():
+                    setattr(esM.componentModelingDict[mdl], var, df.loc[var])
+    return esM
+
+
+def readOptimizationOutputFromParquet(esM, outputDirectory='scenarioOutput'):
+    """
+    Read optimization output from Parquet files (requires the pyarrow python package).
+
+    :param esM: EnergySystemModel instance which includes the setting of the optimized model
+    :type esM: EnergySystemModel instance
+
+    **Default arguments**
+
+    :param outputDirectory: name of the directory with the Parquet files written by writeOptimizationOutputToParquet()
+        |br| * the default value is 'scenarioOutput'
+    :type outputDirectory: string
+
+    :return: esM - an EnergySystemModel class instance
+    """
+    tables = {}
+    for fileName in sorted(os.listdir(outputDirectory)):
+        if fileName.endswith('.parquet'):
+            df = pd.read_parquet(os.path.join(outputDirectory, fileName))
+            if 'TDoptVar' in fileName:
+                df.columns = df.columns.astype(int)
+            tables[fileName[:-len('.parquet')]] = df
+    return setOptimizationOutputTables(esM, tables)
+
+
+def readOptimizationOutputFromHDF5(esM, fileName='scenarioOutput.h5'):
+    """
+    Read optimization output from an HDF5 file (requires the tables python package).
+
+    :param esM: EnergySystemModel instance which includes the setting of the optimized model
+    :type esM: EnergySystemModel instance
+
+    **Default arguments**
+
+    :param fileName: HDF5 file name or path (including .h5 ending) to an HDF5 file written by
+        writeOptimizationOutputToHDF5()
+        |br| * the default value is 'scenarioOutput.h5'
+    :type fileName: string
+
+    :return: esM - an EnergySystemModel class instance
+    """
+    with pd.HDFStore(fileName, mode='r') as store:
+        tables = {key[1:]: store[key] for key in store.keys()}
+    return setOptimizationOutputTables(esM, tables)
+
+
+def readOptimizationOutputMetadata(fileName):
+    """
+    Read the metadata (periods order and segment durations, see getOptimizationOutputMetadata) stored with the
+    optimization output by writeOptimizationOutputToParquet() or writeOptimizationOutputToHDF5().
+
+    :param fileName: name of the directory with the Parquet files or name of the HDF5 file (including .h5 ending)
+    :type fileName: string
+
+    :return: dictionary with the keys 'periodsOrder' and 'timeStepsPerSegment'
+    :rtype: dict
+    """
+    if os.path.isdir(fileName):
+        import pyarrow.parquet as pq
+        parquetFile = [f for f in sorted(os.listdir(fileName)) if f.endswith('.parquet')][0]
+        return json.loads(pq.read_schema(os.path.join(fileName, parquetFile)).metadata[b'FINE'])
+    with pd.HDFStore(fileName, mode='r') as store:
+        return {key: json.loads(getattr(store.root._v_attrs, key)) for key in ['periodsOrder', 'timeStepsPerSegment']}
+
+
 def getDualValues(pyM):
     """
     Get dual values of an optimized pyomo instance.
@@ -313,7 +562,10 @@ def getShadowPrices(esM, constraint, dualValues=None, hasTimeSeries=False, perio
     if dualValues is None:
         dualValues = getDualValues(esM.pyM)
 
-    SP = pd.Series(list(constraint.values()), index=pd.Index(list(constraint.keys()))).map(dualValues)
+    # Constraints declared with the matrix backend are indexed by their row number; their original index is
+    # stored in the rowIndex attribute
+    index = getattr(constraint, 'rowIndex', list(constraint.keys()))
+    SP = pd.Series(list(constraint.values()), index=pd.Index(index)).map(dualValues)
 
     if hasTimeSeries:
         SP = pd.DataFrame(SP).swaplevel(i=0, j=-2).sort_index()
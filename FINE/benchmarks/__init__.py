@@ -0,0 +1,7 @@
+"""
+Last edited: October 17, 2026
+
+|br| @author: FINE Developer Team (FZJ IEK-3)
+"""
+
+from .scalingBenchmark import *
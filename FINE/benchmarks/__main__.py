@@ -0,0 +1,41 @@
+"""
+Run the synthetic scaling benchmark from the command line, e.g.
+
+    python -m FINE.benchmarks --output benchmarkBaseline
+    python -m FINE.benchmarks --output benchmarkNew --compare benchmarkBaseline.json
+
+Last edited: October 17, 2026
+
+|br| @author: FINE Developer Team (FZJ IEK-3)
+"""
+
+import argparse
+import sys
+from FINE.benchmarks import runScalingBenchmark, compareBenchmarkResults
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic scaling benchmark for FINE models.')
+    parser.add_argument('--locations', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--timesteps', type=int, nargs='+', default=[168, 672])
+    parser.add_argument('--components', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--solver', default='glpk')
+    parser.add_argument('--backend', default='pyomo')
+    parser.add_argument('--no-memory', action='store_true', help='do not track the peak memory')
+    parser.add_argument('--output', default=None, help='name of the JSON output file (without .json ending)')
+    parser.add_argument('--compare', default=None, help='JSON file with baseline results')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    benchmark = runScalingBenchmark(numbersOfLocations=args.locations, numbersOfTimeSteps=args.timesteps,
+                                    numbersOfComponents=args.components, solver=args.solver, backend=args.backend,
+                                    trackMemory=not args.no_memory, outputFileName=args.output)
+    if args.compare is not None:
+        comparison = compareBenchmarkResults(args.compare, benchmark, tolerance=args.tolerance)
+        print(comparison.to_string())
+        if comparison['isRegression'].any():
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
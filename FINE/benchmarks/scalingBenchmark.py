@@ -0,0 +1,430 @@
+"""
+Last edited: October 17, 2026
+
+|br| @author: FINE Developer Team (FZJ IEK-3)
+"""
+
+import FINE as fn
+from FINE import utils
+import numpy as np
+import pandas as pd
+from pyomo.version import version as pyomoVersion
+import itertools
+import json
+import platform
+import time
+import tracemalloc
+
+
+def generateSyntheticEnergySystemModel(numberOfLocations=4,
+                                       numberOfTimeSteps=168,
+                                       numberOfComponents=1,
+                                       eligibilityShare=0.75,
+                                       seed=0,
+                                       verboseLogLevel=2):
+    """
+    Generate a synthetic energy system model with an electricity and a hydrogen sector for benchmarking purposes.
+    For each of the numberOfComponents component sets, the model contains a photovoltaic and a wind Source, an
+    electrolyzer (Conversion), a battery and a hydrogen Storage as well as AC cables and pipelines (Transmission).
+    The locational eligibility of these components and their time series are drawn randomly. Furthermore, every
+    location has an electricity and a hydrogen demand (Sink) and expensive imports (Source) which guarantee the
+    feasibility of the optimization problem.
+
+    **Default arguments:**
+
+    :param numberOfLocations: number of locations of the energy system model
+        |br| * the default value is 4
+    :type numberOfLocations: strictly positive integer
+
+    :param numberOfTimeSteps: number of hourly time steps of the energy system model
+        |br| * the default value is 168
+    :type numberOfTimeSteps: strictly positive integer
+
+    :param numberOfComponents: number of component sets (each consisting of seven components) in the model
+        |br| * the default value is 1
+    :type numberOfComponents: strictly positive integer
+
+    :param eligibilityShare: probability with which a component is eligible at a location (or a connection)
+        |br| * the default value is 0.75
+    :type eligibilityShare: float between 0 and 1
+
+    :param seed: seed of the random number generator. The same inputs always result in the same model.
+        |br| * the default value is 0
+    :type seed: integer
+
+    :param verboseLogLevel: verbose log level of the energy system model (see EnergySystemModel)
+        |br| * the default value is 2
+    :type verboseLogLevel: integer (0, 1 or 2)
+
+    :return: synthetic energy system model
+    :rtype: EnergySystemModel instance
+    """
+    utils.isStrictlyPositiveInt(numberOfLocations), utils.isStrictlyPositiveInt(numberOfTimeSteps)
+    utils.isStrictlyPositiveInt(numberOfComponents)
+    if not 0 <= eligibilityShare <= 1:
+        raise ValueError('The eligibilityShare parameter has to be between 0 and 1.')
+
+    rng = np.random.RandomState(seed)
+    locations = ['L' + str(i) for i in range(numberOfLocations)]
+    hours = np.arange(numberOfTimeSteps)
+
+    esM = fn.EnergySystemModel(locations=set(locations), commodities={'electricity', 'hydrogen'},
+                               numberOfTimeSteps=numberOfTimeSteps,
+                               commodityUnitsDict={'electricity': r'GW$_{el}$', 'hydrogen': r'GW$_{H_{2},LHV}$'},
+                               hoursPerTimeStep=1, costUnit='1e9 Euro', lengthUnit='km',
+                               verboseLogLevel=verboseLogLevel)
+
+    def getEligibility():
+        elig = pd.Series((rng.rand(numberOfLocations) < eligibilityShare).astype(int), index=locations)
+        elig.iloc[rng.randint(numberOfLocations)] = 1
+        return elig
+
+    def getConnectionEligibility():
+        elig = np.triu((rng.rand(numberOfLocations, numberOfLocations) < eligibilityShare).astype(int), 1)
+        return pd.DataFrame(elig + elig.T, index=locations, columns=locations)
+
+    def getProfiles(elig, dailyShape, noise):
+        shift = rng.randint(-2, 3, size=numberOfLocations)
+        profiles = np.clip(dailyShape((hours[:, None] + shift[None, :]) % 24) +
+                           noise * rng.rand(numberOfTimeSteps, numberOfLocations), 0, 1)
+        return pd.DataFrame(profiles, columns=locations) * elig
+
+    def solarShape(hour):
+        return np.clip(np.sin((hour - 6) / 12 * np.pi), 0, None)
+
+    def windShape(hour):
+        return 0.4 + 0.2 * np.cos(hour / 24 * 2 * np.pi)
+
+    coordinates = pd.DataFrame(rng.rand(numberOfLocations, 2) * 500, index=locations)
+    distances = pd.DataFrame(np.sqrt(((coordinates.values[:, None, :] - coordinates.values[None, :, :]) ** 2)
+                                     .sum(axis=2)), index=locations, columns=locations)
+
+    for i in range(numberOfComponents):
+        elig = getEligibility()
+        esM.add(fn.Source(esM=esM, name='PV ' + str(i), commodity='electricity', hasCapacityVariable=True,
+                          locationalEligibility=elig, operationRateMax=getProfiles(elig, solarShape, 0.1),
+                          capacityMax=elig * 100, investPerCapacity=0.65, opexPerCapacity=0.65 * 0.02,
+                          interestRate=0.08, economicLifetime=25))
+
+        elig = getEligibility()
+        esM.add(fn.Source(esM=esM, name='Wind ' + str(i), commodity='electricity', hasCapacityVariable=True,
+                          locationalEligibility=elig, operationRateMax=getProfiles(elig, windShape, 0.5),
+                          capacityMax=elig * 100, investPerCapacity=1.1, opexPerCapacity=1.1 * 0.02,
+                          interestRate=0.08, economicLifetime=20))
+
+        esM.add(fn.Conversion(esM=esM, name='Electrolyzer ' + str(i), physicalUnit=r'GW$_{el}$',
+                              commodityConversionFactors={'electricity': -1, 'hydrogen': 0.7},
+                              hasCapacityVariable=True, locationalEligibility=getEligibility(),
+                              investPerCapacity=0.5, opexPerCapacity=0.5 * 0.025, interestRate=0.08,
+                              economicLifetime=10))
+
+        esM.add(fn.Storage(esM=esM, name='Battery ' + str(i), commodity='electricity', hasCapacityVariable=True,
+                           locationalEligibility=getEligibility(), chargeEfficiency=0.95, dischargeEfficiency=0.95,
+                           selfDischarge=0.0001, chargeRate=1, dischargeRate=1, investPerCapacity=0.15,
+                           opexPerCapacity=0.15 * 0.01, interestRate=0.08, economicLifetime=15))
+
+        esM.add(fn.Storage(esM=esM, name='Hydrogen storage ' + str(i), commodity='hydrogen',
+                           hasCapacityVariable=True, locationalEligibility=getEligibility(), stateOfChargeMin=0.33,
+                           investPerCapacity=0.0005, interestRate=0.08, economicLifetime=30))
+
+        if numberOfLocations > 1:
+            esM.add(fn.Transmission(esM=esM, name='AC cables ' + str(i), commodity='electricity',
+                                    hasCapacityVariable=True, locationalEligibility=getConnectionEligibility(),
+                                    distances=distances, losses=0.00003, investPerCapacity=0.0011,
+                                    interestRate=0.08, economicLifetime=40))
+
+            esM.add(fn.Transmission(esM=esM, name='Pipelines ' + str(i), commodity='hydrogen',
+                                    hasCapacityVariable=True, locationalEligibility=getConnectionEligibility(),
+                                    distances=distances, investPerCapacity=0.000177, interestRate=0.08,
+                                    economicLifetime=40))
+
+    demand = pd.DataFrame(5 + 2 * np.sin((hours[:, None] - 9) / 24 * 2 * np.pi) +
+                          rng.rand(numberOfTimeSteps, numberOfLocations), columns=locations)
+    esM.add(fn.Sink(esM=esM, name='Electricity demand', commodity='electricity', hasCapacityVariable=False,
+                    operationRateFix=demand))
+    esM.add(fn.Sink(esM=esM, name='Hydrogen demand', commodity='hydrogen', hasCapacityVariable=False,
+                    operationRateFix=pd.DataFrame(np.ones((numberOfTimeSteps, numberOfLocations)) *
+                                                  rng.rand(numberOfLocations), columns=locations)))
+
+    esM.add(fn.Source(esM=esM, name='Electricity import', commodity='electricity', hasCapacityVariable=False,
+                      commodityCost=0.0005))
+    esM.add(fn.Source(esM=esM, name='Hydrogen import', commodity='hydrogen', hasCapacityVariable=False,
+                      commodityCost=0.0005))
+
+    return esM
+
+
+def runBenchmarkCase(numberOfLocations=4,
+                     numberOfTimeSteps=168,
+                     numberOfComponents=1,
+                     numberOfTypicalPeriods=None,
+                     numberOfTimeStepsPerPeriod=24,
+                     segmentation=False,
+                     numberOfSegmentsPerPeriod=12,
+                     eligibilityShare=0.75,
+                     seed=0,
+                     solver='glpk',
+                     backend='pyomo',
+                     trackMemory=True):
+    """
+    Generate a synthetic energy system model (see generateSyntheticEnergySystemModel), optionally cluster its time
+    series, declare and solve its optimization problem (as LP) and process the optimization output. The run time
+    of each of these steps and the peak memory of the whole case are measured.
+
+    **Default arguments:**
+
+    :param numberOfLocations, numberOfTimeSteps, numberOfComponents, eligibilityShare, seed: see
+        generateSyntheticEnergySystemModel
+
+    :param numberOfTypicalPeriods: number of typical periods into which the time series data are clustered. If None,
+        the time series data are not clustered.
+        |br| * the default value is None
+    :type numberOfTypicalPeriods: strictly positive integer or None
+
+    :param numberOfTimeStepsPerPeriod, segmentation, numberOfSegmentsPerPeriod: see EnergySystemModel.cluster
+        (only used if numberOfTypicalPeriods is not None)
+
+    :param solver: solver which is used to solve the optimization problem (e.g. 'glpk' or 'cbc')
+        |br| * the default value is 'glpk'
+    :type solver: string
+
+    :param backend: backend which is used to declare the optimization problem (see declareOptimizationProblem)
+        |br| * the default value is 'pyomo'
+    :type backend: string
+
+    :param trackMemory: states if the peak memory of the case is tracked with tracemalloc (True) or not (False).
+        Tracking the memory slows down the declaration of the optimization problem, so run times should only be
+        compared between runs with the same trackMemory setting.
+        |br| * the default value is True
+    :type trackMemory: boolean
+
+    :return: benchmark result with the inputs of the case (case), the name of the case (name), the run times in
+        seconds (times), the peak memory in MB (peakMemory, None if trackMemory is False), the size of the
+        optimization problem (variables, constraints) and the objective value (objectiveValue)
+    :rtype: dict
+    """
+    case = {'numberOfLocations': numberOfLocations, 'numberOfTimeSteps': numberOfTimeSteps,
+            'numberOfComponents': numberOfComponents, 'numberOfTypicalPeriods': numberOfTypicalPeriods,
+            'numberOfTimeStepsPerPeriod': numberOfTimeStepsPerPeriod, 'segmentation': segmentation,
+            'numberOfSegmentsPerPeriod': numberOfSegmentsPerPeriod, 'eligibilityShare': eligibilityShare,
+            'seed': seed, 'solver': solver, 'backend': backend}
+    times = {}
+    timeSeriesAggregation = numberOfTypicalPeriods is not None
+
+    if trackMemory:
+        tracemalloc.start()
+    try:
+        _t = time.time()
+        esM = generateSyntheticEnergySystemModel(numberOfLocations, numberOfTimeSteps, numberOfComponents,
+                                                 eligibilityShare, seed)
+        times['generate'] = time.time() - _t
+
+        _t = time.time()
+        if timeSeriesAggregation:
+            esM.cluster(numberOfTypicalPeriods=numberOfTypicalPeriods,
+                        numberOfTimeStepsPerPeriod=numberOfTimeStepsPerPeriod, segmentation=segmentation,
+                        numberOfSegmentsPerPeriod=numberOfSegmentsPerPeriod)
+        times['cluster'] = time.time() - _t
+
+        _t = time.time()
+        esM.declareOptimizationProblem(timeSeriesAggregation=timeSeriesAggregation,
+                                       segmentation=timeSeriesAggregation and segmentation, backend=backend)
+        times['declareOptimizationProblem'] = time.time() - _t
+
+        esM.optimize(declaresOptimizationProblem=False, timeSeriesAggregation=timeSeriesAggregation, solver=solver)
+        profile = esM.solverSpecs['profile']
+        times['solve'] = sum(entry['time'] for entry in profile['solve'] if entry['name'] == 'solve')
+        times['setOptimalValues'] = sum(entry['time'] for entry in profile['postprocess'])
+        times['total'] = sum(times.values())
+    finally:
+        peakMemory = tracemalloc.get_traced_memory()[1] / 1e6 if trackMemory else None
+        if trackMemory:
+            tracemalloc.stop()
+
+    return {'name': getBenchmarkCaseName(case), 'case': case, 'times': times, 'peakMemory': peakMemory,
+            'variables': esM.pyM.nvariables(), 'constraints': esM.pyM.nconstraints(),
+            'objectiveValue': esM.objectiveValue}
+
+
+def getBenchmarkCaseName(case):
+    """
+    Return a short, unique name of a benchmark case which is used to match cases of different benchmark runs.
+
+    :param case: inputs of the benchmark case (see runBenchmarkCase)
+    :type case: dict
+
+    :return: name of the case (e.g. 'L4_T168_C1_full_pyomo_glpk')
+    :rtype: string
+    """
+    name = 'L' + str(case['numberOfLocations']) + '_T' + str(case['numberOfTimeSteps']) + \
+        '_C' + str(case['numberOfComponents'])
+    if case['numberOfTypicalPeriods'] is None:
+        name += '_full'
+    else:
+        name += '_TSA' + str(case['numberOfTypicalPeriods']) + 'x' + str(case['numberOfTimeStepsPerPeriod'])
+        if case['segmentation']:
+            name += 'S' + str(case['numberOfSegmentsPerPeriod'])
+    if case['eligibilityShare'] != 0.75 or case['seed'] != 0:
+        name += '_E' + str(case['eligibilityShare']) + '_seed' + str(case['seed'])
+    return name + '_' + case['backend'] + '_' + case['solver']
+
+
+def runScalingBenchmark(numbersOfLocations=(2, 4, 8),
+                        numbersOfTimeSteps=(168, 672),
+                        numbersOfComponents=(1, 2),
+                        clusterSettings=(None, (4, 24)),
+                        solver='glpk',
+                        backend='pyomo',
+                        trackMemory=True,
+                        outputFileName=None,
+                        verbose=0):
+    """
+    Run the benchmark cases (see runBenchmarkCase) for all combinations of the given numbers of locations, time
+    steps, component sets and cluster settings and, if specified, write the results to a JSON file which can be used
+    as a baseline for later runs (see compareBenchmarkResults).
+
+    **Default arguments:**
+
+    :param numbersOfLocations: numbers of locations which are benchmarked
+        |br| * the default value is (2, 4, 8)
+    :type numbersOfLocations: tuple of strictly positive integers
+
+    :param numbersOfTimeSteps: numbers of time steps which are benchmarked
+        |br| * the default value is (168, 672)
+    :type numbersOfTimeSteps: tuple of strictly positive integers
+
+    :param numbersOfComponents: numbers of component sets which are benchmarked
+        |br| * the default value is (1, 2)
+    :type numbersOfComponents: tuple of strictly positive integers
+
+    :param clusterSettings: cluster settings which are benchmarked, either None (no clustering) or a tuple with
+        the numberOfTypicalPeriods and the numberOfTimeStepsPerPeriod. Settings for which the number of time steps is
+        not a multiple of the numberOfTimeStepsPerPeriod or which would result in more typical periods than periods
+        are skipped.
+        |br| * the default value is (None, (4, 24))
+    :type clusterSettings: tuple
+
+    :param solver, backend, trackMemory: see runBenchmarkCase
+
+    :param outputFileName: name of the JSON output file (without .json ending). If None, no file is written.
+        |br| * the default value is None
+    :type outputFileName: string or None
+
+    :param verbose: if 0, the progress of the benchmark is printed.
+        |br| * the default value is 0
+    :type verbose: integer
+
+    :return: benchmark results with information on the environment (metadata) and the results of the single cases
+        (results)
+    :rtype: dict
+    """
+    results = []
+    for numberOfLocations, numberOfTimeSteps, numberOfComponents, clusterSetting in \
+            itertools.product(numbersOfLocations, numbersOfTimeSteps, numbersOfComponents, clusterSettings):
+        clusterKwargs = {}
+        if clusterSetting is not None:
+            numberOfTypicalPeriods, numberOfTimeStepsPerPeriod = clusterSetting
+            if numberOfTimeSteps % numberOfTimeStepsPerPeriod != 0 or \
+                    numberOfTypicalPeriods >= numberOfTimeSteps // numberOfTimeStepsPerPeriod:
+                continue
+            clusterKwargs = {'numberOfTypicalPeriods': numberOfTypicalPeriods,
+                             'numberOfTimeStepsPerPeriod': numberOfTimeStepsPerPeriod}
+        result = runBenchmarkCase(numberOfLocations=numberOfLocations, numberOfTimeSteps=numberOfTimeSteps,
+                                  numberOfComponents=numberOfComponents, solver=solver, backend=backend,
+                                  trackMemory=trackMemory, **clusterKwargs)
+        utils.output(('{:45}').format(result['name']) + '%.4f sec' % result['times']['total'], verbose, 0)
+        results.append(result)
+
+    benchmark = {'metadata': {'date': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': platform.python_version(),
+                              'platform': platform.platform(), 'pyomo': pyomoVersion,
+                              'numpy': np.__version__, 'pandas': pd.__version__, 'trackMemory': trackMemory},
+                 'results': results}
+    if outputFileName is not None:
+        writeBenchmarkResults(benchmark, outputFileName)
+    return benchmark
+
+
+def writeBenchmarkResults(benchmark, outputFileName='benchmarkBaseline'):
+    """
+    Write benchmark results (see runScalingBenchmark) to a JSON file.
+
+    :param benchmark: benchmark results
+    :type benchmark: dict
+
+    :param outputFileName: name of the JSON output file (without .json ending)
+        |br| * the default value is 'benchmarkBaseline'
+    :type outputFileName: string
+    """
+    with open(outputFileName + '.json', 'w') as f:
+        json.dump(benchmark, f, indent=4)
+
+
+def readBenchmarkResults(fileName='benchmarkBaseline.json'):
+    """
+    Read benchmark results (see runScalingBenchmark) from a JSON file.
+
+    :param fileName: name of the JSON file
+        |br| * the default value is 'benchmarkBaseline.json'
+    :type fileName: string
+
+    :return: benchmark results
+    :rtype: dict
+    """
+    with open(fileName, 'r') as f:
+        return json.load(f)
+
+
+def compareBenchmarkResults(baseline, benchmark, tolerance=0.25, timeThreshold=0.1):
+    """
+    Compare benchmark results with a baseline. Cases are matched by their names; cases which are only part of one
+    of the benchmarks are ignored. For each case, the run times, the peak memory and the size of the optimization
+    problem are compared.
+
+    :param baseline: baseline benchmark results or the name of the JSON file in which they are stored
+    :type baseline: dict or string
+
+    :param benchmark: benchmark results or the name of the JSON file in which they are stored
+    :type benchmark: dict or string
+
+    :param tolerance: relative increase of a metric above which the metric is marked as a regression
+        |br| * the default value is 0.25
+    :type tolerance: positive float
+
+    :param timeThreshold: absolute increase of a run time in seconds below which the run time is not marked as a
+        regression (avoids false alarms for steps which only take fractions of a second)
+        |br| * the default value is 0.1
+    :type timeThreshold: positive float
+
+    :return: comparison with the case name and the metric as index and the baseline value, the current value, the
+        relative change and a regression flag as columns
+    :rtype: pandas DataFrame
+    """
+    if isinstance(baseline, str):
+        baseline = readBenchmarkResults(baseline)
+    if isinstance(benchmark, str):
+        benchmark = readBenchmarkResults(benchmark)
+    utils.isPositiveNumber(tolerance), utils.isPositiveNumber(timeThreshold)
+
+    def getMetrics(result):
+        metrics = {'time_' + key: value for key, value in result['times'].items()}
+        metrics.update({key: result[key] for key in ['peakMemory', 'variables', 'constraints']})
+        return metrics
+
+    baselineResults = {result['name']: getMetrics(result) for result in baseline['results']}
+    rows, index = [], []
+    for result in benchmark['results']:
+        if result['name'] not in baselineResults:
+            continue
+        baselineMetrics = baselineResults[result['name']]
+        for metric, value in getMetrics(result).items():
+            baselineValue = baselineMetrics.get(metric)
+            if value is None or baselineValue is None:
+                continue
+            change = (value - baselineValue) / baselineValue if baselineValue != 0 else 0 if value == 0 else np.inf
+            isRegression = change > tolerance and \
+                (not metric.startswith('time_') or value - baselineValue > timeThreshold)
+            rows.append([baselineValue, value, change, isRegression])
+            index.append((result['name'], metric))
+
+    return pd.DataFrame(rows, columns=['baseline', 'current', 'relativeChange', 'isRegression'],
+                        index=pd.MultiIndex.from_tuples(index, names=['case', 'metric']) if index else None)
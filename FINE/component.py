@@ -3,6 +3,7 @@ from FINE import utils
 import warnings
 import pyomo.environ as pyomo
 import pandas as pd
+import numpy as np
 
 
 class Component(metaclass=ABCMeta):
@@ -407,6 +408,44 @@ class Component(metaclass=ABCMeta):
             esM.componentModelingDict.update({mdl: self.modelingClass()})
         esM.componentModelingDict[mdl].componentsDict.update({self.name: self})
 
+    def updateCostParameter(self, esM, name, data):
+        """
+        Update a cost parameter of the component after the component was added to an EnergySystemModel instance.
+        Cost parameters are the economic parameters (e.g. investPerCapacity, opexPerOperation, commodityCost,
+        interestRate) and the cost or revenue time series (e.g. commodityCostTimeSeries). Parameters which change
+        the structure of the optimization problem (e.g. QPcostScale or adding a time series which was None before)
+        can not be updated.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component is modeled.
+        :type esM: EnergySystemModel instance
+
+        :param name: name of the cost parameter
+        :type name: string
+
+        :param data: new value of the cost parameter (same format as in the initialization of the component)
+        :type data: float, Pandas Series or Pandas DataFrame
+        """
+        economicParameters = ['investPerCapacity', 'investIfBuilt', 'opexPerCapacity', 'opexIfBuilt', 'interestRate',
+                              'economicLifetime', 'opexPerOperation', 'commodityCost', 'commodityRevenue',
+                              'opexPerChargeOperation', 'opexPerDischargeOperation']
+        timeSeriesParameters = ['commodityCostTimeSeries', 'commodityRevenueTimeSeries', 'opexPerChargeOpTimeSeries']
+
+        if name in economicParameters and hasattr(self, name):
+            setattr(self, name, utils.checkAndSetCostParameter(esM, self.name, data, self.dimension,
+                                                               self.locationalEligibility))
+            self.CCF = utils.getCapitalChargeFactor(self.interestRate, self.economicLifetime)
+        elif name in timeSeriesParameters and hasattr(self, name):
+            fullName = 'full' + name[0].upper() + name[1:]
+            fullData = utils.checkAndSetTimeSeries(esM, self.name, data, self.locationalEligibility, self.dimension)
+            if (fullData is None) != (getattr(self, fullName) is None):
+                raise ValueError('The time series ' + name + ' of component ' + self.name + ' can only be updated '
+                                 'if it was specified before and is specified again.\n--> Declare the optimization '
+                                 'problem again.')
+            setattr(self, name, data), setattr(self, fullName, fullData)
+        else:
+            raise ValueError('The parameter ' + name + ' of component ' + self.name + ' is not an updatable cost '
+                             'parameter.')
+
     def prepareTSAInput(self, rateFix, rateMax, rateName, rateWeight, weightDict, data):
         """
         Format the time series data of a component to fit the requirements of the time series aggregation package and
@@ -506,6 +545,10 @@ class ComponentModel(metaclass=ABCMeta):
     Every model class of the several component technologies inherits from the ComponentModel class.
     Within the ComponentModel class, general valid sets, variables and constraints are declared.
     """
+    # Optimal values which are set up on first access (see setOptimalValuesLazily)
+    _pendingOptimalValues = None
+    lazyOptimalValueNames = ('operationVariablesOptimum', 'optSummary')
+
     def __init__(self):
         """ Constructor for creating a ComponentModel class instance. """
         self.abbrvName = ''
@@ -604,15 +647,16 @@ class ComponentModel(metaclass=ABCMeta):
                            if (loc, compName) in getattr(pyM, 'operationVarSet_' + abbrvName)}
                      for loc in esM.locations})
         elif self.dimension == '2dim':
-            # Dictionaries which list all outgoing and incoming components at a location
-            setattr(pyM, 'operationVarDictOut_' + abbrvName,
-                    {loc: {loc_: {compName for compName in compDict
-                                  if (loc + '_' + loc_, compName) in getattr(pyM, 'operationVarSet_' + abbrvName)}
-                           for loc_ in esM.locations} for loc in esM.locations})
-            setattr(pyM, 'operationVarDictIn_' + abbrvName,
-                    {loc: {loc_: {compName for compName in compDict
-                                  if (loc_ + '_' + loc, compName) in getattr(pyM, 'operationVarSet_' + abbrvName)}
-                           for loc_ in esM.locations} for loc in esM.locations})
+            # Dictionaries which list all outgoing and incoming components at a location (only the locations which
+            # are connected by at least one component are listed in the inner dictionaries)
+            opVarDictOut, opVarDictIn = {loc: {} for loc in esM.locations}, {loc: {} for loc in esM.locations}
+            for compName, comp in compDict.items():
+                for connection in comp._connections:
+                    loc, loc_ = comp._mapC[connection]
+                    opVarDictOut[loc].setdefault(loc_, set()).add(compName)
+                    opVarDictIn[loc_].setdefault(loc, set()).add(compName)
+            setattr(pyM, 'operationVarDictOut_' + abbrvName, opVarDictOut)
+            setattr(pyM, 'operationVarDictIn_' + abbrvName, opVarDictIn)
    
     def declareOperationBinarySet(self, pyM):
         """
@@ -1005,14 +1049,20 @@ class ComponentModel(metaclass=ABCMeta):
         opVar, capVar = getattr(pyM, opVarName + '_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         constrSet1 = getattr(pyM, constrSetName + '1_' + abbrvName)
 
-        if not pyM.hasSegmentation:
+        if pyM.backend == 'matrix':
+            factor1 = self.getHoursPerTimeStepArray(pyM, esM, isStateOfCharge)
+            def rate(loc, compName):
+                return 1 if factorName is None else getattr(compDict[compName], factorName)
+            self.operationModeMatrix(pyM, constrName + '1_' + abbrvName, constrSet1, opVar, capVar, factor1, rate,
+                                     isEquality=False)
+        elif not pyM.hasSegmentation:
             factor1 = 1 if isStateOfCharge else esM.hoursPerTimeStep
             def op1(pyM, loc, compName, p, t):
                 factor2 = 1 if factorName is None else getattr(compDict[compName], factorName)
                 return opVar[loc, compName, p, t] <= factor1 * factor2 * capVar[loc, compName]
             setattr(pyM, constrName + '1_' + abbrvName, pyomo.Constraint(constrSet1, pyM.timeSet, rule=op1))
         else:
-            factor1 = (esM.hoursPerSegment/esM.hoursPerSegment).to_dict() if isStateOfCharge else esM.hoursPerSegment.to_dict()
+            factor1 = np.ones_like(pyM.hoursPerSegment) if isStateOfCharge else pyM.hoursPerSegment
             def op1(pyM, loc, compName, p, t):
                 factor2 = 1 if factorName is None else getattr(compDict[compName], factorName)
                 return opVar[loc, compName, p, t] <= factor1[p,t] * factor2 * capVar[loc, compName]
@@ -1034,16 +1084,28 @@ class ComponentModel(metaclass=ABCMeta):
         compDict, abbrvName = self.componentsDict, self.abbrvName
         opVar, capVar = getattr(pyM, opVarName + '_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         constrSet2 = getattr(pyM, constrSetName + '2_' + abbrvName)
-
-        if not pyM.hasSegmentation:
+        if pyM.operationBounds:
+            self.fixZeroOperation(pyM, constrSet2, opVar, opRateName)
+
+        if pyM.backend == 'matrix':
+            factor = self.getHoursPerTimeStepArray(pyM, esM, isStateOfCharge)
+            def rate(loc, compName):
+                return utils.getTimeSetArray(pyM, getattr(compDict[compName], opRateName)[loc])
+            self.operationModeMatrix(pyM, constrName + '2_' + abbrvName, constrSet2, opVar, capVar, factor, rate,
+                                     isEquality=True)
+        elif not pyM.hasSegmentation:
             factor = 1 if isStateOfCharge else esM.hoursPerTimeStep
             def op2(pyM, loc, compName, p, t):
+                if pyM.operationBounds and opVar[loc, compName, p, t].fixed:
+                    return pyomo.Constraint.Skip
                 rate = getattr(compDict[compName], opRateName)
                 return opVar[loc, compName, p, t] == capVar[loc, compName] * rate[loc][p, t] * factor
             setattr(pyM, constrName + '2_' + abbrvName, pyomo.Constraint(constrSet2, pyM.timeSet, rule=op2))
         else:
-            factor = (esM.hoursPerSegment/esM.hoursPerSegment).to_dict() if isStateOfCharge else esM.hoursPerSegment.to_dict()
+            factor = np.ones_like(pyM.hoursPerSegment) if isStateOfCharge else pyM.hoursPerSegment
             def op2(pyM, loc, compName, p, t):
+                if pyM.operationBounds and opVar[loc, compName, p, t].fixed:
+                    return pyomo.Constraint.Skip
                 rate = getattr(compDict[compName], opRateName)
                 return opVar[loc, compName, p, t] == capVar[loc, compName] * rate[loc][p, t] * factor[p,t]
             setattr(pyM, constrName + '2_' + abbrvName, pyomo.Constraint(constrSet2, pyM.timeSet, rule=op2))
@@ -1063,16 +1125,28 @@ class ComponentModel(metaclass=ABCMeta):
         compDict, abbrvName = self.componentsDict, self.abbrvName
         opVar, capVar = getattr(pyM, opVarName + '_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         constrSet3 = getattr(pyM, constrSetName + '3_' + abbrvName)
-
-        if not pyM.hasSegmentation:
+        if pyM.operationBounds:
+            self.fixZeroOperation(pyM, constrSet3, opVar, opRateName)
+
+        if pyM.backend == 'matrix':
+            factor = self.getHoursPerTimeStepArray(pyM, esM, isStateOfCharge)
+            def rate(loc, compName):
+                return utils.getTimeSetArray(pyM, getattr(compDict[compName], opRateName)[loc])
+            self.operationModeMatrix(pyM, constrName + '3_' + abbrvName, constrSet3, opVar, capVar, factor, rate,
+                                     isEquality=False)
+        elif not pyM.hasSegmentation:
             factor = 1 if isStateOfCharge else esM.hoursPerTimeStep
             def op3(pyM, loc, compName, p, t):
+                if pyM.operationBounds and opVar[loc, compName, p, t].fixed:
+                    return pyomo.Constraint.Skip
                 rate = getattr(compDict[compName], opRateName)
                 return opVar[loc, compName, p, t] <= capVar[loc, compName] * rate[loc][p, t] * factor
             setattr(pyM, constrName + '3_' + abbrvName, pyomo.Constraint(constrSet3, pyM.timeSet, rule=op3))
         else:
-            factor = (esM.hoursPerSegment/esM.hoursPerSegment).to_dict() if isStateOfCharge else esM.hoursPerSegment.to_dict()
+            factor = np.ones_like(pyM.hoursPerSegment) if isStateOfCharge else pyM.hoursPerSegment
             def op3(pyM, loc, compName, p, t):
+                if pyM.operationBounds and opVar[loc, compName, p, t].fixed:
+                    return pyomo.Constraint.Skip
                 rate = getattr(compDict[compName], opRateName)
                 return opVar[loc, compName, p, t] <= capVar[loc, compName] * rate[loc][p, t] * factor[p,t]
             setattr(pyM, constrName + '3_' + abbrvName, pyomo.Constraint(constrSet3, pyM.timeSet, rule=op3))
@@ -1089,7 +1163,16 @@ class ComponentModel(metaclass=ABCMeta):
         opVar = getattr(pyM, opVarName + '_' + abbrvName)
         constrSet4 = getattr(pyM, constrSetName + '4_' + abbrvName)
 
-        if not pyM.hasSegmentation:
+        if pyM.operationBounds:
+            self.setOperationBounds(pyM, esM, constrSet4, opVar, opRateName, isEquality=True)
+        elif pyM.backend == 'matrix':
+            factor = (utils.getTimeSetArray(pyM, esM.timeStepsPerSegment) if pyM.hasSegmentation
+                      else np.ones(len(pyM.timeSet)))
+            def rate(loc, compName):
+                return utils.getTimeSetArray(pyM, getattr(compDict[compName], opRateName)[loc])
+            self.operationModeMatrix(pyM, constrName + '4_' + abbrvName, constrSet4, opVar, None, factor, rate,
+                                     isEquality=True)
+        elif not pyM.hasSegmentation:
             def op4(pyM, loc, compName, p, t):
                 rate = getattr(compDict[compName], opRateName)
                 return opVar[loc, compName, p, t] == rate[loc][p, t]
@@ -1097,7 +1180,7 @@ class ComponentModel(metaclass=ABCMeta):
         else:
             def op4(pyM, loc, compName, p, t):
                 rate = getattr(compDict[compName], opRateName)
-                return opVar[loc, compName, p, t] == rate[loc][p, t] * esM.timeStepsPerSegment.to_dict()[p, t]
+                return opVar[loc, compName, p, t] == rate[loc][p, t] * pyM.timeStepsPerSegment[p, t]
             setattr(pyM, constrName + '4_' + abbrvName, pyomo.Constraint(constrSet4, pyM.timeSet, rule=op4))
 
     def operationMode5(self, pyM, esM, constrName, constrSetName, opVarName, opRateName='processedOperationRateMax'):
@@ -1112,7 +1195,16 @@ class ComponentModel(metaclass=ABCMeta):
         opVar = getattr(pyM, opVarName + '_' + abbrvName)
         constrSet5 = getattr(pyM, constrSetName + '5_' + abbrvName)
 
-        if not pyM.hasSegmentation:
+        if pyM.operationBounds:
+            self.setOperationBounds(pyM, esM, constrSet5, opVar, opRateName, isEquality=False)
+        elif pyM.backend == 'matrix':
+            factor = (utils.getTimeSetArray(pyM, esM.timeStepsPerSegment) if pyM.hasSegmentation
+                      else np.ones(len(pyM.timeSet)))
+            def rate(loc, compName):
+                return utils.getTimeSetArray(pyM, getattr(compDict[compName], opRateName)[loc])
+            self.operationModeMatrix(pyM, constrName + '5_' + abbrvName, constrSet5, opVar, None, factor, rate,
+                                     isEquality=False)
+        elif not pyM.hasSegmentation:
             def op5(pyM, loc, compName, p, t):
                 rate = getattr(compDict[compName], opRateName)
                 return opVar[loc, compName, p, t] <= rate[loc][p, t]
@@ -1120,10 +1212,139 @@ class ComponentModel(metaclass=ABCMeta):
         else:
             def op5(pyM, loc, compName, p, t):
                 rate = getattr(compDict[compName], opRateName)
-                return opVar[loc, compName, p, t] <= rate[loc][p, t] * esM.timeStepsPerSegment.to_dict()[p, t]
+                return opVar[loc, compName, p, t] <= rate[loc][p, t] * pyM.timeStepsPerSegment[p, t]
             setattr(pyM, constrName + '5_' + abbrvName, pyomo.Constraint(constrSet5, pyM.timeSet, rule=op5))
 
 
+    def getHoursPerTimeStepArray(self, pyM, esM, isStateOfCharge=False):
+        """
+        Return the hours per time step (or per segment) in the order of pyM.timeSet. For state of charge
+        variables, which are given in [commodityUnit*h], the factor is one.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+        """
+        if isStateOfCharge:
+            return np.ones(len(pyM.timeSet))
+        elif not pyM.hasSegmentation:
+            return np.full(len(pyM.timeSet), float(esM.hoursPerTimeStep))
+        else:
+            return utils.getTimeSetArray(pyM, esM.hoursPerSegment)
+
+    def setOperationBounds(self, pyM, esM, constrSet, opVar, opRateName, isEquality):
+        """
+        Declare operation mode 4 (isEquality=True) or 5 (isEquality=False) as bounds of the operation variables
+        instead of constraints (see the operationBounds parameter of EnergySystemModel.declareOptimizationProblem).
+        The operation variables are fixed to the operation time series or bounded from above by it, respectively.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :param constrSet: set of (loc, compName) tuples of the operation mode
+        :type constrSet: pyomo Set
+
+        :param opVar: operation variable
+        :type opVar: pyomo Var
+
+        :param opRateName: attribute of the components which stores the operation time series
+        :type opRateName: string
+
+        :param isEquality: states if the operation variables are fixed (True) or bounded from above (False)
+        :type isEquality: boolean
+        """
+        compDict, timeSet = self.componentsDict, list(pyM.timeSet)
+        factor = (utils.getTimeSetArray(pyM, esM.timeStepsPerSegment) if pyM.hasSegmentation
+                  else np.ones(len(timeSet)))
+        for loc, compName in constrSet:
+            values = factor * utils.getTimeSetArray(pyM, getattr(compDict[compName], opRateName)[loc])
+            for (p, t), value in zip(timeSet, values.tolist()):
+                var = opVar[loc, compName, p, t]
+                if isEquality:
+                    var.fix(value)
+                else:
+                    var.setub(value if var.ub is None else min(var.ub, value))
+
+    def fixZeroOperation(self, pyM, constrSet, opVar, opRateName):
+        """
+        Fix the operation variables of operation mode 2 or 3 to zero at the time steps at which the operation time
+        series is zero (see the operationBounds parameter of EnergySystemModel.declareOptimizationProblem). The
+        constraints of the operation mode are not declared for these time steps.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param constrSet: set of (loc, compName) tuples of the operation mode
+        :type constrSet: pyomo Set
+
+        :param opVar: operation variable
+        :type opVar: pyomo Var
+
+        :param opRateName: attribute of the components which stores the operation time series
+        :type opRateName: string
+        """
+        compDict, timeSet = self.componentsDict, list(pyM.timeSet)
+        for loc, compName in constrSet:
+            rate = utils.getTimeSetArray(pyM, getattr(compDict[compName], opRateName)[loc])
+            for i in np.flatnonzero(rate == 0):
+                opVar[(loc, compName) + timeSet[i]].fix(0)
+
+    def operationModeMatrix(self, pyM, constrName, constrSet, opVar, capVar, factor, rate, isEquality):
+        """
+        Declare the constraints of an operation mode with the matrix backend. Instead of building one pyomo
+        expression per (loc, compName, p, t) index, the coefficients are assembled as arrays and handed to a
+        pyomo MatrixConstraint. The rows read\n
+        * op - factor * rate * cap (== or <=) 0 if a capacity variable is given and
+        * op (== or <=) factor * rate else.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param constrName: name of the constraint in the pyomo ConcreteModel
+        :type constrName: string
+
+        :param constrSet: set of (loc, compName) tuples for which the constraint is declared
+        :type constrSet: pyomo Set
+
+        :param opVar: operation variable
+        :type opVar: pyomo Var
+
+        :param capVar: capacity variable or None
+        :type capVar: pyomo Var or None
+
+        :param factor: time dependent factor in the order of pyM.timeSet
+        :type factor: numpy array
+
+        :param rate: function which returns the rate (scalar or array in the order of pyM.timeSet) of a component
+            at a location
+        :type rate: function
+
+        :param isEquality: states if the rows are equality (True) or less-or-equal (False) constraints
+        :type isEquality: boolean
+        """
+        timeSet, locComps = list(pyM.timeSet), list(constrSet)
+        rowIndex = [(loc, compName, p, t) for loc, compName in locComps for p, t in timeSet]
+        coefficients = np.zeros(len(rowIndex))
+        for i, (loc, compName) in enumerate(locComps):
+            coefficients[i * len(timeSet):(i + 1) * len(timeSet)] = factor * rate(loc, compName)
+        if pyM.operationBounds:
+            # Skip the rows of operation variables which are fixed (see fixZeroOperation)
+            isFree = np.array([not opVar[index].fixed for index in rowIndex], dtype=bool)
+            rowIndex, coefficients = [index for index, free in zip(rowIndex, isFree) if free], coefficients[isFree]
+
+        terms = [([opVar[index] for index in rowIndex], 1)]
+        if capVar is not None:
+            terms.append(([capVar[loc, compName] for loc, compName, p, t in rowIndex], -coefficients))
+            bound = np.zeros(len(rowIndex))
+        else:
+            bound = coefficients
+        utils.declareMatrixConstraint(pyM, constrName, [(rowIndex, terms)], bound if isEquality else None, bound)
+
     def additionalMinPartLoad(self, pyM, esM, constrName, constrSetName, opVarName, opVarBinName, capVarName):
         """
         Set, if applicable, the minimal part load of a component.
@@ -1272,6 +1493,23 @@ class ComponentModel(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def getCommodityBalanceContributors(self, esM, pyM):
+        """
+        Abstract method which has to be implemented by subclasses (otherwise a NotImplementedError raises).
+        Get the contributors of the modeling class to the commodity balances. The contributors are returned as a
+        dictionary with (loc, commod) tuples as keys. The values are lists of (var, varIndex, coefficient) tuples
+        which contribute var[varIndex + (p, t)] * coefficient to the commodity balance of the time step (p, t).
+        The coefficient is either a scalar or an array in the order of pyM.timeSet.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+        """
+        raise NotImplementedError
+
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
         Abstract method which has to be implemented by subclasses (otherwise a NotImplementedError raises).
@@ -1301,7 +1539,71 @@ class ComponentModel(metaclass=ABCMeta):
         return sum(capVar[loc, compName] / compDict[compName].capacityMax[loc] for compName in compDict
                    if compDict[compName].sharedPotentialID == key and (loc, compName) in capVarSet)
                 
-    def getLocEconomicsTD(self, pyM, esM, factorNames, varName, loc, compName, getOptValue=False):
+    def computeCostParameter(self, key):
+        """
+        Compute the value of a cost parameter from the current attributes of a component. The key of the parameter
+        starts with the type of the parameter, the component name and the location, followed by
+        * the factor names and the divisor name for time independent parameters ('TI'),
+        * the QP factor names and QP divisor names for time independent quadratic parameters ('QP'),
+        * the factor names for time dependent parameters ('TD') or
+        * the name of the time series and the period and time step for time series parameters ('TS').
+
+        :param key: key of the cost parameter
+        :type key: tuple
+        """
+        kind, comp, loc = key[0], self.componentsDict[key[1]], key[2]
+        if kind == 'TI':
+            factorNames, divisorName = key[3], key[4]
+            factor = 1. / getattr(comp, divisorName)[loc] if not divisorName == '' else 1.
+            for factorName in factorNames:
+                factor *= getattr(comp, factorName)[loc]
+        elif kind == 'QP':
+            QPfactorNames, QPdivisorNames = key[3], key[4]
+            factor = 1
+            for QPfactorName in QPfactorNames:
+                factor *= getattr(comp, QPfactorName)[loc]
+            for QPdivisorName in QPdivisorNames:
+                factor /= getattr(comp, QPdivisorName)[loc]
+        elif kind == 'TD':
+            factor = 1.
+            for factorName in key[3]:
+                factor *= getattr(comp, factorName)[loc]
+        else:
+            factor = getattr(comp, key[3])[loc][key[4], key[5]]
+        return factor
+
+    def getCostParameter(self, pyM, key, getOptValue=False, value=None):
+        """
+        Get a cost parameter for the objective function. If the optimization problem was declared with mutable
+        parameters, the value is stored in the mutable pyomo Param costParameter_<abbrvName> and the Param is returned.
+        The value can then be changed without rebuilding the pyomo model (see EnergySystemModel.updateParameters).
+        Otherwise, the value itself is returned.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param key: key of the cost parameter (see computeCostParameter)
+        :type key: tuple
+
+        :param getOptValue: states if the parameter is used for computing an optimal value (True) or for declaring
+            the objective function (False).
+            |br| * the default value is False.
+        :type getOptValue: boolean
+
+        :param value: value of the cost parameter if it is already known. If None, the value is computed (see
+            computeCostParameter).
+            |br| * the default value is None.
+        :type value: float or None
+        """
+        if value is None:
+            value = self.computeCostParameter(key)
+        if getOptValue or not pyM.hasMutableParameters:
+            return value
+        costParameter = getattr(pyM, 'costParameter_' + self.abbrvName)
+        costParameter[key] = value
+        return costParameter[key]
+
+    def getLocEconomicsTD(self, pyM, esM, factorNames, varName, loc, compName, getOptValue=False, factor=None):
         """
         Set time-dependent equation specified for one component in one location or one connection between two locations.
 
@@ -1334,13 +1636,14 @@ class ComponentModel(metaclass=ABCMeta):
             - False: Return the equation. 
             |br| * the default value is False.
         :type getoptValue: boolean        
+
+        :param factor: product of the time-dependent parameters if it is already known (see getCostParameter).
+            |br| * the default value is None.
+        :type factor: float or None
         """
 
         var = getattr(pyM, varName + '_' + self.abbrvName)
-        factors = [getattr(self.componentsDict[compName], factorName)[loc] for factorName in factorNames]
-        factor = 1.
-        for factor_ in factors:
-            factor *= factor_
+        factor = self.getCostParameter(pyM, ('TD', compName, loc, tuple(factorNames)), getOptValue, factor)
         if not getOptValue:
             return (factor * sum(var[loc, compName, p, t] * esM.periodOccurrences[p]
                                  for p, t in pyM.timeSet)/esM.numberOfYears)
@@ -1391,25 +1694,16 @@ class ComponentModel(metaclass=ABCMeta):
         """        
 
         var = getattr(pyM, varName + '_' + self.abbrvName)
-        factors = [getattr(self.componentsDict[compName], factorName)[loc] for factorName in factorNames]
-        divisor = getattr(self.componentsDict[compName], divisorName)[loc] if not divisorName == '' else 1
-        factor = 1./divisor      
-        for factor_ in factors:
-            factor *= factor_ 
-        
+        factor = self.getCostParameter(pyM, ('TI', compName, loc, tuple(factorNames), divisorName), getOptValue)
+
         if self.componentsDict[compName].QPcostScale[loc] == 0:
             if not getOptValue:
                 return factor * var[loc, compName]
             else:
                 return factor * var[loc, compName].value
         else:
-            QPfactors = [getattr(self.componentsDict[compName], QPfactorName)[loc] for QPfactorName in QPfactorNames]
-            QPdivisors = [getattr(self.componentsDict[compName], QPdivisorName)[loc] for QPdivisorName in QPdivisorNames]
-            QPfactor = 1
-            for QPfactor_ in QPfactors:
-                QPfactor *= QPfactor_
-            for QPdivisor in QPdivisors:
-                QPfactor /= QPdivisor
+            QPfactor = self.getCostParameter(pyM, ('QP', compName, loc, tuple(QPfactorNames), tuple(QPdivisorNames)),
+                                             getOptValue)
             if not getOptValue:
                 return factor * var[loc, compName] + QPfactor * var[loc, compName] * var[loc, compName]
             else:
@@ -1475,7 +1769,8 @@ class ComponentModel(metaclass=ABCMeta):
         :param varName: String of the variable that has to be multiplied within the equation (e.g. 'op' for operation variable).
         :type varName: string
 
-        :param dictName: String of the variable set (e.g. 'operationVarDict')
+        :param dictName: String of the variable set (e.g. 'operationVarDict'). In case of a two-dimensional
+            component, the equations are set for the eligible connections of the components instead.
         :type dictName: string
 
         **Default arguments:**  
@@ -1486,15 +1781,19 @@ class ComponentModel(metaclass=ABCMeta):
             |br| * the default value is False.
         :type getoptValue: boolean
         """
-        indices = getattr(pyM, dictName + '_' + self.abbrvName).items()
         if self.dimension == '1dim':
+            indices = getattr(pyM, dictName + '_' + self.abbrvName).items()
             return sum(self.getLocEconomicsTD(pyM, esM, factorNames, varName, loc, compName, getOptValue)
                        for loc, compNames in indices for compName in compNames)
         else:
-            return sum(self.getLocEconomicsTD(pyM, esM, factorNames, varName, loc + '_' + loc_, compName, getOptValue)
-                       for loc, subDict in indices
-                       for loc_, compNames in subDict.items()
-                       for compName in compNames)
+            # The operation variables of a component are declared for its eligible connections (see
+            # Transmission.setConnectionArrays); the parameters are looked up once for all of these connections
+            return sum(self.getLocEconomicsTD(pyM, esM, factorNames, varName, connection, compName, getOptValue,
+                                              float(factor))
+                       for compName, comp in self.componentsDict.items()
+                       for connection, factor in zip(comp._connections, np.prod(
+                           [getattr(comp, factorName)[comp._connections].values for factorName in factorNames],
+                           axis=0)))
 
 
     def getLocEconomicsTimeSeries(self, pyM, esM, factorName, varName, loc, compName, getOptValue=False):
@@ -1537,7 +1836,11 @@ class ComponentModel(metaclass=ABCMeta):
         var = getattr(pyM, varName + '_' + self.abbrvName)
         if getattr(self.componentsDict[compName], factorName) is not None:
             factor = getattr(self.componentsDict[compName], factorName)[loc]
-            if not getOptValue:
+            if not getOptValue and pyM.hasMutableParameters:
+                return sum(self.getCostParameter(pyM, ('TS', compName, loc, factorName, p, t)) *
+                           var[loc, compName, p, t] * esM.periodOccurrences[p]
+                           for p, t in pyM.timeSet)/esM.numberOfYears
+            elif not getOptValue:
                 return sum(factor[p, t] * var[loc, compName, p, t] * esM.periodOccurrences[p]
                                        for p, t in pyM.timeSet)/esM.numberOfYears
             else:
@@ -1624,8 +1927,8 @@ class ComponentModel(metaclass=ABCMeta):
         :rtype: pandas DataFrame
         """
         compDict, abbrvName = self.componentsDict, self.abbrvName
-        capVar = getattr(esM.pyM, 'cap_' + abbrvName)
-        binVar = getattr(esM.pyM, 'designBin_' + abbrvName)
+        capVar = getattr(pyM, 'cap_' + abbrvName)
+        binVar = getattr(pyM, 'designBin_' + abbrvName)
 
         props = ['capacity', 'isBuilt', 'capexCap', 'capexIfBuilt', 'opexCap', 'opexIfBuilt', 'TAC',
                  'invest']
@@ -1714,6 +2017,55 @@ class ComponentModel(metaclass=ABCMeta):
 
         return optSummary
 
+    def setOptimalValuesLazily(self, esM, pyM, solution=None):
+        """
+        Set the optimal values of the design variables (capacityVariablesOptimum and isBuiltVariablesOptimum) and
+        defer setting up all other optimal values (e.g. operationVariablesOptimum) and the optimization summary
+        (optSummary) until one of them is accessed for the first time. The deferred values are then set up at once by
+        the setOptimalValues function of the modeling class and are stored as usual. Since the raw optimal values of
+        the variables are kept in a SolutionSnapshot, the pyomo model can be solved again or declared anew in the
+        meantime.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the components are modeled.
+        :type esM: EnergySystemModel instance
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param solution: snapshot of the optimal values of the variables of the pyomo model. If None, a new snapshot
+            is taken. Passing the same snapshot to all modeling classes avoids copying the values several times.
+            |br| * the default value is None
+        :type solution: SolutionSnapshot or None
+        """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        if solution is None:
+            solution = utils.SolutionSnapshot(pyM)
+
+        values = getattr(solution, 'cap_' + abbrvName).get_values()
+        self.capacityVariablesOptimum = \
+            utils.formatOptimizationOutput(values, 'designVariables', self.dimension, compDict=compDict)
+        values = getattr(solution, 'designBin_' + abbrvName).get_values()
+        self.isBuiltVariablesOptimum = \
+            utils.formatOptimizationOutput(values, 'designVariables', self.dimension, compDict=compDict)
+
+        # Remove the optimal values of a previous optimization run so that accessing them triggers __getattr__
+        for name in self.lazyOptimalValueNames:
+            self.__dict__.pop(name, None)
+        self._pendingOptimalValues = (esM, solution)
+
+    def __getattr__(self, name):
+        """
+        Set up the deferred optimal values (see setOptimalValuesLazily) if one of the optimal values listed in
+        lazyOptimalValueNames is accessed before it is set up and return it afterwards. Accessing any other attribute
+        which does not exist raises an AttributeError.
+        """
+        if name not in type(self).lazyOptimalValueNames or self.__dict__.get('_pendingOptimalValues') is None:
+            raise AttributeError("'" + type(self).__name__ + "' object has no attribute '" + name + "'")
+        esM, solution = self._pendingOptimalValues
+        self._pendingOptimalValues = None
+        self.setOptimalValues(esM, solution)
+        return getattr(self, name)
+
     def getOptimalValues(self, name='all'):
         """
         Return optimal values of the components.
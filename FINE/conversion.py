@@ -227,11 +227,15 @@ class Conversion(Component):
         :param hasTSA: states whether a time series aggregation is requested (True) or not (False).
         :type hasTSA: boolean
         """
-        self.processedOperationRateMax = self.aggregatedOperationRateMax if hasTSA else self.fullOperationRateMax
-        self.processedOperationRateFix = self.aggregatedOperationRateFix if hasTSA else self.fullOperationRateFix
+        self.processedOperationRateMax = utils.setTimeSeriesArray(
+            self.aggregatedOperationRateMax if hasTSA else self.fullOperationRateMax)
+        self.processedOperationRateFix = utils.setTimeSeriesArray(
+            self.aggregatedOperationRateFix if hasTSA else self.fullOperationRateFix)
         if self.fullCommodityConversionFactors != {}:
             for commod in self.fullCommodityConversionFactors:
-                self.processedCommodityConversionFactors[commod] = self.aggregatedCommodityConversionFactors[commod] if hasTSA else self.fullCommodityConversionFactors[commod]
+                self.processedCommodityConversionFactors[commod] = utils.setTimeSeriesArray(
+                    self.aggregatedCommodityConversionFactors[commod] if hasTSA
+                    else self.fullCommodityConversionFactors[commod])
 
     def getDataForTimeSeriesAggregation(self):
         """ Function for getting the required data if a time series aggregation is requested. """
@@ -487,6 +491,29 @@ class ConversionModel(ComponentModel):
                                                           p, t)
                    for compName in opVarDict[loc] if commod in compDict[compName].processedCommodityConversionFactors)
 
+    def getCommodityBalanceContributors(self, esM, pyM):
+        """
+        Get the contributors to the commodity balances (see ComponentModel.getCommodityBalanceContributors).
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+        """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        opVar, opVarDict = getattr(pyM, 'op_' + abbrvName), getattr(pyM, 'operationVarDict_' + abbrvName)
+        contributors = {}
+        for loc, compNames in opVarDict.items():
+            for compName in compNames:
+                for commod, factor in compDict[compName].processedCommodityConversionFactors.items():
+                    if factor is None:
+                        continue
+                    elif not isinstance(factor, (int, float)):
+                        factor = utils.getTimeSetArray(pyM, factor[loc])
+                    contributors.setdefault((loc, commod), []).append((opVar, (loc, compName), factor))
+        return contributors
+
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
         Get contribution to the objective function.
@@ -523,7 +550,7 @@ class ConversionModel(ComponentModel):
 
         # Set optimal operation variables and append optimization summary
         optVal = utils.formatOptimizationOutput(opVar.get_values(), 'operationVariables', '1dim', esM.periodsOrder,
-                                                esM=esM)
+                                                esM=esM, indexSets=utils.getVariableIndexSets(opVar))
         self.operationVariablesOptimum = optVal
 
         props = ['operation', 'opexOp']
@@ -257,14 +257,27 @@ class EnergySystemModel:
         # optimization problem in seconds), runtime (positive float, runtime of the optimization run in seconds),
         # timeLimit (positive float or None, if specified, indicates the maximum allowed runtime of the solver),
         # threads (positive int, number of threads used for optimization, can depend on solver), logFileName
-        # (string, name of logfile).
+        # (string, name of logfile), loadtime (positive float or None, time needed to hand the optimization problem
+        # or the changes made to it to a persistent solver in seconds, None if a non-persistent solver is used) and
+        # savedLoadtime (positive float, time saved compared to handing the whole optimization problem to the
+        # persistent solver again) and profile (dictionary with the stages 'build', 'solve' and 'postprocess' as keys
+        # and lists of entries as values; each entry is a dictionary which stores the name of a phase of the
+        # optimization, the name of the modeling class the phase was executed for (or None), the run time of the phase
+        # in seconds and, if the optimization problem was declared with profile=True, the number of variables,
+        # constraints and nonzeros created in the phase (otherwise None)).
+        # The persistentSolver parameter is None as long as no persistent solver (e.g. gurobi_persistent or
+        # appsi_highs) is used. Otherwise, it is a dictionary which stores the name of the persistent solver, the
+        # solver instance, the pyomo model which was handed to it, the time needed to do so (loadtime) and the time
+        # needed to push changes to it which were not yet considered in an optimization run (updatetime).
         # The objectiveValue parameter is None when the EnergySystemModel is initialized. After calling the 
         # optimize function, the objective value (i.e. TAC of the analyzed energy system) is stored in the 
         # objectiveValue parameter for easier access.
 
         self.pyM = None
         self.solverSpecs = {'solver': '', 'optimizationSpecs': '', 'hasTSA': False, 'buildtime': 0, 'solvetime': 0,
-                            'runtime': 0, 'timeLimit': None, 'threads': 0, 'logFileName': ''}
+                            'runtime': 0, 'timeLimit': None, 'threads': 0, 'logFileName': '', 'loadtime': None,
+                            'savedLoadtime': 0, 'profile': {'build': [], 'solve': [], 'postprocess': []}}
+        self.persistentSolver = None
         self.objectiveValue = None
 
         ################################################################################################################
@@ -399,6 +412,7 @@ class EnergySystemModel:
                 clusterMethod='hierarchical',
                 sortValues=True,
                 storeTSAinstance=False,
+                cacheDirectory=None,
                 **kwargs):
         """
         Cluster the time series data of all components considered in the EnergySystemModel instance and then
@@ -454,12 +468,23 @@ class EnergySystemModel:
             |br| * the default value is False
         :type storeTSAinstance: boolean
 
+        :param cacheDirectory: if not None, the results of the clustering are cached in this directory. The entries
+            of the cache are keyed by a hash of the time series data, of the weights of the time series, of the
+            temporal resolution (hours per time step) and of all clustering arguments. If an entry for the current
+            time series data and clustering arguments exists, the tsam package is not called and the cached typical
+            periods, periods order and segment durations are used instead. Note: the cache directory should be
+            cleared if the tsam package is updated. The TimeSeriesAggregation instance is not cached, thus the cache
+            is not read if storeTSAinstance is True.
+            |br| * the default value is None
+        :type cacheDirectory: string or None
+
         Last edited: November 12 2020
         |br| @author: FINE Developer Team (FZJ IEK-3)
         """
 
         # Check input arguments which have to fit the temporal representation of the energy system
-        utils.checkClusteringInput(numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, len(self.totalTimeSteps))
+        utils.checkClusteringInput(numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, len(self.totalTimeSteps),
+                                   cacheDirectory)
         if segmentation:
             if numberOfSegmentsPerPeriod > numberOfTimeStepsPerPeriod:
                 if self.verbose < 2:
@@ -494,28 +519,51 @@ class EnergySystemModel:
                                              freq=(str(self.hoursPerTimeStep) + 'H'), tz='Europe/Berlin')
 
         # Cluster data with tsam package (the reindex call is here for reproducibility of TimeSeriesAggregation
-        # call) depending on whether segmentation is activated or not
+        # call) depending on whether segmentation is activated or not. If a cache directory is specified, the results
+        # of a previous clustering with the same time series data and arguments are loaded from the cache instead.
         timeSeriesData = timeSeriesData.reindex(sorted(timeSeriesData.columns), axis=1)
+        clusterResults = None
+        if cacheDirectory is not None:
+            clusterArguments = {'numberOfTypicalPeriods': numberOfTypicalPeriods, 'hoursPerPeriod': hoursPerPeriod,
+                                'numberOfTimeStepsPerPeriod': numberOfTimeStepsPerPeriod,
+                                'hoursPerTimeStep': self.hoursPerTimeStep, 'segmentation': segmentation,
+                                'clusterMethod': clusterMethod, 'sortValues': sortValues,
+                                'numberOfSegmentsPerPeriod': numberOfSegmentsPerPeriod if segmentation else None,
+                                **kwargs}
+            cacheKey = utils.getClusterCacheKey(timeSeriesData, weightDict, clusterArguments)
+            if not storeTSAinstance:
+                clusterResults = utils.readClusterCache(cacheDirectory, cacheKey)
+                if clusterResults is not None:
+                    utils.output('\tLoaded clustered time series data from cache.', self.verbose, 0)
+        if clusterResults is None:
+            if segmentation:
+                clusterClass = TimeSeriesAggregation(timeSeries=timeSeriesData, noTypicalPeriods=numberOfTypicalPeriods,
+                                                     segmentation=segmentation, noSegments=numberOfSegmentsPerPeriod,
+                                                     hoursPerPeriod=hoursPerPeriod,
+                                                     clusterMethod=clusterMethod, sortValues=sortValues,
+                                                     weightDict=weightDict, **kwargs)
+            else:
+                clusterClass = TimeSeriesAggregation(timeSeries=timeSeriesData, noTypicalPeriods=numberOfTypicalPeriods,
+                                                     hoursPerPeriod=hoursPerPeriod,
+                                                     clusterMethod=clusterMethod, sortValues=sortValues,
+                                                     weightDict=weightDict, **kwargs)
+            clusterResults = {'clusterPeriodDict': clusterClass.clusterPeriodDict,
+                              'clusterOrder': clusterClass.clusterOrder,
+                              'clusterPeriodIdx': clusterClass.clusterPeriodIdx,
+                              'segmentDurationDict': clusterClass.segmentDurationDict if segmentation else None}
+            if cacheDirectory is not None:
+                utils.writeClusterCache(cacheDirectory, cacheKey, clusterResults)
         if segmentation:
-            clusterClass = TimeSeriesAggregation(timeSeries=timeSeriesData, noTypicalPeriods=numberOfTypicalPeriods,
-                                                 segmentation=segmentation, noSegments=numberOfSegmentsPerPeriod,
-                                                 hoursPerPeriod=hoursPerPeriod,
-                                                 clusterMethod=clusterMethod, sortValues=sortValues,
-                                                 weightDict=weightDict, **kwargs)
             # Convert the clustered data to a pandas DataFrame with the first index as typical period number and the
             # second index as segment number per typical period.
-            data = pd.DataFrame.from_dict(clusterClass.clusterPeriodDict).reset_index(level=2, drop=True)
+            data = pd.DataFrame.from_dict(clusterResults['clusterPeriodDict']).reset_index(level=2, drop=True)
             # Get the length of each segment in each typical period with the first index as typical period number and
             # the second index as segment number per typical period.
-            timeStepsPerSegment = pd.DataFrame.from_dict(clusterClass.segmentDurationDict)['Segment Duration']
+            timeStepsPerSegment = pd.DataFrame.from_dict(clusterResults['segmentDurationDict'])['Segment Duration']
         else:
-            clusterClass = TimeSeriesAggregation(timeSeries=timeSeriesData, noTypicalPeriods=numberOfTypicalPeriods,
-                                                 hoursPerPeriod=hoursPerPeriod,
-                                                 clusterMethod=clusterMethod, sortValues=sortValues,
-                                                 weightDict=weightDict, **kwargs)
             # Convert the clustered data to a pandas DataFrame with the first index as typical period number and the
             # second index as time step number per typical period.
-            data = pd.DataFrame.from_dict(clusterClass.clusterPeriodDict)
+            data = pd.DataFrame.from_dict(clusterResults['clusterPeriodDict'])
         # Store the respective clustered time series data in the associated components
         for mdlName, mdl in self.componentModelingDict.items():
             for compName, comp in mdl.componentsDict.items():
@@ -524,7 +572,7 @@ class EnergySystemModel:
         # Store time series aggregation parameters in class instance
         if storeTSAinstance:
             self.tsaInstance = clusterClass
-        self.typicalPeriods = clusterClass.clusterPeriodIdx
+        self.typicalPeriods = clusterResults['clusterPeriodIdx']
         self.timeStepsPerPeriod = list(range(numberOfTimeStepsPerPeriod))
         self.segmentation = segmentation
         if segmentation:
@@ -540,7 +588,7 @@ class EnergySystemModel:
             self.segmentStartTime = segmentStartTime
         self.periods = list(range(int(len(self.totalTimeSteps) / len(self.timeStepsPerPeriod))))
         self.interPeriodTimeSteps = list(range(int(len(self.totalTimeSteps) / len(self.timeStepsPerPeriod)) + 1))
-        self.periodsOrder = clusterClass.clusterOrder
+        self.periodsOrder = clusterResults['clusterOrder']
         self.periodOccurrences = [(self.periodsOrder == tp).sum() for tp in self.typicalPeriods]
 
         # Set cluster flag to true (used to ensure consistently clustered time series data)
@@ -632,6 +680,16 @@ class EnergySystemModel:
         pyM.timeSet = pyomo.Set(dimen=2, initialize=initTimeSet)
         pyM.interTimeStepsSet = pyomo.Set(dimen=2, initialize=initInterTimeStepsSet)
 
+        # With segmentation, the number of time steps per segment, the hours per segment and the start times of the
+        # segments are stored once as dense (period, segment) arrays, which are looked up in the constraint rules
+        # (e.g. pyM.hoursPerSegment[p, t]). The start times are given for the segments 0 ... numberOfSegmentsPerPeriod.
+        if pyM.hasTSA and pyM.hasSegmentation:
+            pyM.timeStepsPerSegment = self.timeStepsPerSegment.unstack().sort_index().values.astype(float)
+            pyM.hoursPerSegment = self.hoursPerSegment.unstack().sort_index().values.astype(float)
+            pyM.segmentStartTime = self.segmentStartTime.unstack().sort_index().values.astype(float)
+        else:
+            pyM.timeStepsPerSegment, pyM.hoursPerSegment, pyM.segmentStartTime = None, None, None
+
     def declareBalanceLimitConstraint(self, pyM, timeSeriesAggregation):
         """
         Declare balance limit constraint.
@@ -794,22 +852,42 @@ class EnergySystemModel:
         """
         utils.output('Declaring commodity balances...', self.verbose, 0)
 
+        # Collect, once per model declaration, the contributors of all modeling classes to the commodity balances. The
+        # index maps each (location, commodity) tuple to a list of (variable, variable index, coefficient) tuples.
+        contributors = {}
+        for mdl in self.componentModelingDict.values():
+            for key, mdlContributors in mdl.getCommodityBalanceContributors(self, pyM).items():
+                contributors.setdefault(key, []).extend(mdlContributors)
+        pyM.commodityBalanceContributors = contributors
+
         # Declare and initialize a set that states for which location and commodity the commodity balance constraints
         # are non-trivial (i.e. not 0 == 0; trivial constraints raise errors in pyomo).
         def initLocationCommoditySet(pyM):
             return ((loc, commod) for loc in self.locations for commod in self.commodities
-                    if any([mdl.hasOpVariablesForLocationCommodity(self, loc, commod)
-                            for mdl in self.componentModelingDict.values()]))
+                    if contributors.get((loc, commod)))
         pyM.locationCommoditySet = pyomo.Set(dimen=2, initialize=initLocationCommoditySet)
 
         # Declare and initialize commodity balance constraints by checking for each location and commodity in the
         # locationCommoditySet and for each period and time step within the period if the commodity source and sink
-        # terms add up to zero. For this, get the contribution to commodity balance from each modeling class.
-        def commodityBalanceConstraint(pyM, loc, commod, p, t):
-            return sum(mdl.getCommodityBalanceContribution(pyM, commod, loc, p, t)
-                       for mdl in self.componentModelingDict.values()) == 0
-        pyM.commodityBalanceConstraint = pyomo.Constraint(pyM.locationCommoditySet, pyM.timeSet,
-                                                          rule=commodityBalanceConstraint)
+        # terms add up to zero. For this, the contributors of the modeling classes are looked up in the index.
+        timeSetPosition = {(p, t): i for i, (p, t) in enumerate(pyM.timeSet)}
+        if pyM.backend == 'matrix':
+            blocks = []
+            for loc, commod in pyM.locationCommoditySet:
+                rowIndex = [(loc, commod, p, t) for p, t in pyM.timeSet]
+                terms = [([var[varIndex + (p, t)] for p, t in pyM.timeSet], coefficient)
+                         for var, varIndex, coefficient in contributors[loc, commod]]
+                blocks.append((rowIndex, terms))
+            nRows = sum(len(rowIndex) for rowIndex, terms in blocks)
+            utils.declareMatrixConstraint(pyM, 'commodityBalanceConstraint', blocks, np.zeros(nRows), np.zeros(nRows))
+        else:
+            def commodityBalanceConstraint(pyM, loc, commod, p, t):
+                i = timeSetPosition[p, t]
+                return sum(var[varIndex + (p, t)] * (coefficient[i] if isinstance(coefficient, np.ndarray)
+                                                     else coefficient)
+                           for var, varIndex, coefficient in contributors[loc, commod]) == 0
+            pyM.commodityBalanceConstraint = pyomo.Constraint(pyM.locationCommoditySet, pyM.timeSet,
+                                                              rule=commodityBalanceConstraint)
 
     def declareObjective(self, pyM):
         """
@@ -846,7 +924,8 @@ class EnergySystemModel:
             return TAC
         pyM.Obj = pyomo.Objective(rule=objective)
 
-    def declareOptimizationProblem(self, timeSeriesAggregation=False, segmentation=False, relaxIsBuiltBinary=False):
+    def declareOptimizationProblem(self, timeSeriesAggregation=False, segmentation=False, relaxIsBuiltBinary=False,
+                                   backend='pyomo', mutableParameters=False, profile=False, operationBounds=False):
         """
         Declare the optimization problem belonging to the specified energy system for which a pyomo concrete model
         instance is built and filled with
@@ -875,6 +954,39 @@ class EnergySystemModel:
             |br| * the default value is False
         :type declaresOptimizationProblem: boolean
 
+        :param backend: states how the large, time dependent constraint families (operation modes, connection
+            of the states of charge) are built:
+            (a) 'pyomo': one pyomo expression is created per constraint index with rule callbacks (reference) or
+            (b) 'matrix': the coefficients are assembled as NumPy arrays and stored as sparse pyomo
+            MatrixConstraints which are directly handed to the solver interface or LP writer.
+            Both backends result in the same optimization problem.
+            |br| * the default value is 'pyomo'
+        :type backend: string
+
+        :param mutableParameters: states if the cost parameters of the objective function are declared as mutable
+            pyomo Params (True) or as constant values (False). With mutable parameters, the cost parameters can be
+            changed with the updateParameters function without rebuilding the pyomo model.
+            |br| * the default value is False
+        :type mutableParameters: boolean
+
+        :param profile: states if the number of variables, constraints and nonzeros created in each phase of the
+            declaration (e.g. declareVariables of a modeling class) is counted and stored in
+            solverSpecs['profile']['build'] (True) or not (False). The run times of the phases are always stored.
+            Counting the nonzeros requires a pass over all constraint expressions and thus increases the build time.
+            |br| * the default value is False
+        :type profile: boolean
+
+        :param operationBounds: states if the operation modes which only bound single operation variables by
+            constants are declared as variable bounds (True) or as constraints (False). If True,
+            (a) the operation variables of components without a capacity variable are fixed to their fixed operation
+            rates or bounded from above by their maximum operation rates and
+            (b) the operation variables of components with a capacity variable are fixed to zero at the time steps
+            at which their fixed or maximum operation rate is zero.
+            No constraints are declared for these variables and time steps (thus, no dual values are available for
+            them). Both options result in the same optimal solution.
+            |br| * the default value is False
+        :type operationBounds: boolean
+
         Last edited: March 26, 2020
         |br| @author: FINE Developer Team (FZJ IEK-3)
         """
@@ -882,7 +994,9 @@ class EnergySystemModel:
         timeStart = time.time()
 
         # Check correctness of inputs
-        utils.checkDeclareOptimizationProblemInput(timeSeriesAggregation, self.isTimeSeriesDataClustered)
+        utils.checkDeclareOptimizationProblemInput(timeSeriesAggregation, self.isTimeSeriesDataClustered, backend,
+                                                   mutableParameters, profile, operationBounds)
+        self.solverSpecs['profile'] = {'build': [], 'solve': [], 'postprocess': []}
 
         ################################################################################################################
         #                           Initialize mathematical model (ConcreteModel) instance                             #
@@ -895,9 +1009,15 @@ class EnergySystemModel:
         self.pyM = pyomo.ConcreteModel()
         pyM = self.pyM
         pyM.dual = pyomo.Suffix(direction=pyomo.Suffix.IMPORT)
+        pyM.backend = backend
+        pyM.operationBounds = operationBounds
+        pyM.hasMutableParameters = mutableParameters
+        pyM.profiledComponents = set() if profile else None
 
         # Set time sets for the model instance
+        _t = time.time()
         self.declareTimeSets(pyM, timeSeriesAggregation, segmentation)
+        utils.addProfileEntry(self, 'build', 'declareTimeSets', _t)
 
         ################################################################################################################
         #                         Declare component specific sets, variables and constraints                           #
@@ -905,10 +1025,19 @@ class EnergySystemModel:
 
         for key, mdl in self.componentModelingDict.items():
             _t = time.time()
+            if mutableParameters:
+                setattr(pyM, 'costParameter_' + mdl.abbrvName,
+                        pyomo.Param(pyomo.Any, mutable=True, within=pyomo.Any, initialize={}))
             utils.output('Declaring sets, variables and constraints for ' + key, self.verbose, 0)
+            __t = time.time()
             utils.output('\tdeclaring sets... ', self.verbose, 0), mdl.declareSets(self, pyM)
+            utils.addProfileEntry(self, 'build', 'declareSets', __t, key)
+            __t = time.time()
             utils.output('\tdeclaring variables... ', self.verbose, 0), mdl.declareVariables(self, pyM, relaxIsBuiltBinary)
+            utils.addProfileEntry(self, 'build', 'declareVariables', __t, key)
+            __t = time.time()
             utils.output('\tdeclaring constraints... ', self.verbose, 0), mdl.declareComponentConstraints(self, pyM)
+            utils.addProfileEntry(self, 'build', 'declareComponentConstraints', __t, key)
             utils.output('\t\t(%.4f' % (time.time() - _t) + ' sec)\n', self.verbose, 0)
 
         ################################################################################################################
@@ -918,21 +1047,25 @@ class EnergySystemModel:
         # Declare constraints for enforcing shared capacities
         _t = time.time()
         self.declareSharedPotentialConstraints(pyM)
+        utils.addProfileEntry(self, 'build', 'declareSharedPotentialConstraints', _t)
         utils.output('\t\t(%.4f' % (time.time() - _t) + ' sec)\n', self.verbose, 0)
 
         # Declare constraints for linked quantities
         _t = time.time()
         self.declareComponentLinkedQuantityConstraints(pyM)
+        utils.addProfileEntry(self, 'build', 'declareComponentLinkedQuantityConstraints', _t)
         utils.output('\t\t(%.4f' % (time.time() - _t) + ' sec)\n', self.verbose, 0)
 
         # Declare commodity balance constraints (one balance constraint for each commodity, location and time step)
         _t = time.time()
         self.declareCommodityBalanceConstraints(pyM)
+        utils.addProfileEntry(self, 'build', 'declareCommodityBalanceConstraints', _t)
         utils.output('\t\t(%.4f' % (time.time() - _t) + ' sec)\n', self.verbose, 0)
 
         # Declare constraint for balanceLimit
         _t = time.time()
         self.declareBalanceLimitConstraint(pyM, timeSeriesAggregation)
+        utils.addProfileEntry(self, 'build', 'declareBalanceLimitConstraint', _t)
         utils.output('\t\t(%.4f' % (time.time() - _t) + ' sec)\n', self.verbose, 0)
 
         ################################################################################################################
@@ -942,6 +1075,7 @@ class EnergySystemModel:
         # Declare objective function by obtaining the contributions to the objective function from all modeling classes
         _t = time.time()
         self.declareObjective(pyM)
+        utils.addProfileEntry(self, 'build', 'declareObjective', _t)
         utils.output('\t\t(%.4f' % (time.time() - _t) + ' sec)\n', self.verbose, 0)
 
         # Store the build time of the optimize function call in the EnergySystemModel instance
@@ -956,7 +1090,12 @@ class EnergySystemModel:
                  solver='None', 
                  timeLimit=None, 
                  optimizationSpecs='',
-                 warmstart=False):
+                 warmstart=False,
+                 backend='pyomo',
+                 mutableParameters=False,
+                 profile=False,
+                 resultsMode='eager',
+                 operationBounds=False):
         """
         Optimize the specified energy system for which a pyomo ConcreteModel instance is built or called upon.
         A pyomo instance is optimized with the specified inputs, and the optimization results are further
@@ -1026,6 +1165,40 @@ class EnergySystemModel:
             |br| * the default value is False
         :type warmstart: boolean
 
+        :param backend: states how the optimization problem is built ('pyomo' or 'matrix'). Only used if
+            declaresOptimizationProblem is set to True. See declareOptimizationProblem for more information.
+            |br| * the default value is 'pyomo'
+        :type backend: string
+
+        :param mutableParameters: states if the cost parameters are declared as mutable pyomo Params. Only used if
+            declaresOptimizationProblem is set to True. See declareOptimizationProblem for more information.
+            |br| * the default value is False
+        :type mutableParameters: boolean
+
+        :param profile: states if the number of variables, constraints and nonzeros created in each phase of the
+            declaration is counted. Only used if declaresOptimizationProblem is set to True. The run times of the
+            build, solve and postprocess phases are always stored in solverSpecs['profile']. See
+            declareOptimizationProblem for more information.
+            |br| * the default value is False
+        :type profile: boolean
+
+        :param resultsMode: states how the optimal values are processed after the optimization ('eager' or 'lazy').
+            With 'eager', all optimal values (e.g. operationVariablesOptimum) and the optimization summaries
+            (optSummary) of the modeling classes are set up directly. With 'lazy', only the objective value and the
+            optimal values of the design variables (capacityVariablesOptimum and isBuiltVariablesOptimum) are set up
+            directly. The raw optimal values of all other variables are stored and the remaining optimal values and
+            the optimization summary of a modeling class are set up (and then kept) the first time one of them is
+            accessed. Note that they are set up with the time series aggregation state at the time of the access, so
+            they should be accessed before the model is clustered again.
+            |br| * the default value is 'eager'
+        :type resultsMode: string
+
+        :param operationBounds: states if the operation modes which only bound single operation variables by
+            constants are declared as variable bounds (True) or as constraints (False). Only used if
+            declaresOptimizationProblem is set to True. See declareOptimizationProblem for more information.
+            |br| * the default value is False
+        :type operationBounds: boolean
+
         Last edited: March 26, 2020
         |br| @author: FINE Developer Team (FZJ IEK-3)
         """
@@ -1035,7 +1208,9 @@ class EnergySystemModel:
 
         if declaresOptimizationProblem:
             self.declareOptimizationProblem(timeSeriesAggregation=timeSeriesAggregation, segmentation=self.segmentation,
-                                            relaxIsBuiltBinary=relaxIsBuiltBinary)
+                                            relaxIsBuiltBinary=relaxIsBuiltBinary, backend=backend,
+                                            mutableParameters=mutableParameters, profile=profile,
+                                            operationBounds=operationBounds)
         else:
             if self.pyM is None:
                 raise TypeError('The optimization problem is not declared yet. Set the argument declaresOptimization'
@@ -1046,7 +1221,9 @@ class EnergySystemModel:
 
         # Check correctness of inputs
         utils.checkOptimizeInput(timeSeriesAggregation, self.isTimeSeriesDataClustered, logFileName, threads, solver,
-                                 timeLimit, optimizationSpecs, warmstart)
+                                 timeLimit, optimizationSpecs, warmstart, backend, mutableParameters, profile,
+                                 resultsMode, operationBounds)
+        self.solverSpecs['profile']['solve'], self.solverSpecs['profile']['postprocess'] = [], []
 
         # Store keyword arguments in the EnergySystemModel instance
         self.solverSpecs['logFileName'], self.solverSpecs['threads'] = logFileName, threads
@@ -1082,30 +1259,52 @@ class EnergySystemModel:
         #                                  Solve the specified optimization problem                                    #
         ################################################################################################################
 
-        # Set which solver should solve the specified optimization problem
-        optimizer = opt.SolverFactory(solver)
+        # Set which solver should solve the specified optimization problem. A persistent solver is only set up once
+        # for a pyomo model and reused in subsequent optimization runs, so that the model does not have to be written
+        # and read in again.
+        if utils.isPersistentSolver(solver):
+            _t = time.time()
+            optimizer = self.getPersistentSolver(solver)
+            utils.addProfileEntry(self, 'solve', 'loadPersistentSolver', _t)
+        else:
+            optimizer = opt.SolverFactory(solver)
+            self.solverSpecs['loadtime'], self.solverSpecs['savedLoadtime'] = None, 0
 
         # Set, if specified, the time limit
-        if self.solverSpecs['timeLimit'] is not None and solver == 'gurobi':
+        if self.solverSpecs['timeLimit'] is not None and solver in ['gurobi', 'gurobi_persistent']:
             optimizer.options['timelimit'] = timeLimit
 
         # Set the specified solver options
-        if 'LogToConsole=' not in optimizationSpecs and solver == "gurobi":
+        if 'LogToConsole=' not in optimizationSpecs and solver in ['gurobi', 'gurobi_persistent']:
             if self.verbose == 2:
                 optimizationSpecs += ' LogToConsole=0'
 
         # Solve optimization problem. The optimization solve time is stored and the solver information is printed.
-        if solver=='gurobi':
-            optimizer.set_options('Threads=' + str(threads) + ' logfile=' + logFileName + ' ' + optimizationSpecs)
-            solver_info = optimizer.solve(self.pyM, warmstart=warmstart, tee=True)
-        elif solver=="glpk":
-            optimizer.set_options(optimizationSpecs)
-            solver_info = optimizer.solve(self.pyM, tee=True)
-        else:
-            solver_info = optimizer.solve(self.pyM, tee=True)
+        # The run times of the phases of the solve (writing the problem, solver process, loading the solution) are
+        # stored in the profile.
+        _t = time.time()
+        with utils.profileSolverPhases(self, optimizer):
+            if solver in ['gurobi', 'gurobi_persistent']:
+                optimizer.set_options('Threads=' + str(threads) + ' logfile=' + logFileName + ' ' + optimizationSpecs)
+                solver_info = optimizer.solve(self.pyM, warmstart=warmstart, tee=True)
+            elif solver=="glpk":
+                optimizer.set_options(optimizationSpecs)
+                solver_info = optimizer.solve(self.pyM, tee=True)
+            elif solver.startswith('appsi_'):
+                # appsi solvers can not provide dual values for mixed integer problems
+                if self.persistentSolver['hasDiscreteVariables']:
+                    self.pyM.dual.set_direction(pyomo.Suffix.LOCAL)
+                solver_info = optimizer.solve(self.pyM, tee=True, timelimit=timeLimit)
+                self.pyM.dual.set_direction(pyomo.Suffix.IMPORT)
+            else:
+                solver_info = optimizer.solve(self.pyM, tee=True)
+        utils.addProfileEntry(self, 'solve', 'solve', _t)
         self.solverSpecs['solvetime'] = time.time() - timeStart
         utils.output(solver_info.solver(), self.verbose, 0), utils.output(solver_info.problem(), self.verbose, 0)
         utils.output('Solve time: ' + str(self.solverSpecs['solvetime']) + ' sec.', self.verbose, 0)
+        if self.solverSpecs['loadtime'] is not None:
+            utils.output('Load time (persistent solver): ' + str(self.solverSpecs['loadtime']) + ' sec., saved load '
+                         'time: ' + str(self.solverSpecs['savedLoadtime']) + ' sec.', self.verbose, 0)
 
         ################################################################################################################
         #                                      Post-process optimization output                                        #
@@ -1134,11 +1333,23 @@ class EnergySystemModel:
             if not solver_info.solver.termination_condition == opt.TerminationCondition.optimal and self.verbose < 2:
                 warnings.warn('Output is generated for a non-optimal solution.')
             utils.output("\nProcessing optimization output...", self.verbose, 0)
-            # Declare component specific sets, variables and constraints
+            # In the lazy results mode, the optimal values of all variables are copied once and the optimal values
+            # of the modeling classes are only set up on first access (except for the design variables).
+            if resultsMode == 'lazy':
+                __t = time.time()
+                solution = utils.SolutionSnapshot(self.pyM)
+                utils.addProfileEntry(self, 'postprocess', 'solutionSnapshot', __t)
+            # Set the optimal values of the components
             w = str(len(max(self.componentModelingDict.keys()))+6)
             for key, mdl in self.componentModelingDict.items():
                 __t = time.time()
-                mdl.setOptimalValues(self, self.pyM)
+                if resultsMode == 'lazy':
+                    mdl.setOptimalValuesLazily(self, self.pyM, solution)
+                    utils.addProfileEntry(self, 'postprocess', 'setOptimalValuesLazily', __t, key)
+                else:
+                    mdl._pendingOptimalValues = None
+                    mdl.setOptimalValues(self, self.pyM)
+                    utils.addProfileEntry(self, 'postprocess', 'setOptimalValues', __t, key)
                 outputString = ('for {:' + w + '}').format(key + ' ...') + "(%.4f" % (time.time() - __t) + "sec)"
                 utils.output(outputString, self.verbose, 0)
             # Store the objective value in the EnergySystemModel instance.
@@ -1148,3 +1359,133 @@ class EnergySystemModel:
 
         # Store the runtime of the optimize function call in the EnergySystemModel instance
         self.solverSpecs['runtime'] = self.solverSpecs['buildtime'] + time.time() - timeStart
+
+    def getPersistentSolver(self, solver):
+        """
+        Return the persistent solver instance which is associated with the declared pyomo model. If no such instance
+        exists yet (or if it was set up for another solver or for a previously declared pyomo model), a new instance
+        is set up and the pyomo model is handed over to it. The time needed to hand over the model or to push
+        the changes made to the model since the last optimization run is stored in solverSpecs['loadtime'], the time
+        saved compared to handing over the whole model again in solverSpecs['savedLoadtime'].
+
+        :param solver: name of the persistent solver (e.g. 'gurobi_persistent', 'appsi_highs' or 'appsi_cbc')
+        :type solver: string
+
+        :return: persistent solver instance
+        """
+        if self.persistentSolver is None or self.persistentSolver['solver'] != solver or \
+                self.persistentSolver['pyM'] is not self.pyM:
+            _t = time.time()
+            optimizer = opt.SolverFactory(solver)
+            if solver.startswith('appsi_'):
+                # Changes of the model are pushed explicitly with the updatePersistentSolver function. Hence, the
+                # appsi solver does not have to check the whole model for changes before every solve.
+                updateConfig = optimizer.update_config
+                updateConfig.check_for_new_or_removed_constraints = False
+                updateConfig.check_for_new_or_removed_vars = False
+                updateConfig.check_for_new_or_removed_params = False
+                updateConfig.check_for_new_objective = False
+                updateConfig.update_constraints = False
+                updateConfig.update_vars = False
+                updateConfig.update_params = False
+                updateConfig.update_named_expressions = False
+                updateConfig.update_objective = False
+            optimizer.set_instance(self.pyM)
+            hasDiscreteVariables = any(not var.is_continuous()
+                                       for var in self.pyM.component_data_objects(pyomo.Var, active=True))
+            self.persistentSolver = {'solver': solver, 'optimizer': optimizer, 'pyM': self.pyM,
+                                     'loadtime': time.time() - _t, 'updatetime': 0,
+                                     'hasDiscreteVariables': hasDiscreteVariables}
+            self.solverSpecs['loadtime'], self.solverSpecs['savedLoadtime'] = self.persistentSolver['loadtime'], 0
+            utils.output('Persistent solver ' + solver + ' set up.', self.verbose, 0)
+        else:
+            updatetime = self.persistentSolver['updatetime']
+            self.solverSpecs['loadtime'] = updatetime
+            self.solverSpecs['savedLoadtime'] = max(self.persistentSolver['loadtime'] - updatetime, 0)
+            self.persistentSolver['updatetime'] = 0
+        return self.persistentSolver['optimizer']
+
+    def updatePersistentSolver(self, variables=None, objective=False):
+        """
+        Push changes of the declared pyomo model incrementally to the persistent solver which is associated with
+        it. If no persistent solver is associated with the declared pyomo model, nothing is done.
+
+        **Default arguments:**
+
+        :param variables: pyomo variables whose bounds or fixed values were changed
+            |br| * the default value is None
+        :type variables: list of pyomo variables or None
+
+        :param objective: states if the objective function (e.g. the values of mutable parameters in the objective
+            function) was changed.
+            |br| * the default value is False
+        :type objective: boolean
+        """
+        if self.persistentSolver is None or self.persistentSolver['pyM'] is not self.pyM:
+            return
+        _t = time.time()
+        optimizer = self.persistentSolver['optimizer']
+        if self.persistentSolver['solver'].startswith('appsi_'):
+            if variables:
+                optimizer.update_variables(variables)
+            if objective:
+                optimizer.update_params()
+                optimizer.set_objective(self.pyM.Obj)
+        else:
+            for var in variables if variables else []:
+                optimizer.update_var(var)
+            if objective:
+                optimizer.set_objective(self.pyM.Obj)
+        self.persistentSolver['updatetime'] += time.time() - _t
+
+    def updateParameters(self, componentName, parameters, reoptimize=True, **kwargs):
+        """
+        Update cost parameters of a component in an optimization problem which was declared with mutable parameters
+        (declareOptimizationProblem(mutableParameters=True)) and, if specified, optimize it again. The values of the
+        mutable pyomo Params are changed in place, i.e. the pyomo model is not rebuilt. This is for example useful for
+        sensitivity analyses of cost parameters.
+
+        **Required arguments:**
+
+        :param componentName: name of the component whose parameters should be updated
+        :type componentName: string
+
+        :param parameters: new values of the cost parameters with the parameter names as keys (e.g.
+            {'investPerCapacity': 600, 'commodityCostTimeSeries': costs}). See Component.updateCostParameter for the
+            parameters which can be updated.
+        :type parameters: dict
+
+        **Default arguments:**
+
+        :param reoptimize: states if the optimization problem should be optimized again after the update.
+            |br| * the default value is True
+        :type reoptimize: boolean
+
+        :param kwargs: additional keyword arguments which are passed to the optimize function (e.g. solver).
+            The declaresOptimizationProblem parameter is always set to False.
+        """
+        if self.pyM is None or not self.pyM.hasMutableParameters:
+            raise ValueError('The optimization problem has to be declared with mutable parameters first.\n--> Call '
+                             'the declareOptimizationProblem or the optimize function with mutableParameters=True.')
+        if not isinstance(parameters, dict):
+            raise TypeError('The parameters parameter has to be a dictionary.')
+
+        comp = self.getComponent(componentName)
+        mdl = self.componentModelingDict[self.componentNames[componentName]]
+        for name, data in parameters.items():
+            if self.pyM.hasTSA and name.endswith('TimeSeries'):
+                raise ValueError('Time series can not be updated if the time series are aggregated.\n--> Call the '
+                                 'cluster function and declare the optimization problem again.')
+            comp.updateCostParameter(self, name, data)
+        comp.setTimeSeriesData(self.pyM.hasTSA)
+
+        # Update the values of the mutable parameters of the component
+        costParameter = getattr(self.pyM, 'costParameter_' + mdl.abbrvName)
+        for key in costParameter:
+            if key[1] == componentName:
+                costParameter[key] = mdl.computeCostParameter(key)
+        self.updatePersistentSolver(objective=True)
+
+        if reoptimize:
+            kwargs.setdefault('timeSeriesAggregation', self.pyM.hasTSA)
+            self.optimize(declaresOptimizationProblem=False, **kwargs)
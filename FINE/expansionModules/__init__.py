@@ -6,3 +6,8 @@ Last edited: February 06, 2020
 from .transformationPath import *
 from .robustPipelineSizing import *
 from .optimizeTSAmultiStage import *
+from .rollingHorizon import *
+from .spatialAggregation import *
+from .technologyAggregation import *
+from .parallelDecomposition import *
+from .bendersDecomposition import *
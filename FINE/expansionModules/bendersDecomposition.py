@@ -0,0 +1,349 @@
+"""
+Last edited: October 17, 2026
+|br| @author: FINE Developer Team (FZJ IEK-3)
+"""
+
+from FINE import utils
+from FINE.expansionModules.parallelDecomposition import checkSeparability, setBlock, getBlockSolution, \
+    mergeBlockSolutions
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.repn import generate_standard_repn
+import pyomo.environ as pyomo
+import concurrent.futures
+import numpy as np
+import pandas as pd
+import pickle
+import os
+import time
+
+# Prefixes of the names of the design variables of the modeling classes. The numbers of installed units (nbReal and
+# nbInt variables) are determined by the capacities and are therefore not passed to the subproblems.
+DESIGN_VARIABLES = ['cap_', 'designBin_', 'nbReal_', 'nbInt_']
+SUBPROBLEM_DESIGN_VARIABLES = ['cap_', 'designBin_']
+
+
+def optimizeBenders(esM, numberOfBlocks=None, maxWorkers=None, maxIterations=50, optimalityGap=1e-4, penalty=1e6,
+                    **kwargs):
+    """
+    Optimize an energy system model with a Benders decomposition into a design (master) problem and operation
+    subproblems.
+
+    The master problem contains the design variables (cap, designBin, nbReal and nbInt variables) with their time
+    independent constraints and costs and an estimate of the operation costs of each subproblem. The subproblems
+    optimize the operation of blocks of typical periods (time series aggregation) or of consecutive time steps (full
+    temporal resolution) for the design of the master problem. They are linear programs (the design variables are
+    continuous and set by equality constraints) and are solved in parallel processes. The dual values of
+    the equality constraints yield optimality cuts which are added to the master problem in each iteration. The
+    equality constraints are elastic (deviations are penalized with the penalty factor) such that the subproblems are
+    feasible for every design of the master problem.
+
+    The optimal value of the master problem is a lower bound and the total annual costs of the best design found so
+    far (design costs plus operation costs of all subproblems) an upper bound of the optimal value. The iterations stop
+    when the relative gap between the bounds is smaller than optimalityGap or after maxIterations iterations. The
+    optimal values of the subproblems of the best design are then set in the modeling classes as after a regular
+    optimization and the bounds are stored in esM.lowerBound, esM.upperBound and esM.gap (as in
+    optimizeTSAmultiStage). The objective value is set to the upper bound. esM.pyM is not changed.
+
+    If the model contains components which couple the periods or time steps (e.g. storage components or annual
+    constraints, see optimizeParallelPeriods), the operation has to be optimized in a single subproblem
+    (numberOfBlocks=1). Components with binary operation variables (e.g. ConversionDynamic components or components
+    with a minimum part load) are not supported since their subproblems are not linear.
+
+    **Required arguments:**
+
+    :param esM: energy system model which is optimized.
+    :type esM: EnergySystemModel instance from the FINE package
+
+    **Default arguments:**
+
+    :param numberOfBlocks: number of subproblems into which the typical periods (time series aggregation) or the time
+        steps (full temporal resolution) are split. If None, the number of subproblems is set to the number of
+        workers (limited by the number of typical periods or time steps).
+        |br| * the default value is None
+    :type numberOfBlocks: strictly positive integer or None
+
+    :param maxWorkers: maximum number of processes which solve the subproblems in parallel. If None, the number of
+        processors of the machine is used. If set to 1, the subproblems are solved consecutively in the current
+        process.
+        |br| * the default value is None
+    :type maxWorkers: strictly positive integer or None
+
+    :param maxIterations: maximum number of iterations
+        |br| * the default value is 50
+    :type maxIterations: strictly positive integer
+
+    :param optimalityGap: relative gap between the lower and the upper bound at which the iterations stop
+        |br| * the default value is 1e-4
+    :type optimalityGap: positive float (>=0)
+
+    :param penalty: cost factor of deviations of the design variables of the subproblems from the design of the
+        master problem. It has to be larger than the marginal operation costs of the design variables.
+        |br| * the default value is 1e6
+    :type penalty: strictly positive float
+
+    :param kwargs: additional keyword arguments for the optimize function of the EnergySystemModel (e.g. solver,
+        threads, timeSeriesAggregation, relaxIsBuiltBinary, timeLimit or optimizationSpecs). Persistent solvers and
+        the matrix backend can not be used.
+
+    :returns: summary of the iterations (lower bound, upper bound, gap and run time of each iteration)
+    :rtype: pandas DataFrame
+    """
+    utils.isStrictlyPositiveInt(maxIterations), utils.isPositiveNumber(optimalityGap)
+    utils.isStrictlyPositiveNumber(penalty)
+    if numberOfBlocks is not None:
+        utils.isStrictlyPositiveInt(numberOfBlocks)
+    if maxWorkers is not None:
+        utils.isStrictlyPositiveInt(maxWorkers)
+    if kwargs.get('backend', 'pyomo') != 'pyomo':
+        raise ValueError('The Benders decomposition requires the pyomo backend.')
+    if utils.isPersistentSolver(kwargs.get('solver', 'None')):
+        raise ValueError('The Benders decomposition does not support persistent solvers.')
+    hasTSA = kwargs.get('timeSeriesAggregation', False)
+    if hasTSA and not esM.isTimeSeriesDataClustered:
+        raise ValueError('The time series data has to be clustered before the optimization with time series '
+                         'aggregation (call the cluster function first).')
+    for mdl in esM.componentModelingDict.values():
+        if hasattr(mdl, 'initialOperationStates'):
+            raise ValueError('The Benders decomposition does not support ConversionDynamic components.')
+    kwargs.pop('declaresOptimizationProblem', None)
+    kwargs['resultsMode'] = 'lazy'
+
+    # Split the typical periods or the time steps into blocks
+    maxWorkers = maxWorkers if maxWorkers is not None else os.cpu_count()
+    units = list(esM.typicalPeriods) if hasTSA else list(esM.totalTimeSteps)
+    numberOfBlocks = min(numberOfBlocks if numberOfBlocks is not None else maxWorkers, len(units))
+    if numberOfBlocks > 1:
+        checkSeparability(esM, hasTSA)
+    blocks = [[int(unit) for unit in block] for block in np.array_split(units, numberOfBlocks)]
+
+    # Copy the energy system model without the pyomo model and the persistent solver (which can not be pickled)
+    pyM, persistentSolver = getattr(esM, 'pyM', None), esM.persistentSolver
+    esM.pyM, esM.persistentSolver = None, None
+    try:
+        esMData = pickle.dumps(esM, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        esM.pyM, esM.persistentSolver = pyM, persistentSolver
+
+    # Declare the master problem based on a model of a single time step without its time dependent constraints
+    masterEsM = pickle.loads(esMData)
+    setBlock(masterEsM, [0], False)
+    masterEsM.declareOptimizationProblem(relaxIsBuiltBinary=kwargs.get('relaxIsBuiltBinary', False))
+    designVars, designCosts = declareMasterProblem(masterEsM.pyM, len(blocks))
+    designKeys = sorted(key for key in designVars if key[0].startswith(tuple(SUBPROBLEM_DESIGN_VARIABLES)))
+    masterKwargs = dict(kwargs, timeSeriesAggregation=False)
+
+    utils.output('\nBenders decomposition with ' + str(len(designKeys)) + ' design variables and ' +
+                 str(len(blocks)) + ' subproblems...', esM.verbose, 0)
+
+    summary, best = [], None
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=min(maxWorkers, len(blocks))) \
+        if maxWorkers > 1 and len(blocks) > 1 else None
+    try:
+        # Bound the operation costs of each subproblem from below by its optimal value for a free design
+        results = solveSubproblems(executor, esMData, blocks, hasTSA, None, designKeys, penalty, kwargs)
+        for i, (_, operationCosts, _, _, _) in enumerate(results):
+            masterEsM.pyM.BendersTheta[i].setlb(operationCosts)
+
+        for iteration in range(1, maxIterations + 1):
+            _t = time.time()
+            masterEsM.optimize(declaresOptimizationProblem=False, **masterKwargs)
+            checkSolverSpecs(masterEsM.solverSpecs, 'master problem')
+            lowerBound = masterEsM.objectiveValue
+            masterValues = {key: getDesignValue(var) for key, var in designVars.items()}
+            designValues = [masterValues[key] for key in designKeys]
+
+            results = solveSubproblems(executor, esMData, blocks, hasTSA, designValues, designKeys, penalty, kwargs)
+            upperBound = np.inf
+            if all(slack <= 1e-6 for _, _, _, slack, _ in results):
+                upperBound = pyomo.value(designCosts) + sum(operationCosts for _, operationCosts, _, _, _ in results)
+                if best is None or upperBound < best[0]:
+                    best = (upperBound, masterValues, [solution for solution, _, _, _, _ in results])
+
+            # Add an optimality cut for each subproblem to the master problem
+            for i, (_, operationCosts, duals, _, _) in enumerate(results):
+                masterEsM.pyM.BendersCuts.add(masterEsM.pyM.BendersTheta[i] >= operationCosts + sum(
+                    dual * (designVars[key] - value) for key, value, dual in zip(designKeys, designValues, duals)
+                    if abs(dual) > 1e-12))
+
+            bestUpperBound = best[0] if best is not None else np.inf
+            gap = (bestUpperBound - lowerBound) / abs(bestUpperBound) if best is not None and bestUpperBound != 0 \
+                else np.inf
+            summary.append({'iteration': iteration, 'lowerBound': lowerBound, 'upperBound': upperBound,
+                            'bestUpperBound': bestUpperBound, 'gap': gap, 'runtime': time.time() - _t})
+            utils.output('Iteration ' + str(iteration) + ': lower bound ' + str(round(lowerBound, 2)) +
+                         ', upper bound ' + str(round(bestUpperBound, 2)) + ', gap ' + str(round(gap * 100, 4)) +
+                         '%', esM.verbose, 0)
+            if gap <= optimalityGap:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if best is None:
+        raise ValueError('The Benders decomposition did not find a feasible design in ' + str(maxIterations) +
+                         ' iterations. Increase the maximum number of iterations or the penalty factor.')
+
+    # Set the optimal values of the best design and of the corresponding subproblems in the modeling classes
+    upperBound, masterValues, solutions = best
+    solution = mergeBlockSolutions(solutions)
+    for (name, index), value in masterValues.items():
+        getattr(solution, name).values[index] = value
+    for mdl in esM.componentModelingDict.values():
+        mdl._pendingOptimalValues = None
+        mdl.setOptimalValues(esM, solution)
+    esM.objectiveValue = upperBound
+    esM.lowerBound, esM.upperBound, esM.gap = lowerBound, upperBound, summary[-1]['gap']
+    utils.output('The real optimal value lies between ' + str(round(lowerBound, 2)) + ' and ' +
+                 str(round(upperBound, 2)) + ' with a gap of ' + str(round(esM.gap * 100, 2)) + '%.', esM.verbose, 0)
+
+    return pd.DataFrame(summary).set_index('iteration')
+
+
+def getDesignVariables(pyM):
+    """
+    Return the design variables of a pyomo model.
+
+    :returns: pyomo variables with (variable name, index) tuples as keys
+    :rtype: dict
+    """
+    return {(var.local_name, index): var[index] for var in pyM.component_objects(pyomo.Var, descend_into=False)
+            if any(var.local_name.startswith(prefix) for prefix in DESIGN_VARIABLES) for index in var}
+
+
+def getDesignValue(var):
+    """
+    Return the optimal value of a design variable of the master problem (rounded for discrete variables).
+    """
+    if var.value is None:
+        return var.lb if var.lb is not None else 0
+    return round(var.value) if var.is_integer() else var.value
+
+
+def getObjectiveParts(pyM, designVars):
+    """
+    Split the objective function of a pyomo model into the time independent costs of the design variables (including
+    constant costs) and the remaining (operation) costs.
+
+    :returns: design costs, operation costs
+    :rtype: tuple of pyomo expressions
+    """
+    designIds = {id(var) for var in designVars.values()}
+    repn = generate_standard_repn(pyM.Obj.expr, quadratic=True)
+    if repn.nonlinear_expr is not None:
+        raise ValueError('The Benders decomposition requires a linear or quadratic objective function.')
+    designCosts, operationCosts = [repn.constant], []
+    for coef, var in zip(repn.linear_coefs, repn.linear_vars):
+        (designCosts if id(var) in designIds else operationCosts).append(coef * var)
+    for coef, (var1, var2) in zip(repn.quadratic_coefs, repn.quadratic_vars):
+        (designCosts if id(var1) in designIds and id(var2) in designIds else operationCosts).append(
+            coef * var1 * var2)
+    return pyomo.quicksum(designCosts), pyomo.quicksum(operationCosts)
+
+
+def declareMasterProblem(pyM, numberOfSubproblems):
+    """
+    Convert the pyomo model of an energy system model into the master problem of the Benders decomposition. All
+    constraints which contain other than design variables are deactivated and the objective function is replaced
+    by the design costs plus the estimated operation costs of the subproblems (BendersTheta variables). The optimality
+    cuts are added to the BendersCuts constraint list.
+
+    :returns: design variables, design costs
+    :rtype: tuple (dict, pyomo expression)
+    """
+    designVars = getDesignVariables(pyM)
+    designIds = {id(var) for var in designVars.values()}
+    for constraint in pyM.component_data_objects(pyomo.Constraint, active=True, descend_into=False):
+        operationVars = [var for var in identify_variables(constraint.body) if id(var) not in designIds]
+        for var in operationVars:
+            if var.is_integer():
+                raise ValueError('The Benders decomposition requires linear subproblems. The binary operation '
+                                 'variable ' + var.name + ' is not supported.')
+        if operationVars:
+            constraint.deactivate()
+
+    designCosts, _ = getObjectiveParts(pyM, designVars)
+    pyM.del_component('Obj')
+    pyM.BendersTheta = pyomo.Var(range(numberOfSubproblems), domain=pyomo.Reals)
+    pyM.BendersCuts = pyomo.ConstraintList()
+    pyM.Obj = pyomo.Objective(expr=designCosts + pyomo.quicksum(pyM.BendersTheta[i]
+                                                                for i in range(numberOfSubproblems)))
+    return designVars, designCosts
+
+
+def solveSubproblems(executor, esMData, blocks, hasTSA, designValues, designKeys, penalty, kwargs):
+    """
+    Solve the subproblems of all blocks (in parallel if an executor is given) and check the solver status.
+    """
+    if executor is None:
+        results = [solveSubproblem(esMData, block, hasTSA, designValues, designKeys, penalty, kwargs)
+                   for block in blocks]
+    else:
+        results = list(executor.map(solveSubproblem, [esMData] * len(blocks), blocks, [hasTSA] * len(blocks),
+                                    [designValues] * len(blocks), [designKeys] * len(blocks),
+                                    [penalty] * len(blocks), [kwargs] * len(blocks)))
+    for i, (_, _, _, _, solverSpecs) in enumerate(results):
+        checkSolverSpecs(solverSpecs, 'subproblem ' + str(i + 1))
+    return results
+
+
+def checkSolverSpecs(solverSpecs, name):
+    """
+    Raise a ValueError if an optimization failed.
+    """
+    if solverSpecs['status'] in ['error', 'aborted', 'unknown'] or \
+            solverSpecs['terminationCondition'] in ['infeasible', 'unbounded', 'infeasibleOrUnbounded']:
+        raise ValueError('The optimization of the ' + name + ' failed (status: ' + solverSpecs['status'] +
+                         ', termination condition: ' + solverSpecs['terminationCondition'] + '). Subproblems are '
+                         'unbounded if components with revenues have unlimited capacities (set capacityMax) or if '
+                         'their revenues per unit of capacity exceed the penalty factor.')
+
+
+def solveSubproblem(esMData, block, hasTSA, designValues, designKeys, penalty, kwargs):
+    """
+    Optimize the operation of one block of typical periods or time steps of a pickled energy system model for the
+    given values of the design variables. If designValues is None, the design variables are free (continuous within
+    their bounds and design constraints). The function is executed in the worker processes of optimizeBenders.
+
+    :returns: optimal values of all variables (with the time steps of the full time horizon), operation costs, dual
+        values of the design variables, sum of the deviations from the design values and solver specifications
+    :rtype: tuple (SolutionSnapshot, float, list, float, dict)
+    """
+    esM = pickle.loads(esMData)
+    setBlock(esM, block, hasTSA)
+    esM.declareOptimizationProblem(timeSeriesAggregation=hasTSA, segmentation=esM.segmentation and hasTSA,
+                                   relaxIsBuiltBinary=True)
+    pyM = esM.pyM
+    # The design variables are continuous in the subproblems. If the design is set by the master problem, the design
+    # constraints and the bounds of the design variables are considered in the master problem. Removing them from the
+    # subproblem avoids degenerate dual values (of the size of the penalty factor) at these bounds. The free design of
+    # the initial relaxation keeps them since its operation costs are otherwise unbounded for components with revenues.
+    designVars = getDesignVariables(pyM)
+    designIds = {id(var) for var in designVars.values()}
+    for var in designVars.values():
+        lb, ub = (var.lb, var.ub) if designValues is None else (None, None)
+        var.domain = pyomo.Reals
+        var.setlb(lb), var.setub(ub)
+    if designValues is not None:
+        for constraint in pyM.component_data_objects(pyomo.Constraint, active=True, descend_into=False):
+            if all(id(var) in designIds for var in identify_variables(constraint.body)):
+                constraint.deactivate()
+    _, operationCosts = getObjectiveParts(pyM, designVars)
+
+    # Set the design variables to the design of the master problem by elastic equality constraints
+    if designValues is not None:
+        indices = range(len(designKeys))
+        pyM.BendersSlackPos = pyomo.Var(indices, domain=pyomo.NonNegativeReals)
+        pyM.BendersSlackNeg = pyomo.Var(indices, domain=pyomo.NonNegativeReals)
+        pyM.BendersDesign = pyomo.Constraint(indices, rule=lambda pyM, i: designVars[designKeys[i]] -
+                                             pyM.BendersSlackPos[i] + pyM.BendersSlackNeg[i] == designValues[i])
+        operationCosts += penalty * pyomo.quicksum(pyM.BendersSlackPos[i] + pyM.BendersSlackNeg[i] for i in indices)
+    pyM.del_component('Obj')
+    pyM.Obj = pyomo.Objective(expr=operationCosts)
+
+    esM.optimize(declaresOptimizationProblem=False, **kwargs)
+    solverSpecs = {name: esM.solverSpecs.get(name) for name in ['status', 'terminationCondition', 'solvetime']}
+    if designValues is None or solverSpecs['terminationCondition'] != 'optimal':
+        return None, getattr(esM, 'objectiveValue', None), None, None, solverSpecs
+    duals = [pyM.dual.get(pyM.BendersDesign[i], 0) for i in range(len(designKeys))]
+    slack = sum(pyomo.value(pyM.BendersSlackPos[i] + pyM.BendersSlackNeg[i]) for i in range(len(designKeys)))
+    return getBlockSolution(esM, block, hasTSA), esM.objectiveValue, duals, slack, solverSpecs
@@ -136,7 +136,8 @@ def optimizeTSAmultiStage(esM,
 
 def fixBinaryVariables(esM):
     """"
-    Search for the optimized binary variables and set them as fixed.
+    Search for the optimized binary variables and set them as fixed. The binary variables of the declared pyomo
+    model are fixed as well and, if a persistent solver is used, the changes are pushed incrementally to it.
 
     :param esM: energy system model to which the component should be added. Used for unit checks.
     :type esM: EnergySystemModel instance from the FINE package
@@ -150,3 +151,18 @@ def fixBinaryVariables(esM):
             for comp in compValues.index.get_level_values(0).unique():
                 values = utils.preprocess2dimData(compValues.loc[comp].fillna(value=-1).round(decimals=0).astype(np.int64), discard=False)
                 esM.componentModelingDict[mdl].componentsDict[comp].isBuiltFix = values
+
+    # Fix the binary variables of the declared pyomo model
+    if esM.pyM is None:
+        return
+    fixedVariables = []
+    for mdl in esM.componentModelingDict.values():
+        designBinVar = getattr(esM.pyM, 'designBin_' + mdl.abbrvName, None)
+        if designBinVar is None:
+            continue
+        for (loc, compName) in designBinVar:
+            isBuiltFix = mdl.componentsDict[compName].isBuiltFix
+            if isBuiltFix is not None and loc in isBuiltFix.index and isBuiltFix[loc] >= 0:
+                designBinVar[loc, compName].fix(isBuiltFix[loc])
+                fixedVariables.append(designBinVar[loc, compName])
+    esM.updatePersistentSolver(variables=fixedVariables)
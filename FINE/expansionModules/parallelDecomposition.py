@@ -0,0 +1,225 @@
+"""
+Last edited: October 17, 2026
+|br| @author: FINE Developer Team (FZJ IEK-3)
+"""
+
+from FINE.component import ComponentModel
+from FINE import utils
+from FINE.expansionModules.rollingHorizon import getWindowTimeSeries, addWindowValues
+import concurrent.futures
+import numpy as np
+import pandas as pd
+import pickle
+import os
+import time
+
+
+def optimizeParallelPeriods(esM, numberOfBlocks=None, maxWorkers=None, **kwargs):
+    """
+    Optimize the operation of an energy system model with a fixed design by decomposing the optimization problem
+    into independent temporal blocks which are solved in parallel processes.
+
+    If the capacities of all components are fixed and no constraint couples the operation of different periods, the
+    optimization problem separates by period:
+
+    * with time series aggregation (timeSeriesAggregation=True), the typical periods are split into numberOfBlocks
+      blocks.
+    * with the full temporal resolution, the time steps are split into numberOfBlocks consecutive blocks. The model
+      must not contain ConversionDynamic components since these couple consecutive time steps.
+
+    Storage components are not supported since their state of charge couples the periods (also for periodical
+    storage components, whose state of charge between periods is a single variable shared by all periods).
+
+    Components with annual constraints (yearly limits, balance limits, full load hours or the cyclic lifetime) and
+    DemandSideManagement components are not supported. Each block is optimized in a separate process (the energy
+    system model is copied to the processes without its pyomo model). Afterwards, the optimal values of all blocks
+    are merged and set in the modeling classes as after a regular optimization (e.g. operationVariablesOptimum,
+    optSummary). The objective value is set to the sum of the design costs and of the operation costs of all blocks.
+    esM.pyM is not changed.
+
+    **Required arguments:**
+
+    :param esM: energy system model which is optimized. The capacities of all components with a capacity variable
+        have to be fixed (capacityFix).
+    :type esM: EnergySystemModel instance from the FINE package
+
+    **Default arguments:**
+
+    :param numberOfBlocks: number of blocks into which the typical periods (time series aggregation) or the time
+        steps (full temporal resolution) are split. If None, the number of blocks is set to the number of workers
+        (limited by the number of typical periods or time steps).
+        |br| * the default value is None
+    :type numberOfBlocks: strictly positive integer or None
+
+    :param maxWorkers: maximum number of processes which solve the blocks in parallel. If None, the number of
+        processors of the machine is used. If set to 1, the blocks are solved consecutively in the current process.
+        |br| * the default value is None
+    :type maxWorkers: strictly positive integer or None
+
+    :param kwargs: additional keyword arguments for the optimize function of the EnergySystemModel (e.g. solver,
+        threads, timeSeriesAggregation, timeLimit, optimizationSpecs or backend).
+
+    :returns: summary of the blocks (typical periods, first and last time step, objective value, solve time, solver
+        status and termination condition of each block)
+    :rtype: pandas DataFrame
+    """
+    if numberOfBlocks is not None:
+        utils.isStrictlyPositiveInt(numberOfBlocks)
+    if maxWorkers is not None:
+        utils.isStrictlyPositiveInt(maxWorkers)
+    hasTSA = kwargs.get('timeSeriesAggregation', False)
+    checkSeparability(esM, hasTSA)
+    for mdl in esM.componentModelingDict.values():
+        for compName, comp in mdl.componentsDict.items():
+            if comp.hasCapacityVariable and comp.capacityFix is None:
+                raise ValueError('The parallel optimization of periods requires fixed capacities. Set the capacityFix '
+                                 'parameter of component ' + compName + '.')
+    kwargs['resultsMode'] = 'lazy'
+
+    # Split the typical periods or the time steps into blocks
+    maxWorkers = maxWorkers if maxWorkers is not None else os.cpu_count()
+    units = list(esM.typicalPeriods) if hasTSA else list(esM.totalTimeSteps)
+    numberOfBlocks = min(numberOfBlocks if numberOfBlocks is not None else maxWorkers, len(units))
+    blocks = [[int(unit) for unit in block] for block in np.array_split(units, numberOfBlocks)]
+    utils.output('\nOptimizing ' + str(len(blocks)) + ' blocks of ' + ('typical periods' if hasTSA else 'time steps') +
+                 ' with up to ' + str(min(maxWorkers, len(blocks))) + ' parallel processes...', esM.verbose, 0)
+
+    # Copy the energy system model without the pyomo model and the persistent solver (which can not be pickled)
+    pyM, persistentSolver = getattr(esM, 'pyM', None), esM.persistentSolver
+    esM.pyM, esM.persistentSolver = None, None
+    try:
+        esMData = pickle.dumps(esM, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        esM.pyM, esM.persistentSolver = pyM, persistentSolver
+
+    _t = time.time()
+    if maxWorkers == 1 or len(blocks) == 1:
+        results = [optimizeBlock(esMData, block, hasTSA, kwargs) for block in blocks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(maxWorkers, len(blocks))) as executor:
+            results = list(executor.map(optimizeBlock, [esMData] * len(blocks), blocks, [hasTSA] * len(blocks),
+                                        [kwargs] * len(blocks)))
+    utils.output('\t\t(%.4f' % (time.time() - _t) + ' sec)\n', esM.verbose, 0)
+
+    summary = []
+    for i, (block, (solution, objectiveValue, designCosts, solverSpecs)) in enumerate(zip(blocks, results)):
+        if solverSpecs['status'] in ['error', 'aborted', 'unknown'] or \
+                solverSpecs['terminationCondition'] in ['infeasible', 'unbounded', 'infeasibleOrUnbounded']:
+            raise ValueError('The optimization of block ' + str(i + 1) + ' failed (status: ' +
+                             solverSpecs['status'] + ', termination condition: ' +
+                             solverSpecs['terminationCondition'] + ').')
+        summary.append({'periods': block if hasTSA else [0],
+                        'start': 0 if hasTSA else block[0],
+                        'end': len(esM.timeStepsPerPeriod) - 1 if hasTSA else block[-1],
+                        'objectiveValue': objectiveValue, 'solvetime': solverSpecs['solvetime'],
+                        'status': solverSpecs['status'],
+                        'terminationCondition': solverSpecs['terminationCondition']})
+
+    # Merge the optimal values of all blocks and set them in the modeling classes
+    solution = mergeBlockSolutions([blockSolution for blockSolution, _, _, _ in results])
+    for mdl in esM.componentModelingDict.values():
+        mdl._pendingOptimalValues = None
+        mdl.setOptimalValues(esM, solution)
+    # The design costs are part of the objective value of each block
+    esM.objectiveValue = results[0][2] + sum(objectiveValue - designCosts for _, objectiveValue, designCosts, _
+                                             in results)
+
+    return pd.DataFrame(summary)
+
+
+def checkSeparability(esM, hasTSA):
+    """
+    Check if the operation of an energy system model with a given design separates by typical period (time series
+    aggregation) or by time step (full temporal resolution). A ValueError is raised otherwise.
+    """
+    if hasTSA and not esM.isTimeSeriesDataClustered:
+        raise ValueError('The time series data has to be clustered before the optimization with time series '
+                         'aggregation (call the cluster function first).')
+    if esM.balanceLimit is not None:
+        raise ValueError('The parallel optimization of periods does not support balance limits.')
+    if 'DSMModel' in esM.componentModelingDict:
+        raise ValueError('The parallel optimization of periods does not support DemandSideManagement components.')
+    for mdlName, mdl in esM.componentModelingDict.items():
+        for compName, comp in mdl.componentsDict.items():
+            if getattr(comp, 'yearlyFullLoadHoursMin', None) is not None or \
+                    getattr(comp, 'yearlyFullLoadHoursMax', None) is not None or \
+                    getattr(comp, 'commodityLimitID', None) is not None or \
+                    getattr(comp, 'cyclicLifetime', None) is not None:
+                raise ValueError('The annual constraints of component ' + compName + ' couple the periods. They are '
+                                 'not supported by the parallel optimization of periods.')
+            if hasattr(mdl, 'boundaryStatesOfCharge'):
+                raise ValueError('The state of charge of component ' + compName + ' couples the periods. Storage '
+                                 'components are not supported by the parallel optimization of periods.')
+            if hasattr(mdl, 'initialOperationStates') and not hasTSA:
+                raise ValueError('The operation of the ConversionDynamic component ' + compName + ' couples the '
+                                 'time steps. It is only supported with time series aggregation.')
+
+
+def optimizeBlock(esMData, block, hasTSA, kwargs):
+    """
+    Optimize one block of typical periods or time steps of a pickled energy system model. The function is executed
+    in the worker processes of optimizeParallelPeriods.
+
+    :returns: optimal values of all variables (with the time steps of the full time horizon), objective value of the
+        block, time independent costs (design costs) and solver specifications
+    :rtype: tuple (SolutionSnapshot, float, float, dict)
+    """
+    esM = pickle.loads(esMData)
+    setBlock(esM, block, hasTSA)
+    esM.optimize(**kwargs)
+    solution = getBlockSolution(esM, block, hasTSA)
+    designCosts = sum(utils.pyomo.value(ComponentModel.getObjectiveFunctionContribution(mdl, esM, esM.pyM))
+                      for mdl in esM.componentModelingDict.values())
+    solverSpecs = {name: esM.solverSpecs.get(name) for name in ['status', 'terminationCondition', 'solvetime']}
+    return solution, getattr(esM, 'objectiveValue', None), designCosts, solverSpecs
+
+
+def setBlock(esM, block, hasTSA):
+    """
+    Restrict an energy system model to a block of typical periods (time series aggregation) or of consecutive time
+    steps (full temporal resolution). The number of years of the full time horizon is kept such that the operation
+    costs of the blocks add up to the operation costs of the full time horizon.
+    """
+    if hasTSA:
+        esM.typicalPeriods = block
+    else:
+        start, end = block[0], block[-1] + 1
+        esM.numberOfTimeSteps = end - start
+        esM.totalTimeSteps = list(range(end - start))
+        for mdl in esM.componentModelingDict.values():
+            for comp in mdl.componentsDict.values():
+                for name, value in list(vars(comp).items()):
+                    if name.startswith('full'):
+                        setattr(comp, name, getWindowTimeSeries(value, start, end))
+
+
+def getBlockSolution(esM, block, hasTSA):
+    """
+    Return the optimal values of all variables of the solved pyomo model of a block. The time steps of a block of
+    consecutive time steps are shifted to the time steps of the full time horizon.
+
+    :rtype: SolutionSnapshot
+    """
+    solution = utils.SolutionSnapshot(esM.pyM)
+    if not hasTSA:
+        values = {}
+        addWindowValues(esM.pyM, values, block[0], len(block), True)
+        for name, varValues in values.items():
+            setattr(solution, name, utils.SolutionValues(varValues))
+    return solution
+
+
+def mergeBlockSolutions(solutions):
+    """
+    Merge the optimal values of the variables of several blocks into the first solution.
+
+    :rtype: SolutionSnapshot
+    """
+    solution = solutions[0]
+    for blockSolution in solutions[1:]:
+        for name, varValues in vars(blockSolution).items():
+            if isinstance(varValues, utils.SolutionValues):
+                getattr(solution, name).values.update(varValues.values)
+                # The index sets of the first block do not cover the time steps of the other blocks
+                getattr(solution, name).indexSets = None
+    return solution
@@ -25,6 +25,7 @@ import matplotlib as mpl
 import shapely as shp
 import time
 from multiprocessing import Pool
+from contextlib import nullcontext
 import sys
 from functools import partial
 
@@ -501,6 +502,82 @@ def createSteinerTree(graph, distances, inner_nodes):
     return S, distances
 
 
+# read-only input data which is sent once to every worker process of a WorkerPool
+_workerData = {}
+
+
+def _initializeWorker(sharedData):
+    _workerData.clear()
+    _workerData.update(sharedData)
+
+
+def _runWorkerTask(function, sharedNames, kwargs, item):
+    return function(item, **{name: _workerData[name] for name in sharedNames}, **kwargs)
+
+
+class WorkerPool(object):
+    """
+    Pool of worker processes which can be shared by the stages of determineDiscretePipelineDesign (generation of the
+    robust scenarios, computation of the time step flows and postprocessing). Large read-only input data (e.g. the
+    graph, the distances and the injection and withdrawal rates) is sent once to every worker by the initializer of
+    the pool instead of being pickled with every task, and the tasks are sent to the workers in chunks. With a
+    single thread, the tasks are executed in the current process without starting a pool.
+    """
+
+    def __init__(self, threads=1, **sharedData):
+        """
+        Constructor for creating a WorkerPool
+
+        :param threads: number of worker processes
+            |br| * the default value is 1
+        :type threads: strictly positive integer
+
+        :param sharedData: read-only input data which is sent once to every worker (e.g. graph=graph)
+        """
+        utils.isStrictlyPositiveInt(threads)
+        self.threads = threads
+        self.sharedData = sharedData
+        self.pool = Pool(threads, initializer=_initializeWorker, initargs=(sharedData,)) if threads > 1 else None
+
+    def imap(self, function, items, **kwargs):
+        """
+        Apply function(item, **kwargs) to all items. Keyword arguments which are identical to the shared data of the
+        pool are not sent with the tasks but taken from the data of the workers.
+
+        :return: iterator over the results in the order of the items
+        """
+        if self.pool is None:
+            return (function(item, **kwargs) for item in items)
+        sharedNames = [name for name, value in kwargs.items()
+                       if name in self.sharedData and self.sharedData[name] is value]
+        taskKwargs = {name: value for name, value in kwargs.items() if name not in sharedNames}
+        chunksize = max(1, len(items) // (4 * self.threads))
+        return self.pool.imap(partial(_runWorkerTask, function, sharedNames, taskKwargs), items, chunksize)
+
+    def close(self, terminate=False):
+        """
+        Close the pool and wait for the worker processes to exit.
+
+        :param terminate: if True, the worker processes are stopped without completing outstanding tasks
+            |br| * the default value is False
+        :type terminate: boolean
+        """
+        if self.pool is not None:
+            if terminate:
+                self.pool.terminate()
+            else:
+                self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, *args):
+        # if an exception is raised in one of the stages, the outstanding tasks are not completed
+        self.close(terminate=excType is not None)
+
+
 def _generateRobustScenarios(startNode_endNode, **kwargs):
     startNode = startNode_endNode[0]
     endNode = startNode_endNode[1]
@@ -508,7 +585,7 @@ def _generateRobustScenarios(startNode_endNode, **kwargs):
 
 
 def generateRobustScenarios(injectionWithdrawalRates, graph, distances, dic_node_minPress, dic_node_maxPress,
-    solver='glpk', threads=1, verbose=0):
+    solver='glpk', threads=1, verbose=0, method='auto', pool=None):
     """
     Compute for every node combination a special robust scenario according to Robinius et. al. (2019)
     and Labbé et. al. (2019)
@@ -529,6 +606,14 @@ def generateRobustScenarios(injectionWithdrawalRates, graph, distances, dic_node
     :param verbose: if > 0, parallelization progress is displayed
     :type verbose: int
 
+    :param method: method for computing the special scenarios: 'numpy' (closed-form computation for tree-shaped
+        networks, see computeSpecialScenariosTree), 'pyomo' (one LP per node pair, see computeSingleSpecialScenario)
+        or 'auto' ('numpy' if the network is a tree, otherwise 'pyomo')
+    :type method: string, default 'auto'
+
+    :param pool: pool of worker processes which is used instead of a new pool with the given number of threads
+    :type pool: WorkerPool or None, default None
+
     :return dictionary that contains for every node pair a dictionary containing all arc flows of the corresponding
     special scenario
     :rtype: dictionary key: (node1,node2), value: dictionary: key: arc, value: arc flow in [kg/s]
@@ -543,6 +628,7 @@ def generateRobustScenarios(injectionWithdrawalRates, graph, distances, dic_node
     isPandasDataFrameNumber(injectionWithdrawalRates)
     isNetworkxGraph(graph)
     isPandasSeriesPositiveNumber(distances)
+    useTreeFlows = isTreeFlowMethod(method, graph, distances)
 
     # get for every  entry/exit node the minimal and maximal injection rate and save it in a
     # dictionary: key: node, value: min Rate; respectively max Rate in [kg/s]
@@ -590,16 +676,20 @@ def generateRobustScenarios(injectionWithdrawalRates, graph, distances, dic_node
     else:
         nodes = [(startNode, endNode) for startNode in graph.nodes for endNode in graph.nodes if startNode != endNode]
 
-    pool = Pool(threads)
-    for i, values in enumerate(pool.imap(partial(_generateRobustScenarios, graph=graph, distances=distances,
-                                                entries=entries, exits=exits, dic_nodes_MinCapacity=dic_nodes_MinCapacity,
-                                                dic_nodes_MaxCapacity=dic_nodes_MaxCapacity, solver=solver),
-                               nodes), 1):
-        if verbose == 0:
-            sys.stderr.write('\rPercentage simulated: {:d}%'.format(int(i / len(nodes) * 100)))
-        dic_nodePair_flows[values[0]] = values[1]
-    pool.close()
-    pool.join()
+    if useTreeFlows:
+        dic_nodePair_flows = computeSpecialScenariosTree(graph, distances, entries, exits, nodes,
+                                                         dic_nodes_MinCapacity, dic_nodes_MaxCapacity)
+        return dic_nodePair_flows, entries, exits
+
+    # a pool which is only created for this stage is closed afterwards (also if an exception is raised)
+    with nullcontext(pool) if pool is not None else WorkerPool(threads, graph=graph, distances=distances) as workerPool:
+        for i, values in enumerate(workerPool.imap(_generateRobustScenarios, nodes, graph=graph, distances=distances,
+                                                   entries=entries, exits=exits,
+                                                   dic_nodes_MinCapacity=dic_nodes_MinCapacity,
+                                                   dic_nodes_MaxCapacity=dic_nodes_MaxCapacity, solver=solver), 1):
+            if verbose == 0:
+                sys.stderr.write('\rPercentage simulated: {:d}%'.format(int(i / len(nodes) * 100)))
+            dic_nodePair_flows[values[0]] = values[1]
 
     return dic_nodePair_flows, entries, exits
 
@@ -670,10 +760,10 @@ def computeSingleSpecialScenario(graph, distances, entries, exits, startNode, en
 
     # Description model: we have a simple directed graph. We allow negative flows because a pipe can be used in both
     # directions by the flows
-    model.Nodes = py.Set(initialize=graph.nodes)
+    model.Nodes = py.Set(initialize=list(graph.nodes))
     # important to use distances.keys() instead of graph.edges such that we do not have key errors later on because
     # the edges in graph are undirected and in distances.keys() directed
-    model.Arcs = py.Set(initialize=distances.keys(), dimen=2)
+    model.Arcs = py.Set(initialize=list(distances.keys()), dimen=2)
 
     # create demand variables for every node;
     # if specialScenario is true, then we compute special scenario, i.e. entry/exit demand variables are bounded by
@@ -779,6 +869,141 @@ def computeSingleSpecialScenario(graph, distances, entries, exits, startNode, en
     return dic_scenario_flow
 
 
+def isTreeFlowMethod(method, graph, distances):
+    """
+    Check if the flows are computed in closed form for a tree-shaped network (True) or by LPs (False).
+
+    :param method: 'numpy', 'pyomo' or 'auto' ('numpy' if the network is a tree, otherwise 'pyomo')
+    :type method: string
+
+    :return True if the flows are computed in closed form
+    :rtype: bool
+    """
+    if method not in ['auto', 'numpy', 'pyomo']:
+        raise ValueError("The method has to be 'auto', 'numpy' or 'pyomo'.")
+    if method == 'pyomo':
+        return False
+    isTree = nx.is_tree(graph) and len(distances) == graph.number_of_edges() and \
+        all(graph.has_edge(arc[0], arc[1]) for arc in distances.index)
+    if method == 'numpy' and not isTree:
+        raise ValueError("The method 'numpy' requires a tree-shaped network (see createSteinerTree).")
+    return isTree
+
+
+def getIncidenceMatrix(graph, distances):
+    """
+    Compute the node-arc incidence matrix of the network. The entry of a node and an arc is 1 if the arc ends in the
+    node and -1 if it starts in the node such that the matrix multiplied by the arc flows yields the node demands.
+
+    :param graph: an undirected networkx graph
+    :type graph: networkx graph object
+
+    :param distances: pipeline distances; its index contains the (directed) arcs
+    :type distances: pandas series
+
+    :return list of nodes (rows), list of arcs (columns) and incidence matrix
+    :rtype: list, list, numpy array
+    """
+    nodes, arcs = list(graph.nodes), list(distances.index)
+    nodeIndex = {node: i for i, node in enumerate(nodes)}
+    incidenceMatrix = np.zeros((len(nodes), len(arcs)))
+    for j, (startNode, endNode) in enumerate(arcs):
+        incidenceMatrix[nodeIndex[startNode], j] = -1
+        incidenceMatrix[nodeIndex[endNode], j] = 1
+    return nodes, arcs, incidenceMatrix
+
+
+def computeTreeFlows(demands, incidenceMatrix):
+    """
+    Compute the arc flows of a tree-shaped network for one or several demand vectors. On a tree, the arc flows are
+    unique and given by the solution of the incidence matrix system without the (redundant) first row.
+
+    :param demands: node demands (withdrawals positive, injections negative); one column per demand vector
+    :type demands: numpy array (number of nodes x number of demand vectors)
+
+    :param incidenceMatrix: node-arc incidence matrix of the tree (see getIncidenceMatrix)
+    :type incidenceMatrix: numpy array (number of nodes x number of arcs)
+
+    :return arc flows; one column per demand vector
+    :rtype: numpy array (number of arcs x number of demand vectors)
+    """
+    return np.linalg.solve(incidenceMatrix[1:], demands[1:])
+
+
+def computeSpecialScenariosTree(graph, distances, entries, exits, nodePairs, dic_nodes_MinCapacity,
+                                dic_nodes_MaxCapacity):
+    """
+    Compute the special robust scenarios of all given node pairs of a tree-shaped network in closed form (the
+    scenarios are optimal solutions of the LPs of computeSingleSpecialScenario).
+
+    On a tree, the flow on an arc equals the demand of the nodes behind it. Hence, the objective of the LP (the sum of
+    the flows along the path from the start node to the end node) equals the sum of the node demands weighted by the
+    number of path arcs between the start node and the node at which the path is closest to the node. The weights
+    are computed from the hop distances of the tree and the LP (maximizing the weighted demands such that the
+    demands are balanced) is solved by a greedy algorithm for all node pairs at once: starting with all demands at
+    their lower bounds, the demands of the nodes with the largest weights are increased until they are balanced.
+
+    :param graph: an undirected tree-shaped networkx graph
+    :type graph: networkx graph object
+
+    :param distances: pipeline distances; its index contains the (directed) arcs
+    :type distances: pandas series
+
+    :param entries: list of entry nodes of the network
+    :type entries: list of strings
+
+    :param exits: list of exit nodes of the network
+    :type exits: list of strings
+
+    :param nodePairs: list of (start node, end node) tuples
+    :type nodePairs: list of tuples
+
+    :param dic_nodes_MinCapacity: dictionary containing minimal capacity for each entry and exit node
+    :type dic_nodes_MinCapacity: dictionary: key: node of the network, value: float
+
+    :param dic_nodes_MaxCapacity: dictionary containing maximal capacity for each entry and exit node
+    :type dic_nodes_MaxCapacity: dictionary: key: node of the network, value: float
+
+    :return dictionary that contains for every node pair a dictionary containing all arc flows of the corresponding
+    special scenario
+    :rtype: dictionary key: (node1,node2), value: dictionary: key: arc, value: arc flow
+    """
+    nodes, arcs, incidenceMatrix = getIncidenceMatrix(graph, distances)
+    nodeIndex = {node: i for i, node in enumerate(nodes)}
+    if not nodePairs:
+        return {}
+
+    # bounds of the node demands of the special scenarios (inner nodes have no demand)
+    lowerBounds = np.array([min(0, dic_nodes_MinCapacity[node]) if node in entries or node in exits else 0
+                            for node in nodes], dtype=float)
+    upperBounds = np.array([max(0, dic_nodes_MaxCapacity[node]) if node in entries or node in exits else 0
+                            for node in nodes], dtype=float)
+    # as the LP, infeasible scenarios (the demands can not be balanced) yield no flows
+    if lowerBounds.sum() > 0 or upperBounds.sum() < 0:
+        utils.output('The demands of the special scenarios can not be balanced. No output is generated.', 0, 0)
+        return {nodePair: {} for nodePair in nodePairs}
+
+    # weight of each node: number of path arcs between the start node and the projection of the node on the path
+    hops = np.zeros((len(nodes), len(nodes)))
+    for node, lengths in nx.all_pairs_shortest_path_length(graph):
+        for otherNode, length in lengths.items():
+            hops[nodeIndex[node], nodeIndex[otherNode]] = length
+    startNodes = np.array([nodeIndex[startNode] for startNode, _ in nodePairs])
+    endNodes = np.array([nodeIndex[endNode] for _, endNode in nodePairs])
+    weights = (hops[startNodes] + hops[startNodes, endNodes][:, np.newaxis] - hops[endNodes]) / 2
+
+    # greedy: increase the demands of the nodes with the largest weights until the demands are balanced
+    order = np.argsort(-weights, axis=1, kind='stable')
+    capacities = (upperBounds - lowerBounds)[order]
+    increases = np.clip(-lowerBounds.sum() - (np.cumsum(capacities, axis=1) - capacities), 0, capacities)
+    demands = np.tile(lowerBounds, (len(nodePairs), 1))
+    np.put_along_axis(demands, order, lowerBounds[order] + increases, axis=1)
+
+    flows = computeTreeFlows(demands.T, incidenceMatrix)
+    return {nodePair: {arc: float(flows[j, i]) for j, arc in enumerate(arcs)}
+            for i, nodePair in enumerate(nodePairs)}
+
+
 def computeLargeMergedDiameters(dic_subSetDiam_costs, nDigits=6):
     """
     Compute merged diameters, i.e. compute equivalent single diameter for two looped pipes.
@@ -825,9 +1050,10 @@ def computeLargeMergedDiameters(dic_subSetDiam_costs, nDigits=6):
 
 def determinePressureDropCoef(dic_scenario_flows, distances, dic_node_minPress, dic_node_maxPress,
                               diameters, ir=0.2, rho_n=0.089882, T_m=20 + 273.15, T_n=273.15, p_n=1.01325,
-                              Z_n=1.00062387922965, nDigits=6):
+                              Z_n=1.00062387922965, nDigits=6, returnArray=False):
     """
-    Compute for each scenario, diameter, and each arc the corresponding pressure drop
+    Compute for each scenario, diameter, and each arc the corresponding pressure drop. The pressure drops of all
+    scenarios, arcs, and diameters are computed at once on arrays.
 
     :param dic_scenario_flows: dictionary that contains for every node pair a dictionary containing all
     arc flows in [kg/s] of the corresponding (special) scenario
@@ -875,7 +1101,13 @@ def determinePressureDropCoef(dic_scenario_flows, distances, dic_node_minPress,
         |br| * the default value is 6
     :type nDigits: positive int; optional
 
-    :return dictionary that contains for every scenario and diameter the corresponding pressure drops
+    :param returnArray: if True, the pressure drops are additionally returned as a dense array with the dimensions
+        (scenario, arc, diameter) in the order of dic_scenario_flows, distances.index and diameters
+        |br| * the default value is False
+    :type returnArray: bool; optional
+
+    :return dictionary that contains for every scenario and diameter the corresponding pressure drops (and the dense
+        array if returnArray is True)
     :rtype: dictionary key: (diameter, scenario Name), value: dic: key: arc, value: pressure drop
     """
     # check type and value
@@ -899,62 +1131,67 @@ def determinePressureDropCoef(dic_scenario_flows, distances, dic_node_minPress,
     utils.isPositiveNumber(p_n)
     utils.isPositiveNumber(Z_n)
     utils.isStrictlyPositiveInt(nDigits)
+    isBool(returnArray)
+
+    # compute for each scenario, arc, and diameter its pressure drop at once on arrays of shape
+    # (scenario, arc, diameter); arcs which are not contained in the flows of a scenario get the flow zero
+    scenarios = list(dic_scenario_flows.keys())
+    arcs = list(distances.index)
+    flows = np.array([[dic_scenario_flows[nodePair].get(arc, 0.0) for arc in arcs] for nodePair in scenarios],
+                     dtype=float).reshape(len(scenarios), len(arcs))[:, :, np.newaxis]
+    diams = np.array(diameters, dtype=float)[np.newaxis, np.newaxis, :]
+    pressureDropCoef = np.zeros((len(scenarios), len(arcs), len(diameters)))
+    isActive = np.broadcast_to(flows != 0.0, pressureDropCoef.shape)
+
+    # Compute approximation of average pressure flow in pipe (u,v) by
+    # if flow((u,v)) is positive then set p_min to lower pressure bound of v and p_max to upper pressure bound u
+    # if flow((u,v)) is negative then set p_min to lower pressure bound of u and p_max to upper pressure bound v
+    minPressStart = np.array([dic_node_minPress[arc[0]] for arc in arcs], dtype=float)[np.newaxis, :, np.newaxis]
+    minPressEnd = np.array([dic_node_minPress[arc[1]] for arc in arcs], dtype=float)[np.newaxis, :, np.newaxis]
+    maxPressStart = np.array([dic_node_maxPress[arc[0]] for arc in arcs], dtype=float)[np.newaxis, :, np.newaxis]
+    maxPressEnd = np.array([dic_node_maxPress[arc[1]] for arc in arcs], dtype=float)[np.newaxis, :, np.newaxis]
+    p_min = np.where(flows > 0, minPressEnd, minPressStart)
+    p_max = np.where(flows > 0, maxPressStart, maxPressEnd)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # compute approximation of average pressure
+        p_m = (2 / 3) * (p_max + p_min - (p_max * p_min) / (p_max + p_min))
+        # approximation for density
+        rho = 0.11922 * p_m ** 0.91192 - 0.17264
+        # approximation of the realgasfactor
+        Z_m = 5.04421 * 10 ** (-4) * p_m ** 1.03905 + 1.00050
+        K_m = Z_m / Z_n
+        # approximation of the dynamic viscosity
+        eta = 1.04298 * 10 ** (-10) * p_m ** 1.53560 + 8.79987 * 10 ** (-6)
+        nue = eta / rho
+        # compute cross section of the pipes and velocity
+        tmpvalue_A = 0.25 * np.pi * diams ** 2
+        tmpvalue_w = (np.abs(flows) / rho) / tmpvalue_A
+        # compute reynolds number
+        tmpvalue_Re = tmpvalue_w * (diams / nue)
+        tmpvalue_alpha = np.exp(-np.exp(6.75 - 0.0025 * tmpvalue_Re))
+        tmpvalue_Lambda = (64 / tmpvalue_Re) * (1 - tmpvalue_alpha) + tmpvalue_alpha * (
+                -2 * np.log10(2.7 * (np.log10(tmpvalue_Re) ** 1.2 / tmpvalue_Re) + ir / (3.71 * 1000 * diams))) ** (-2)
+        # note p_n is in [bar] instead of [PA], thus we divide tmpvalue_C by 10**5
+        # explanation: we have p_i^2-p_j^2=C. If p_i is in [PA] and we want p_i in [bar] then this leads to
+        # (p_i/10^5)^2-(p_j/10^5)^2=C/10^10
+        # but we changed p_n in computation C from [PA] to [bar] hence we only divide C by 10^5
+        tmpvalue_C_bar = tmpvalue_Lambda * 16 * rho_n * T_m * p_n * K_m / (np.pi ** 2 * T_n * 10 ** 5)
+        # compute final pressure drop coefficient depending on the flow
+        lengths = distances.values.astype(float)[np.newaxis, :, np.newaxis]
+        tmp_value_C_coef = (lengths / rho_n ** 2) * (tmpvalue_C_bar * flows * np.abs(flows) / diams ** 5)
+    pressureDropCoef[isActive] = tmp_value_C_coef[isActive]
 
-    # compute for each diameter, scenario, and arc its pressure drop
     # save results in dic: key: (diameter, scenario Name), value: dic: key: arc, value: pressure drop
+    arcIndex = {arc: j for j, arc in enumerate(arcs)}
     dic_pressureDropCoef = {}
-    for diameter in diameters:
-        for nodePair in dic_scenario_flows.keys():
-            # initialize dictionary
-            dic_pressureDropCoef[(diameter, nodePair)] = {}
-            # compute cross section of considered pipe and diameter
-            tmpvalue_A = 0.25 * np.pi * diameter ** 2
-            for arc in dic_scenario_flows[nodePair].keys():
-                # check if flow is unequal to zero
-                if dic_scenario_flows[nodePair][arc] != 0.0:
-                    # Compute approximation of average pressure flow in pipe (u,v) by
-                    # if flow((u,v)) is positive then set p_min to lower pressure bound of v and p_max to
-                    # upper pressure bound u
-                    # if flow((u,v)) is negative then set p_min to lower pressure bound of u and p_max to
-                    # upper pressure bound v
-                    if dic_scenario_flows[nodePair][arc] > 0:
-                        p_min = dic_node_minPress[arc[1]]
-                        p_max = dic_node_maxPress[arc[0]]
-                    else:
-                        p_min = dic_node_minPress[arc[0]]
-                        p_max = dic_node_maxPress[arc[1]]
-                    # compute approximation of average pressure
-                    p_m = (2 / 3) * (p_max + p_min - (p_max * p_min) / (p_max + p_min))
-                    # approximation for density
-                    rho = 0.11922 * p_m ** 0.91192 - 0.17264
-                    # approximation of the realgasfactor
-                    Z_m = 5.04421 * 10 ** (-4) * p_m ** 1.03905 + 1.00050
-                    K_m = Z_m / Z_n
-                    # approximation of the dynamic viscosity
-                    eta = 1.04298 * 10 ** (-10) * p_m ** 1.53560 + 8.79987 * 10 ** (-6)
-                    nue = eta / rho
-                    # compute velocity
-                    tmpvalue_w = (abs(dic_scenario_flows[nodePair][arc]) / rho) / tmpvalue_A
-                    # compute reynolds number
-                    tmpvalue_Re = tmpvalue_w * (diameter / nue)
-                    tmpvalue_alpha = np.exp(-np.exp(6.75 - 0.0025 * tmpvalue_Re))
-                    tmpvalue_Lambda = (64 / tmpvalue_Re) * (1 - tmpvalue_alpha) + tmpvalue_alpha * (
-                            -2 * np.log10(2.7 * (np.log10(tmpvalue_Re) ** 1.2 / tmpvalue_Re) + ir / (3.71 * 1000 *
-                                                                                                     diameter))) ** (-2)
-                    # note p_n is in [bar] instead of [PA], thus we divide tmpvalue_C by 10**5
-                    # explanation: we have p_i^2-p_j^2=C. If p_i is in [PA] and we want p_i in [bar] then this leads to
-                    # (p_i/10^5)^2-(p_j/10^5)^2=C/10^10
-                    # but we changed p_n in computation C from [PA] to [bar] hence we only divide C by 10^5
-                    tmpvalue_C_bar = tmpvalue_Lambda * 16 * rho_n * T_m * p_n * K_m / (np.pi ** 2 * T_n * 10 ** 5)
-                    # compute final pressure drop coefficient depending on the flow
-                    tmp_value_C_coef = (distances[arc] / rho_n ** 2) * \
-                                       (tmpvalue_C_bar * dic_scenario_flows[nodePair][arc] *
-                                        abs(dic_scenario_flows[nodePair][arc]) / diameter ** 5)
-                    # save pressure drop for considered diameter, scenario, and arc
-                    dic_pressureDropCoef[(diameter, nodePair)][arc] = tmp_value_C_coef
-                else:
-                    dic_pressureDropCoef[(diameter, nodePair)][arc] = 0
+    for k, diameter in enumerate(diameters):
+        for i, nodePair in enumerate(scenarios):
+            dic_pressureDropCoef[(diameter, nodePair)] = \
+                {arc: float(pressureDropCoef[i, arcIndex[arc], k]) for arc in dic_scenario_flows[nodePair].keys()}
 
+    if returnArray:
+        return dic_pressureDropCoef, pressureDropCoef
     return dic_pressureDropCoef
 
 
@@ -1039,7 +1276,7 @@ def determineOptimalDiscretePipelineSelection(graph, distances, dic_pressureDrop
     model = py.ConcreteModel()
 
     # sets for nodes, arcs, diameters, scenarios
-    model.nodes = py.Set(initialize=graph.nodes)
+    model.nodes = py.Set(initialize=list(graph.nodes))
     model.arcs = py.Set(initialize=list(distances.keys()), dimen=2)
     # diameters assuming that each pipe has the same diameter options
     model.diameters = py.Set(initialize=diameters)
@@ -1151,48 +1388,17 @@ def determineOptimalDiscretePipelineSelection(graph, distances, dic_pressureDrop
     return dic_arc_diam, dic_scen_node_press
 
 
-def _postprocessing(scenario, dic_scenario_flows, graph, **kwargs):
-    dic_scen_PressLevel = {}
-    dic_scen_MaxViolPress = math.inf
-    # copy a list of nodes
-    tmp_nodes = copy.deepcopy(list(graph.nodes))
-    # we now set iteratively the pressure level of a single node to its upper pressure bound and then compute the
-    # unique pressure levels until we find valid pressure levels or have tested all nodes
-    while tmp_nodes:
-        # we have not found valid pressure levels for this scenario
-        # temporary pressure levels
-        dic_tmp_pressure = {}
-        for node in list(graph.nodes):
-            dic_tmp_pressure[node] = None
-        # choose the node which pressure level is fixed to the upper pressure bound
-        current_node = tmp_nodes[0]
-        validation, tmp_viol = computePressureAtNode(graph=graph, node=current_node, nodeUpperBound=current_node,
-            dic_scenario_flows=dic_scenario_flows[scenario], dic_node_pressure=dic_tmp_pressure, **kwargs)
-        # if validation true, then we have feasible pressure levels; empty list of nodes that have to be
-        # considered
-        if validation:
-            tmp_nodes = []
-            # we have feasible pressure level and save them
-            dic_scen_PressLevel = dic_tmp_pressure
-            dic_scen_MaxViolPress = tmp_viol
-        else:
-            # remove considered entry from list of nodes that will be considered for fixing the pressure level
-            tmp_nodes.remove(tmp_nodes[0])
-            # we update the maximal pressure level violation
-            if tmp_viol < dic_scen_MaxViolPress:
-                # save currently best pressure levels
-                dic_scen_PressLevel = copy.deepcopy(dic_tmp_pressure)
-                dic_scen_MaxViolPress = tmp_viol
-
-    return scenario, dic_scen_PressLevel, dic_scen_MaxViolPress
+def _postprocessing(dic_scenario_flows, **kwargs):
+    return computePressureLevels(dic_scenario_flows=dic_scenario_flows, **kwargs)
 
 
 def postprocessing(graph, distances, dic_arc_diam, dic_scenario_flows, dic_node_minPress, dic_node_maxPress,
-    threads=1, verbose=0):
+    threads=1, verbose=0, pool=None):
     """"
     Compute "more" accurate pressure levels for the considered scenarios in the network with optimal diameters
     Apply postprocessing of Master's thesis with adaption that we possibly consider every node for fixing its
-    pressure level to the upper pressure bound.
+    pressure level to the upper pressure bound. The pressure levels of all scenarios are computed at once (see
+    computePressureLevels); if threads > 1, the scenarios are split into chunks which are processed in parallel.
 
     :param graph: an undirected networkx graph: Its edges have the attribute length which is the pipeline length in [m]
     :type graph: networkx graph object
@@ -1219,6 +1425,9 @@ def postprocessing(graph, distances, dic_arc_diam, dic_scenario_flows, dic_node_
     :param verbose: if > 0, parallelization progress is displayed
     :type verbose: int
 
+    :param pool: pool of worker processes which is used instead of a new pool with the given number of threads
+    :type pool: WorkerPool or None, default None
+
     It holds dic_node_minPress[index] <= dic_node_maxPress[index]
 
     :return: dictionary that contains for every scenario the corresponding pressure levels in [bar]
@@ -1246,23 +1455,155 @@ def postprocessing(graph, distances, dic_arc_diam, dic_scenario_flows, dic_node_
     # maximal violation of pressure bounds; zero if no violation exists; dic: key: scenario, value: pressure violation
     dic_scen_MaxViolPress = {}
     # we compute "precise" pressure levels for every scenarios
-
-    pool = Pool(threads)
     scenarios = [scenario for scenario in dic_scenario_flows.keys()]
 
-    for i, values in enumerate(pool.imap(partial(_postprocessing, validation=True, graph=graph, dic_arc_diam=dic_arc_diam,
-        distances=distances, dic_node_minPress=dic_node_minPress, dic_node_maxPress=dic_node_maxPress, tmp_violation=0,
-        dic_scenario_flows=dic_scenario_flows), scenarios), 1):
-        if verbose == 0:
-            sys.stderr.write('\rPercentage simulated: {:d}%'.format(int(i / len(scenarios) * 100)))      
-        dic_scen_PressLevel[values[0]] = values[1]
-        dic_scen_MaxViolPress[values[0]] = values[2]
-    pool.close()
-    pool.join()
+    workerThreads = pool.threads if pool is not None else threads
+    if workerThreads == 1:
+        return computePressureLevels(graph, distances, dic_arc_diam, dic_scenario_flows, dic_node_minPress,
+                                     dic_node_maxPress)
+
+    # each task only contains the flows of its chunk of scenarios
+    chunks = [{scenario: dic_scenario_flows[scenario] for scenario in scenarios[index[0]:index[-1] + 1]}
+              for index in np.array_split(range(len(scenarios)), workerThreads) if len(index) > 0]
+
+    # a pool which is only created for this stage is closed afterwards (also if an exception is raised)
+    with nullcontext(pool) if pool is not None else WorkerPool(threads, graph=graph, distances=distances,
+                                                               dic_node_minPress=dic_node_minPress,
+                                                               dic_node_maxPress=dic_node_maxPress) as workerPool:
+        for i, values in enumerate(workerPool.imap(_postprocessing, chunks, graph=graph, dic_arc_diam=dic_arc_diam,
+            distances=distances, dic_node_minPress=dic_node_minPress, dic_node_maxPress=dic_node_maxPress), 1):
+            if verbose == 0:
+                sys.stderr.write('\rPercentage simulated: {:d}%'.format(int(i / len(chunks) * 100)))
+            dic_scen_PressLevel.update(values[0])
+            dic_scen_MaxViolPress.update(values[1])
 
     return dic_scen_PressLevel, dic_scen_MaxViolPress
 
 
+def computePressureLevels(graph, distances, dic_arc_diam, dic_scenario_flows, dic_node_minPress, dic_node_maxPress,
+                          ir=0.2, rho_n=0.089882, T_m=20 + 273.15, T_n=273.15, p_n=1.01325, Z_n=1.00062387922965,
+                          nDigits=6, maxIterations=100):
+    """"
+    Compute the pressure levels of all given scenarios at once. As in computePressureAtNode, the pressure level of a
+    node is fixed to its upper pressure bound and the pressure levels of all other nodes are computed arc by arc.
+    The tree is traversed by a breadth-first search from the fixed node and the pressure levels of all arcs of one
+    level of the tree are computed for all scenarios at once (see computePressureEndnodeArcs and
+    computePressureStartnodeArcs). Each node is fixed to its upper pressure bound in turn until feasible pressure
+    levels are found for all scenarios. For each scenario, the first feasible pressure levels or the pressure levels
+    with the smallest violation of the pressure bounds are returned. Nodes behind an arc with an infeasible pressure
+    drop have the pressure level None.
+
+    :param graph: an undirected tree-shaped networkx graph: Its edges have the attribute length which is the
+        pipeline length in [m]
+    :type graph: networkx graph object
+
+    :param distances: pipeline distances in the length unit specified in the esM object ([m])
+    :type distances: pandas series
+
+    :param dic_arc_diam: dictionary containing for each arc the optimal diameter in [m]
+    :type: dictionary: key: arc, value: optimal diameter
+
+    :param dic_scenario_flows: dictionary that contains for every scenario a dictionary containing all
+        arc flows in [kg/s] of the corresponding scenario
+    :type dic_scenario_flows: dictionary key: scenarioName, value: dictionary: key: arc, value: arc flow
+
+    :param dic_node_minPress: dictionary that contains for every node of the network its lower pressure bound in [bar]
+    :type dic_node_minPress: dictionary: key: node of the network, value: non-negative float
+
+    :param dic_node_maxPress: dictionary that contains for every node of the network its upper pressure bound in [bar]
+    :type dic_node_maxPress: dictionary key: node of the network, value: non-negative float
+
+    :param ir, rho_n, T_m, T_n, p_n, Z_n: see computePressureAtNode
+
+    :param nDigits: number of digits which defines the tolerance 10^-nDigits of the nonlinear equations
+        |br| * the default value is 6
+    :type nDigits: positive int
+
+    :param maxIterations: maximal number of Newton iterations for computing the pressure levels of start nodes
+        |br| * the default value is 100
+    :type maxIterations: positive int
+
+    :return: dictionary that contains for every scenario the corresponding pressure levels in [bar]
+    :rtype: dictionary key: scenarioName, value: dic: key: node, value pressure level
+
+    :return: dictionary that contains for every scenario the maximal pressure bound violation in [bar]
+    :rtype: dictionary key: scenarioName, value: float = maximal pressure bound violation
+    """
+    scenarios = list(dic_scenario_flows.keys())
+    nodes = list(graph.nodes)
+    nodeIndex = {node: i for i, node in enumerate(nodes)}
+    minPress = np.array([dic_node_minPress[node] for node in nodes], dtype=float)
+    maxPress = np.array([dic_node_maxPress[node] for node in nodes], dtype=float)
+
+    # best found pressure levels and violations of all scenarios
+    bestPressures = np.full((len(scenarios), len(nodes)), np.nan)
+    bestViolations = np.full(len(scenarios), math.inf)
+    isOpen = np.ones(len(scenarios), dtype=bool)
+
+    for root in nodes:
+        if not isOpen.any():
+            break
+        # only consider the scenarios for which no feasible pressure levels have been found yet
+        openScenarios = [scenario for scenario, isOpenScenario in zip(scenarios, isOpen) if isOpenScenario]
+        pressures = np.full((len(openScenarios), len(nodes)), np.nan)
+        pressures[:, nodeIndex[root]] = dic_node_maxPress[root]
+
+        # group the arcs of the breadth-first search tree by the level of the tree
+        depths = nx.single_source_shortest_path_length(graph, root)
+        levels = {}
+        for parent, child in nx.bfs_edges(graph, root):
+            levels.setdefault(depths[child], []).append((parent, child))
+
+        for level in sorted(levels.keys()):
+            parents = [nodeIndex[parent] for parent, _ in levels[level]]
+            children = [nodeIndex[child] for _, child in levels[level]]
+            arcs = [(parent, child) if (parent, child) in distances.index else (child, parent)
+                    for parent, child in levels[level]]
+            # flows from the parent to the child node
+            flows = np.array([[dic_scenario_flows[scenario][arc] * (1 if arc == (parent, child) else -1)
+                               for arc, (parent, child) in zip(arcs, levels[level])] for scenario in openScenarios],
+                             dtype=float).reshape(len(openScenarios), len(arcs))
+            diameters = np.array([dic_arc_diam[arc] for arc in arcs], dtype=float)
+            lengths = np.array([distances[arc] for arc in arcs], dtype=float)
+
+            parentPressures = pressures[:, parents]
+            isKnown = np.isfinite(parentPressures)
+            # if the flow leaves the parent node, the parent node is the start node of the flow
+            isStart = isKnown & (flows >= 0)
+            isEnd = isKnown & (flows < 0)
+            childPressures = np.full(flows.shape, np.nan)
+            childPressures[isStart] = computePressureEndnodeArcs(
+                parentPressures[isStart], flows[isStart], np.broadcast_to(diameters, flows.shape)[isStart],
+                np.broadcast_to(lengths, flows.shape)[isStart], ir, rho_n, T_m, T_n, p_n, Z_n)
+            childPressures[isEnd] = computePressureStartnodeArcs(
+                parentPressures[isEnd], flows[isEnd], np.broadcast_to(diameters, flows.shape)[isEnd],
+                np.broadcast_to(lengths, flows.shape)[isEnd], ir, rho_n, T_m, T_n, p_n, Z_n,
+                tol=10 ** (- nDigits), maxIterations=maxIterations)
+            pressures[:, children] = childPressures
+
+        # maximal violation of the pressure bounds; infinite if the pressure drop of an arc is infeasible
+        with np.errstate(invalid='ignore'):
+            violations = np.nanmax(np.maximum(np.maximum(minPress - pressures, pressures - maxPress), 0), axis=1)
+        violations[np.isneginf(pressures).any(axis=1)] = math.inf
+
+        # update the best found pressure levels
+        openIndex = np.flatnonzero(isOpen)
+        isBetter = violations < bestViolations[openIndex]
+        bestPressures[openIndex[isBetter]] = pressures[isBetter]
+        bestViolations[openIndex[isBetter]] = violations[isBetter]
+        isOpen[openIndex[violations == 0]] = False
+
+    dic_scen_PressLevel, dic_scen_MaxViolPress = {}, {}
+    for i, scenario in enumerate(scenarios):
+        if bestViolations[i] == math.inf:
+            dic_scen_PressLevel[scenario] = {}
+        else:
+            dic_scen_PressLevel[scenario] = {node: None if np.isnan(bestPressures[i, j]) else float(bestPressures[i, j])
+                                             for j, node in enumerate(nodes)}
+        dic_scen_MaxViolPress[scenario] = float(bestViolations[i])
+    return dic_scen_PressLevel, dic_scen_MaxViolPress
+
+
 def computePressureAtNode(validation, node, nodeUpperBound, graph, dic_arc_diam, distances, dic_scenario_flows,
                           dic_node_minPress, dic_node_maxPress, tmp_violation, dic_node_pressure,
                           ir=0.2, rho_n=0.089882, T_m=20 + 273.15, T_n=273.15, p_n=1.01325,
@@ -1672,6 +2013,204 @@ def computePressureEndnodeArc(arc, pressureStartNode, dic_scenario_flows, dic_ar
         # pressure drop is too big return negative value, which is a invalid pressure value
         return -math.inf
 
+def computePressureDropArcs(pressureStartNodes, flows, diameters, lengths, ir=0.2, rho_n=0.089882, T_m=20 + 273.15,
+                            T_n=273.15, p_n=1.01325, Z_n=1.00062387922965):
+    """"
+    Compute the pressure drop coefficients C of several arcs with p_start^2 - p_end^2 = C (see
+    computePressureEndnodeArc) for given pressure levels of the start nodes.
+
+    :param pressureStartNodes: pressure levels of the start nodes in [bar]
+    :type pressureStartNodes: numpy array
+
+    :param flows: arc flows in [kg/s]
+    :type flows: numpy array
+
+    :param diameters: diameters of the arcs in [m]
+    :type diameters: numpy array
+
+    :param lengths: lengths of the arcs in [m]
+    :type lengths: numpy array
+
+    :param ir, rho_n, T_m, T_n, p_n, Z_n: see computePressureEndnodeArc
+
+    :return: pressure drop coefficients in [bar^2] (infinite if the pressure drop is too large)
+    :rtype: numpy array
+    """
+    C = np.zeros(np.shape(flows))
+    isActive = flows != 0
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        A = 0.25 * math.pi * diameters ** 2
+        rho_in = 0.11922 * pressureStartNodes ** 0.91192 - 0.17264
+        V_in = np.abs(flows) / rho_in
+        w_in = V_in / A
+        eta_in = 1.04298 * 10 ** (-10) * pressureStartNodes ** 1.53560 + 8.79987 * 10 ** (-6)
+        nue_in = eta_in / rho_in
+        Re_in = w_in * (diameters / nue_in)
+        alpha = np.exp(-np.exp(6.75 - 0.0025 * Re_in))
+        Lambda = (64 / Re_in) * (1 - alpha) + alpha * (-2 * np.log10(
+            (2.7 * (np.log10(Re_in)) ** 1.2) / Re_in +
+            ir / (3.71 * 1000 * diameters))) ** (-2)
+        C_tilde = (Lambda * lengths * rho_in * w_in ** 2) / (2 * diameters)
+        # note pressure_start is in bar
+        p_m = pressureStartNodes - C_tilde / 10 ** 5
+        Z_m = 5.04421 * 10 ** (-4) * np.abs(p_m) ** 1.03905 + 1.00050
+        K_m = Z_m / Z_n
+        C_active = (Lambda * 16 * lengths * T_m * p_n * K_m) / (math.pi ** 2 * T_n * rho_n * 10 ** 5 *
+                                                               diameters ** 5) * flows ** 2
+    # pressure drop too large no valid pressure assignment possible
+    C_active = np.where(p_m < 0.0, math.inf, C_active)
+    C[isActive] = C_active[isActive]
+    return C
+
+
+def computePressureEndnodeArcs(pressureStartNodes, flows, diameters, lengths, ir=0.2, rho_n=0.089882,
+                               T_m=20 + 273.15, T_n=273.15, p_n=1.01325, Z_n=1.00062387922965):
+    """"
+    Compute the pressure levels of the end nodes of several arcs (e.g. all arcs of one level of the tree for all
+    scenarios) for given pressure levels of the start nodes at once (see computePressureEndnodeArc).
+
+    :param pressureStartNodes: pressure levels of the start nodes in [bar]
+    :type pressureStartNodes: numpy array
+
+    :param flows: arc flows from the start nodes to the end nodes in [kg/s]
+    :type flows: numpy array
+
+    :param diameters: diameters of the arcs in [m]
+    :type diameters: numpy array
+
+    :param lengths: lengths of the arcs in [m]
+    :type lengths: numpy array
+
+    :param ir, rho_n, T_m, T_n, p_n, Z_n: see computePressureEndnodeArc
+
+    :return: pressure levels of the end nodes in [bar] (-inf if the pressure drop is too large)
+    :rtype: numpy array
+    """
+    pressureStartNodes = np.asarray(pressureStartNodes, dtype=float)
+    C = computePressureDropArcs(pressureStartNodes, np.asarray(flows, dtype=float), diameters, lengths, ir, rho_n,
+                                T_m, T_n, p_n, Z_n)
+    squaredPressures = pressureStartNodes ** 2 - C
+    # pressure drop is too big return negative value, which is a invalid pressure value
+    return np.where(squaredPressures >= 0, np.sqrt(np.maximum(squaredPressures, 0)), -math.inf)
+
+
+def computePressureStartnodeArcs(pressureEndNodes, flows, diameters, lengths, ir=0.2, rho_n=0.089882,
+                                 T_m=20 + 273.15, T_n=273.15, p_n=1.01325, Z_n=1.00062387922965, tol=10 ** (-4),
+                                 maxIterations=100):
+    """"
+    Compute the pressure levels of the start nodes of several arcs (e.g. all arcs of one level of the tree for all
+    scenarios) for given pressure levels of the end nodes at once (see computePressureStartnodeArc). The nonlinear
+    equations f(p_start) = p_start^2 - p_end^2 - C(p_start) = 0 are solved by array-wise Newton iterations; only
+    the equations which have not yet been solved to the given tolerance are updated in each iteration. The
+    derivatives are approximated by finite differences.
+
+    :param pressureEndNodes: pressure levels of the end nodes in [bar]
+    :type pressureEndNodes: numpy array
+
+    :param flows: arc flows from the start nodes to the end nodes in [kg/s]
+    :type flows: numpy array
+
+    :param diameters: diameters of the arcs in [m]
+    :type diameters: numpy array
+
+    :param lengths: lengths of the arcs in [m]
+    :type lengths: numpy array
+
+    :param ir, rho_n, T_m, T_n, p_n, Z_n: see computePressureStartnodeArc
+
+    :param tol: tolerance to which accuracy we solve the equations
+        |br| * the default value is 10^-4
+    :type tol: non-negative float
+
+    :param maxIterations: maximal number of Newton iterations
+        |br| * the default value is 100
+    :type maxIterations: positive int
+
+    :return: pressure levels of the start nodes in [bar] (-inf if no solution is found)
+    :rtype: numpy array
+    """
+    shape = np.shape(pressureEndNodes)
+    pressureEndNodes = np.asarray(pressureEndNodes, dtype=float).ravel()
+    flows, diameters, lengths = [np.broadcast_to(np.asarray(value, dtype=float), shape).ravel()
+                                 for value in [flows, diameters, lengths]]
+
+    def f(pressures, index):
+        return pressures ** 2 - pressureEndNodes[index] ** 2 - \
+            computePressureDropArcs(pressures, flows[index], diameters[index], lengths[index], ir, rho_n, T_m, T_n,
+                                    p_n, Z_n)
+
+    index = np.arange(pressureEndNodes.size)
+    # start value: pressure drop evaluated at the pressure level of the end node
+    pressures = np.sqrt(pressureEndNodes ** 2 + computePressureDropArcs(pressureEndNodes, flows, diameters, lengths,
+                                                                         ir, rho_n, T_m, T_n, p_n, Z_n))
+    pressures = np.where(np.isfinite(pressures), pressures, 2 * pressureEndNodes)
+    values = f(pressures, index)
+    isOpen = ~(np.abs(values) <= tol)
+    for _ in range(maxIterations):
+        if not isOpen.any():
+            break
+        openPressures, openValues = pressures[isOpen], values[isOpen]
+        step = 1e-7 * np.maximum(openPressures, 1)
+        derivatives = (f(openPressures + step, index[isOpen]) - openValues) / step
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newPressures = openPressures - openValues / derivatives
+        # the start pressure is at least the end pressure; if the pressure drop is too large for the current
+        # pressure level (f = -inf), the pressure level is doubled
+        newPressures = np.where(np.isfinite(newPressures), np.maximum(newPressures, pressureEndNodes[isOpen]),
+                                2 * openPressures)
+        pressures[isOpen] = newPressures
+        values[isOpen] = f(newPressures, index[isOpen])
+        isOpen[isOpen] = ~(np.abs(values[isOpen]) <= tol)
+
+    # this means we could not solve the equation, this could be the case if the pressure drop is too large
+    return np.where(isOpen, -math.inf, pressures).reshape(shape)
+
+
+def getUniqueTimeSteps(injectionWithdrawalRates, nDigits=6):
+    """"
+    Determine the time steps with unique injection and withdrawal rates. Time steps whose rates are identical after
+    rounding to nDigits digits (e.g. time steps of the same typical period) are represented by the first of these
+    time steps such that flows and pressure levels only have to be computed once per unique time step.
+
+    :param: injectionWithdrawalRates: injection and withdrawal rates (withdrawals from the network are positive while
+        injections are negative) in [kg^3/s]
+    :type injectionWithdrawalRates: pandas DataFrame
+
+    :param nDigits: number of digits used in the round function
+        |br| * the default value is 6
+    :type nDigits: positive int
+
+    :return: injection and withdrawal rates of the unique time steps
+    :rtype: pandas DataFrame
+
+    :return: dictionary that contains for every time step its unique time step
+    :rtype: dictionary key: timeStep, value: unique timeStep
+    """
+    # adding 0.0 replaces -0.0 by 0.0 such that both are hashed identically
+    hashes = pd.util.hash_pandas_object(injectionWithdrawalRates.round(nDigits) + 0.0, index=False)
+    dic_hash_timeStep = {}
+    dic_timeStep_uniqueTimeStep = {timeStep: dic_hash_timeStep.setdefault(rowHash, timeStep)
+                                   for timeStep, rowHash in hashes.items()}
+    return injectionWithdrawalRates.loc[list(dic_hash_timeStep.values())], dic_timeStep_uniqueTimeStep
+
+
+def scatterUniqueTimeSteps(dic_uniqueTimeStep_values, dic_timeStep_uniqueTimeStep):
+    """"
+    Assign the results of the unique time steps (see getUniqueTimeSteps) to all time steps.
+
+    :param dic_uniqueTimeStep_values: dictionary that contains for every unique time step a result
+    :type dic_uniqueTimeStep_values: dictionary key: unique timeStep, value: result
+
+    :param dic_timeStep_uniqueTimeStep: dictionary that contains for every time step its unique time step
+    :type dic_timeStep_uniqueTimeStep: dictionary key: timeStep, value: unique timeStep
+
+    :return: dictionary that contains for every time step the result (a copy) of its unique time step
+    :rtype: dictionary key: timeStep, value: result
+    """
+    return {timeStep: copy.copy(dic_uniqueTimeStep_values[uniqueTimeStep])
+            for timeStep, uniqueTimeStep in dic_timeStep_uniqueTimeStep.items()}
+
+
 def _computeTimeStepFlows(index, injectionWithdrawalRates, graph, **kwargs):
     # compute flows corresponding to demand by fixing demand for every node to given value and then compute
     # flows by LP
@@ -1691,9 +2230,11 @@ def _computeTimeStepFlows(index, injectionWithdrawalRates, graph, **kwargs):
         dic_nodes_MaxCapacity=dic_nodes_MaxCapacity, graph=graph, **kwargs)
 
 
-def computeTimeStepFlows(injectionWithdrawalRates, distances, graph, entries, exits, threads=1, verbose=0, solver='glpk'):
+def computeTimeStepFlows(injectionWithdrawalRates, distances, graph, entries, exits, threads=1, verbose=0,
+                         solver='glpk', method='auto', nDigits=6, pool=None):
     """"
-    Compute for each timeStep and demands given by injectionWithdrawalRates the corresponding flow values
+    Compute for each timeStep and demands given by injectionWithdrawalRates the corresponding flow values. The flows
+    are only computed once for time steps with identical injection and withdrawal rates (see getUniqueTimeSteps).
 
     :param: injectionWithdrawalRates: injection and withdrawal rates (withdrawals from the network are positive while
         injections are negative) in [kg^3/s]
@@ -1720,6 +2261,17 @@ def computeTimeStepFlows(injectionWithdrawalRates, distances, graph, entries, ex
     :param solver: name of the optimization solver to use
     :type solver: string, default 'glpk'
 
+    :param method: method for computing the flows: 'numpy' (one linear solve for all time steps of a tree-shaped
+        network), 'pyomo' (one LP per time step) or 'auto' ('numpy' if the network is a tree, otherwise 'pyomo')
+    :type method: string, default 'auto'
+
+    :param nDigits: number of digits to which the injection and withdrawal rates are rounded for identifying
+        identical time steps
+    :type nDigits: positive int, default 6
+
+    :param pool: pool of worker processes which is used instead of a new pool with the given number of threads
+    :type pool: WorkerPool or None, default None
+
     :return: dictionary that contains for every time step the corresponding flows in [kg/s]
     :rtype: dictionary key: timeStep, value: dict: key: arc, value: arc flow
     """
@@ -1729,26 +2281,49 @@ def computeTimeStepFlows(injectionWithdrawalRates, distances, graph, entries, ex
     isNetworkxGraph(graph)
     isListOfStrings(entries)
     isListOfStrings(exits)
+    utils.isStrictlyPositiveInt(nDigits)
+
+    # compute the flows only once for identical time steps
+    uniqueRates, dic_timeStep_uniqueTimeStep = getUniqueTimeSteps(injectionWithdrawalRates, nDigits)
+    if len(uniqueRates) < len(injectionWithdrawalRates):
+        dic_uniqueTimeStep_flows = computeTimeStepFlows(uniqueRates, distances, graph, entries, exits, threads=threads,
+                                                        verbose=verbose, solver=solver, method=method, nDigits=nDigits,
+                                                        pool=pool)
+        return scatterUniqueTimeSteps(dic_uniqueTimeStep_flows, dic_timeStep_uniqueTimeStep)
 
     # compute for every time step the corresponding flows; dict: key: timeStep, value: dict: key: arc, value: flow
     dic_timeStep_flows = {}
     # nodes with nonzero demand are given by columns of dataframe
     activeNodes = injectionWithdrawalRates.columns
-    pool = Pool(threads)
+
+    if isTreeFlowMethod(method, graph, distances):
+        nodes, arcs, incidenceMatrix = getIncidenceMatrix(graph, distances)
+        demands = injectionWithdrawalRates.reindex(columns=nodes, fill_value=0).values.T.astype(float)
+        flows = computeTreeFlows(demands, incidenceMatrix)
+        # as the LP, time steps with unbalanced demands yield no flows
+        isBalanced = np.abs(demands.sum(axis=0)) <= 1e-6 * np.maximum(np.abs(demands).sum(axis=0), 1)
+        for i, index in enumerate(injectionWithdrawalRates.index):
+            if isBalanced[i]:
+                dic_timeStep_flows[index] = {arc: float(flows[j, i]) for j, arc in enumerate(arcs)}
+            else:
+                utils.output('The injection and withdrawal rates of time step ' + str(index) + ' are not balanced. '
+                             'No output is generated.', 0, 0)
+                dic_timeStep_flows[index] = {}
+        return dic_timeStep_flows
 
     indexList = list(injectionWithdrawalRates.index)
 
-    for i, values in enumerate(pool.imap(partial(_computeTimeStepFlows, graph=graph, distances=distances,
-                                                entries=entries, exits=exits, startNode=activeNodes[0],
-                                                endNode=activeNodes[1], specialScenario=False,
-                                                injectionWithdrawalRates=injectionWithdrawalRates,
-                                                solver=solver),
-                               indexList), 1):
-        if verbose == 0:
-            sys.stderr.write('\rPercentage simulated: {:d}%'.format(int(i / len(indexList) * 100)))
-        dic_timeStep_flows[values[0]] = values[1]
-    pool.close()
-    pool.join()
+    # a pool which is only created for this stage is closed afterwards (also if an exception is raised)
+    with nullcontext(pool) if pool is not None else WorkerPool(
+            threads, graph=graph, distances=distances, injectionWithdrawalRates=injectionWithdrawalRates) as workerPool:
+        for i, values in enumerate(workerPool.imap(_computeTimeStepFlows, indexList, graph=graph, distances=distances,
+                                                   entries=entries, exits=exits, startNode=activeNodes[0],
+                                                   endNode=activeNodes[1], specialScenario=False,
+                                                   injectionWithdrawalRates=injectionWithdrawalRates,
+                                                   solver=solver), 1):
+            if verbose == 0:
+                sys.stderr.write('\rPercentage simulated: {:d}%'.format(int(i / len(indexList) * 100)))
+            dic_timeStep_flows[values[0]] = values[1]
 
     return dic_timeStep_flows
 
@@ -2099,6 +2674,8 @@ def determineDiscretePipelineDesign(robust, injectionWithdrawalRates, distances,
             nx.draw(graph, with_labels=True)
         plt.show()
 
+    # Compute scenarios for timeSteps only once for time steps with identical injection and withdrawal rates
+    uniqueRates, dic_timeStep_uniqueTimeStep = getUniqueTimeSteps(injectionWithdrawalRates, nDigits)
     # Compute robust scenarios for spanning tree network
     utils.output("Compute robust scenario set for tree network (based on " +
         str(len(graph.nodes)*len(graph.nodes)-len(graph.nodes)) +
@@ -2109,12 +2686,14 @@ def determineDiscretePipelineDesign(robust, injectionWithdrawalRates, distances,
     utils.output("Number of robust scenarios: " + str(len(dic_nodePair_flows.keys())) , verbose, 0)    
     utils.output("\t\t(%.4f" % (time.time() - timeStart) + " sec)\n", verbose, 0)
 
-    # Compute scenarios for timeSteps
+    # Compute scenarios for timeSteps; flows, pressure drops and pressure levels are only computed once for time
+    # steps with identical injection and withdrawal rates
     utils.output("Compute scenarios for each timestep. Number of timestep scenarios: "
-          + str(injectionWithdrawalRates.shape[0]) + '. Threads: ' + str(threads), verbose, 0)
+          + str(injectionWithdrawalRates.shape[0]) + ' (unique: ' + str(uniqueRates.shape[0]) + '). Threads: ' +
+          str(threads), verbose, 0)
     timeStart = time.time()
-    dic_timeStep_flows = computeTimeStepFlows(injectionWithdrawalRates, distances, graph, entries, exits,
-        solver=solver, threads=threads, verbose=verbose)
+    dic_timeStep_flows = computeTimeStepFlows(uniqueRates, distances, graph, entries, exits,
+        solver=solver, threads=threads, verbose=verbose, nDigits=nDigits)
     utils.output("\t\t(%.4f" % (time.time() - timeStart) + " sec)\n", verbose, 0)
 
     # Compute equivalent single diameters for looped (parallel) pipes
@@ -2172,29 +2751,37 @@ def determineDiscretePipelineDesign(robust, injectionWithdrawalRates, distances,
         utils.output("No feasible diameter selections exits", verbose, 0)
         return None
 
-    # Do postprocessing: Use a "more" accurate pressure model and apply Postprocessing of master's thesis:
-    # first do postprocessing for special scenarios
-    utils.output("Do postprocessing for robust (special) scenarios. Number of scenarios: " + str(len(dic_nodePair_flows)) +
-        '. Threads: ' + str(threads), verbose, 0)
-    timeStart = time.time()
-    dic_scen_PressLevels, dic_scen_MaxViolPress = postprocessing(graph, distances, dic_arc_diam, dic_nodePair_flows,
-                                                                 dic_node_minPress, dic_node_maxPress,
-                                                                 threads=threads, verbose=verbose)
-    utils.output("\t\t(%.4f" % (time.time() - timeStart) + " sec)\n", verbose, 0)
-    # print if some of these scenarios are not feasible for the "more" precise pressure model
-    for scenario in dic_scen_MaxViolPress.keys():
-        if dic_scen_MaxViolPress[scenario] > 0:
-            utils.output("Robust Scenario " + str(scenario) + " violates pressure bounds by " +
-                  str(dic_scen_MaxViolPress[scenario]), verbose, 0)
-
-    # compute pressure levels for each time step
-    utils.output("Do postprocessing for each timestep scenarios. Number of scenarios: " +
-          str(injectionWithdrawalRates.shape[0])  + '. Threads: ' + str(threads), verbose, 0)
-    timeStart = time.time()
-    dic_timeStep_PressLevels, dic_timeStep_MaxViolPress = postprocessing(graph, distances, dic_arc_diam,
-                                                                         dic_timeStep_flows, dic_node_minPress,
-                                                                         dic_node_maxPress,
-                                                                         threads=threads, verbose=verbose)
+    # The worker processes are shared by the postprocessing of the robust scenarios and of the time step scenarios;
+    # the large read-only input data is sent once to every worker. The flows of the tree network are computed in
+    # closed form and do not use the worker processes.
+    with WorkerPool(threads, graph=graph, distances=distances, dic_node_minPress=dic_node_minPress,
+                    dic_node_maxPress=dic_node_maxPress) as pool:
+        # Do postprocessing: Use a "more" accurate pressure model and apply Postprocessing of master's thesis:
+        # first do postprocessing for special scenarios
+        utils.output("Do postprocessing for robust (special) scenarios. Number of scenarios: " +
+            str(len(dic_nodePair_flows)) + '. Threads: ' + str(threads), verbose, 0)
+        timeStart = time.time()
+        dic_scen_PressLevels, dic_scen_MaxViolPress = postprocessing(graph, distances, dic_arc_diam,
+                                                                     dic_nodePair_flows, dic_node_minPress,
+                                                                     dic_node_maxPress, threads=threads,
+                                                                     verbose=verbose, pool=pool)
+        utils.output("\t\t(%.4f" % (time.time() - timeStart) + " sec)\n", verbose, 0)
+        # print if some of these scenarios are not feasible for the "more" precise pressure model
+        for scenario in dic_scen_MaxViolPress.keys():
+            if dic_scen_MaxViolPress[scenario] > 0:
+                utils.output("Robust Scenario " + str(scenario) + " violates pressure bounds by " +
+                      str(dic_scen_MaxViolPress[scenario]), verbose, 0)
+
+        # compute pressure levels for each time step
+        utils.output("Do postprocessing for each timestep scenarios. Number of scenarios: " +
+              str(len(dic_timeStep_flows))  + '. Threads: ' + str(threads), verbose, 0)
+        timeStart = time.time()
+        dic_timeStep_PressLevels, dic_timeStep_MaxViolPress = postprocessing(graph, distances, dic_arc_diam,
+                                                                             dic_timeStep_flows, dic_node_minPress,
+                                                                             dic_node_maxPress, threads=threads,
+                                                                             verbose=verbose, pool=pool)
+    dic_timeStep_PressLevels = scatterUniqueTimeSteps(dic_timeStep_PressLevels, dic_timeStep_uniqueTimeStep)
+    dic_timeStep_MaxViolPress = scatterUniqueTimeSteps(dic_timeStep_MaxViolPress, dic_timeStep_uniqueTimeStep)
     utils.output("\t\t(%.4f" % (time.time() - timeStart) + " sec)\n", verbose, 0)
     for timeStep in dic_timeStep_MaxViolPress.keys():
         if dic_timeStep_MaxViolPress[timeStep] > 0:
@@ -0,0 +1,235 @@
+"""
+Last edited: October 17, 2026
+|br| @author: FINE Developer Team (FZJ IEK-3)
+"""
+
+from FINE import utils
+import pandas as pd
+import time
+
+
+def optimizeRollingHorizon(esM, windowLength, overlap=0, **kwargs):
+    """
+    Optimize the operation of an energy system model with fixed capacities in a full temporal resolution by solving
+    consecutive time windows of the time horizon (rolling horizon). Each window consists of windowLength time steps
+    whose optimal values are kept and of overlap additional time steps (look-ahead) whose optimal values are
+    discarded and which are optimized again in the next window. Hence, only the optimization problem of one window is
+    declared at a time and the memory required by the solver scales with the window size instead of the time horizon.
+
+    The windows are connected as follows:
+
+    * the state of charge of the storage components at the beginning of a window is set to the optimal state of
+      charge at the end of the kept time steps of the previous window. The state of charge at the beginning of the
+      first window is optimized and the state of charge at the end of the last window has to match it (which
+      corresponds to the cyclic state constraint of the full problem).
+    * the operation, on/off, start and stop states of ConversionDynamic components before a window are set to the
+      optimal values of the previous windows (minimum up and down times and ramping limits are thus considered across
+      window boundaries). The first window is cyclic as in the full problem.
+
+    After the last window, the optimal values of all windows are stitched together and set in the modeling classes as
+    after a regular optimization (e.g. operationVariablesOptimum, optSummary). The objective value is set to the sum of
+    the total annual costs in the optimization summaries. esM.pyM holds the pyomo model of the last window.
+    Note: constraints which refer to annual values (e.g. yearly limits, balance limits, full load hours or the cyclic
+    lifetime) are applied to each window with the values scaled to the length of the window.
+
+    **Required arguments:**
+
+    :param esM: energy system model which is optimized. The capacities of all components with a capacity variable
+        have to be fixed (capacityFix).
+    :type esM: EnergySystemModel instance from the FINE package
+
+    :param windowLength: number of time steps per window whose optimal values are kept
+    :type windowLength: strictly positive integer
+
+    **Default arguments:**
+
+    :param overlap: number of additional time steps per window whose optimal values are discarded
+        |br| * the default value is 0
+    :type overlap: positive integer (>=0)
+
+    :param kwargs: additional keyword arguments for the optimize function of the EnergySystemModel (e.g. solver,
+        threads, timeLimit, optimizationSpecs or backend). The time series aggregation can not be used.
+
+    :returns: summary of the windows (first and last time step of the kept time steps, number of time steps of the
+        window, objective value and solve time of each window)
+    :rtype: pandas DataFrame
+    """
+    utils.isStrictlyPositiveInt(windowLength), utils.isPositiveNumber(overlap)
+    if not isinstance(overlap, int):
+        raise TypeError('The overlap parameter has to be an integer.')
+    if kwargs.get('timeSeriesAggregation', False):
+        raise ValueError('The rolling horizon optimization requires a full temporal resolution.')
+    if 'DSMModel' in esM.componentModelingDict:
+        raise ValueError('The rolling horizon optimization does not support DemandSideManagement components.')
+    for mdl in esM.componentModelingDict.values():
+        for compName, comp in mdl.componentsDict.items():
+            if comp.hasCapacityVariable and comp.capacityFix is None:
+                raise ValueError('The rolling horizon optimization requires fixed capacities. Set the capacityFix '
+                                 'parameter of component ' + compName + '.')
+    kwargs['timeSeriesAggregation'], kwargs['resultsMode'] = False, 'lazy'
+
+    numberOfTimeSteps = esM.numberOfTimeSteps
+    starts = list(range(0, numberOfTimeSteps, windowLength))
+    storageModels = [mdl for mdl in esM.componentModelingDict.values() if hasattr(mdl, 'boundaryStatesOfCharge')]
+    dynamicModels = [mdl for mdl in esM.componentModelingDict.values() if hasattr(mdl, 'initialOperationStates')]
+    historyLength = max([max(comp.downTimeMin or 0, comp.upTimeMin or 0, 1) for mdl in dynamicModels
+                         for comp in mdl.componentsDict.values()] + [1])
+
+    # Store the temporal representation of the energy system model and the full time series data of all components
+    timeAttributes = {name: getattr(esM, name) for name in ['numberOfTimeSteps', 'totalTimeSteps', 'numberOfYears',
+                                                            'timeStepsPerPeriod', 'interPeriodTimeSteps', 'periods',
+                                                            'periodsOrder', 'periodOccurrences']}
+    fullTimeSeries = {(mdlName, compName): {name: value for name, value in vars(comp).items()
+                                            if name.startswith('full')}
+                      for mdlName, mdl in esM.componentModelingDict.items()
+                      for compName, comp in mdl.componentsDict.items()}
+
+    values, summary, initialStates = {}, [], None
+    try:
+        for window, start in enumerate(starts):
+            end = min(start + windowLength, numberOfTimeSteps)
+            windowEnd = min(end + overlap, numberOfTimeSteps)
+            isLastWindow = end == numberOfTimeSteps
+            utils.output('\nOptimizing window ' + str(window + 1) + ' of ' + str(len(starts)) + ' (time steps ' +
+                         str(start) + ' to ' + str(windowEnd - 1) + ')...', esM.verbose, 0)
+
+            # Set the temporal representation and the time series data of the window
+            esM.numberOfTimeSteps = windowEnd - start
+            esM.totalTimeSteps = list(range(windowEnd - start))
+            esM.numberOfYears = esM.numberOfTimeSteps * esM.hoursPerTimeStep / 8760.0
+            for (mdlName, compName), timeSeries in fullTimeSeries.items():
+                comp = esM.componentModelingDict[mdlName].componentsDict[compName]
+                for name, value in timeSeries.items():
+                    setattr(comp, name, getWindowTimeSeries(value, start, windowEnd))
+
+            # Set the states at the boundaries of the window (a single window is cyclic as the full problem)
+            for mdl in storageModels:
+                if len(starts) > 1:
+                    mdl.boundaryStatesOfCharge = {
+                        'initial': None if window == 0 else initialStates[mdl.abbrvName],
+                        'final': getInitialValues(values, 'stateOfCharge_' + mdl.abbrvName) if isLastWindow
+                        else None}
+            for mdl in dynamicModels:
+                if window > 0:
+                    mdl.initialOperationStates = getOperationStates(values, mdl.abbrvName, start, historyLength)
+
+            _t = time.time()
+            esM.optimize(**kwargs)
+            if esM.solverSpecs['status'] in ['error', 'aborted', 'unknown'] or \
+                    esM.solverSpecs['terminationCondition'] in ['infeasible', 'unbounded', 'infeasibleOrUnbounded']:
+                raise ValueError('The optimization of window ' + str(window + 1) + ' failed (status: ' +
+                                 esM.solverSpecs['status'] + ', termination condition: ' +
+                                 esM.solverSpecs['terminationCondition'] + ').')
+            summary.append({'start': start, 'end': end - 1, 'numberOfTimeSteps': windowEnd - start,
+                            'objectiveValue': esM.objectiveValue, 'solvetime': time.time() - _t})
+
+            # Keep the optimal values of the time steps which are not optimized again in the next window
+            initialStates = {mdl.abbrvName: {(loc, compName): value for (loc, compName, p, t), value in
+                                             getattr(esM.pyM, 'stateOfCharge_' + mdl.abbrvName).get_values().items()
+                                             if t == end - start} for mdl in storageModels}
+            addWindowValues(esM.pyM, values, start, end - start, isLastWindow)
+    finally:
+        # Restore the temporal representation and the full time series data of the energy system model
+        for name, value in timeAttributes.items():
+            setattr(esM, name, value)
+        for (mdlName, compName), timeSeries in fullTimeSeries.items():
+            comp = esM.componentModelingDict[mdlName].componentsDict[compName]
+            for name, value in timeSeries.items():
+                setattr(comp, name, value)
+            comp.setTimeSeriesData(False)
+        for mdl in storageModels:
+            mdl.boundaryStatesOfCharge = None
+        for mdl in dynamicModels:
+            mdl.initialOperationStates = None
+
+    # Set the stitched optimal values of the full time horizon in the modeling classes
+    solution = utils.SolutionSnapshot(esM.pyM)
+    for name, varValues in values.items():
+        setattr(solution, name, utils.SolutionValues(varValues))
+    for mdl in esM.componentModelingDict.values():
+        mdl._pendingOptimalValues = None
+        mdl.setOptimalValues(esM, solution)
+    esM.objectiveValue = sum(mdl.optSummary.loc[mdl.optSummary.index.get_level_values(1) == 'TAC'].sum().sum()
+                             for mdl in esM.componentModelingDict.values())
+
+    return pd.DataFrame(summary)
+
+
+def getWindowTimeSeries(data, start, end):
+    """
+    Return the part of a full time series (indexed by period and time step) which belongs to a time window. The time
+    steps of the returned time series start at 0. Dictionaries of time series are processed element-wise and all other
+    data is returned unchanged.
+
+    :param data: full time series data
+    :type data: pandas DataFrame or Series with a (period, time step) MultiIndex, dict or other data
+
+    :param start: first time step of the window
+    :type start: integer
+
+    :param end: time step after the last time step of the window
+    :type end: integer
+    """
+    if isinstance(data, dict):
+        return {key: getWindowTimeSeries(value, start, end) for key, value in data.items()}
+    if not isinstance(data, (pd.DataFrame, pd.Series)) or data.index.nlevels != 2:
+        return data
+    timeSteps = data.index.get_level_values(1)
+    data = data[(timeSteps >= start) & (timeSteps < end)]
+    data.index = pd.MultiIndex.from_arrays([data.index.get_level_values(0), data.index.get_level_values(1) - start],
+                                          names=data.index.names)
+    return data
+
+
+def addWindowValues(pyM, values, start, numberOfTimeSteps, isLastWindow):
+    """
+    Add the optimal values of the variables of a solved time window to the optimal values of the full time horizon.
+    The time steps of time-dependent variables are shifted by the first time step of the window and only the first
+    numberOfTimeSteps time steps are kept (for the last window, all time steps including the final point in time are
+    kept). The optimal values of time-independent variables are overwritten.
+    """
+    for var in pyM.component_objects(utils.pyomo.Var, descend_into=False):
+        isTimeDependent = any(subset is pyM.timeSet or subset is pyM.interTimeStepsSet
+                              for subset in var.index_set().subsets())
+        varValues = values.setdefault(var.local_name, {})
+        if not isTimeDependent:
+            varValues.update(var.get_values())
+            continue
+        for index, value in var.get_values().items():
+            if index[-1] < numberOfTimeSteps or isLastWindow:
+                varValues[index[:-1] + (index[-1] + start,)] = value
+
+
+def getInitialValues(values, varName):
+    """
+    Return the optimal values of a variable at the first time step for each (location, component) tuple.
+    """
+    return {(loc, compName): value for (loc, compName, p, t), value in values[varName].items() if t == 0}
+
+
+def getHistory(values, varName, start, historyLength):
+    """
+    Return the optimal values of a variable in the historyLength time steps before the time step start for each
+    (location, component) tuple (in chronological order).
+    """
+    history = {}
+    for (loc, compName, p, t), value in values.get(varName, {}).items():
+        if start - historyLength <= t < start:
+            history.setdefault((loc, compName), {})[t] = value
+    return {key: [timeSteps[t] for t in sorted(timeSteps)] for key, timeSteps in history.items()}
+
+
+def getOperationStates(values, abbrvName, start, historyLength):
+    """
+    Return the operation, on/off, start and stop states of the ConversionDynamic components in the historyLength time
+    steps before the time step start. The start and stop states are derived from the changes of the on/off states
+    (the optimal values of the start and stop variables can both be 1 in a time step in which the unit is off).
+    """
+    opBin = {key: [round(value) for value in history] for key, history in
+             getHistory(values, 'op_bin_' + abbrvName, start, historyLength + 1).items()}
+    return {'op': getHistory(values, 'op_' + abbrvName, start, historyLength),
+            'op_bin': {key: history[-historyLength:] for key, history in opBin.items()},
+            'startVariable': {key: [max(history[i] - history[i - 1], 0) if i > 0 else 0
+                                    for i in range(len(history))][-historyLength:] for key, history in opBin.items()},
+            'stopVariable': {key: [max(history[i - 1] - history[i], 0) if i > 0 else 0
+                                   for i in range(len(history))][-historyLength:] for key, history in opBin.items()}}
@@ -0,0 +1,463 @@
+"""
+Last edited: October 17, 2026
+|br| @author: FINE Developer Team (FZJ IEK-3)
+"""
+
+import FINE as fn
+from FINE import utils
+import inspect
+import numpy as np
+import pandas as pd
+
+# Parameters which are summed up when locations are merged (all other location dependent parameters are averaged)
+EXTENSIVE_PARAMETERS = ['capacityMin', 'capacityMax', 'capacityFix']
+# Parameters which indicate if a component is (or has to be) built in a location
+ELIGIBILITY_PARAMETERS = ['locationalEligibility', 'isBuiltFix']
+# Operation time series which are given as absolute values if the component has no capacity variable
+OPERATION_TIME_SERIES = ['operationRateMax', 'operationRateFix', 'chargeOpRateMax', 'chargeOpRateFix',
+                         'dischargeOpRateMax', 'dischargeOpRateFix']
+# Distance related cost parameters of transmission components (stored as costs per connection)
+DISTANCE_COST_PARAMETERS = ['investPerCapacity', 'investIfBuilt', 'opexPerCapacity', 'opexIfBuilt']
+# Component classes which can be spatially aggregated
+SUPPORTED_COMPONENTS = (fn.Source, fn.Sink, fn.Conversion, fn.Storage, fn.Transmission)
+UNSUPPORTED_COMPONENTS = (fn.ConversionPartLoad, fn.LinearOptimalPowerFlow, fn.DemandSideManagementBETA,
+                          fn.StorageExtBETA)
+
+
+def getSpatialAggregationGroups(esM, numberOfRegions, connectivity=None, geometries=None):
+    """
+    Group the locations of an energy system model into a given number of regions. The locations are merged
+    hierarchically (Ward's method): in each step, the two regions whose merge increases the variance of the location
+    features the least are merged. The features of a location are its (normalized) time series of all components and,
+    if geometries are given, the coordinates of its centroid. Only regions which are connected can be merged.
+
+    **Required arguments:**
+
+    :param esM: energy system model whose locations are grouped
+    :type esM: EnergySystemModel instance from the FINE package
+
+    :param numberOfRegions: number of regions into which the locations are grouped
+    :type numberOfRegions: strictly positive integer
+
+    **Default arguments:**
+
+    :param connectivity: indicates which locations are adjacent (values > 0). If connectivity is None, the locations
+        are considered to be adjacent if their geometries touch or intersect (if geometries are given) or if they are
+        connected by a transmission component.
+        |br| * the default value is None
+    :type connectivity: pandas DataFrame with the locations as index and as columns or None
+
+    :param geometries: geometries of the locations (e.g. a GeoDataFrame or GeoSeries from the geopandas package)
+        |br| * the default value is None
+    :type geometries: geopandas GeoDataFrame or GeoSeries with the locations as index or None
+
+    :returns: locations of each region (the regions are named 'region0', 'region1', ...)
+    :rtype: dict
+    """
+    utils.isStrictlyPositiveInt(numberOfRegions)
+    locations = sorted(esM.locations)
+    if numberOfRegions > len(locations):
+        raise ValueError('The numberOfRegions can not exceed the number of locations of the energy system model.')
+
+    # Get the features of the locations
+    features = [getLocationFeatures(esM, locations)]
+    if geometries is not None:
+        if not set(locations) <= set(geometries.index):
+            raise ValueError('The geometries have to be given for all locations of the energy system model.')
+        centroids = geometries.loc[locations].geometry.centroid
+        coordinates = np.array([centroids.x.values, centroids.y.values]).T
+        features.append((coordinates - coordinates.mean(axis=0)) / max(coordinates.std(axis=0).max(), 1e-12))
+    features = np.hstack(features)
+
+    # Get the adjacency of the locations
+    if connectivity is None:
+        connectivity = getLocationConnectivity(esM, locations, geometries)
+    elif not isinstance(connectivity, pd.DataFrame):
+        raise TypeError('The connectivity has to be a pandas DataFrame.')
+    elif not (set(locations) <= set(connectivity.index) and set(locations) <= set(connectivity.columns)):
+        raise ValueError('The connectivity has to be given for all locations of the energy system model.')
+    adjacency = (connectivity.loc[locations, locations].values > 0)
+    adjacency = adjacency | adjacency.T
+
+    # Merge the regions hierarchically
+    regions = [[i] for i in range(len(locations))]
+    while len(regions) > numberOfRegions:
+        bestMerge, bestCost = None, np.inf
+        for i in range(len(regions)):
+            for j in range(i + 1, len(regions)):
+                if not adjacency[np.ix_(regions[i], regions[j])].any():
+                    continue
+                n1, n2 = len(regions[i]), len(regions[j])
+                difference = features[regions[i]].mean(axis=0) - features[regions[j]].mean(axis=0)
+                cost = n1 * n2 / (n1 + n2) * (difference ** 2).sum()
+                if cost < bestCost:
+                    bestMerge, bestCost = (i, j), cost
+        if bestMerge is None:
+            raise ValueError('The locations can not be merged into ' + str(numberOfRegions) + ' regions since ' +
+                             'only ' + str(len(regions)) + ' groups of locations are connected.')
+        i, j = bestMerge
+        regions[i] = regions[i] + regions.pop(j)
+
+    regions = sorted([sorted(locations[i] for i in region) for region in regions])
+    return {'region' + str(i): region for i, region in enumerate(regions)}
+
+
+def aggregateSpatially(esM, regionGroups=None, numberOfRegions=None, connectivity=None, geometries=None):
+    """
+    Return a new energy system model in which the locations of the given energy system model are merged into regions
+    (super-regions). The components are aggregated as follows:
+
+    * capacityMin, capacityMax and capacityFix are summed up.
+    * the locationalEligibility and isBuiltFix parameters are set to 1 if they are 1 for any location of a region.
+    * operation time series (e.g. operationRateMax or operationRateFix) of components without a capacity variable
+      are summed up.
+    * all other location dependent parameters (e.g. costs, lifetimes, relative operation time series, cost time
+      series or time-dependent commodity conversion factors) are averaged weighted with the capacity (capacityMax,
+      capacityFix or the summed up absolute operation time series) of the component in the locations.
+    * transmission components are only kept between different regions. The connections between two regions are
+      merged: their capacities are summed up, their distances, losses and (length-specific) costs are averaged
+      weighted with their capacities.
+
+    Locational balance limits are summed up. Results of an optimization of the aggregated energy system model can be
+    mapped back to the original locations with disaggregateOptimizationOutput.
+
+    **Required arguments:**
+
+    :param esM: energy system model which is aggregated. Source, Sink, Conversion (including ConversionDynamic),
+        Storage and Transmission components are supported.
+    :type esM: EnergySystemModel instance from the FINE package
+
+    **Default arguments:**
+
+    :param regionGroups: locations of each region. If regionGroups is None, the regions are determined with
+        getSpatialAggregationGroups.
+        |br| * the default value is None
+    :type regionGroups: dict with region names as keys and lists of locations as values or None
+
+    :param numberOfRegions, connectivity, geometries: see getSpatialAggregationGroups (only used if regionGroups is
+        None)
+        |br| * the default values are None
+
+    :returns: aggregated energy system model and the locations of each region
+    :rtype: tuple (EnergySystemModel instance, dict)
+    """
+    if regionGroups is None:
+        if numberOfRegions is None:
+            raise ValueError('Either the regionGroups or the numberOfRegions parameter has to be specified.')
+        regionGroups = getSpatialAggregationGroups(esM, numberOfRegions, connectivity, geometries)
+    checkRegionGroups(esM, regionGroups)
+
+    for mdl in esM.componentModelingDict.values():
+        for compName, comp in mdl.componentsDict.items():
+            if isinstance(comp, UNSUPPORTED_COMPONENTS) or not isinstance(comp, SUPPORTED_COMPONENTS):
+                raise TypeError('The spatial aggregation does not support components of type ' +
+                                type(comp).__name__ + ' (' + compName + ').')
+
+    balanceLimit = esM.balanceLimit
+    if isinstance(balanceLimit, pd.DataFrame):
+        balanceLimit = pd.DataFrame({region: balanceLimit[locs].sum(axis=1) for region, locs in regionGroups.items()})
+        for column in esM.balanceLimit.columns.difference(esM.locations):
+            balanceLimit[column] = esM.balanceLimit[column]
+
+    aggregatedEsM = fn.EnergySystemModel(locations=set(regionGroups), commodities=esM.commodities,
+                                         commodityUnitsDict=esM.commodityUnitsDict,
+                                         numberOfTimeSteps=esM.numberOfTimeSteps,
+                                         hoursPerTimeStep=esM.hoursPerTimeStep, costUnit=esM.costUnit,
+                                         lengthUnit=esM.lengthUnit, verboseLogLevel=esM.verbose,
+                                         balanceLimit=balanceLimit, lowerBound=esM.lowerBound)
+
+    for mdl in esM.componentModelingDict.values():
+        for compName, comp in mdl.componentsDict.items():
+            if isinstance(comp, fn.Transmission):
+                kwargs = getAggregatedTransmissionParameters(esM, comp, regionGroups)
+                if kwargs is None:
+                    utils.output('The transmission component ' + compName + ' only connects locations within ' +
+                                 'the same regions and is not considered in the aggregated model.', esM.verbose, 0)
+                    continue
+            else:
+                kwargs = getAggregatedParameters(esM, comp, regionGroups)
+            aggregatedEsM.add(type(comp)(esM=aggregatedEsM, **kwargs))
+
+    return aggregatedEsM, regionGroups
+
+
+def disaggregateOptimizationOutput(esM, aggregatedEsM, regionGroups):
+    """
+    Map the optimal values of the design and operation variables of an optimized spatially aggregated energy system
+    model back to the original locations. The values of a region are distributed to its locations proportionally to
+    the capacity of the component in the locations (see aggregateSpatially), the values of a connection between two
+    regions to the original connections between the regions proportionally to their capacities. Binary values
+    (isBuiltVariablesOptimum) are set for all eligible locations of a region. As in the output of the original model,
+    the design variables of ineligible locations are NaN and their operation variables are not part of the output.
+    Flows within a region are not modeled in the aggregated energy system model and are hence not part of the output.
+
+    :param esM: original energy system model
+    :type esM: EnergySystemModel instance from the FINE package
+
+    :param aggregatedEsM: optimized aggregated energy system model (see aggregateSpatially)
+    :type aggregatedEsM: EnergySystemModel instance from the FINE package
+
+    :param regionGroups: locations of each region
+    :type regionGroups: dict
+
+    :returns: disaggregated optimal values for each modeling class (e.g. 'SourceSinkModel') and attribute (e.g.
+        'operationVariablesOptimum') in the format of the optimal values of the original energy system model
+    :rtype: dict
+    """
+    output = {}
+    for mdlName, mdl in aggregatedEsM.componentModelingDict.items():
+        for name in sorted(vars(mdl)):
+            if not name.endswith('VariablesOptimum') or getattr(mdl, name) is None:
+                continue
+            optVal = getattr(mdl, name)
+            if mdl.dimension == '1dim':
+                shares = {compName: getLocationShares(esM, esM.getComponent(compName), regionGroups)
+                          for compName in mdl.componentsDict}
+                output.setdefault(mdlName, {})[name] = \
+                    disaggregate1dimOutput(optVal, shares, regionGroups, isBinary=name.startswith('isBuilt'))
+            else:
+                shares = {compName: getConnectionShares(esM, esM.getComponent(compName), regionGroups)
+                          for compName in mdl.componentsDict}
+                output.setdefault(mdlName, {})[name] = \
+                    disaggregate2dimOutput(optVal, shares, {compName: esM.getComponent(compName)._mapC
+                                                            for compName in mdl.componentsDict},
+                                           isBinary=name.startswith('isBuilt'))
+    return output
+
+
+def checkRegionGroups(esM, regionGroups):
+    """ Check if each location of the energy system model is assigned to exactly one region. """
+    if not isinstance(regionGroups, dict):
+        raise TypeError('The regionGroups parameter has to be a dictionary.')
+    locations = [loc for locs in regionGroups.values() for loc in locs]
+    if len(locations) != len(set(locations)) or set(locations) != set(esM.locations):
+        raise ValueError('Each location of the energy system model has to be assigned to exactly one region.')
+    if any('_' in str(region) for region in regionGroups):
+        raise ValueError('The region names must not contain underscores.')
+
+
+def getLocationFeatures(esM, locations):
+    """
+    Return the (normalized) time series of all components of an energy system model for each location (rows).
+    """
+    features = [np.zeros((len(locations), 0))]
+    for mdl in esM.componentModelingDict.values():
+        if mdl.dimension != '1dim':
+            continue
+        for comp in mdl.componentsDict.values():
+            for data in getTimeSeriesParameters(comp).values():
+                for timeSeries in (data.values() if isinstance(data, dict) else [data]):
+                    values = timeSeries.reindex(columns=locations).fillna(0).values.T
+                    scale = np.abs(values).max()
+                    if scale > 0:
+                        features.append(values / scale)
+    return np.hstack(features)
+
+
+def getLocationConnectivity(esM, locations, geometries=None):
+    """
+    Return the adjacency of the locations, derived from their geometries (if given) or from the connections of the
+    transmission components.
+    """
+    connectivity = pd.DataFrame(0, index=locations, columns=locations)
+    if geometries is not None:
+        for loc1 in locations:
+            for loc2 in locations:
+                if loc1 != loc2 and geometries.geometry[loc1].intersects(geometries.geometry[loc2]):
+                    connectivity.loc[loc1, loc2] = 1
+        return connectivity
+    for mdl in esM.componentModelingDict.values():
+        if mdl.dimension == '2dim':
+            for comp in mdl.componentsDict.values():
+                for loc1, loc2 in comp._mapC.values():
+                    connectivity.loc[loc1, loc2] = 1
+    return connectivity
+
+
+def getTimeSeriesParameters(comp):
+    """
+    Return the full time series of the input parameters of a component with a time step index (instead of the
+    (period, time step) MultiIndex). Time-dependent commodity conversion factors are returned as a dictionary.
+    """
+    timeSeries = {}
+    for name in getParameterNames(comp):
+        data = getattr(comp, 'full' + name[0].upper() + name[1:], None)
+        if isinstance(data, pd.DataFrame):
+            timeSeries[name] = data.droplevel(0)
+        elif isinstance(data, dict) and data:
+            timeSeries[name] = {key: value.droplevel(0) for key, value in data.items()}
+    return timeSeries
+
+
+def getParameterNames(comp):
+    """ Return the names of the input parameters of the component class (including those of its base classes). """
+    names = []
+    for cls in type(comp).__mro__:
+        if cls is object or '__init__' not in vars(cls):
+            continue
+        parameters = inspect.signature(cls.__init__).parameters
+        names += [name for name, parameter in parameters.items() if name not in ['self', 'esM'] + names and
+                  parameter.kind not in [parameter.VAR_KEYWORD, parameter.VAR_POSITIONAL]]
+        if not any(parameter.kind == parameter.VAR_KEYWORD for parameter in parameters.values()):
+            break
+    return names
+
+
+def getComponentWeights(comp):
+    """
+    Return the weights of a component in its locations (or connections) which are used for averaging its parameters:
+    the maximum capacity, the fixed capacity, the summed up absolute operation time series or the locational
+    eligibility (in this order, depending on which is specified).
+    """
+    for data in [comp.capacityMax, comp.capacityFix]:
+        if isinstance(data, pd.Series) and data.sum() > 0 and not np.isinf(data).any():
+            return data.fillna(0)
+    if not comp.hasCapacityVariable:
+        timeSeries = getTimeSeriesParameters(comp)
+        for name in OPERATION_TIME_SERIES:
+            if isinstance(timeSeries.get(name), pd.DataFrame) and timeSeries[name].values.sum() > 0:
+                return timeSeries[name].sum()
+    return comp.locationalEligibility.astype(float)
+
+
+def getWeightedMean(data, weights, keys):
+    """ Return the mean of the data of the given keys weighted with the given weights (unweighted if they are 0). """
+    weights = weights.reindex(keys).fillna(0)
+    if weights.sum() <= 0:
+        weights = pd.Series(1., index=keys)
+    if isinstance(data, pd.DataFrame):
+        return (data.reindex(columns=keys).fillna(0) * weights).sum(axis=1) / weights.sum()
+    return (data.reindex(keys).fillna(0) * weights).sum() / weights.sum()
+
+
+def aggregateParameter(name, data, weights, regionGroups, comp):
+    """ Aggregate a location dependent parameter (Series) or time series (DataFrame) of a component. """
+    if isinstance(data, dict):
+        return {key: aggregateParameter(name, value, weights, regionGroups, comp) for key, value in data.items()}
+    if not isinstance(data, (pd.Series, pd.DataFrame)):
+        return data
+    if isinstance(data, pd.DataFrame):
+        if name in OPERATION_TIME_SERIES and not comp.hasCapacityVariable:
+            return pd.DataFrame({region: data.reindex(columns=locs).fillna(0).sum(axis=1)
+                                 for region, locs in regionGroups.items()})
+        return pd.DataFrame({region: getWeightedMean(data, weights, locs) for region, locs in regionGroups.items()})
+    if name in EXTENSIVE_PARAMETERS:
+        return pd.Series({region: data.reindex(locs).sum() for region, locs in regionGroups.items()})
+    if name in ELIGIBILITY_PARAMETERS:
+        return pd.Series({region: data.reindex(locs).fillna(0).max() for region, locs in regionGroups.items()})
+    return pd.Series({region: getWeightedMean(data, weights, locs) for region, locs in regionGroups.items()})
+
+
+def getAggregatedParameters(esM, comp, regionGroups):
+    """ Return the input parameters of a one-dimensional component for the aggregated energy system model. """
+    weights, timeSeries, kwargs = getComponentWeights(comp), getTimeSeriesParameters(comp), {}
+    for name in getParameterNames(comp):
+        data = timeSeries.get(name, getattr(comp, name))
+        if name == 'commodityConversionFactors':
+            data = {commod: timeSeries.get(name, {}).get(commod, factor)
+                    for commod, factor in getattr(comp, name).items()}
+        if isinstance(data, dict) or (isinstance(data, (pd.Series, pd.DataFrame)) and
+                                      set(getattr(data, 'columns', data.index)) <= set(esM.locations)):
+            data = aggregateParameter(name, data, weights, regionGroups, comp)
+        kwargs[name] = data
+    return kwargs
+
+
+def getRegionConnections(comp, regionGroups):
+    """ Return the original connections of a transmission component between each pair of different regions. """
+    regionOfLocation = {loc: region for region, locs in regionGroups.items() for loc in locs}
+    connections = {}
+    for connection, (loc1, loc2) in comp._mapC.items():
+        if regionOfLocation[loc1] != regionOfLocation[loc2]:
+            key = regionOfLocation[loc1] + '_' + regionOfLocation[loc2]
+            connections.setdefault(key, []).append(connection)
+    return connections
+
+
+def getAggregatedTransmissionParameters(esM, comp, regionGroups):
+    """
+    Return the input parameters of a transmission component for the aggregated energy system model (None if the
+    component only connects locations within the same regions).
+    """
+    connections = getRegionConnections(comp, regionGroups)
+    if not connections:
+        return None
+    weights, timeSeries, kwargs = getComponentWeights(comp), getTimeSeriesParameters(comp), {}
+    distances = comp.distances
+    for name in getParameterNames(comp):
+        data = timeSeries.get(name, getattr(comp, name))
+        if name in DISTANCE_COST_PARAMETERS:
+            # Costs are given per length in the input data
+            data = (data / (distances * 0.5)).replace([np.inf, -np.inf], np.nan).fillna(0)
+        if name == 'locationalEligibility':
+            data = pd.Series(1, index=list(connections))
+        elif isinstance(data, (pd.Series, pd.DataFrame)) and \
+                set(getattr(data, 'columns', data.index)) <= set(comp._mapC):
+            data = aggregateParameter(name, data, weights, connections, comp)
+        kwargs[name] = data
+    return kwargs
+
+
+def getLocationShares(esM, comp, regionGroups):
+    """
+    Return the share of each eligible location in the capacity of a one-dimensional component in its region. The
+    ineligible locations are not part of the shares.
+    """
+    weights, shares = getComponentWeights(comp).reindex(list(esM.locations)).fillna(0), {}
+    eligibility = comp.locationalEligibility.reindex(list(esM.locations)).fillna(0)
+    for region, locs in regionGroups.items():
+        w = weights.reindex([loc for loc in locs if eligibility[loc] > 0])
+        if w.sum() <= 0:
+            w = pd.Series(1., index=w.index)
+        shares[region] = w / w.sum()
+    return shares
+
+
+def getConnectionShares(esM, comp, regionGroups):
+    """ Return the share of each original connection of a transmission component in its connection of regions. """
+    weights, shares = getComponentWeights(comp), {}
+    for key, connections in getRegionConnections(comp, regionGroups).items():
+        w = weights.reindex(connections).fillna(0)
+        if w.sum() <= 0:
+            w = pd.Series(1., index=connections)
+        shares[key] = w / w.sum()
+    return shares
+
+
+def disaggregate1dimOutput(optVal, shares, regionGroups, isBinary=False):
+    """ Disaggregate optimal values of a one-dimensional modeling class (see disaggregateOptimizationOutput). """
+    if optVal.index.nlevels == 1:
+        # Design variables (components as index, locations as columns)
+        data = {}
+        for compName, row in optVal.iterrows():
+            for region, value in row.items():
+                for loc, share in shares[compName][region].items():
+                    data.setdefault(loc, {})[compName] = value if isBinary else value * share
+        locations = sorted(loc for locs in regionGroups.values() for loc in locs)
+        return pd.DataFrame(data).reindex(index=optVal.index, columns=locations)
+    # Operation variables (components and locations as index, time steps as columns)
+    rows, index = [], []
+    for (compName, region), row in optVal.iterrows():
+        for loc, share in shares[compName][region].items():
+            rows.append(row.values if isBinary else row.values * share), index.append((compName, loc))
+    return pd.DataFrame(rows, index=pd.MultiIndex.from_tuples(index), columns=optVal.columns).sort_index()
+
+
+def disaggregate2dimOutput(optVal, shares, mapC, isBinary=False):
+    """ Disaggregate optimal values of a two-dimensional modeling class (see disaggregateOptimizationOutput). """
+    data = {}
+    if optVal.index.nlevels == 2:
+        # Design variables (components and start locations as index, end locations as columns)
+        for (compName, region1), row in optVal.iterrows():
+            for region2, value in row.dropna().items():
+                for connection, share in shares[compName].get(region1 + '_' + region2, {}).items():
+                    loc1, loc2 = mapC[compName][connection]
+                    data.setdefault(loc2, {})[(compName, loc1)] = value if isBinary else value * share
+        return pd.DataFrame(data).sort_index().sort_index(axis=1)
+    # Operation variables (components, start and end locations as index, time steps as columns)
+    for (compName, region1, region2), row in optVal.iterrows():
+        for connection, share in shares[compName].get(region1 + '_' + region2, {}).items():
+            loc1, loc2 = mapC[compName][connection]
+            data[(compName, loc1, loc2)] = row.values if isBinary else row.values * share
+    return pd.DataFrame(list(data.values()), index=pd.MultiIndex.from_tuples(list(data)),
+                        columns=optVal.columns).sort_index()
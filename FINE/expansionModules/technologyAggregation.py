@@ -0,0 +1,299 @@
+"""
+Last edited: October 17, 2026
+|br| @author: FINE Developer Team (FZJ IEK-3)
+"""
+
+import FINE as fn
+from FINE import utils
+from FINE.expansionModules.spatialAggregation import getParameterNames, getTimeSeriesParameters, \
+    getComponentWeights, OPERATION_TIME_SERIES, ELIGIBILITY_PARAMETERS
+import copy
+import numpy as np
+import pandas as pd
+
+# Component classes whose components can be merged (subclasses are not merged since their additional constraints,
+# e.g. minimum up and down times, refer to individual plants)
+AGGREGATABLE_COMPONENTS = (fn.Source, fn.Sink, fn.Conversion)
+# Parameters which have to be identical for all components which are merged
+IDENTICAL_PARAMETERS = ['commodity', 'physicalUnit', 'commodityConversionFactors', 'hasCapacityVariable',
+                        'capacityVariableDomain', 'capacityPerPlantUnit', 'hasIsBuiltBinaryVariable', 'bigM',
+                        'partLoadMin', 'sharedPotentialID', 'linkedQuantityID', 'linkedConversionCapacityID',
+                        'commodityLimitID', 'yearlyLimit', 'balanceLimitID', 'tsaWeight']
+# Parameters which have to be None for all components which are merged
+UNSPECIFIED_PARAMETERS = ['capacityMin', 'capacityFix', 'isBuiltFix', 'yearlyFullLoadHoursMin',
+                          'yearlyFullLoadHoursMax']
+
+
+def getTechnologyAggregationGroups(esM, threshold=0.1, componentNames=None):
+    """
+    Group similar components of an energy system model which can be represented by one component. Components can be
+    grouped if they are of the same class (Source, Sink or Conversion), have the same commodities, conversion
+    factors and (non-location dependent) parameters and if no minimum or fixed capacities, fixed operation rates or
+    full load hours are specified for them. Among these, the components are merged hierarchically (complete linkage)
+    as long as the distance between any two components of a group does not exceed the threshold. The distance of
+    two components is the maximum of the relative differences of their cost parameters and lifetimes and of the mean
+    absolute difference of their (normalized) operation rate and cost time series.
+
+    **Default arguments:**
+
+    :param threshold: maximum distance of two components which are grouped
+        |br| * the default value is 0.1
+    :type threshold: positive float (>= 0)
+
+    :param componentNames: names of the components which can be grouped. If None, all components can be grouped.
+        |br| * the default value is None
+    :type componentNames: list of strings or None
+
+    :returns: names of the components of each group with more than one component (the groups are named after their
+        first component with the suffix ' (aggregated)')
+    :rtype: dict
+    """
+    utils.isPositiveNumber(threshold)
+    if componentNames is None:
+        componentNames = sorted(esM.componentNames)
+    classes = {}
+    for compName in componentNames:
+        comp = esM.getComponent(compName)
+        key = getCompatibilityKey(comp)
+        if key is not None:
+            classes.setdefault(key, []).append(compName)
+
+    groups = {}
+    for compNames in classes.values():
+        if len(compNames) < 2:
+            continue
+        distances = np.array([[getComponentDistance(esM.getComponent(c1), esM.getComponent(c2))
+                               for c2 in compNames] for c1 in compNames])
+        clusters = [[i] for i in range(len(compNames))]
+        while len(clusters) > 1:
+            linkage = [(distances[np.ix_(clusters[i], clusters[j])].max(), i, j)
+                       for i in range(len(clusters)) for j in range(i + 1, len(clusters))]
+            distance, i, j = min(linkage)
+            if distance > threshold:
+                break
+            clusters[i] = clusters[i] + clusters.pop(j)
+        for cluster in clusters:
+            if len(cluster) > 1:
+                members = sorted(compNames[i] for i in cluster)
+                groups[members[0] + ' (aggregated)'] = members
+    return groups
+
+
+def aggregateTechnologies(esM, componentGroups=None, threshold=0.1, componentNames=None):
+    """
+    Return a copy of the energy system model in which each group of components is replaced by one representative
+    component. The parameters of the representative component are aggregated for each location as follows:
+
+    * the maximum capacities (capacityMax) are summed up (if specified for all components of the group).
+    * the locationalEligibility is set to 1 if it is 1 for any component of the group.
+    * operation time series of components without a capacity variable are summed up.
+    * all other location dependent parameters (e.g. costs, lifetimes, operation rate or cost time series) are
+      averaged weighted with the capacity (capacityMax or the summed up absolute operation time series) of the
+      components in the location.
+
+    Results of an optimization of the aggregated energy system model can be mapped back to the original components
+    with disaggregateTechnologyOutput.
+
+    **Required arguments:**
+
+    :param esM: energy system model whose components are aggregated
+    :type esM: EnergySystemModel instance from the FINE package
+
+    **Default arguments:**
+
+    :param componentGroups: names of the components of each group (the keys are used as names of the
+        representative components). If componentGroups is None, the groups are determined with
+        getTechnologyAggregationGroups.
+        |br| * the default value is None
+    :type componentGroups: dict with strings as keys and lists of component names as values or None
+
+    :param threshold, componentNames: see getTechnologyAggregationGroups (only used if componentGroups is None)
+
+    :returns: aggregated energy system model and the names of the components of each group
+    :rtype: tuple (EnergySystemModel instance, dict)
+    """
+    if componentGroups is None:
+        componentGroups = getTechnologyAggregationGroups(esM, threshold, componentNames)
+    checkComponentGroups(esM, componentGroups)
+
+    # The pyomo model of the energy system model is not copied
+    pyM, esM.pyM = esM.pyM, None
+    try:
+        aggregatedEsM = copy.deepcopy(esM)
+    finally:
+        esM.pyM = pyM
+    for groupName, compNames in componentGroups.items():
+        kwargs = getRepresentativeParameters(esM, [esM.getComponent(compName) for compName in compNames])
+        kwargs['name'] = groupName
+        for compName in compNames:
+            aggregatedEsM.removeComponent(compName)
+        aggregatedEsM.add(type(esM.getComponent(compNames[0]))(esM=aggregatedEsM, **kwargs))
+        utils.output('The components ' + str(compNames) + ' are represented by the component ' + groupName + '.',
+                     esM.verbose, 0)
+    return aggregatedEsM, componentGroups
+
+
+def disaggregateTechnologyOutput(esM, aggregatedEsM, componentGroups):
+    """
+    Map the optimal values of the design and operation variables of an optimized technology aggregated energy system
+    model back to the original components. The capacity of a representative component is distributed to the
+    components of its group proportionally to their capacities (see aggregateTechnologies), its operation
+    proportionally to their available operation (capacity times operation rate time series) in each time step. Hence,
+    the disaggregated values satisfy the capacity and operation rate limits of the original components. Binary values
+    (isBuiltVariablesOptimum) are set for all eligible components of a group.
+
+    :param esM: original energy system model
+    :type esM: EnergySystemModel instance from the FINE package
+
+    :param aggregatedEsM: optimized aggregated energy system model (see aggregateTechnologies)
+    :type aggregatedEsM: EnergySystemModel instance from the FINE package
+
+    :param componentGroups: names of the components of each group
+    :type componentGroups: dict
+
+    :returns: optimal values for each modeling class (e.g. 'SourceSinkModel') and attribute (e.g.
+        'operationVariablesOptimum') in the format of the optimal values of the original energy system model
+    :rtype: dict
+    """
+    output = {}
+    for mdlName, mdl in aggregatedEsM.componentModelingDict.items():
+        for name in sorted(vars(mdl)):
+            if not name.endswith('VariablesOptimum') or getattr(mdl, name) is None:
+                continue
+            optVal = getattr(mdl, name)
+            isBinary, isDesign = name.startswith('isBuilt'), optVal.index.nlevels == 1
+            frames = [optVal.drop([groupName for groupName in componentGroups if groupName in optVal.index],
+                                  level=None if isDesign else 0)]
+            for groupName, compNames in componentGroups.items():
+                if groupName not in optVal.index.get_level_values(0):
+                    continue
+                comps = [esM.getComponent(compName) for compName in compNames]
+                if isDesign:
+                    shares = getCapacityShares(comps, list(optVal.columns))
+                    factors = {compName: 1 if isBinary else shares[compName] for compName in compNames}
+                    frames.append(pd.DataFrame({compName: (optVal.loc[groupName] * factors[compName])
+                                                .where(shares[compName] > 0, 0) for compName in compNames}).T)
+                else:
+                    frames.append(pd.concat({compName: values for compName, values in
+                                             disaggregateOperation(optVal.loc[groupName], comps, isBinary).items()}))
+            output.setdefault(mdlName, {})[name] = pd.concat(frames).sort_index()
+    return output
+
+
+def checkComponentGroups(esM, componentGroups):
+    """ Check if the components of each group can be represented by one component. """
+    if not isinstance(componentGroups, dict):
+        raise TypeError('The componentGroups parameter has to be a dictionary.')
+    compNames = [compName for names in componentGroups.values() for compName in names]
+    if len(compNames) != len(set(compNames)):
+        raise ValueError('Each component can only be assigned to one group.')
+    for groupName, names in componentGroups.items():
+        if groupName in esM.componentNames and groupName not in names:
+            raise ValueError('The group name ' + groupName + ' is already used by another component.')
+        keys = {getCompatibilityKey(esM.getComponent(compName)) for compName in names}
+        if None in keys or len(keys) != 1:
+            raise ValueError('The components of the group ' + groupName + ' can not be represented by one component.')
+
+
+def getCompatibilityKey(comp):
+    """
+    Return a key which is identical for all components which can be represented by one component (None if the
+    component can not be merged with other components).
+    """
+    if type(comp) not in AGGREGATABLE_COMPONENTS:
+        return None
+    if any(getattr(comp, name, None) is not None for name in UNSPECIFIED_PARAMETERS) or \
+            getattr(comp, 'fullOperationRateFix', None) is not None or \
+            getattr(comp, 'fullCommodityConversionFactors', None):
+        return None
+    key = [type(comp).__name__, comp.modelingClass.__name__]
+    key += [(name, str(sorted(value.items())) if isinstance(value, dict) else str(value))
+            for name, value in [(name, getattr(comp, name, None)) for name in IDENTICAL_PARAMETERS]]
+    key += [(name, getattr(comp, 'full' + name[0].upper() + name[1:], None) is None)
+            for name in getParameterNames(comp) if hasattr(comp, 'full' + name[0].upper() + name[1:])]
+    return tuple(key)
+
+
+def getComponentDistance(comp1, comp2):
+    """ Return the distance of two components (see getTechnologyAggregationGroups). """
+    distance = 0
+    timeSeries1, timeSeries2 = getTimeSeriesParameters(comp1), getTimeSeriesParameters(comp2)
+    for name in getParameterNames(comp1):
+        data1, data2 = timeSeries1.get(name, getattr(comp1, name)), timeSeries2.get(name, getattr(comp2, name))
+        if isinstance(data1, pd.DataFrame) and isinstance(data2, pd.DataFrame):
+            if name in OPERATION_TIME_SERIES and not comp1.hasCapacityVariable:
+                data1, data2 = data1 / max(data1.values.max(), 1e-12), data2 / max(data2.values.max(), 1e-12)
+            scale = max(np.abs(data1.values).max(), np.abs(data2.values).max(), 1e-12) \
+                if name not in OPERATION_TIME_SERIES else 1
+            distance = max(distance, (data1 - data2).abs().values.mean() / scale)
+        elif isinstance(data1, pd.Series) and isinstance(data2, pd.Series) and name not in ELIGIBILITY_PARAMETERS \
+                and name != 'capacityMax':
+            eligible = (comp1.locationalEligibility > 0) | (comp2.locationalEligibility > 0)
+            data1, data2 = data1[eligible].astype(float), data2.reindex(data1.index)[eligible].astype(float)
+            difference = ((data1 - data2).abs() / np.maximum(np.maximum(data1.abs(), data2.abs()), 1e-12))
+            distance = max(distance, difference.max() if len(difference) else 0)
+    return distance
+
+
+def getRepresentativeParameters(esM, comps):
+    """ Return the input parameters of the component which represents the given components. """
+    weights = pd.DataFrame({comp.name: getComponentWeights(comp) for comp in comps}).fillna(0)
+    timeSeries = {comp.name: getTimeSeriesParameters(comp) for comp in comps}
+    kwargs = {}
+    for name in getParameterNames(comps[0]):
+        data = {comp.name: timeSeries[comp.name].get(name, getattr(comp, name)) for comp in comps}
+        first = data[comps[0].name]
+        if name == 'capacityMax':
+            kwargs[name] = None if any(value is None for value in data.values()) else \
+                sum(value.fillna(0) for value in data.values())
+        elif name in ELIGIBILITY_PARAMETERS and isinstance(first, pd.Series):
+            kwargs[name] = pd.DataFrame(data).fillna(0).max(axis=1)
+        elif isinstance(first, pd.DataFrame):
+            if name in OPERATION_TIME_SERIES and not comps[0].hasCapacityVariable:
+                kwargs[name] = sum(value for value in data.values())
+            else:
+                kwargs[name] = sum(data[compName] * weights[compName] for compName in data) / \
+                    getTotalWeights(weights)
+        elif isinstance(first, pd.Series) and set(first.index) <= set(esM.locations):
+            kwargs[name] = pd.DataFrame(data).fillna(0).mul(weights).sum(axis=1) / getTotalWeights(weights)
+        else:
+            kwargs[name] = first
+    return kwargs
+
+
+def getTotalWeights(weights):
+    """ Return the total weights of each location (1 if they are 0 to avoid a division by zero). """
+    total = weights.sum(axis=1)
+    return total.where(total > 0, 1)
+
+
+def getCapacityShares(comps, locations):
+    """ Return the share of each component in the capacity of the group in each location. """
+    weights = pd.DataFrame({comp.name: getComponentWeights(comp) for comp in comps}).reindex(locations).fillna(0)
+    eligibility = pd.DataFrame({comp.name: comp.locationalEligibility for comp in comps}).reindex(locations)
+    weights = weights.where(weights.sum(axis=1) > 0, eligibility.fillna(0).astype(float), axis=0)
+    return weights.div(weights.sum(axis=1).where(weights.sum(axis=1) > 0, 1), axis=0)
+
+
+def disaggregateOperation(optVal, comps, isBinary=False):
+    """
+    Distribute the operation of a representative component (locations as index, time steps as columns) to the
+    components of its group proportionally to their available operation in each time step.
+    """
+    locations, timeSteps = list(optVal.index), optVal.columns
+    capacityShares = getCapacityShares(comps, locations)
+    capacityShares = {comp.name: pd.DataFrame(np.outer(capacityShares[comp.name].values, np.ones(len(timeSteps))),
+                                              index=locations, columns=timeSteps) for comp in comps}
+    availability = {}
+    for comp in comps:
+        availability[comp.name] = capacityShares[comp.name]
+        if getattr(comp, 'fullOperationRateMax', None) is not None:
+            rate = comp.fullOperationRateMax.droplevel(0).reindex(columns=locations).fillna(0).T
+            rate.columns = timeSteps
+            availability[comp.name] = capacityShares[comp.name] * rate if comp.hasCapacityVariable else rate
+    total = sum(availability.values())
+    values = {}
+    for comp in comps:
+        share = (availability[comp.name] / total.where(total > 0, 1)).where(total > 0, capacityShares[comp.name])
+        values[comp.name] = optVal.where(share > 0, 0) if isBinary else optVal * share
+    return values
@@ -17,6 +17,7 @@ def optimizeSimpleMyopic(esM,
                          timeSeriesAggregation=True, 
                          numberOfTypicalPeriods = 7, 
                          numberOfTimeStepsPerPeriod=24, 
+                         clusterCacheDirectory=None,
                          logFileName='', 
                          threads=3, 
                          solver='gurobi', 
@@ -70,6 +71,12 @@ def optimizeSimpleMyopic(esM,
         |br| * the default value is 24
     :type numberOfTimeStepsPerPeriod: strictly positive integer
 
+    :param clusterCacheDirectory: directory in which the results of the clustering are cached (see the cacheDirectory
+        parameter of EnergySystemModel.cluster). If the time series data does not change between the optimization
+        runs, the time series data is then only clustered once.
+        |br| * the default value is None
+    :type clusterCacheDirectory: string or None
+
     :param CO2Reference: gives the reference value of the CO2 emission to which the reduction should be applied to.
         The default value refers to the emissions of 1990 within the electricity sector (366kt CO2_eq)
         |br| * the default value is 366
@@ -116,7 +123,8 @@ def optimizeSimpleMyopic(esM,
 
         # Optimization
         if timeSeriesAggregation:
-            esM.cluster(numberOfTypicalPeriods=numberOfTypicalPeriods, numberOfTimeStepsPerPeriod=numberOfTimeStepsPerPeriod)
+            esM.cluster(numberOfTypicalPeriods=numberOfTypicalPeriods,
+                        numberOfTimeStepsPerPeriod=numberOfTimeStepsPerPeriod, cacheDirectory=clusterCacheDirectory)
 
         esM.optimize(declaresOptimizationProblem=True, timeSeriesAggregation=timeSeriesAggregation, 
                         logFileName=logFileName, threads=threads, solver=solver, timeLimit=timeLimit, 
@@ -286,12 +286,14 @@ class Source(Component):
         :param hasTSA: states whether a time series aggregation is requested (True) or not (False).
         :type hasTSA: boolean
         """
-        self.processedOperationRateMax = self.aggregatedOperationRateMax if hasTSA else self.fullOperationRateMax
-        self.processedOperationRateFix = self.aggregatedOperationRateFix if hasTSA else self.fullOperationRateFix
-        self.processedCommodityCostTimeSeries = \
-            self.aggregatedCommodityCostTimeSeries if hasTSA else self.fullCommodityCostTimeSeries
-        self.processedCommodityRevenueTimeSeries = \
-            self.aggregatedCommodityRevenueTimeSeries if hasTSA else self.fullCommodityRevenueTimeSeries
+        self.processedOperationRateMax = utils.setTimeSeriesArray(
+            self.aggregatedOperationRateMax if hasTSA else self.fullOperationRateMax)
+        self.processedOperationRateFix = utils.setTimeSeriesArray(
+            self.aggregatedOperationRateFix if hasTSA else self.fullOperationRateFix)
+        self.processedCommodityCostTimeSeries = utils.setTimeSeriesArray(
+            self.aggregatedCommodityCostTimeSeries if hasTSA else self.fullCommodityCostTimeSeries)
+        self.processedCommodityRevenueTimeSeries = utils.setTimeSeriesArray(
+            self.aggregatedCommodityRevenueTimeSeries if hasTSA else self.fullCommodityRevenueTimeSeries)
 
     def getDataForTimeSeriesAggregation(self):
         """ Function for getting the required data if a time series aggregation is requested. """
@@ -683,6 +685,25 @@ class SourceSinkModel(ComponentModel):
         return sum(opVar[loc, compName, p, t] * compDict[compName].sign
                    for compName in opVarDict[loc] if compDict[compName].commodity == commod)
 
+    def getCommodityBalanceContributors(self, esM, pyM):
+        """
+        Get the contributors to the commodity balances (see ComponentModel.getCommodityBalanceContributors).
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+        """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        opVar, opVarDict = getattr(pyM, 'op_' + abbrvName), getattr(pyM, 'operationVarDict_' + abbrvName)
+        contributors = {}
+        for loc, compNames in opVarDict.items():
+            for compName in compNames:
+                contributors.setdefault((loc, compDict[compName].commodity), []).append(
+                    (opVar, (loc, compName), compDict[compName].sign))
+        return contributors
+
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
         Get contribution to the objective function.
@@ -726,7 +747,7 @@ class SourceSinkModel(ComponentModel):
 
         # Set optimal operation variables and append optimization summary
         optVal = utils.formatOptimizationOutput(opVar.get_values(), 'operationVariables', '1dim', esM.periodsOrder,
-                                                esM=esM)
+                                                esM=esM, indexSets=utils.getVariableIndexSets(opVar))
         self.operationVariablesOptimum = optVal
 
         props = ['operation', 'opexOp', 'commodCosts', 'commodRevenues']
@@ -764,7 +785,7 @@ class SourceSinkModel(ComponentModel):
 
                     # in case of time series aggregation rearange clustered cost time series
                     calcCostTD = utils.buildFullTimeSeries(
-                        compDict[compName].processedCommodityCostTimeSeries.unstack(level=1).stack(level=0),
+                        compDict[compName].processedCommodityCostTimeSeries.frame.unstack(level=1).stack(level=0),
                         esM.periodsOrder, esM=esM, divide=False)
                     # multiply with operation values to get the total cost
                     cCostTD.loc[compName,:] = optVal.xs(compName, level=0).T.mul(calcCostTD.T).sum(axis=0)
@@ -772,7 +793,7 @@ class SourceSinkModel(ComponentModel):
                 if not compDict[compName].processedCommodityRevenueTimeSeries is None:
                     # in case of time series aggregation rearange clustered revenue time series
                     calcRevenueTD = utils.buildFullTimeSeries(
-                        compDict[compName].processedCommodityRevenueTimeSeries.unstack(level=1).stack(level=0),
+                        compDict[compName].processedCommodityRevenueTimeSeries.frame.unstack(level=1).stack(level=0),
                         esM.periodsOrder, esM=esM, divide=False)
                     # multiply with operation values to get the total revenue
                     cRevenueTD.loc[compName,:] = optVal.xs(compName, level=0).T.mul(calcRevenueTD.T).sum(axis=0)
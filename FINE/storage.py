@@ -339,10 +339,14 @@ class Storage(Component):
         :param hasTSA: states whether a time series aggregation is requested (True) or not (False).
         :type hasTSA: boolean
         """
-        self.processedChargeOpRateMax = self.aggregatedChargeOpRateMax if hasTSA else self.fullChargeOpRateMax
-        self.processedChargeOpRateFix = self.aggregatedChargeOpRateFix if hasTSA else self.fullChargeOpRateFix
-        self.processedDischargeOpRateMax = self.aggregatedDischargeOpRateMax if hasTSA else self.fullDischargeOpRateMax
-        self.processedDischargeOpRateFix = self.aggregatedDischargeOpRateFix if hasTSA else self.fullDischargeOpRateFix
+        self.processedChargeOpRateMax = utils.setTimeSeriesArray(
+            self.aggregatedChargeOpRateMax if hasTSA else self.fullChargeOpRateMax)
+        self.processedChargeOpRateFix = utils.setTimeSeriesArray(
+            self.aggregatedChargeOpRateFix if hasTSA else self.fullChargeOpRateFix)
+        self.processedDischargeOpRateMax = utils.setTimeSeriesArray(
+            self.aggregatedDischargeOpRateMax if hasTSA else self.fullDischargeOpRateMax)
+        self.processedDischargeOpRateFix = utils.setTimeSeriesArray(
+            self.aggregatedDischargeOpRateFix if hasTSA else self.fullDischargeOpRateFix)
 
     def getDataForTimeSeriesAggregation(self):
         """ Function for getting the required data if a time series aggregation is requested. """
@@ -376,6 +380,11 @@ class StorageModel(ComponentModel):
     instance. These declarations are necessary for the modeling and optimization of the energy system model.
     The StorageModel class inherits from the ComponentModel class.
     """
+    # States of charge at the beginning and at the end of the modeled time horizon which replace the cyclic state
+    # constraint in a full temporal resolution if they are specified (see optimizeRollingHorizon)
+    boundaryStatesOfCharge = None
+    lazyOptimalValueNames = ('chargeOperationVariablesOptimum', 'dischargeOperationVariablesOptimum',
+                             'stateOfChargeOperationVariablesOptimum', 'optSummary')
 
     def __init__(self):
         """" Constructor for creating a StorageModel class instance """
@@ -515,6 +524,33 @@ class StorageModel(ComponentModel):
     #                                          Declare component constraints                                           #
     ####################################################################################################################
 
+    def getSelfDischargeFactors(self, pyM, esM, startTimes=False):
+        """
+        Get the self-discharge factors of the components in a model with segmentation as dense (period, segment)
+        arrays, which are computed once per constraint declaration instead of once per constraint index:\n
+        * (1 - selfDischarge) ** hoursPerSegment for the self-discharge within a segment (startTimes=False) or
+        * (1 - selfDischarge) ** (segmentStartTime * hoursPerTimeStep) for the self-discharge between the start of a
+          period and the start of a segment (startTimes=True).
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :param startTimes: states if the factors refer to the start times of the segments (True) or to the durations
+            of the segments (False).
+            |br| * the default value is False
+        :type startTimes: boolean
+
+        :returns: self-discharge factors with the component names as keys (empty dictionary without segmentation)
+        :rtype: dictionary
+        """
+        if not pyM.hasSegmentation:
+            return {}
+        hours = pyM.segmentStartTime * esM.hoursPerTimeStep if startTimes else pyM.hoursPerSegment
+        return {compName: (1 - comp.selfDischarge) ** hours for compName, comp in self.componentsDict.items()}
+
     def connectSOCs(self, pyM, esM):
         """
         Declare the constraint for connecting the state of charge with the charge and discharge operation:
@@ -540,6 +576,25 @@ class StorageModel(ComponentModel):
         chargeOp, dischargeOp = getattr(pyM, 'chargeOp_' + abbrvName), getattr(pyM, 'dischargeOp_' + abbrvName)
         opVarSet = getattr(pyM, 'operationVarSet_' + abbrvName)
 
+        if pyM.backend == 'matrix':
+            hours = self.getHoursPerTimeStepArray(pyM, esM)
+            rowIndex = [(loc, compName, p, t) for loc, compName in opVarSet for p, t in pyM.timeSet]
+            compNames = [compName for loc, compName in opVarSet]
+            selfDischarge = np.concatenate([(1 - compDict[compName].selfDischarge) ** hours
+                                            for compName in compNames]) if compNames else np.zeros(0)
+            chargeEfficiency = np.repeat([compDict[compName].chargeEfficiency for compName in compNames],
+                                         len(pyM.timeSet))
+            dischargeEfficiency = np.repeat([compDict[compName].dischargeEfficiency for compName in compNames],
+                                            len(pyM.timeSet))
+            terms = [([SOC[loc, compName, p, t+1] for loc, compName, p, t in rowIndex], 1),
+                     ([SOC[loc, compName, p, t] for loc, compName, p, t in rowIndex], -selfDischarge),
+                     ([chargeOp[index] for index in rowIndex], -chargeEfficiency),
+                     ([dischargeOp[index] for index in rowIndex], 1 / dischargeEfficiency)]
+            utils.declareMatrixConstraint(pyM, 'ConstrConnectSOC_' + abbrvName, [(rowIndex, terms)],
+                                          np.zeros(len(rowIndex)), np.zeros(len(rowIndex)))
+            return
+
+        selfDischargeFactors = self.getSelfDischargeFactors(pyM, esM)
         def connectSOCs(pyM, loc, compName, p, t):
             if not pyM.hasSegmentation:
                 return (SOC[loc, compName, p, t+1] - SOC[loc, compName, p, t] *
@@ -548,7 +603,7 @@ class StorageModel(ComponentModel):
                         dischargeOp[loc, compName, p, t] / compDict[compName].dischargeEfficiency)
             else:
                 return (SOC[loc, compName, p, t+1] - SOC[loc, compName, p, t] *
-                        (1 - compDict[compName].selfDischarge) ** esM.hoursPerSegment.to_dict()[p, t] ==
+                        selfDischargeFactors[compName][p, t] ==
                         chargeOp[loc, compName, p, t] * compDict[compName].chargeEfficiency -
                         dischargeOp[loc, compName, p, t] / compDict[compName].dischargeEfficiency)
         setattr(pyM, 'ConstrConnectSOC_' + abbrvName, pyomo.Constraint(opVarSet, pyM.timeSet, rule=connectSOCs))
@@ -567,6 +622,12 @@ class StorageModel(ComponentModel):
 
         .. math::
             SoC^{inter}_{loc,0} = SoC^{inter}_{loc,p^{total}} 
+
+        If boundary states of charge are specified for the modeling class (a dictionary with the keys 'initial' and
+        'final', each with None or a dictionary with the state of charge of each (location, component) tuple), the
+        states of charge at the beginning and at the end of the time horizon are instead set to these values (the
+        full temporal resolution is required). This is used for solving consecutive time windows of the time
+        horizon (see optimizeRollingHorizon).
             
         :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
         :type pyM: pyomo ConcreteModel
@@ -580,6 +641,25 @@ class StorageModel(ComponentModel):
         offsetUp = getattr(pyM, 'stateOfChargeOffsetUp_' + abbrvName)
         offsetDown = getattr(pyM, 'stateOfChargeOffsetDown_' + abbrvName)
 
+        if self.boundaryStatesOfCharge is not None:
+            if pyM.hasTSA:
+                raise ValueError('Boundary states of charge can only be specified for a full temporal resolution.')
+            initial, final = self.boundaryStatesOfCharge['initial'], self.boundaryStatesOfCharge['final']
+
+            def initialState(pyM, loc, compName):
+                return SOC[loc, compName, 0, 0] == initial[loc, compName]
+
+            def finalState(pyM, loc, compName):
+                offsetUp_ = offsetUp[loc, compName, 0] if (loc, compName, 0) in offsetUp else 0
+                offsetDown_ = offsetDown[loc, compName, 0] if (loc, compName, 0) in offsetDown else 0
+                return final[loc, compName] == \
+                    SOC[loc, compName, 0, esM.timeStepsPerPeriod[-1] + 1] + (offsetUp_ - offsetDown_)
+            if initial is not None:
+                setattr(pyM, 'ConstrInitialState_' + abbrvName, pyomo.Constraint(opVarSet, rule=initialState))
+            if final is not None:
+                setattr(pyM, 'ConstrFinalState_' + abbrvName, pyomo.Constraint(opVarSet, rule=finalState))
+            return
+
         if not pyM.hasTSA:
             def cyclicState(pyM, loc, compName):
                 offsetUp_ = offsetUp[loc, compName, 0] if (loc, compName, 0) in offsetUp else 0
@@ -856,6 +936,7 @@ class StorageModel(ComponentModel):
         SOC, capVar = getattr(pyM, 'stateOfCharge_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         constrSet = getattr(pyM, 'designDimensionVarSet_' + abbrvName)
 
+        selfDischargeFactors = self.getSelfDischargeFactors(pyM, esM, startTimes=True)
         def SOCMaxPrecise(pyM, loc, compName, pInter, t):
             if compDict[compName].doPreciseTsaModeling:
                 if not pyM.hasSegmentation:
@@ -865,8 +946,7 @@ class StorageModel(ComponentModel):
                             <= capVar[loc, compName] * compDict[compName].stateOfChargeMax)
                 else:
                     return (SOCinter[loc, compName, pInter] *
-                            ((1 - compDict[compName].selfDischarge) **
-                            (esM.segmentStartTime.to_dict()[esM.periodsOrder[pInter], t] * esM.hoursPerTimeStep)) +
+                            selfDischargeFactors[compName][esM.periodsOrder[pInter], t] +
                             SOC[loc, compName, esM.periodsOrder[pInter], t]
                             <= capVar[loc, compName] * compDict[compName].stateOfChargeMax)
             else:
@@ -894,6 +974,7 @@ class StorageModel(ComponentModel):
         SOC, capVar = getattr(pyM, 'stateOfCharge_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         preciseSet = getattr(pyM, 'varSetPrecise_' + abbrvName)
 
+        selfDischargeFactors = self.getSelfDischargeFactors(pyM, esM, startTimes=True)
         def SOCMinPrecise(pyM, loc, compName, pInter, t):
             if compDict[compName].hasCapacityVariable:
                 if not pyM.hasSegmentation:
@@ -901,8 +982,8 @@ class StorageModel(ComponentModel):
                             (t * esM.hoursPerTimeStep)) + SOC[loc, compName, esM.periodsOrder[pInter], t]
                             >= capVar[loc, compName] * compDict[compName].stateOfChargeMin)
                 else:
-                    return (SOCinter[loc, compName, pInter] * ((1 - compDict[compName].selfDischarge) **
-                            (esM.segmentStartTime.to_dict()[esM.periodsOrder[pInter], t] * esM.hoursPerTimeStep)) +
+                    return (SOCinter[loc, compName, pInter] *
+                            selfDischargeFactors[compName][esM.periodsOrder[pInter], t] +
                             SOC[loc, compName, esM.periodsOrder[pInter], t]
                             >= capVar[loc, compName] * compDict[compName].stateOfChargeMin)
             else:
@@ -911,8 +992,8 @@ class StorageModel(ComponentModel):
                             (t * esM.hoursPerTimeStep)) + SOC[loc, compName, esM.periodsOrder[pInter], t]
                             >= compDict[compName].stateOfChargeMin)
                 else:
-                    return (SOCinter[loc, compName, pInter] * ((1 - compDict[compName].selfDischarge) **
-                            (esM.segmentStartTime.to_dict()[esM.periodsOrder[pInter], t] * esM.hoursPerTimeStep)) +
+                    return (SOCinter[loc, compName, pInter] *
+                            selfDischargeFactors[compName][esM.periodsOrder[pInter], t] +
                             SOC[loc, compName, esM.periodsOrder[pInter], t]
                             >= compDict[compName].stateOfChargeMin)
         setattr(pyM, 'ConstrSOCMinPrecise_' + abbrvName,
@@ -1074,6 +1155,26 @@ class StorageModel(ComponentModel):
         return sum(dischargeOp[loc, compName, p, t] - chargeOp[loc, compName, p, t]
                    for compName in opVarDict[loc] if commod == self.componentsDict[compName].commodity)
 
+    def getCommodityBalanceContributors(self, esM, pyM):
+        """
+        Get the contributors to the commodity balances (see ComponentModel.getCommodityBalanceContributors).
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+        """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        chargeOp, dischargeOp = getattr(pyM, 'chargeOp_' + abbrvName), getattr(pyM, 'dischargeOp_' + abbrvName)
+        opVarDict = getattr(pyM, 'operationVarDict_' + abbrvName)
+        contributors = {}
+        for loc, compNames in opVarDict.items():
+            for compName in compNames:
+                contributors.setdefault((loc, compDict[compName].commodity), []).extend(
+                    [(dischargeOp, (loc, compName), 1), (chargeOp, (loc, compName), -1)])
+        return contributors
+
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
         Get contribution to the objective function.
@@ -1142,7 +1243,7 @@ class StorageModel(ComponentModel):
 
         # * charge variables and contributions
         optVal = utils.formatOptimizationOutput(chargeOp.get_values(), 'operationVariables', '1dim', esM.periodsOrder,
-                                                esM=esM)
+                                                esM=esM, indexSets=utils.getVariableIndexSets(chargeOp))
         self.chargeOperationVariablesOptimum = optVal
 
         if optVal is not None:
@@ -1157,7 +1258,8 @@ class StorageModel(ComponentModel):
 
         # * discharge variables and contributions
         optVal = utils.formatOptimizationOutput(dischargeOp.get_values(), 'operationVariables', '1dim',
-                                                esM.periodsOrder, esM=esM)
+                                                esM.periodsOrder, esM=esM,
+                                                indexSets=utils.getVariableIndexSets(dischargeOp))
         self.dischargeOperationVariablesOptimum = optVal
         # Check if there are time steps, at which a storage component is both charging and discharging
         for compName in opSum.index:
@@ -1182,7 +1284,7 @@ class StorageModel(ComponentModel):
         # * set state of charge variables
         if not pyM.hasTSA:
             optVal = utils.formatOptimizationOutput(SOC.get_values(), 'operationVariables', '1dim', esM.periodsOrder,
-                                                    esM=esM)
+                                                    esM=esM, indexSets=utils.getVariableIndexSets(SOC))
             # Remove the last column (by applying the cycle constraint, the first and the last columns are equal to each
             # other)
             optVal = optVal.loc[:, :len(optVal.columns) - 2]
@@ -13,6 +13,7 @@ from FINE import utils
 import FINE as fn
 import pyomo.environ as pyomo
 import pandas as pd
+import numpy as np
 import warnings
 
 class DemandSideManagementBETA(Sink):
@@ -208,6 +209,48 @@ class DSMModel(SourceSinkModel):
         self.optSummary = None
 
 
+    def getShiftWindows(self, pyM, esM):
+        """
+        Return the shift windows of the DSM components. For each component, the names of its virtual storage
+        components and, for each location, the index of the virtual storage which shifts the demand down in each time
+        step (integer array in the order of pyM.timeSet) and the maximum charging rates of the virtual storages
+        (array of shape (tDelta, number of time steps)) are given. The shift windows are computed once per pyomo model.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :return: dictionary with the component names as keys and tuples (storage names, dictionary with the down
+            indices per location, dictionary with the maximum charging rates per location) as values
+        :rtype: dict
+        """
+        shiftWindows = getattr(pyM, 'shiftWindows_' + self.abbrvName, None)
+        if shiftWindows is not None:
+            return shiftWindows
+
+        shiftWindows = {}
+        for compName, comp in self.componentsDict.items():
+            storNames = [compName + '_' + str(i) for i in range(comp.tDelta)]
+            storComps = [esM.getComponent(storName) for storName in storNames]
+            downIndices, chargeOpRatesMax = {}, {}
+            for loc in comp.locationalEligibility.index[comp.locationalEligibility == 1]:
+                # The virtual storage which shifts the demand down has no operation costs in the time step
+                isDown = np.array([utils.getTimeSetArray(pyM, stor.processedOpexPerChargeOpTimeSeries[loc]) == 0
+                                   for stor in storComps])
+                if not isDown.any(axis=0).all():
+                    raise ValueError('The shift window of component ' + compName + ' at location ' + loc +
+                                     ' is not defined for all time steps.')
+                downIndices[loc] = isDown.argmax(axis=0)
+                chargeOpRatesMax[loc] = np.array([utils.getTimeSetArray(pyM, stor.processedChargeOpRateMax[loc])
+                                                  for stor in storComps])
+            shiftWindows[compName] = (storNames, downIndices, chargeOpRatesMax)
+
+        setattr(pyM, 'shiftWindows_' + self.abbrvName, shiftWindows)
+        return shiftWindows
+
+
     def limitUpDownShifts(self, pyM, esM):
         """
         Declare the constraint that the state of charge [commodityUnit*h] is limited by the installed capacity
@@ -222,20 +265,16 @@ class DSMModel(SourceSinkModel):
         compDict, abbrvName = self.componentsDict, self.abbrvName
         chargeOp = getattr(pyM, 'chargeOp_storExt')
         constrSet = getattr(pyM, 'operationVarSet_' + self.abbrvName)
+        shiftWindows = self.getShiftWindows(pyM, esM)
+        timeSetIndex = {pt: ix for ix, pt in enumerate(pyM.timeSet)}
 
         def limitUpDownShifts(pyM, loc, compName, p, t):
+            storNames, downIndices, chargeOpRatesMax = shiftWindows[compName]
+            ix = timeSetIndex[p, t]
+            ixDown = downIndices[loc][ix]
 
-            # ixDown = str((compDict[compName].tBwd + t) % compDict[compName].tDelta)
-            for i in range(compDict[compName].tDelta):
-                if esM.getComponent(compName + '_' + str(i)).processedOpexPerChargeOpTimeSeries.loc[(p, t), loc] == 0:
-                    ixDown = str(i)
-                    break
-
-            ixUp = [str(i) for i in range(compDict[compName].tDelta) if str(i) != ixDown]
-
-            return (sum(chargeOp[loc, compName + '_' + compName_i, p, t] for compName_i in ixUp) +
-                    (esM.getComponent(compName + '_' + ixDown).processedChargeOpRateMax.loc[(p, t), loc] -
-                     chargeOp[loc, compName + '_' + ixDown, p, t]) <=
+            return (sum(chargeOp[loc, storName, p, t] for i, storName in enumerate(storNames) if i != ixDown) +
+                    (float(chargeOpRatesMax[loc][ixDown, ix]) - chargeOp[loc, storNames[ixDown], p, t]) <=
                     max(compDict[compName].shiftUpMax, compDict[compName].shiftDownMax))
 
         setattr(pyM, 'limitUpDownShifts_' + abbrvName,
@@ -256,17 +295,14 @@ class DSMModel(SourceSinkModel):
         compDict, abbrvName = self.componentsDict, self.abbrvName
         chargeOp = getattr(pyM, 'chargeOp_storExt')
         constrSet = getattr(pyM, 'operationVarSet_' + self.abbrvName)
+        shiftWindows = self.getShiftWindows(pyM, esM)
+        timeSetIndex = {pt: ix for ix, pt in enumerate(pyM.timeSet)}
 
         def shiftUpMax(pyM, loc, compName, p, t):
-            
-            # ixDown = str((compDict[compName].tBwd + t) % compDict[compName].tDelta)
-            for i in range(compDict[compName].tDelta):
-                if esM.getComponent(compName + '_' + str(i)).processedOpexPerChargeOpTimeSeries.loc[(p, t), loc] == 0:
-                    ixDown = str(i)
-                    break
-            ixUp = [str(i) for i in range(compDict[compName].tDelta) if str(i) != ixDown]
-
-            return (sum(chargeOp[loc, compName + '_' + compName_i, p, t] for compName_i in ixUp) <=
+            storNames, downIndices, _ = shiftWindows[compName]
+            ixDown = downIndices[loc][timeSetIndex[p, t]]
+
+            return (sum(chargeOp[loc, storName, p, t] for i, storName in enumerate(storNames) if i != ixDown) <=
                     compDict[compName].shiftUpMax)
 
         setattr(pyM, 'shiftUpMax_' + abbrvName,
@@ -287,17 +323,16 @@ class DSMModel(SourceSinkModel):
         compDict, abbrvName = self.componentsDict, self.abbrvName
         chargeOp = getattr(pyM, 'chargeOp_storExt')
         constrSet = getattr(pyM, 'operationVarSet_' + self.abbrvName)
+        shiftWindows = self.getShiftWindows(pyM, esM)
+        timeSetIndex = {pt: ix for ix, pt in enumerate(pyM.timeSet)}
 
         def shiftDownMax(pyM, loc, compName, p, t):
+            storNames, downIndices, chargeOpRatesMax = shiftWindows[compName]
+            ix = timeSetIndex[p, t]
+            ixDown = downIndices[loc][ix]
 
-            #ixDown = str((compDict[compName].tBwd + t) % compDict[compName].tDelta)
-            for i in range(compDict[compName].tDelta):
-                if esM.getComponent(compName + '_' + str(i)).processedOpexPerChargeOpTimeSeries.loc[(p, t), loc] == 0:
-                    ixDown = str(i)
-                    break
-
-            return (esM.getComponent(compName + '_' + ixDown).processedChargeOpRateMax.loc[(p, t), loc] - 
-                    chargeOp[loc, compName + '_' + ixDown, p, t] <= compDict[compName].shiftDownMax)
+            return (float(chargeOpRatesMax[loc][ixDown, ix]) - chargeOp[loc, storNames[ixDown], p, t] <=
+                    compDict[compName].shiftDownMax)
 
         setattr(pyM, 'shiftDownMax_' + abbrvName,
                 pyomo.Constraint(constrSet, pyM.timeSet, rule=shiftDownMax))
@@ -344,16 +379,15 @@ class DSMModel(SourceSinkModel):
         # Set optimal operation variables and append optimization summary
         chargeOp = getattr(pyM, 'chargeOp_storExt')
         optVal = utils.formatOptimizationOutput(chargeOp.get_values(), 'operationVariables', '1dim', esM.periodsOrder,
-                                                esM=esM)
-
-        def groupStor(x):
-            ix = optVal.loc[x].name
-            for compName, comp in self.componentsDict.items():
-                if ix[0] in [compName + '_' + str(i) for i in range(comp.tBwd+comp.tFwd+1)]:
-                    return (compName, ix[1])
+                                                esM=esM, indexSets=utils.getVariableIndexSets(chargeOp))
 
-        optVal = optVal.groupby(lambda x: groupStor(x)).sum()
-        optVal.index = pd.MultiIndex.from_tuples(optVal.index)
+        # Sum up the operation of the virtual storage components of each DSM component
+        storNames = {compName + '_' + str(i): compName for compName, comp in compDict.items()
+                     for i in range(comp.tDelta)}
+        optVal = optVal[optVal.index.get_level_values(0).isin(list(storNames))]
+        optVal = optVal.groupby([optVal.index.get_level_values(0).map(storNames),
+                                 optVal.index.get_level_values(1)]).sum()
+        optVal.index.names = [None, None]
 
         self.operationVariablesOptimum = optVal
 
@@ -384,7 +418,7 @@ class DSMModel(SourceSinkModel):
                 if not compDict[compName].processedCommodityCostTimeSeries is None:
                     # in case of time series aggregation rearange clustered cost time series
                     calcCostTD = utils.buildFullTimeSeries(
-                        compDict[compName].processedCommodityCostTimeSeries.unstack(level=1).stack(level=0),
+                        compDict[compName].processedCommodityCostTimeSeries.frame.unstack(level=1).stack(level=0),
                         esM.periodsOrder, esM=esM, divide=False)
                     # multiply with operation values to get the total cost
                     cCostTD.loc[compName,:] = optVal.xs(compName, level=0).T.mul(calcCostTD.T).sum(axis=0)
@@ -392,7 +426,7 @@ class DSMModel(SourceSinkModel):
                 if not compDict[compName].processedCommodityRevenueTimeSeries is None:
                     # in case of time series aggregation rearange clustered revenue time series
                     calcRevenueTD = utils.buildFullTimeSeries(
-                        compDict[compName].processedCommodityRevenueTimeSeries.unstack(level=1).stack(level=0),
+                        compDict[compName].processedCommodityRevenueTimeSeries.frame.unstack(level=1).stack(level=0),
                         esM.periodsOrder, esM=esM, divide=False)
                     # multiply with operation values to get the total revenue
                     cRevenueTD.loc[compName,:] = optVal.xs(compName, level=0).T.mul(calcRevenueTD.T).sum(axis=0)
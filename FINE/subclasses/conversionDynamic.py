@@ -96,6 +96,9 @@ class ConversionDynamicModel(ConversionModel):
     It is used for the declaration of the sets, variables and constraints which are valid for the ConversionDynamic
     class instance. These declarations are necessary for the modeling and optimization of the energy system model.
     The ConversionDynamicModel class inherits from the ConversionModel class. """
+    # Optimal values of the operation variables before the modeled time horizon which replace the cyclic references
+    # at the beginning of a period if they are specified (see getVariableAtTimeStep and optimizeRollingHorizon)
+    initialOperationStates = None
 
     def __init__(self):
         self.abbrvName = 'conv_dyn'
@@ -236,6 +239,29 @@ class ConversionDynamicModel(ConversionModel):
     #                                          Declare component constraints                                           #
     ####################################################################################################################
 
+    def getVariableAtTimeStep(self, var, varName, loc, compName, p, t, numberOfTimeSteps):
+        """
+        Return the variable of a component at a time step of a period. Negative time steps refer to the time steps
+        before the first time step of the period. By default, they refer cyclically to the last time steps of the
+        period. If initial operation states are specified for the modeling class (a dictionary with the variable
+        names 'op', 'op_bin', 'startVariable' and 'stopVariable' as keys and dictionaries with a list of the optimal
+        values before the modeled time horizon for each (location, component) tuple as values), they refer to
+        these values instead. Values which are not given are set to 0.
+        """
+        if t >= 0:
+            return var[loc, compName, p, t]
+        if self.initialOperationStates is None:
+            return var[loc, compName, p, numberOfTimeSteps + t]
+        values = self.initialOperationStates[varName][loc, compName]
+        return values[t] if len(values) >= -t else 0
+
+    def getHistoryOffset(self):
+        """
+        Return the offset of the first time step before a period which is considered in the minimum down and up time
+        constraints. The cyclic formulation considers one time step more than the constraints inside a period.
+        """
+        return 0 if self.initialOperationStates is None else 1
+
     def minimumDownTime(self, pyM, esM):
         """
         Ensure that conversion unit is not ramping up and down too often by implementing a minimum down time after ramping down.
@@ -258,7 +284,7 @@ class ConversionDynamicModel(ConversionModel):
             if t>=1:
                 return (opVarBin[loc, compName, p, t]-opVarBin[loc, compName, p, t-1]-opVarStartBin[loc, compName, p, t]+opVarStopBin[loc, compName, p, t] == 0)
             else:
-                return (opVarBin[loc, compName, p, t]-opVarBin[loc, compName, p, numberOfTimeSteps-1]-opVarStartBin[loc, compName, p, t] \
+                return (opVarBin[loc, compName, p, t]-self.getVariableAtTimeStep(opVarBin, 'op_bin', loc, compName, p, -1, numberOfTimeSteps)-opVarStartBin[loc, compName, p, t] \
                 + opVarStopBin[loc, compName, p, t] == 0)
         setattr(pyM, 'ConstrMinDownTime1_' + abbrvName, pyomo.Constraint(constrSetMinDownTime, pyM.timeSet, rule=minimumDownTime1))
           
@@ -268,7 +294,7 @@ class ConversionDynamicModel(ConversionModel):
                 return opVarBin[loc, compName, p, t] <= 1 -pyomo.quicksum(opVarStopBin[loc, compName, p, t_down] for t_down in range(t-downTimeMin+1, t))
             else:
                 return opVarBin[loc, compName, p, t] <= 1 -pyomo.quicksum(opVarStopBin[loc, compName, p, t_down] for t_down in range(0, t)) \
-                    - pyomo.quicksum(opVarStopBin[loc, compName, p, t_down] for t_down in range(numberOfTimeSteps-(downTimeMin-t), numberOfTimeSteps))
+                    - pyomo.quicksum(self.getVariableAtTimeStep(opVarStopBin, 'stopVariable', loc, compName, p, t_down, numberOfTimeSteps) for t_down in range(t-downTimeMin+self.getHistoryOffset(), 0))
 
         setattr(pyM, 'ConstrMinDownTime2_' + abbrvName, pyomo.Constraint(constrSetMinDownTime, pyM.timeSet, rule=minimumDownTime2))          
                     
@@ -295,7 +321,7 @@ class ConversionDynamicModel(ConversionModel):
                 if (t>=1 and downTimeMin==None): # avoid to set constraints twice
                     return (opVarBin[loc, compName, p, t]-opVarBin[loc, compName, p, t-1]-opVarStartBin[loc, compName, p, t]+opVarStopBin[loc, compName, p, t] == 0)
                 else:
-                    return (opVarBin[loc, compName, p, t]-opVarBin[loc, compName, p, numberOfTimeSteps-1]-opVarStartBin[loc, compName, p, t] \
+                    return (opVarBin[loc, compName, p, t]-self.getVariableAtTimeStep(opVarBin, 'op_bin', loc, compName, p, -1, numberOfTimeSteps)-opVarStartBin[loc, compName, p, t] \
                         + opVarStopBin[loc, compName, p, t] == 0)
             setattr(pyM, 'ConstrMinUpTime1_' + abbrvName, pyomo.Constraint(constrSetMinUpTime, pyM.timeSet, rule=minimumUpTime1))
               
@@ -305,7 +331,7 @@ class ConversionDynamicModel(ConversionModel):
                     return opVarBin[loc, compName, p, t] >= pyomo.quicksum(opVarStartBin[loc, compName, p, t_up] for t_up in range(t-upTimeMin+1, t))
                 else:
                     return opVarBin[loc, compName, p, t] >= pyomo.quicksum(opVarStartBin[loc, compName, p, t_up] for t_up in range(0, t)) \
-                        + pyomo.quicksum(opVarStartBin[loc, compName, p, t_up] for t_up in range(numberOfTimeSteps-(upTimeMin-t), numberOfTimeSteps))
+                        + pyomo.quicksum(self.getVariableAtTimeStep(opVarStartBin, 'startVariable', loc, compName, p, t_up, numberOfTimeSteps) for t_up in range(t-upTimeMin+self.getHistoryOffset(), 0))
     
             setattr(pyM, 'ConstrMinUpTime2_' + abbrvName, pyomo.Constraint(constrSetMinUpTime, pyM.timeSet, rule=minimumUpTime2))    
     
@@ -335,12 +361,12 @@ class ConversionDynamicModel(ConversionModel):
                     if (t>=1): # avoid to set constraints twice
                         return (opVar[loc, compName, p, t]-opVar[loc, compName, p, t-1] <= rampRateMax*capVar[loc, compName])
                     else:
-                        return (opVar[loc, compName, p, t]-opVar[loc, compName, p, numberOfTimeSteps-1] <= rampRateMax*capVar[loc, compName])
+                        return (opVar[loc, compName, p, t]-self.getVariableAtTimeStep(opVar, 'op', loc, compName, p, -1, numberOfTimeSteps) <= rampRateMax*capVar[loc, compName])
                 else:
                     if (t>=1): # avoid to set constraints twice
                         return (opVar[loc, compName, p, t]-opVar[loc, compName, p, t-1] <= rampRateMax*capVar[loc, compName])
                     else:
-                        return (opVar[loc, compName, p, t]-opVar[loc, compName, p, numberOfTimeSteps-1] <= rampRateMax*esM.timeStepsPerSegment.to_dict()[p, t]*capVar[loc, compName])
+                        return (opVar[loc, compName, p, t]-self.getVariableAtTimeStep(opVar, 'op', loc, compName, p, -1, numberOfTimeSteps) <= rampRateMax*pyM.timeStepsPerSegment[p, t]*capVar[loc, compName])
             setattr(pyM, 'ConstrRampUpMax_' + abbrvName, pyomo.Constraint(constrSetRampUpMax, pyM.timeSet, rule=rampUpMax))
               
     def rampDownMax(self, pyM, esM):
@@ -368,12 +394,12 @@ class ConversionDynamicModel(ConversionModel):
                     if (t>=1): # avoid to set constraints twice
                         return (opVar[loc, compName, p, t-1]-opVar[loc, compName, p, t] <= rampRateMax*capVar[loc, compName])
                     else:
-                        return (opVar[loc, compName, p, numberOfTimeSteps-1]-opVar[loc, compName, p, t] <= rampRateMax*capVar[loc, compName])
+                        return (self.getVariableAtTimeStep(opVar, 'op', loc, compName, p, -1, numberOfTimeSteps)-opVar[loc, compName, p, t] <= rampRateMax*capVar[loc, compName])
                 else:
                     if (t>=1): # avoid to set constraints twice
                         return (opVar[loc, compName, p, t-1]-opVar[loc, compName, p, t] <= rampRateMax*capVar[loc, compName])
                     else:
-                        return (opVar[loc, compName, p, numberOfTimeSteps-1]-opVar[loc, compName, p, t] <= rampRateMax*esM.timeStepsPerSegment.to_dict()[p, t]*capVar[loc, compName])
+                        return (self.getVariableAtTimeStep(opVar, 'op', loc, compName, p, -1, numberOfTimeSteps)-opVar[loc, compName, p, t] <= rampRateMax*pyM.timeStepsPerSegment[p, t]*capVar[loc, compName])
             setattr(pyM, 'ConstrRampDownMax_' + abbrvName, pyomo.Constraint(constrSetRampDownMax, pyM.timeSet, rule=rampDownMax))
                     
     
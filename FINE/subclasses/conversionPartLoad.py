@@ -278,7 +278,7 @@ class ConversionPartLoadModel(ConversionModel):
             setattr(pyM, 'ConstrSegmentCapacity_' + abbrvName,  pyomo.Constraint(opVarSet, pyM.timeSet, rule=segmentCapacityConstraint))
         else:
             def segmentCapacityConstraint(pyM, loc, compName, p, t):
-                return sum(discretizationSegmentConVar[loc, compName, discretStep, p, t] for discretStep in range(compDict[compName].nSegments)) == esM.hoursPerSegment.to_dict()[p, t] * capVar[loc, compName]
+                return sum(discretizationSegmentConVar[loc, compName, discretStep, p, t] for discretStep in range(compDict[compName].nSegments)) == pyM.hoursPerSegment[p, t] * capVar[loc, compName]
             setattr(pyM, 'ConstrSegmentCapacity_' + abbrvName,  pyomo.Constraint(opVarSet, pyM.timeSet, rule=segmentCapacityConstraint))
 
 
@@ -303,7 +303,7 @@ class ConversionPartLoadModel(ConversionModel):
         else:
             def pointCapacityConstraint(pyM, loc, compName, p, t):
                 nPoints = compDict[compName].nSegments+1
-                return sum(discretizationPointConVar[loc, compName, discretStep, p, t] for discretStep in range(nPoints)) == esM.hoursPerSegment.to_dict()[p, t] * capVar[loc, compName]
+                return sum(discretizationPointConVar[loc, compName, discretStep, p, t] for discretStep in range(nPoints)) == pyM.hoursPerSegment[p, t] * capVar[loc, compName]
             setattr(pyM, 'ConstrPointCapacity_' + abbrvName,  pyomo.Constraint(opVarSet, pyM.timeSet, rule=pointCapacityConstraint))
 
     def declareOpConstrSetMinPartLoad(self, pyM, constrSetName):
@@ -424,6 +424,21 @@ class ConversionPartLoadModel(ConversionModel):
                        compDict[compName].discretizedPartLoad[commod]['ySegments'][discretStep] for discretStep in range(compDict[compName].nSegments+1)) \
                    for compName in opVarDict[loc] if commod in compDict[compName].discretizedPartLoad)
 
+    def getCommodityBalanceContributors(self, esM, pyM):
+        """ Get the contributors to the commodity balances (see ComponentModel.getCommodityBalanceContributors). """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        opVarDict = getattr(pyM, 'operationVarDict_' + abbrvName)
+        discretizationPointConVar = getattr(pyM, 'discretizationPoint_' + self.abbrvName)
+        contributors = {}
+        for loc, compNames in opVarDict.items():
+            for compName in compNames:
+                for commod, partLoad in compDict[compName].discretizedPartLoad.items():
+                    contributors.setdefault((loc, commod), []).extend(
+                        [(discretizationPointConVar, (loc, compName, discretStep),
+                          partLoad['xSegments'][discretStep] * partLoad['ySegments'][discretStep])
+                         for discretStep in range(compDict[compName].nSegments+1)])
+        return contributors
+
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
         Get contribution to the objective function.
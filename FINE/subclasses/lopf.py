@@ -10,6 +10,8 @@ class LinearOptimalPowerFlow(Transmission):
     linearized power flow (i.e. for AC lines). The LinearOptimalPowerFlow class inherits from the Transmission
     class.
     """
+    connectionParameters = Transmission.connectionParameters + ('reactances',)
+
     def __init__(self, 
                  esM, 
                  name, 
@@ -101,6 +103,21 @@ class LinearOptimalPowerFlow(Transmission):
         """
         super().addToEnergySystemModel(esM)
 
+    def setConnectionArrays(self, esM):
+        """
+        Intern the locations and the connections of the component (see Transmission.setConnectionArrays) and store
+        the reactances of the connections as an array which is aligned with the connection ids (_reactanceValues).
+        The power flow requires that the reverse connections of all connections are eligible.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component is modeled.
+        :type esM: EnergySystemModel class instance
+        """
+        super().setConnectionArrays(esM)
+        if (self._reverseConnections < 0).any():
+            raise ValueError('The reverse connections of all connections of component ' + self.name +
+                             ' have to be eligible.')
+        self._reactanceValues = self.reactances[self._connections].values.astype(float)
+
 
 class LOPFModel(TransmissionModel):
 
@@ -109,6 +126,7 @@ class LOPFModel(TransmissionModel):
     It is used for the declaration of the sets, variables and constraints which are valid for the LinearOptimalPowerFlow
     class instance. These declarations are necessary for the modeling and optimization of the energy system model.
     The LOPFModel class inherits from the TransmissionModel class. """
+    lazyOptimalValueNames = ('operationVariablesOptimum', 'phaseAngleVariablesOptimum', 'optSummary')
 
     def __init__(self):
         self.abbrvName = 'lopf'
@@ -147,20 +165,10 @@ class LOPFModel(TransmissionModel):
         :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
         :type pyM: pyomo Concrete Model
         """
+        super().declareSets(esM, pyM)
 
-        # # Declare design variable sets
-        self.declareDesignVarSet(pyM)
-        self.declareContinuousDesignVarSet(pyM)
-        self.declareDiscreteDesignVarSet(pyM)
-        self.declareDesignDecisionVarSet(pyM)
-
-        # Declare operation variable sets
-        self.declareOpVarSet(esM, pyM)
+        # Declare phase angle variable set
         self.initPhaseAngleVarSet(pyM)
-        self.declareOperationBinarySet(pyM)
-
-        # Declare operation variable set
-        self.declareOperationModeSets(pyM, 'opConstrSet', 'operationRateMax', 'operationRateFix')
 
     ####################################################################################################################
     #                                                Declare variables                                                 #
@@ -219,10 +227,12 @@ class LOPFModel(TransmissionModel):
         opVar, opVarSet = getattr(pyM, 'op_' + abbrvName), getattr(pyM, 'operationVarSet_' + abbrvName)
 
         def powerFlowDC(pyM, loc, compName, p, t):
-            node1, node2 = compDict[compName]._mapC[loc]
-            return (opVar[loc, compName, p, t] - opVar[compDict[compName]._mapI[loc], compName, p, t] ==
-                    (phaseAngleVar[node1, compName, p, t]-phaseAngleVar[node2, compName, p, t])/
-                    compDict[compName].reactances[loc])
+            comp = compDict[compName]
+            i = comp._connectionIds[loc]
+            node1, node2 = comp._mapC[loc]
+            return (opVar[loc, compName, p, t] - opVar[comp._connections[comp._reverseConnections[i]], compName, p, t]
+                    == (phaseAngleVar[node1, compName, p, t]-phaseAngleVar[node2, compName, p, t])/
+                    comp._reactanceValues[i])
         setattr(pyM, 'ConstrpowerFlowDC_' + abbrvName,  pyomo.Constraint(opVarSet, pyM.timeSet, rule=powerFlowDC))
 
     def basePhaseAngle(self, pyM):
@@ -281,7 +291,8 @@ class LOPFModel(TransmissionModel):
         phaseAngleVar = getattr(pyM, 'phaseAngle_' + abbrvName)
 
         optVal_ = utils.formatOptimizationOutput(phaseAngleVar.get_values(), 'operationVariables', '1dim',
-                                                 esM.periodsOrder, esM=esM)
+                                                 esM.periodsOrder, esM=esM,
+                                                 indexSets=utils.getVariableIndexSets(phaseAngleVar))
         self.phaseAngleVariablesOptimum = optVal_
 
     def getOptimalValues(self, name='all'):
@@ -138,16 +138,20 @@ class StorageExtBETA(Storage):
         :param hasTSA: states whether a time series aggregation is requested (True) or not (False).
         :type hasTSA: boolean
         """
-        self.processedChargeOpRateMax = self.aggregatedChargeOpRateMax if hasTSA else self.fullChargeOpRateMax
-        self.processedChargeOpRateFix = self.aggregatedChargeOpRateFix if hasTSA else self.fullChargeOpRateFix
-        self.processedDischargeOpRateMax = self.aggregatedDischargeOpRateMax if hasTSA else self.fullDischargeOpRateMax
-        self.processedDischargeOpRateFix = self.aggregatedDischargeOpRateFix if hasTSA else self.fullDischargeOpRateFix
-        self.processedStateOfChargeOpRateMax = self.aggregatedStateOfChargeOpRateMax if hasTSA \
-            else self.fullStateOfChargeOpRateMax
-        self.processedDtateOfChargeOpRateFix = self.aggregatedStateOfChargeOpRateFix if hasTSA \
-            else self.fullStateOfChargeOpRateFix
-        self.processedOpexPerChargeOpTimeSeries = \
-            self.aggregatedOpexPerChargeOpTimeSeries if hasTSA else self.fullOpexPerChargeOpTimeSeries
+        self.processedChargeOpRateMax = utils.setTimeSeriesArray(
+            self.aggregatedChargeOpRateMax if hasTSA else self.fullChargeOpRateMax)
+        self.processedChargeOpRateFix = utils.setTimeSeriesArray(
+            self.aggregatedChargeOpRateFix if hasTSA else self.fullChargeOpRateFix)
+        self.processedDischargeOpRateMax = utils.setTimeSeriesArray(
+            self.aggregatedDischargeOpRateMax if hasTSA else self.fullDischargeOpRateMax)
+        self.processedDischargeOpRateFix = utils.setTimeSeriesArray(
+            self.aggregatedDischargeOpRateFix if hasTSA else self.fullDischargeOpRateFix)
+        self.processedStateOfChargeOpRateMax = utils.setTimeSeriesArray(
+            self.aggregatedStateOfChargeOpRateMax if hasTSA else self.fullStateOfChargeOpRateMax)
+        self.processedDtateOfChargeOpRateFix = utils.setTimeSeriesArray(
+            self.aggregatedStateOfChargeOpRateFix if hasTSA else self.fullStateOfChargeOpRateFix)
+        self.processedOpexPerChargeOpTimeSeries = utils.setTimeSeriesArray(
+            self.aggregatedOpexPerChargeOpTimeSeries if hasTSA else self.fullOpexPerChargeOpTimeSeries)
 
     def getDataForTimeSeriesAggregation(self):
         """ Function for getting the required data if a time series aggregation is requested. """
@@ -239,6 +243,7 @@ class StorageExtModel(StorageModel):
         SOC, capVar = getattr(pyM, 'stateOfCharge_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         constrSet1 = getattr(pyM, 'stateOfChargeOpConstrSet1_' + abbrvName)
 
+        selfDischargeFactors = self.getSelfDischargeFactors(pyM, esM, startTimes=True)
         def SOCMaxPrecise1(pyM, loc, compName, pInter, t):
             if compDict[compName].doPreciseTsaModeling:
                 if not pyM.hasSegmentation:
@@ -248,8 +253,7 @@ class StorageExtModel(StorageModel):
                             <= capVar[loc, compName] * compDict[compName].stateOfChargeMax)
                 else:
                     return (SOCinter[loc, compName, pInter] *
-                            ((1 - compDict[compName].selfDischarge) **
-                            (esM.segmentStartTime.to_dict()[esM.periodsOrder[pInter], t] * esM.hoursPerTimeStep)) +
+                            selfDischargeFactors[compName][esM.periodsOrder[pInter], t] +
                             SOC[loc, compName, esM.periodsOrder[pInter], t]
                             <= capVar[loc, compName] * compDict[compName].stateOfChargeMax)
             else:
@@ -273,6 +277,7 @@ class StorageExtModel(StorageModel):
         SOC, capVar = getattr(pyM, 'stateOfCharge_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         constrSet2 = getattr(pyM, 'stateOfChargeOpConstrSet2_' + abbrvName)
 
+        selfDischargeFactors = self.getSelfDischargeFactors(pyM, esM, startTimes=True)
         def SOCMaxPrecise2(pyM, loc, compName, pInter, t):
             if compDict[compName].doPreciseTsaModeling:
                 if not pyM.hasSegmentation:
@@ -283,8 +288,7 @@ class StorageExtModel(StorageModel):
                             compDict[compName].processedStateOfChargeOpRateFix[loc][esM.periodsOrder[pInter], t])
                 else:
                     return (SOCinter[loc, compName, pInter] *
-                            ((1 - compDict[compName].selfDischarge) **
-                            (esM.segmentStartTime.to_dict()[esM.periodsOrder[pInter], t] * esM.hoursPerTimeStep)) +
+                            selfDischargeFactors[compName][esM.periodsOrder[pInter], t] +
                             SOC[loc, compName, esM.periodsOrder[pInter], t]
                             == capVar[loc, compName] *
                             compDict[compName].processedStateOfChargeOpRateFix[loc][esM.periodsOrder[pInter], t])
@@ -309,6 +313,7 @@ class StorageExtModel(StorageModel):
         SOC, capVar = getattr(pyM, 'stateOfCharge_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         constrSet3 = getattr(pyM, 'stateOfChargeOpConstrSet3_' + abbrvName)
 
+        selfDischargeFactors = self.getSelfDischargeFactors(pyM, esM, startTimes=True)
         def SOCMaxPrecise3(pyM, loc, compName, pInter, t):
             if compDict[compName].doPreciseTsaModeling:
                 if not pyM.hasSegmentation:
@@ -319,8 +324,7 @@ class StorageExtModel(StorageModel):
                             compDict[compName].processedStateOfChargeOpRateMax[loc][esM.periodsOrder[pInter], t])
                 else:
                     return (SOCinter[loc, compName, pInter] *
-                            ((1 - compDict[compName].selfDischarge) **
-                            (esM.segmentStartTime.to_dict()[esM.periodsOrder[pInter], t] * esM.hoursPerTimeStep)) +
+                            selfDischargeFactors[compName][esM.periodsOrder[pInter], t] +
                             SOC[loc, compName, esM.periodsOrder[pInter], t]
                             <= capVar[loc, compName] *
                             compDict[compName].processedStateOfChargeOpRateMax[loc][esM.periodsOrder[pInter], t])
@@ -345,6 +349,7 @@ class StorageExtModel(StorageModel):
         SOC = getattr(pyM, 'stateOfCharge_' + abbrvName)
         constrSet4 = getattr(pyM, 'stateOfChargeOpConstrSet4_' + abbrvName)
 
+        selfDischargeFactors = self.getSelfDischargeFactors(pyM, esM, startTimes=True)
         def SOCMaxPrecise4(pyM, loc, compName, pInter, t):
             if compDict[compName].doPreciseTsaModeling:
                 if not pyM.hasSegmentation:
@@ -354,8 +359,7 @@ class StorageExtModel(StorageModel):
                             == compDict[compName].processedStateOfChargeOpRateFix[loc][esM.periodsOrder[pInter], t])
                 else:
                     return (SOCinter[loc, compName, pInter] *
-                            ((1 - compDict[compName].selfDischarge) **
-                            (esM.segmentStartTime.to_dict()[esM.periodsOrder[pInter], t] * esM.hoursPerTimeStep)) +
+                            selfDischargeFactors[compName][esM.periodsOrder[pInter], t] +
                             SOC[loc, compName, esM.periodsOrder[pInter], t]
                             == compDict[compName].processedStateOfChargeOpRateFix[loc][esM.periodsOrder[pInter], t])
             else:
@@ -379,6 +383,7 @@ class StorageExtModel(StorageModel):
         SOC = getattr(pyM, 'stateOfCharge_' + abbrvName)
         constrSet5 = getattr(pyM, 'stateOfChargeOpConstrSet5_' + abbrvName)
 
+        selfDischargeFactors = self.getSelfDischargeFactors(pyM, esM, startTimes=True)
         def SOCMaxPrecise5(pyM, loc, compName, pInter, t):
             if compDict[compName].doPreciseTsaModeling:
                 if not pyM.hasSegmentation:
@@ -388,8 +393,7 @@ class StorageExtModel(StorageModel):
                             <= compDict[compName].processedStateOfChargeOpRateMax[loc][esM.periodsOrder[pInter], t])
                 else:
                     return (SOCinter[loc, compName, pInter] *
-                            ((1 - compDict[compName].selfDischarge) **
-                            (esM.segmentStartTime.to_dict()[esM.periodsOrder[pInter], t] * esM.hoursPerTimeStep)) +
+                            selfDischargeFactors[compName][esM.periodsOrder[pInter], t] +
                             SOC[loc, compName, esM.periodsOrder[pInter], t]
                             <= compDict[compName].processedStateOfChargeOpRateMax[loc][esM.periodsOrder[pInter], t])
             else:
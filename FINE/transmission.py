@@ -3,6 +3,7 @@ from FINE import utils
 import warnings
 import pyomo.environ as pyomo
 import pandas as pd
+import numpy as np
 
 
 class Transmission(Component):
@@ -12,6 +13,9 @@ class Transmission(Component):
     Last edited: March 02, 2021
     |br| @author: FINE Developer Team (FZJ IEK-3)
     """
+    # Parameters from which the connection arrays are derived (see setConnectionArrays)
+    connectionParameters = ('locationalEligibility', 'losses', 'distances')
+
     def __init__(self,
                  esM,
                  name,
@@ -246,6 +250,70 @@ class Transmission(Component):
         :type esM: EnergySystemModel class instance
         """
         super().addToEnergySystemModel(esM)
+        self.setConnectionArrays(esM)
+
+    def setConnectionArrays(self, esM):
+        """
+        Intern the locations of the energy system model and the eligible connections of the component to integer ids
+        and store the connection data which is required for the declaration of the commodity balances as arrays which
+        are aligned with the connection ids:
+
+        * _connections: names of the connections (the id of a connection is its position in the list)
+        * _connectionNodes: ids of the start and end locations of the connections
+        * _reverseConnections: ids of the reverse connections (-1 if the reverse connection is not eligible)
+        * _lossFactors: shares of the operation which arrive at the end locations (1 - losses * distances)
+        * _incidenceOut, _incidenceIn: ids of the connections which start and end at a location (indexed by the
+          location ids)
+
+        The values of the connectionParameters are stored as well such that changes can be detected (see
+        updateConnectionArrays).
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component is modeled.
+        :type esM: EnergySystemModel class instance
+        """
+        self._locationIds = {loc: i for i, loc in enumerate(sorted(esM.locations))}
+        self._connections = [connection for connection in self._mapC
+                             if self.locationalEligibility[connection] == 1]
+        self._connectionIds = {connection: i for i, connection in enumerate(self._connections)}
+        self._connectionNodes = np.array([[self._locationIds[loc] for loc in self._mapC[connection]]
+                                          for connection in self._connections], dtype=int).reshape(-1, 2)
+        self._reverseConnections = np.array([self._connectionIds.get(self._mapI[connection], -1)
+                                             for connection in self._connections], dtype=int)
+        self._lossFactors = 1 - self.losses[self._connections].values * self.distances[self._connections].values
+        self._incidenceOut = [np.flatnonzero(self._connectionNodes[:, 0] == i) for i in range(len(self._locationIds))]
+        self._incidenceIn = [np.flatnonzero(self._connectionNodes[:, 1] == i) for i in range(len(self._locationIds))]
+        self._connectionParameterValues = {name: getattr(self, name).copy() for name in self.connectionParameters}
+
+    def updateConnectionArrays(self, esM):
+        """
+        Intern the connections of the component anew (see setConnectionArrays) if the locations of the energy system
+        model or the values of the connectionParameters (e.g. the losses) have been changed since the connections were
+        interned.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component is modeled.
+        :type esM: EnergySystemModel class instance
+        """
+        if list(self._locationIds) != sorted(esM.locations) or \
+                not all(values.equals(getattr(self, name)) for name, values in self._connectionParameterValues.items()):
+            self.setConnectionArrays(esM)
+
+    def updateCostParameter(self, esM, name, data):
+        """
+        Update a cost parameter of the component (see Component.updateCostParameter). As in the initialization of the
+        component, the distance related costs are multiplied with half of the distances.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component is modeled.
+        :type esM: EnergySystemModel instance
+
+        :param name: name of the cost parameter
+        :type name: string
+
+        :param data: new value of the cost parameter (same format as in the initialization of the component)
+        :type data: float, Pandas Series or Pandas DataFrame
+        """
+        super().updateCostParameter(esM, name, utils.preprocess2dimData(data, self._mapC))
+        if name in ['investPerCapacity', 'investIfBuilt', 'opexPerCapacity', 'opexIfBuilt']:
+            setattr(self, name, getattr(self, name) * (self.distances * 0.5))
 
     def setTimeSeriesData(self, hasTSA):
         """
@@ -255,8 +323,10 @@ class Transmission(Component):
         :param hasTSA: states whether a time series aggregation is requested (True) or not (False).
         :type hasTSA: boolean
         """
-        self.processedOperationRateMax = self.aggregatedOperationRateMax if hasTSA else self.fullOperationRateMax
-        self.processedOperationRateFix = self.aggregatedOperationRateFix if hasTSA else self.fullOperationRateFix
+        self.processedOperationRateMax = utils.setTimeSeriesArray(
+            self.aggregatedOperationRateMax if hasTSA else self.fullOperationRateMax)
+        self.processedOperationRateFix = utils.setTimeSeriesArray(
+            self.aggregatedOperationRateFix if hasTSA else self.fullOperationRateFix)
 
     def getDataForTimeSeriesAggregation(self):
         """ Function for getting the required data if a time series aggregation is requested. """
@@ -308,6 +378,11 @@ class TransmissionModel(ComponentModel):
         :type pyM: pyomo ConcreteModel
         """
 
+        # Intern the connections of the components anew if their eligibility, losses or distances have been changed
+        # after the components were added to the energy system model
+        for comp in self.componentsDict.values():
+            comp.updateConnectionArrays(esM)
+
         # # Declare design variable sets
         self.declareDesignVarSet(pyM)
         self.declareContinuousDesignVarSet(pyM)
@@ -394,7 +469,16 @@ class TransmissionModel(ComponentModel):
         opVar, capVar = getattr(pyM, opVarName + '_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         constrSet1 = getattr(pyM, constrSetName + '1_' + abbrvName)
 
-        if not pyM.hasSegmentation:
+        if pyM.backend == 'matrix':
+            factor = self.getHoursPerTimeStepArray(pyM, esM)
+            rowIndex = [(loc, compName, p, t) for loc, compName in constrSet1 for p, t in pyM.timeSet]
+            terms = [([opVar[loc, compName, p, t] for loc, compName, p, t in rowIndex], 1),
+                     ([opVar[compDict[compName]._mapI[loc], compName, p, t] for loc, compName, p, t in rowIndex], 1),
+                     ([capVar[loc, compName] for loc, compName, p, t in rowIndex],
+                      -np.tile(factor, len(constrSet1)))]
+            utils.declareMatrixConstraint(pyM, constrName + '_' + abbrvName, [(rowIndex, terms)], None,
+                                          np.zeros(len(rowIndex)))
+        elif not pyM.hasSegmentation:
             def op1(pyM, loc, compName, p, t):
                 return opVar[loc, compName, p, t] + opVar[compDict[compName]._mapI[loc], compName, p, t] <= \
                        capVar[loc, compName] * esM.hoursPerTimeStep
@@ -402,7 +486,7 @@ class TransmissionModel(ComponentModel):
         else:
             def op1(pyM, loc, compName, p, t):
                 return opVar[loc, compName, p, t] + opVar[compDict[compName]._mapI[loc], compName, p, t] <= \
-                       capVar[loc, compName] * esM.hoursPerSegment.to_dict()[p,t]
+                       capVar[loc, compName] * pyM.hoursPerSegment[p, t]
             setattr(pyM, constrName + '_' + abbrvName, pyomo.Constraint(constrSet1, pyM.timeSet, rule=op1))
 
     def declareComponentConstraints(self, esM, pyM):
@@ -478,10 +562,10 @@ class TransmissionModel(ComponentModel):
         :param commod: string
         """
 
-        return any([comp.commodity == commod and
-                    (loc + '_' + loc_ in comp.locationalEligibility.index or
-                     loc_ + '_' + loc in comp.locationalEligibility.index)
-                    for comp in self.componentsDict.values() for loc_ in esM.locations])
+        return any(comp.commodity == commod and loc in comp._locationIds and
+                   (len(comp._incidenceOut[comp._locationIds[loc]]) > 0 or
+                    len(comp._incidenceIn[comp._locationIds[loc]]) > 0)
+                   for comp in self.componentsDict.values())
 
     def getCommodityBalanceContribution(self, pyM, commod, loc, p, t):
         """ 
@@ -495,18 +579,53 @@ class TransmissionModel(ComponentModel):
             & - & \\underset{\substack{(loc_{in},loc_{out}) \in \\ \mathcal{L}^{tans}:loc_{out}=loc}}{ \sum } op^{comp,op}_{(loc_{in},loc_{out}),p,t}
             \\end{eqnarray*}
         """
-        compDict, abbrvName = self.componentsDict, self.abbrvName
-        opVar, opVarDictIn = getattr(pyM, 'op_' + abbrvName), getattr(pyM, 'operationVarDictIn_' + abbrvName)
-        opVarDictOut = getattr(pyM, 'operationVarDictOut_' + abbrvName)
-        return sum(opVar[loc_ + '_' + loc, compName, p, t] *
-                   (1 - compDict[compName].losses[loc_ + '_' + loc] * compDict[compName].distances[loc_ + '_' + loc])
-                   for loc_ in opVarDictIn[loc].keys()
-                   for compName in opVarDictIn[loc][loc_]
-                   if commod in compDict[compName].commodity) - \
-               sum(opVar[loc + '_' + loc_, compName, p, t]
-                   for loc_ in opVarDictOut[loc].keys()
-                   for compName in opVarDictOut[loc][loc_]
-                   if commod in compDict[compName].commodity)
+        opVar = getattr(pyM, 'op_' + self.abbrvName)
+        return sum(opVar[connection, compName, p, t] * coefficient
+                   for connection, compName, coefficient in self.getLocationContributors(loc, commod))
+
+    def getLocationContributors(self, loc, commod=None):
+        """
+        Get the operation variable indices of the connections which start or end at a location together with their
+        coefficients in the commodity balance of the location. The connections are looked up in the incidence lists
+        of the components: incoming flows contribute with their losses considered, outgoing flows with a negative sign.
+
+        :param loc: name of the regarded location (locations are defined in the EnergySystemModel instance)
+        :type loc: string
+
+        :param commod: name of the regarded commodity. If None, the connections of all components are returned.
+            |br| * the default value is None
+        :type commod: string or None
+
+        :returns: (connection, compName, coefficient) tuples
+        :rtype: list
+        """
+        contributors = []
+        for compName, comp in self.componentsDict.items():
+            if (commod is not None and comp.commodity != commod) or loc not in comp._locationIds:
+                continue
+            locId = comp._locationIds[loc]
+            contributors.extend((comp._connections[i], compName, float(comp._lossFactors[i]))
+                                for i in comp._incidenceIn[locId])
+            contributors.extend((comp._connections[i], compName, -1) for i in comp._incidenceOut[locId])
+        return contributors
+
+    def getCommodityBalanceContributors(self, esM, pyM):
+        """
+        Get the contributors to the commodity balances (see ComponentModel.getCommodityBalanceContributors).
+        Incoming flows contribute with their losses considered, outgoing flows with a negative sign.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+        """
+        opVar, contributors = getattr(pyM, 'op_' + self.abbrvName), {}
+        for loc in esM.locations:
+            for connection, compName, coefficient in self.getLocationContributors(loc):
+                contributors.setdefault((loc, self.componentsDict[compName].commodity), []).append(
+                    (opVar, (connection, compName), coefficient))
+        return contributors
 
     def getBalanceLimitContribution(self, esM, pyM, ID, loc, timeSeriesAggregation):
         """
@@ -533,10 +652,7 @@ class TransmissionModel(ComponentModel):
         :param loc: Name of the regarded location (locations are defined in the EnergySystemModel instance)
         :type loc: string
         """
-        compDict, abbrvName = self.componentsDict, self.abbrvName
-        opVar, opVarDictIn = getattr(pyM, 'op_' + abbrvName), getattr(pyM, 'operationVarDictIn_' + abbrvName)
-        opVarDictOut = getattr(pyM, 'operationVarDictOut_' + abbrvName)
-        limitDict = getattr(pyM, 'balanceLimitDict')
+        opVar, limitDict = getattr(pyM, 'op_' + self.abbrvName), getattr(pyM, 'balanceLimitDict')
         if timeSeriesAggregation:
             periods = esM.typicalPeriods
             timeSteps = esM.timeStepsPerPeriod
@@ -544,18 +660,9 @@ class TransmissionModel(ComponentModel):
             periods = esM.periods
             timeSteps = esM.totalTimeSteps
         aut = \
-            sum(opVar[loc_ + "_" + loc, compName, p, t] *
-                (1 - compDict[compName].losses[loc_ + '_' + loc] * 
-                 compDict[compName].distances[loc_ + '_' + loc]) *
-                esM.periodOccurrences[p]
-                for loc_ in opVarDictIn[loc].keys()
-                for compName in opVarDictIn[loc][loc_] if compName in limitDict[(ID, loc)]
-                for p in periods
-                for t in timeSteps) - \
-            sum(opVar[loc + "_" + loc_, compName, p, t] *
-                esM.periodOccurrences[p]
-                for loc_ in opVarDictOut[loc].keys()
-                for compName in opVarDictOut[loc][loc_] if compName in limitDict[(ID, loc)]
+            sum(opVar[connection, compName, p, t] * coefficient * esM.periodOccurrences[p]
+                for connection, compName, coefficient in self.getLocationContributors(loc)
+                if compName in limitDict[(ID, loc)]
                 for p in periods
                 for t in timeSteps)
         return aut
@@ -597,10 +704,11 @@ class TransmissionModel(ComponentModel):
                 optSummaryBasic.loc[compName, cost] = (data).values
 
         # Set optimal operation variables and append optimization summary
+        indexSets = utils.getVariableIndexSets(opVar)
         optVal = utils.formatOptimizationOutput(opVar.get_values(), 'operationVariables', '1dim', esM.periodsOrder,
-                                                esM=esM)
+                                                esM=esM, indexSets=indexSets)
         optVal_ = utils.formatOptimizationOutput(opVar.get_values(), 'operationVariables', '2dim', esM.periodsOrder,
-                                                 compDict=compDict, esM=esM)
+                                                 compDict=compDict, esM=esM, indexSets=indexSets)
         self.operationVariablesOptimum = optVal_
 
         props = ['operation', 'opexOp']
@@ -4,8 +4,14 @@ Last edited: March 02, 2021
 |br| @author: FINE Developer Team (FZJ IEK-3)
 """
 import warnings
+import time
+import os
+import pickle
+import hashlib
+from contextlib import contextmanager
 import pandas as pd
 import numpy as np
+import pyomo.environ as pyomo
 import pwlf
 import FINE as fn
 import matplotlib.pyplot as plt
@@ -761,7 +767,8 @@ def checkAndSetFullLoadHoursParameter(esM, name, data, dimension, locationalElig
                              'All entries in economic parameter series have to be positive.')
         return _data
 
-def checkClusteringInput(numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, totalNumberOfTimeSteps):
+def checkClusteringInput(numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, totalNumberOfTimeSteps,
+                         cacheDirectory=None):
     isStrictlyPositiveInt(numberOfTypicalPeriods), isStrictlyPositiveInt(numberOfTimeStepsPerPeriod)
     if not totalNumberOfTimeSteps % numberOfTimeStepsPerPeriod == 0:
         raise ValueError('The numberOfTimeStepsPerPeriod has to be an integer divisor of the total number of time\n' +
@@ -769,9 +776,59 @@ def checkClusteringInput(numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, tot
     if totalNumberOfTimeSteps < numberOfTypicalPeriods * numberOfTimeStepsPerPeriod:
         raise ValueError('The product of the numberOfTypicalPeriods and the numberOfTimeStepsPerPeriod has to be \n' +
                          'smaller than the total number of time steps considered in the energy system model.')
+    if cacheDirectory is not None and not isinstance(cacheDirectory, str):
+        raise TypeError('The cacheDirectory parameter has to be a string or None.')
 
 
-def checkDeclareOptimizationProblemInput(timeSeriesAggregation, isTimeSeriesDataClustered):
+def getClusterCacheKey(timeSeriesData, weightDict, clusterArguments):
+    """
+    Return a key for the cluster cache which is the hash of the content of the time series data, of the weights of
+    the time series and of the arguments of the clustering.
+
+    :param timeSeriesData: time series data which is clustered
+    :type timeSeriesData: pandas DataFrame
+
+    :param weightDict: weights of the time series (column names as keys)
+    :type weightDict: dict
+
+    :param clusterArguments: arguments of the clustering (argument names as keys)
+    :type clusterArguments: dict
+
+    :return: hexadecimal SHA-256 hash
+    :rtype: string
+    """
+    hasher = hashlib.sha256()
+    hasher.update(np.ascontiguousarray(timeSeriesData.values, dtype=float).tobytes())
+    hasher.update(repr((list(timeSeriesData.columns), sorted(weightDict.items()),
+                        sorted(clusterArguments.items(), key=lambda item: item[0]))).encode())
+    return hasher.hexdigest()
+
+
+def readClusterCache(cacheDirectory, key):
+    """
+    Return the cluster cache entry with the given key or None if the cache directory does not contain such an entry.
+    """
+    fileName = os.path.join(cacheDirectory, key + '.pkl')
+    if not os.path.isfile(fileName):
+        return None
+    with open(fileName, 'rb') as f:
+        return pickle.load(f)
+
+
+def writeClusterCache(cacheDirectory, key, entry):
+    """
+    Write an entry to the cluster cache. The entry is first written to a temporary file which is then renamed, so that
+    concurrent runs which share the cache directory never read incomplete entries.
+    """
+    os.makedirs(cacheDirectory, exist_ok=True)
+    fileName = os.path.join(cacheDirectory, key + '.pkl')
+    with open(fileName + '.' + str(os.getpid()) + '.tmp', 'wb') as f:
+        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(fileName + '.' + str(os.getpid()) + '.tmp', fileName)
+
+
+def checkDeclareOptimizationProblemInput(timeSeriesAggregation, isTimeSeriesDataClustered, backend='pyomo',
+                                         mutableParameters=False, profile=False, operationBounds=False):
     if not isinstance(timeSeriesAggregation, bool):
         raise TypeError('The timeSeriesAggregation parameter has to be a boolean.')
 
@@ -779,10 +836,24 @@ def checkDeclareOptimizationProblemInput(timeSeriesAggregation, isTimeSeriesData
         raise ValueError('The time series flag indicates possible inconsistencies in the aggregated time series '
                          ' data.\n--> Call the cluster function first, then the optimize function.')
 
+    if backend not in ['pyomo', 'matrix']:
+        raise ValueError("The backend parameter has to be either 'pyomo' or 'matrix'.")
+
+    if not isinstance(mutableParameters, bool):
+        raise TypeError('The mutableParameters parameter has to be a boolean.')
+
+    if not isinstance(profile, bool):
+        raise TypeError('The profile parameter has to be a boolean.')
+
+    if not isinstance(operationBounds, bool):
+        raise TypeError('The operationBounds parameter has to be a boolean.')
+
 
 def checkOptimizeInput(timeSeriesAggregation, isTimeSeriesDataClustered, logFileName, threads, solver,
-                       timeLimit, optimizationSpecs, warmstart):
-    checkDeclareOptimizationProblemInput(timeSeriesAggregation, isTimeSeriesDataClustered)
+                       timeLimit, optimizationSpecs, warmstart, backend='pyomo', mutableParameters=False,
+                       profile=False, resultsMode='eager', operationBounds=False):
+    checkDeclareOptimizationProblemInput(timeSeriesAggregation, isTimeSeriesDataClustered, backend, mutableParameters,
+                                         profile, operationBounds)
 
     if not isinstance(logFileName, str):
         raise TypeError('The logFileName parameter has to be a string.')
@@ -802,6 +873,49 @@ def checkOptimizeInput(timeSeriesAggregation, isTimeSeriesDataClustered, logFile
     if not isinstance(warmstart, bool):
         raise ValueError('The warmstart parameter has to be a boolean.')
 
+    if resultsMode not in ['eager', 'lazy']:
+        raise ValueError("The resultsMode parameter has to be either 'eager' or 'lazy'.")
+
+
+class SolutionValues(object):
+    """
+    Optimal values of an indexed pyomo variable. Like the pyomo variable itself, the values are returned as a
+    dictionary by the get_values function. The index sets of the variable (see getVariableIndexSets) are kept in the
+    indexSets attribute.
+    """
+    def __init__(self, values, indexSets=None):
+        self.values = values
+        self.indexSets = indexSets
+
+    def get_values(self):
+        return self.values
+
+
+class SolutionSnapshot(object):
+    """
+    Copy of the optimal values of all variables of a pyomo model. The snapshot provides the optimal values of each
+    variable under the name of the variable (see SolutionValues) and the hasTSA, hasSegmentation and
+    hasMutableParameters flags of the pyomo model. It can therefore replace the pyomo model in the setOptimalValues
+    functions of the modeling classes after the pyomo model was solved again or was declared anew.
+
+    :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+    :type pyM: pyomo ConcreteModel
+    """
+    def __init__(self, pyM):
+        for var in pyM.component_objects(pyomo.Var, descend_into=False):
+            setattr(self, var.local_name, SolutionValues(var.get_values(), getVariableIndexSets(var)))
+        for flag in ['hasTSA', 'hasSegmentation', 'hasMutableParameters']:
+            setattr(self, flag, getattr(pyM, flag, False))
+
+
+def isPersistentSolver(solver):
+    """
+    Check if the solver is a persistent pyomo solver (e.g. 'gurobi_persistent', 'cplex_persistent') or an appsi
+    solver (e.g. 'appsi_highs', 'appsi_cbc'). For these solvers, the pyomo model is only handed over once and later
+    changes are pushed incrementally to the solver.
+    """
+    return solver.endswith('_persistent') or solver.startswith('appsi_')
+
 
 def setFormattedTimeSeries(timeSeries):
     if timeSeries is None:
@@ -812,6 +926,89 @@ def setFormattedTimeSeries(timeSeries):
         return data.set_index(['Period', 'TimeStep'])
 
 
+class TimeSeriesArray(object):
+    """
+    Array-backed storage of a time series which is given by a DataFrame with a (Period, TimeStep) MultiIndex and
+    one column per location (or connection). The values are stored in a contiguous float64 array of shape
+    (periods, time steps, locations) such that the constraint rules look up single values by plain array indexing:
+    ``timeSeries[loc][p, t]``. The DataFrame is only built on demand (see frame).
+    """
+
+    def __init__(self, data):
+        """
+        Constructor for creating a TimeSeriesArray.
+
+        :param data: time series with a (Period, TimeStep) MultiIndex; the time steps of each period have to be
+            numbered from 0 on
+        :type data: pandas DataFrame
+        """
+        periods = list(data.index.get_level_values(0).unique())
+        numberOfTimeSteps = int(data.index.get_level_values(1).max()) + 1 if len(data) > 0 else 0
+        self.columns = list(data.columns)
+        self.locationIndex = {loc: i for i, loc in enumerate(self.columns)}
+        self.periodIndex = {p: i for i, p in enumerate(periods)}
+        self.indexNames = list(data.index.names)
+        index = pd.MultiIndex.from_product([periods, range(numberOfTimeSteps)])
+        self.values = np.ascontiguousarray(
+            data.reindex(index).values.astype(float).reshape(len(periods), numberOfTimeSteps, len(self.columns)))
+        self._frame = None
+
+    def __getitem__(self, loc):
+        return TimeSeriesArrayColumn(self.values[:, :, self.locationIndex[loc]], self.periodIndex)
+
+    def __contains__(self, loc):
+        return loc in self.locationIndex
+
+    @property
+    def frame(self):
+        """
+        Return the time series as a DataFrame with a (Period, TimeStep) MultiIndex (built on first access).
+        """
+        if self._frame is None:
+            index = pd.MultiIndex.from_product([list(self.periodIndex.keys()), range(self.values.shape[1])],
+                                               names=self.indexNames)
+            self._frame = pd.DataFrame(self.values.reshape(-1, len(self.columns)), index=index,
+                                       columns=self.columns)
+        return self._frame
+
+    def __getstate__(self):
+        # the DataFrame is rebuilt on demand after unpickling
+        state = self.__dict__.copy()
+        state['_frame'] = None
+        return state
+
+
+class TimeSeriesArrayColumn(object):
+    """
+    Values of one location of a TimeSeriesArray with the shape (periods, time steps), indexed by [p, t].
+    """
+
+    def __init__(self, values, periodIndex):
+        self.values, self.periodIndex = values, periodIndex
+
+    def __getitem__(self, key):
+        return self.values[self.periodIndex[key[0]], key[1]]
+
+    def getTimeSetArray(self, pyM):
+        """
+        Return the values in the order of pyM.timeSet.
+
+        :rtype: numpy array
+        """
+        periods, timeSteps = zip(*pyM.timeSet) if len(pyM.timeSet) > 0 else ((), ())
+        return self.values[[self.periodIndex[p] for p in periods], list(timeSteps)]
+
+
+def setTimeSeriesArray(timeSeries):
+    """
+    Return the array-backed representation (TimeSeriesArray) of a time series with a (Period, TimeStep) MultiIndex.
+    Other data (e.g. None or constant conversion factors) is returned unchanged.
+    """
+    if not isinstance(timeSeries, pd.DataFrame):
+        return timeSeries
+    return TimeSeriesArray(timeSeries)
+
+
 def buildFullTimeSeries(df, periodsOrder, axis=1, esM=None, divide=True):
     # If segmentation is chosen, the segments of each period need to be unravelled to the original number of
     # time steps first
@@ -842,7 +1039,8 @@ def buildFullTimeSeries(df, periodsOrder, axis=1, esM=None, divide=True):
     return pd.concat(data, axis=axis, ignore_index=True)
 
 
-def formatOptimizationOutput(data, varType, dimension, periodsOrder=None, compDict=None, esM=None):
+def formatOptimizationOutput(data, varType, dimension, periodsOrder=None, compDict=None, esM=None,
+                             indexSets=None):
     '''
     Functionality for formatting the optimization output. The function is used in the 
     setOptimalValues()-method of the ComponentModel class. 
@@ -883,6 +1081,11 @@ def formatOptimizationOutput(data, varType, dimension, periodsOrder=None, compDi
         |br| * the default value is None
     :type esM: EnergySystemModel instance
 
+    :param indexSets: index sets of the operation variables (see getVariableIndexSets). If given, the rows and columns
+        of the formatted operation variables are taken from the index sets instead of the keys of data.
+        |br| * the default value is None
+    :type indexSets: tuple of two lists or None
+
     :return: formatted version of data. If data is an empty dictionary, it returns None.
     :rtype: pandas DataFrame
     '''
@@ -917,6 +1120,10 @@ def formatOptimizationOutput(data, varType, dimension, periodsOrder=None, compDi
         # Get rid of the unnecessary 0 level
         df.columns = df.columns.droplevel()
         return df
+    elif varType == 'operationVariables' and dimension in ['1dim', '2dim'] and len(next(iter(data))) == 4:
+        # Operation variables indexed by (location, component, period, time step) are formatted with array
+        # operations (see formatOperationVariablesOutput)
+        return formatOperationVariablesOutput(data, dimension, periodsOrder, compDict, esM, indexSets)
     elif varType == 'operationVariables' and dimension == '1dim':
         # Convert dictionary to DataFrame, transpose, put the period column first and sort the index
         # Results in a one dimensional DataFrame
@@ -951,6 +1158,103 @@ def formatOptimizationOutput(data, varType, dimension, periodsOrder=None, compDi
                          'and the dimension parameter has to be either \'1dim\' or \'2dim\'.')
 
 
+def formatOperationVariablesOutput(data, dimension, periodsOrder, compDict=None, esM=None, indexSets=None):
+    """
+    Format optimal values of operation variables with the keys (location, component, period, time step) into a
+    DataFrame with the components and locations as index and the time steps of the full time horizon as columns.
+    The rows are given by the (location, component) index set of the variable and the columns by the periods and
+    time steps of its (period, time step) index set. The values are read in this known order and written into a
+    preallocated NumPy array with the shape (rows, periods, time steps). The full time series is then obtained with
+    a single fancy-index over the periodsOrder (and the segments, if segmentation is used) and a reshape. The resulting
+    DataFrame has the same layout as the one obtained with buildFullTimeSeries. Its values always have the dtype
+    float64; variables without a value (None) are given as NaN.
+
+    :param data: optimized values given as dictionary with the keys (location, component, period, time step)
+    :type data: dict
+
+    :param dimension: dimension of the data ('1dim' or '2dim')
+    :type dimension: string
+
+    :param periodsOrder: order of the periods of the time series data (see formatOptimizationOutput)
+    :type periodsOrder: list
+
+    :param compDict: dictionary of the component instances of interest (required if dimension is '2dim')
+    :type compDict: dict
+
+    :param esM: EnergySystemModel instance representing the energy system in which the components are modeled
+        (required if segmentation is used)
+    :type esM: EnergySystemModel instance
+
+    :param indexSets: (location, component) index set and (period, time step) index set of the variable (see
+        getVariableIndexSets). If None, the index sets are collected from the keys of data.
+        |br| * the default value is None
+    :type indexSets: tuple of two lists or None
+
+    :return: formatted version of data
+    :rtype: pandas DataFrame
+    """
+    # Read the values in the order of the index sets. The values of a pyomo variable are already given in the order
+    # of its index sets (the number of values and the first and last key are checked). Otherwise, e.g. if the index
+    # sets are collected from the keys of data, the values are looked up one by one.
+    if indexSets is not None and len(data) == len(indexSets[0]) * len(indexSets[1]) and \
+            next(iter(data)) == indexSets[0][0] + indexSets[1][0] and \
+            next(reversed(data)) == indexSets[0][-1] + indexSets[1][-1]:
+        rowSet, timeSet = indexSets
+        values = np.array(list(data.values()), dtype=float)
+    else:
+        rowSet, timeSet = indexSets if indexSets is not None else \
+            (list(dict.fromkeys(key[:2] for key in data)), list(dict.fromkeys(key[2:] for key in data)))
+        values = np.array([data.get(row + timeStep) for row in rowSet for timeStep in timeSet], dtype=float)
+    values = values.reshape(len(rowSet), len(timeSet))
+
+    # Sort the rows by their labels (component and location (1dim) or connection (2dim))
+    if dimension == '1dim':
+        rowLabels = [(comp, loc) for loc, comp in rowSet]
+    else:
+        rowLabels = [(comp,) + compDict[comp]._mapC[loc] for loc, comp in rowSet]
+    order = sorted(range(len(rowLabels)), key=rowLabels.__getitem__)
+
+    # Write the values into an array with the shape (rows, periods, time steps)
+    periods, timeSteps = sorted(set(p for p, _ in timeSet)), sorted(set(t for _, t in timeSet))
+    periodIndex = {p: i for i, p in enumerate(periods)}
+    timeStepIndex = {t: i for i, t in enumerate(timeSteps)}
+    values3dim = np.full((len(rowSet), len(periods), len(timeSteps)), np.nan)
+    values3dim[:, [periodIndex[p] for p, _ in timeSet], [timeStepIndex[t] for _, t in timeSet]] = values[order]
+
+    # If segmentation is chosen, the segments of each period are unravelled to the original number of time steps
+    # and the values are divided by the number of time steps per segment
+    if esM is not None and esM.segmentation:
+        repetitions = np.array([esM.timeStepsPerSegment.loc[p].loc[timeSteps].values for p in periods])
+        segments = np.array([np.repeat(np.arange(len(timeSteps)), reps) for reps in repetitions])
+        values3dim = values3dim[:, np.arange(len(periods))[:, None], segments] / \
+            repetitions[np.arange(len(periods))[:, None], segments]
+
+    # Concat data according to periods order to cover the full time horizon
+    values3dim = values3dim[:, [periodIndex[p] for p in periodsOrder], :]
+    return pd.DataFrame(values3dim.reshape(len(rowSet), -1),
+                        index=pd.MultiIndex.from_tuples([rowLabels[i] for i in order]))
+
+
+def getVariableIndexSets(var):
+    """
+    Return the index sets of a variable which is indexed by a (location, component) set and a (period, time step)
+    set as lists (e.g. the operation variables). None is returned for variables which are indexed differently.
+
+    :param var: pyomo variable or optimal values of a variable (see SolutionValues)
+    :type var: pyomo Var or SolutionValues
+
+    :rtype: tuple of two lists or None
+    """
+    if isinstance(var, SolutionValues):
+        return var.indexSets
+    if var.dim() != 4:
+        return None
+    subsets = list(var.index_set().subsets())
+    if len(subsets) != 2 or any(subset.dimen != 2 for subset in subsets):
+        return None
+    return list(subsets[0]), list(subsets[1])
+
+
 def setOptimalComponentVariables(optVal, varType, compDict):
     if optVal is not None:
         for compName, comp in compDict.items():
@@ -1003,6 +1307,173 @@ def map2dimData(data, mapC):
         return data
 
 
+def getTimeSetArray(pyM, data):
+    """
+    Return the values of a (period, time step) indexed Series aligned with the ordering of pyM.timeSet.
+
+    :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+    :type pyM: pyomo ConcreteModel
+
+    :param data: time dependent data with a (period, time step) MultiIndex
+    :type data: pandas Series or TimeSeriesArrayColumn
+
+    :return: values of the data in the order of pyM.timeSet
+    :rtype: numpy array
+    """
+    if isinstance(data, TimeSeriesArrayColumn):
+        return data.getTimeSetArray(pyM)
+    return data.reindex(pd.MultiIndex.from_tuples(list(pyM.timeSet))).values.astype(float)
+
+
+def declareMatrixConstraint(pyM, constrName, blocks, lower, upper):
+    """
+    Declare a family of linear constraints lower <= A x <= upper as a pyomo MatrixConstraint. The coefficient
+    matrix is stored in compressed sparse row format and no pyomo expression is created for the single rows.
+    The rows are given in blocks. Within a block, every row has the same number of terms; a term is given by a list
+    of pyomo variables (one per row) and the corresponding coefficients (one per row or a scalar). The index of the
+    rows is stored in the rowIndex attribute of the constraint.
+
+    :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+    :type pyM: pyomo ConcreteModel
+
+    :param constrName: name of the constraint in the pyomo ConcreteModel
+    :type constrName: string
+
+    :param blocks: blocks of rows given as (rowIndex, terms) tuples. The rowIndex is a list with the index of
+        the rows (e.g. (loc, compName, p, t) tuples) and terms is a list of (variables, coefficients) tuples.
+    :type blocks: list of tuples
+
+    :param lower: lower bounds of the rows or None if the rows are not bounded from below
+    :type lower: numpy array or None
+
+    :param upper: upper bounds of the rows or None if the rows are not bounded from above
+    :type upper: numpy array or None
+    """
+    from pyomo.core.base.matrix_constraint import MatrixConstraint
+
+    columns, columnIds = [], {}
+    rowIndex, data, indices, indptr = [], [], [], [0]
+    for blockIndex, terms in blocks:
+        nRows, nTerms = len(blockIndex), len(terms)
+        blockIndices = np.empty((nRows, nTerms), dtype=np.int64)
+        blockData = np.empty((nRows, nTerms))
+        for j, (variables, coefficients) in enumerate(terms):
+            for i, var in enumerate(variables):
+                columnId = columnIds.get(id(var))
+                if columnId is None:
+                    columnId = columnIds[id(var)] = len(columns)
+                    columns.append(var)
+                blockIndices[i, j] = columnId
+            blockData[:, j] = coefficients
+        rowIndex.extend(blockIndex)
+        data.extend(blockData.ravel().tolist())
+        indices.extend(blockIndices.ravel().tolist())
+        indptr.extend(range(indptr[-1] + nTerms, indptr[-1] + nRows * nTerms + 1, nTerms) if nTerms > 0
+                      else [indptr[-1]] * nRows)
+
+    lower = [None] * len(rowIndex) if lower is None else np.asarray(lower, dtype=float).tolist()
+    upper = [None] * len(rowIndex) if upper is None else np.asarray(upper, dtype=float).tolist()
+    constr = MatrixConstraint(data, indices, indptr, lower, upper, columns)
+    constr.rowIndex = rowIndex
+    setattr(pyM, constrName, constr)
+
+
+def getNewComponentSizes(pyM):
+    """
+    Return the number of variables, constraints and nonzeros of the variables, constraints and objectives of the
+    pyomo model which were not yet considered in a previous call of this function. The considered components are
+    stored in pyM.profiledComponents.
+
+    :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+    :type pyM: pyomo ConcreteModel
+
+    :return: number of variables, constraints and nonzeros
+    :rtype: tuple of integers
+    """
+    from pyomo.core.base.matrix_constraint import MatrixConstraint
+    from pyomo.core.expr.current import identify_variables
+
+    nVariables, nConstraints, nNonzeros = 0, 0, 0
+    for component in pyM.component_objects([pyomo.Var, pyomo.Constraint, pyomo.Objective]):
+        if id(component) in pyM.profiledComponents:
+            continue
+        pyM.profiledComponents.add(id(component))
+        if component.ctype is pyomo.Var:
+            nVariables += len(component)
+        elif isinstance(component, MatrixConstraint):
+            nConstraints += len(component)
+            nNonzeros += len(component._A_data)
+        elif component.ctype is pyomo.Constraint:
+            nConstraints += len(component)
+            nNonzeros += sum(len(list(identify_variables(constr.body, include_fixed=False)))
+                             for constr in component.values())
+        else:
+            nNonzeros += sum(len(list(identify_variables(obj.expr, include_fixed=False)))
+                             for obj in component.values())
+    return nVariables, nConstraints, nNonzeros
+
+
+def addProfileEntry(esM, stage, name, timeStart, modelingClass=None):
+    """
+    Add an entry with the run time of a phase of the optimization to esM.solverSpecs['profile'][stage]. If the
+    optimization problem was declared with profile=True, the number of variables, constraints and nonzeros which were
+    created in a phase of the build stage are added to the entry as well (otherwise they are None).
+
+    :param esM: EnergySystemModel instance which is optimized
+    :type esM: EnergySystemModel instance
+
+    :param stage: stage of the optimization ('build', 'solve' or 'postprocess')
+    :type stage: string
+
+    :param name: name of the phase (e.g. 'declareVariables')
+    :type name: string
+
+    :param timeStart: starting time of the phase
+    :type timeStart: float
+
+    :param modelingClass: name of the modeling class for which the phase was executed or None
+    :type modelingClass: string or None
+    """
+    entry = {'name': name, 'modelingClass': modelingClass, 'time': time.time() - timeStart,
+             'variables': None, 'constraints': None, 'nonzeros': None}
+    if stage == 'build' and esM.pyM.profiledComponents is not None:
+        entry['variables'], entry['constraints'], entry['nonzeros'] = getNewComponentSizes(esM.pyM)
+    esM.solverSpecs['profile'][stage].append(entry)
+
+
+@contextmanager
+def profileSolverPhases(esM, optimizer):
+    """
+    Context manager which adds the run times of writing the optimization problem, of the solver process and of
+    loading the solution to esM.solverSpecs['profile']['solve'] while the optimizer solves the problem. Phases which
+    are not exposed by the optimizer (e.g. writing the problem file with appsi solvers) are not listed separately.
+
+    :param esM: EnergySystemModel instance which is optimized
+    :type esM: EnergySystemModel instance
+
+    :param optimizer: pyomo solver instance
+    """
+    phases = {'_presolve': 'writeProblem', '_apply_solver': 'solverProcess', '_postsolve': 'loadSolution'}
+
+    def timePhase(method, name):
+        def timedMethod(*args, **kwargs):
+            _t = time.time()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                addProfileEntry(esM, 'solve', name, _t)
+        return timedMethod
+
+    wrapped = [method for method in phases if hasattr(optimizer, method)]
+    for method in wrapped:
+        setattr(optimizer, method, timePhase(getattr(optimizer, method), phases[method]))
+    try:
+        yield
+    finally:
+        for method in wrapped:
+            delattr(optimizer, method)
+
+
 def output(output, verbose, val):
     if verbose == val:
         print(output)
@@ -119,3 +119,29 @@ def test_DSM(dsm_test_esM):
     pd.testing.assert_series_equal(generator_outputs.loc[('cheap', 'location')], cheap_with_dsm)
     pd.testing.assert_series_equal(generator_outputs.loc[('expensive', 'location')], expensive_with_dsm)
     pd.testing.assert_series_equal(esM_load_with_DSM.loc[('flexible demand', 'location')], load_with_dsm)
+
+
+def test_DSMShiftWindows(dsm_test_esM):
+    """
+    Check that the precomputed shift windows of a DSM component match the operation costs and maximum charging rates
+    of its virtual storage components.
+    """
+    esM, load_without_dsm, _, _, _, _ = dsm_test_esM
+    tFwd, tBwd = 2, 3
+    esM.add(fn.DemandSideManagementBETA(esM=esM, name='flexible demand', commodity='electricity',
+                                        hasCapacityVariable=False, tFwd=tFwd, tBwd=tBwd,
+                                        operationRateFix=load_without_dsm, opexShift=1,
+                                        shiftDownMax=10, shiftUpMax=10, socOffsetDown=-1, socOffsetUp=-1))
+    esM.declareOptimizationProblem(timeSeriesAggregation=False)
+
+    storNames, downIndices, chargeOpRatesMax = \
+        esM.componentModelingDict['DSMModel'].getShiftWindows(esM.pyM, esM)['flexible demand']
+    assert storNames == ['flexible demand_' + str(i) for i in range(tFwd + tBwd + 1)]
+    assert chargeOpRatesMax['location'].shape == (len(storNames), len(esM.pyM.timeSet))
+    for ix, (p, t) in enumerate(esM.pyM.timeSet):
+        ixDown = downIndices['location'][ix]
+        stor = esM.getComponent(storNames[ixDown])
+        assert stor.processedOpexPerChargeOpTimeSeries['location'][p, t] == 0
+        assert all(esM.getComponent(storName).processedOpexPerChargeOpTimeSeries['location'][p, t] != 0
+                   for storName in storNames[:ixDown])
+        assert chargeOpRatesMax['location'][ixDown, ix] == stor.processedChargeOpRateMax['location'][p, t]
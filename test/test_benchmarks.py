@@ -0,0 +1,26 @@
+import FINE.benchmarks as fnb
+import os
+
+
+def test_scalingBenchmark(tmpdir):
+    '''
+    Run a small synthetic scaling benchmark, write it as a baseline and compare a second run against it.
+    '''
+    fileName = os.path.join(str(tmpdir), 'baseline')
+    baseline = fnb.runScalingBenchmark(numbersOfLocations=(2,), numbersOfTimeSteps=(48,), numbersOfComponents=(1,),
+                                       clusterSettings=(None, (1, 24)), solver='glpk', outputFileName=fileName)
+    assert [result['case']['numberOfTypicalPeriods'] for result in baseline['results']] == [None, 1]
+    assert baseline['results'][1]['name'].startswith('L2_T48_C1_TSA1x24_pyomo')
+    for result in baseline['results']:
+        assert result['name'] == fnb.getBenchmarkCaseName(result['case'])
+        assert result['peakMemory'] > 0
+        assert result['objectiveValue'] > 0
+        assert set(result['times']) == {'generate', 'cluster', 'declareOptimizationProblem', 'solve',
+                                        'setOptimalValues', 'total'}
+
+    benchmark = fnb.runScalingBenchmark(numbersOfLocations=(2,), numbersOfTimeSteps=(48,), numbersOfComponents=(1,),
+                                        clusterSettings=(None,), solver='glpk', trackMemory=False)
+    comparison = fnb.compareBenchmarkResults(fileName + '.json', benchmark)
+    assert list(comparison.index.get_level_values('case').unique()) == [baseline['results'][0]['name']]
+    assert (comparison.loc[(slice(None), ['variables', 'constraints']), 'relativeChange'] == 0).all()
+    assert 'peakMemory' not in comparison.index.get_level_values('metric')
@@ -0,0 +1,85 @@
+import FINE as fn
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def getExpansionEsM(withStorage=False):
+    locations = ['coast', 'city']
+    esM = fn.EnergySystemModel(locations=set(locations), commodities={'electricity'}, numberOfTimeSteps=24,
+                               commodityUnitsDict={'electricity': r'kW$_{el}$'}, hoursPerTimeStep=1, costUnit='1 Euro',
+                               lengthUnit='km', verboseLogLevel=2)
+
+    esM.add(fn.Source(esM=esM, name='Wind', commodity='electricity', hasCapacityVariable=True,
+                      hasIsBuiltBinaryVariable=True, bigM=30, capacityMax=pd.Series([30., 5.], index=locations),
+                      investPerCapacity=pd.Series([4e4, 9e4], index=locations),
+                      investIfBuilt=pd.Series([1e5, 2e4], index=locations), interestRate=0., economicLifetime=1,
+                      operationRateMax=pd.DataFrame({'coast': [.9, .7, .2, .1, .4, .8] * 4,
+                                                     'city': [.5, .4, .1, .1, .2, .4] * 4})))
+    esM.add(fn.Source(esM=esM, name='Gas plant', commodity='electricity', hasCapacityVariable=False,
+                      opexPerOperation=pd.Series([35., 30.], index=locations)))
+    if withStorage:
+        esM.add(fn.Storage(esM=esM, name='Battery', commodity='electricity', hasCapacityVariable=True,
+                           capacityMax=pd.Series(10., index=locations), investPerCapacity=20., interestRate=0.,
+                           economicLifetime=1, chargeEfficiency=0.9, dischargeEfficiency=0.9))
+    esM.add(fn.Transmission(esM=esM, name='Cables', commodity='electricity', hasCapacityVariable=True,
+                            capacityMax=10., investPerCapacity=5., interestRate=0., economicLifetime=1,
+                            opexPerOperation=0.1))
+    esM.add(fn.Sink(esM=esM, name='Demand', commodity='electricity', hasCapacityVariable=False,
+                    operationRateFix=pd.DataFrame({'coast': [1.] * 24, 'city': [3., 4., 5., 6., 5., 4.] * 4})))
+    return esM
+
+
+def test_bendersDecomposition():
+    '''
+    Check that the Benders decomposition with several subproblems yields the optimal value of the full optimization.
+    '''
+    esM = getExpansionEsM()
+    esM.optimize(solver='glpk')
+    objectiveValue = esM.objectiveValue
+    isBuilt = esM.componentModelingDict['SourceSinkModel'].isBuiltVariablesOptimum.copy()
+
+    summary = fn.optimizeBenders(esM, numberOfBlocks=3, maxWorkers=2, solver='glpk')
+    assert np.isclose(esM.objectiveValue, objectiveValue, rtol=1e-4)
+    assert esM.lowerBound <= esM.upperBound * (1 + 1e-6) and esM.gap <= 1e-4
+    assert (summary['lowerBound'].diff().dropna() >= -1e-6).all()
+    assert (esM.componentModelingDict['SourceSinkModel'].isBuiltVariablesOptimum.fillna(-1) ==
+            isBuilt.fillna(-1)).all().all()
+    opVal = esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum
+    assert list(opVal.columns) == list(range(24))
+    capacities = esM.componentModelingDict['SourceSinkModel'].capacityVariablesOptimum
+    assert (opVal.loc['Wind'].max(axis=1) <= capacities.loc['Wind'] + 1e-6).all()
+
+
+def test_bendersDecompositionStorage():
+    '''
+    Check the Benders decomposition with time series aggregation and a single subproblem for a model with a storage
+    component.
+    '''
+    esM = getExpansionEsM(withStorage=True)
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=6)
+    esM.optimize(timeSeriesAggregation=True, solver='glpk')
+    objectiveValue = esM.objectiveValue
+
+    fn.optimizeBenders(esM, numberOfBlocks=1, timeSeriesAggregation=True, solver='glpk')
+    assert np.isclose(esM.objectiveValue, objectiveValue, rtol=1e-4)
+
+    with pytest.raises(ValueError):
+        fn.optimizeBenders(esM, numberOfBlocks=2, timeSeriesAggregation=True, solver='glpk')
+
+
+def test_bendersDecompositionRevenue():
+    '''
+    Check that the initial relaxation of the subproblems keeps the capacity bounds such that components which earn
+    revenues per unit of capacity do not make it unbounded.
+    '''
+    esM = getExpansionEsM()
+    esM.add(fn.Sink(esM=esM, name='Export', commodity='electricity', hasCapacityVariable=True,
+                    capacityMax=pd.Series([5., 0.], index=['coast', 'city']), commodityRevenue=50.))
+    esM.optimize(solver='glpk')
+    objectiveValue = esM.objectiveValue
+
+    fn.optimizeBenders(esM, numberOfBlocks=2, maxWorkers=1, solver='glpk')
+    assert np.isclose(esM.objectiveValue, objectiveValue, rtol=1e-4)
+    capacities = esM.componentModelingDict['SourceSinkModel'].capacityVariablesOptimum
+    assert capacities.loc['Export', 'coast'] <= 5. + 1e-6
@@ -0,0 +1,59 @@
+import copy
+import FINE as fn
+import pandas as pd
+import os
+
+
+def test_clusterCache(minimal_test_esM, tmpdir, monkeypatch):
+    '''
+    Get the minimal test system, cluster it with a cache directory and check that the second clustering with the same
+    time series data is loaded from the cache while changed time series data or arguments are clustered again.
+    '''
+    esM = minimal_test_esM
+    cacheDirectory = str(tmpdir)
+
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=1, segmentation=False,
+                cacheDirectory=cacheDirectory)
+    periodsOrder, typicalPeriods = esM.periodsOrder, esM.typicalPeriods
+    data = esM.getComponent('Electricity market').aggregatedCommodityCostTimeSeries.copy()
+    assert len(os.listdir(cacheDirectory)) == 1
+
+    # A cache hit must not call the tsam package
+    def TimeSeriesAggregation(*args, **kwargs):
+        raise AssertionError('The tsam package was called although the cache contains an entry.')
+    monkeypatch.setattr(fn.energySystemModel, 'TimeSeriesAggregation', TimeSeriesAggregation)
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=1, segmentation=False,
+                cacheDirectory=cacheDirectory)
+    assert list(esM.periodsOrder) == list(periodsOrder) and list(esM.typicalPeriods) == list(typicalPeriods)
+    pd.testing.assert_frame_equal(esM.getComponent('Electricity market').aggregatedCommodityCostTimeSeries, data)
+    monkeypatch.undo()
+
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=2, segmentation=True,
+                numberOfSegmentsPerPeriod=1, cacheDirectory=cacheDirectory)
+    esM.getComponent('Electricity market').fullCommodityCostTimeSeries.iloc[0] *= 2
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=2, segmentation=True,
+                numberOfSegmentsPerPeriod=1, cacheDirectory=cacheDirectory)
+    assert len(os.listdir(cacheDirectory)) == 3
+    esM.optimize(timeSeriesAggregation=True, solver='glpk')
+
+
+def test_clusterCacheTemporalResolution(minimal_test_esM, tmpdir):
+    '''
+    Get the minimal test system and a copy with the same time series data at a different temporal resolution and
+    check that clustering both with the same hours per period does not share a cache entry.
+    '''
+    esM = minimal_test_esM
+    esM_coarse = copy.deepcopy(esM)
+    esM_coarse.hoursPerTimeStep = 2 * esM.hoursPerTimeStep
+    cacheDirectory = str(tmpdir)
+
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=2, cacheDirectory=cacheDirectory)
+    esM_coarse.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=1, cacheDirectory=cacheDirectory)
+    assert len(os.listdir(cacheDirectory)) == 2
+    data = esM_coarse.getComponent('Electricity market').aggregatedCommodityCostTimeSeries.copy()
+    periodsOrder = list(esM_coarse.periodsOrder)
+
+    esM_coarse.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=1)
+    assert list(esM_coarse.periodsOrder) == periodsOrder
+    pd.testing.assert_frame_equal(esM_coarse.getComponent('Electricity market').aggregatedCommodityCostTimeSeries,
+                                  data)
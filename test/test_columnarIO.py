@@ -0,0 +1,42 @@
+import FINE as fn
+import pandas as pd
+import pytest
+import os
+
+
+@pytest.mark.parametrize('fileFormat', ['Parquet', 'HDF5'])
+def test_columnarOptimizationOutput(minimal_test_esM, tmpdir, fileFormat):
+    '''
+    Get the minimal test system, write its optimization output to Parquet or HDF5 files and read it into a second
+    energy system model.
+    '''
+    pytest.importorskip('pyarrow' if fileFormat == 'Parquet' else 'tables')
+    esM = minimal_test_esM
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=2, segmentation=True,
+                numberOfSegmentsPerPeriod=1)
+    esM.optimize(timeSeriesAggregation=True, solver='glpk')
+
+    fileName = os.path.join(str(tmpdir), 'scenarioOutput')
+    getattr(fn, 'writeOptimizationOutputTo' + fileFormat)(esM, fileName, optSumOutputLevel=0, optValOutputLevel=0)
+    if fileFormat == 'HDF5':
+        fileName += '.h5'
+
+    metadata = fn.readOptimizationOutputMetadata(fileName)
+    assert metadata['periodsOrder'] == list(esM.periodsOrder)
+    assert metadata['timeStepsPerSegment'] == {str(p): [2] for p in esM.typicalPeriods}
+
+    esM_ = esM.__class__(locations=esM.locations, commodities=esM.commodities, numberOfTimeSteps=4,
+                         commodityUnitsDict=esM.commodityUnitsDict, hoursPerTimeStep=2190, costUnit='1 Euro',
+                         lengthUnit='km', verboseLogLevel=2)
+    for comp in esM.componentNames:
+        esM_.add(esM.getComponent(comp))
+    getattr(fn, 'readOptimizationOutputFrom' + fileFormat)(esM_, fileName)
+
+    for mdl in esM.componentModelingDict:
+        pd.testing.assert_frame_equal(esM_.getOptimizationSummary(mdl), esM.getOptimizationSummary(mdl).astype(float))
+    pd.testing.assert_frame_equal(esM_.componentModelingDict['StorageModel'].chargeOperationVariablesOptimum,
+                                  esM.componentModelingDict['StorageModel'].chargeOperationVariablesOptimum,
+                                  check_names=False)
+    pd.testing.assert_frame_equal(esM_.componentModelingDict['TransmissionModel'].operationVariablesOptimum,
+                                  esM.componentModelingDict['TransmissionModel'].operationVariablesOptimum,
+                                  check_names=False)
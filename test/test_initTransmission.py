@@ -128,4 +128,74 @@ def test_initializeTransmission_withSeries():
 
 
 
-    
\ No newline at end of file
+    
+def test_transmissionConnectionArrays():
+    '''
+    Tests if the connections of Transmission and LinearOptimalPowerFlow components are interned to integer ids and
+    if the commodity balances and the power flow constraints are declared with the aligned connection data.
+    '''
+    locations = ['cluster_1', 'cluster_2', 'cluster_3']
+    esM = fn.EnergySystemModel(locations=set(locations), commodities={'electricity'}, numberOfTimeSteps=4,
+                               commodityUnitsDict={'electricity': 'kW'},
+                               hoursPerTimeStep=1, costUnit='cost_unit', lengthUnit='length_unit')
+
+    esM.add(fn.Source(esM=esM, name='Generator', commodity='electricity', hasCapacityVariable=False,
+                      locationalEligibility=pd.Series([1, 0, 0], index=locations),
+                      commodityCostTimeSeries=pd.DataFrame({'cluster_1': [1., 2., 1., 2.], 'cluster_2': [0.] * 4,
+                                                                        'cluster_3': [0.] * 4})))
+    esM.add(fn.Sink(esM=esM, name='Demand', commodity='electricity', hasCapacityVariable=False,
+                    operationRateFix=pd.DataFrame({'cluster_1': [0.] * 4, 'cluster_2': [1., 2., 3., 2.],
+                                                   'cluster_3': [2., 1., 0., 1.]})))
+
+    elig_df = pd.DataFrame([[0, 1, 0], [1, 0, 1], [0, 1, 0]], index=locations, columns=locations)
+    distances = pd.DataFrame(10., index=locations, columns=locations)
+    esM.add(fn.Transmission(esM=esM, name='Cables', commodity='electricity', hasCapacityVariable=True,
+                            locationalEligibility=elig_df, distances=distances * elig_df, losses=0.01,
+                            capacityMax=10, investPerCapacity=1., interestRate=0., economicLifetime=1,
+                            opexPerOperation=0.001))
+
+    reactances = pd.DataFrame(0.1, index=locations, columns=locations)
+    esM.add(fn.LinearOptimalPowerFlow(esM=esM, name='AC lines', commodity='electricity', hasCapacityVariable=True,
+                                      reactances=reactances, capacityFix=elig_df, distances=distances))
+
+    comp = esM.getComponent('Cables')
+    assert comp._connections == [connection for connection in comp._mapC]
+    for i, connection in enumerate(comp._connections):
+        loc1, loc2 = comp._mapC[connection]
+        assert [locations[j] for j in comp._connectionNodes[i]] == [loc1, loc2]
+        assert comp._connections[comp._reverseConnections[i]] == comp._mapI[connection]
+        assert np.isclose(comp._lossFactors[i], 0.9)
+        assert i in comp._incidenceOut[locations.index(loc1)] and i in comp._incidenceIn[locations.index(loc2)]
+    assert len(comp._incidenceIn[locations.index('cluster_2')]) == 2
+    assert np.allclose(esM.getComponent('AC lines')._reactanceValues, 0.1)
+
+    esM.optimize(solver='glpk')
+
+    # The generation equals the demand plus the losses of the cables
+    opVal = esM.componentModelingDict['TransmissionModel'].operationVariablesOptimum
+    lossesCables = 0.1 * opVal.loc['Cables'].values.sum()
+    generation = esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum.loc['Generator'].values.sum()
+    assert np.isclose(generation, 12 + lossesCables)
+
+    # The operation costs are declared for the eligible connections
+    mdl = esM.componentModelingDict['TransmissionModel']
+    assert np.isclose(mdl.getEconomicsTD(esM.pyM, esM, ['opexPerOperation'], 'op', 'operationVarDictOut', True),
+                      0.001 * opVal.loc['Cables'].values.sum() / esM.numberOfYears)
+
+    # The connection arrays are only rebuilt if the losses are changed after the component was added
+    lossFactors = comp._lossFactors
+    esM.declareOptimizationProblem()
+    assert comp._lossFactors is lossFactors
+    comp.losses = comp.losses * 2
+    esM.optimize(solver='glpk')
+    assert np.allclose(comp._lossFactors, 0.8)
+    opVal = esM.componentModelingDict['TransmissionModel'].operationVariablesOptimum
+    generation = esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum.loc['Generator'].values.sum()
+    assert np.isclose(generation, 12 + 0.2 * opVal.loc['Cables'].values.sum())
+
+    # The power flows of the AC lines satisfy the power flow equations
+    flows = esM.componentModelingDict['LOPFModel'].operationVariablesOptimum.loc['AC lines']
+    phaseAngles = esM.componentModelingDict['LOPFModel'].phaseAngleVariablesOptimum.loc['AC lines']
+    for loc1, loc2 in esM.getComponent('AC lines')._mapC.values():
+        assert np.allclose(flows.loc[(loc1, loc2)].values - flows.loc[(loc2, loc1)].values,
+                           (phaseAngles.loc[loc1].values - phaseAngles.loc[loc2].values) / 0.1)
@@ -0,0 +1,34 @@
+import pandas as pd
+import pyomo.environ as pyomo
+
+
+def test_lazyResults(minimal_test_esM):
+    '''
+    Get the minimal test system, optimize it with eagerly and lazily set up results and check that the lazily set up
+    results are only set up on access and are equal to the eagerly set up ones, even if the values of the pyomo
+    variables were changed in the meantime.
+    '''
+    esM = minimal_test_esM
+
+    esM.optimize(solver='glpk')
+    eager = {key: (mdl.getOptimalValues(), esM.getOptimizationSummary(key))
+             for key, mdl in esM.componentModelingDict.items()}
+
+    esM.optimize(solver='glpk', resultsMode='lazy')
+    mdl = esM.componentModelingDict['StorageModel']
+    assert 'optSummary' not in vars(mdl) and 'chargeOperationVariablesOptimum' not in vars(mdl)
+    # only the listed optimal values are set up on access, other attributes do not exist
+    assert not hasattr(mdl, 'someTypo') and not hasattr(mdl, 'operationVariablesOptimum')
+    assert mdl._pendingOptimalValues is not None and 'optSummary' not in vars(mdl)
+    pd.testing.assert_frame_equal(mdl.capacityVariablesOptimum,
+                                  eager['StorageModel'][0]['capacityVariablesOptimum']['values'])
+
+    for var in esM.pyM.component_data_objects(pyomo.Var):
+        var.value = 0
+    for key, mdl in esM.componentModelingDict.items():
+        optimalValues, optSummary = eager[key]
+        pd.testing.assert_frame_equal(esM.getOptimizationSummary(key), optSummary)
+        for name, values in mdl.getOptimalValues().items():
+            if values['values'] is not None:
+                pd.testing.assert_frame_equal(values['values'], optimalValues[name]['values'], check_dtype=False)
+        assert mdl._pendingOptimalValues is None
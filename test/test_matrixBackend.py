@@ -0,0 +1,28 @@
+import FINE as fn
+import numpy as np
+
+
+def test_matrixBackend(minimal_test_esM):
+    '''
+    Get the minimal test system, and check that the pyomo and the matrix backend lead to the same solution, with and
+    without time series aggregation and segmentation.
+    '''
+    esM = minimal_test_esM
+
+    esM.optimize(solver='glpk')
+    objPyomo = esM.pyM.Obj()
+    SPPyomo = fn.getShadowPrices(esM, esM.pyM.ConstrOperation4_srcSnk, dualValues=None, hasTimeSeries=True,
+                                 periodOccurrences=esM.periodOccurrences, periodsOrder=esM.periodsOrder)
+
+    esM.optimize(solver='glpk', backend='matrix')
+    assert np.isclose(esM.pyM.Obj(), objPyomo)
+    SPMatrix = fn.getShadowPrices(esM, esM.pyM.ConstrOperation4_srcSnk, dualValues=None, hasTimeSeries=True,
+                                  periodOccurrences=esM.periodOccurrences, periodsOrder=esM.periodsOrder)
+    assert np.isclose(SPMatrix.sum(), SPPyomo.sum())
+
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=2, segmentation=True,
+                numberOfSegmentsPerPeriod=1, sortValues=False, rescaleClusterPeriods=False)
+    esM.optimize(timeSeriesAggregation=True, solver='glpk')
+    objPyomo = esM.pyM.Obj()
+    esM.optimize(timeSeriesAggregation=True, solver='glpk', backend='matrix')
+    assert np.isclose(esM.pyM.Obj(), objPyomo)
@@ -0,0 +1,66 @@
+import FINE as fn
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def getRenewableEsM():
+    locations = ['loc1', 'loc2']
+    esM = fn.EnergySystemModel(locations=set(locations), commodities={'electricity'}, numberOfTimeSteps=6,
+                               commodityUnitsDict={'electricity': r'kW$_{el}$'}, hoursPerTimeStep=1,
+                               costUnit='1 Euro', lengthUnit='km', verboseLogLevel=2)
+
+    esM.add(fn.Source(esM=esM, name='PV', commodity='electricity', hasCapacityVariable=True,
+                      capacityMax=pd.Series(10., index=locations), investPerCapacity=100., interestRate=0.,
+                      economicLifetime=1,
+                      operationRateMax=pd.DataFrame({loc: [0., .5, 1., .5, 0., 0.] for loc in locations})))
+    esM.add(fn.Source(esM=esM, name='Run-of-river', commodity='electricity', hasCapacityVariable=True,
+                      capacityMax=pd.Series(2., index=locations), investPerCapacity=150., interestRate=0.,
+                      economicLifetime=1,
+                      operationRateFix=pd.DataFrame({'loc1': [0., 1., 1., 0., .5, .5], 'loc2': [0.] * 6})))
+    esM.add(fn.Source(esM=esM, name='Electricity market', commodity='electricity', hasCapacityVariable=False,
+                      operationRateMax=pd.DataFrame({'loc1': [3.] * 6, 'loc2': [0., 1., 2., 3., 2., 1.]}),
+                      commodityCostTimeSeries=pd.DataFrame({loc: [100., 10., 10., 20., 50., 100.]
+                                                            for loc in locations})))
+    esM.add(fn.Storage(esM=esM, name='Battery', commodity='electricity', hasCapacityVariable=True,
+                       capacityMax=pd.Series(10., index=locations), investPerCapacity=20., interestRate=0.,
+                       economicLifetime=1, chargeEfficiency=0.9, dischargeEfficiency=0.9))
+    esM.add(fn.Transmission(esM=esM, name='Cables', commodity='electricity', hasCapacityVariable=True,
+                            capacityMax=5., investPerCapacity=1., interestRate=0., economicLifetime=1))
+    esM.add(fn.Sink(esM=esM, name='Demand', commodity='electricity', hasCapacityVariable=False,
+                    operationRateFix=pd.DataFrame({'loc1': [1., 2., 3., 2., 1., 2.],
+                                                   'loc2': [2., 1., 1., 3., 2., 1.]})))
+    return esM
+
+
+@pytest.mark.parametrize('backend', ['pyomo', 'matrix'])
+def test_operationBounds(backend):
+    '''
+    Check that declaring the operation modes with fixed and maximum operation rates as variable bounds yields the
+    same solution as declaring them as constraints, and that the corresponding constraint rows are not declared.
+    '''
+    esM = getRenewableEsM()
+    esM.optimize(solver='glpk', backend=backend)
+    objective = esM.pyM.Obj()
+    opVal = esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum.copy()
+    nConstraints = esM.pyM.nconstraints()
+
+    esM.optimize(solver='glpk', backend=backend, operationBounds=True)
+    assert np.isclose(esM.pyM.Obj(), objective)
+    assert esM.pyM.nconstraints() < nConstraints
+    assert not hasattr(esM.pyM, 'ConstrOperation4_srcSnk') and not hasattr(esM.pyM, 'ConstrOperation5_srcSnk')
+
+    opVar = esM.pyM.op_srcSnk
+    # Demand: fixed to the operation rate, electricity market: bounded by the maximum operation rate
+    assert opVar['loc2', 'Demand', 0, 3].fixed and opVar['loc2', 'Demand', 0, 3].value == 3.
+    assert not opVar['loc2', 'Electricity market', 0, 2].fixed and opVar['loc2', 'Electricity market', 0, 2].ub == 2.
+    # PV and run-of-river: fixed to zero at the time steps with zero operation rate
+    assert opVar['loc1', 'PV', 0, 0].fixed and not opVar['loc1', 'PV', 0, 1].fixed
+    assert all(opVar['loc2', 'Run-of-river', 0, t].fixed for t in range(6))
+    assert opVar['loc1', 'Run-of-river', 0, 4].value == pytest.approx(
+        esM.componentModelingDict['SourceSinkModel'].capacityVariablesOptimum.loc['Run-of-river', 'loc1'] * .5)
+    pd.testing.assert_frame_equal(esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum.loc[
+                                      ['Demand']], opVal.loc[['Demand']])
+
+    with pytest.raises(TypeError):
+        esM.optimize(solver='glpk', operationBounds=1)
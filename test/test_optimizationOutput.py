@@ -0,0 +1,69 @@
+from FINE import utils
+import numpy as np
+import pandas as pd
+
+
+def test_formatOperationVariablesOutput(minimal_test_esM):
+    '''
+    Get the minimal test system, and check that the formatted operation variables cover the full time horizon and
+    are consistent with the values of the pyomo variables, with and without segmentation.
+    '''
+    esM = minimal_test_esM
+
+    esM.optimize(solver='glpk')
+    opVar = esM.pyM.op_srcSnk
+    optVal = esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum
+    assert optVal.shape[1] == len(esM.totalTimeSteps)
+    for (comp, loc), values in optVal.iterrows():
+        assert np.allclose(values.values, [opVar[loc, comp, 0, t].value for t in esM.totalTimeSteps])
+
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=2, segmentation=True,
+                numberOfSegmentsPerPeriod=1, sortValues=False, rescaleClusterPeriods=False)
+    esM.optimize(timeSeriesAggregation=True, solver='glpk')
+    opVar = esM.pyM.op_srcSnk
+    optVal = esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum
+    assert optVal.shape[1] == len(esM.totalTimeSteps)
+    for (comp, loc), values in optVal.iterrows():
+        assert np.isclose(values.sum(), sum(opVar[loc, comp, p, 0].value for p in esM.periodsOrder))
+
+    optVal = esM.componentModelingDict['TransmissionModel'].operationVariablesOptimum
+    assert list(optVal.index.names) == [None, None, None]
+    assert all(len(ix) == 3 for ix in optVal.index)
+
+
+def test_formatOperationVariablesOutputIndexSets(minimal_test_esM):
+    '''
+    Get the minimal test system, and check that the operation variables formatted with the index sets of the pyomo
+    variable are equal to the ones formatted with the keys of the optimal values and that variables without a value
+    are given as NaN in a float64 DataFrame.
+    '''
+    esM = minimal_test_esM
+
+    esM.optimize(solver='glpk')
+    opVar = esM.pyM.op_srcSnk
+    indexSets = utils.getVariableIndexSets(opVar)
+    assert indexSets == (list(esM.pyM.operationVarSet_srcSnk), list(esM.pyM.timeSet))
+    assert utils.getVariableIndexSets(esM.pyM.cap_srcSnk) is None
+
+    values = opVar.get_values()
+    optVal = utils.formatOptimizationOutput(values, 'operationVariables', '1dim', esM.periodsOrder, esM=esM,
+                                            indexSets=indexSets)
+    pd.testing.assert_frame_equal(optVal, utils.formatOptimizationOutput(values, 'operationVariables', '1dim',
+                                                                         esM.periodsOrder, esM=esM))
+
+    loc, comp, p, t = next(iter(values))
+    values[loc, comp, p, t] = None
+    optVal = utils.formatOptimizationOutput(values, 'operationVariables', '1dim', esM.periodsOrder, esM=esM,
+                                            indexSets=indexSets)
+    assert (optVal.dtypes == np.float64).all()
+    assert np.isnan(optVal.loc[(comp, loc), t]) and optVal.drop(columns=t).notna().all().all()
+
+    # many (component, location) rows are labeled correctly and values which are not given in the order of the index
+    # sets are looked up
+    rowSet = [('loc' + str(i), 'comp' + str(j)) for i in range(10) for j in range(20)]
+    timeSet = [(0, t) for t in range(3)]
+    values = {(loc, comp, p, t): 10. * i + t for i, (loc, comp) in enumerate(rowSet) for p, t in timeSet}
+    optVal = utils.formatOptimizationOutput(dict(reversed(values.items())), 'operationVariables', '1dim', [0],
+                                            indexSets=(rowSet, timeSet))
+    assert optVal.index.is_unique and len(optVal) == len(rowSet)
+    assert optVal.loc[('comp19', 'loc9')].tolist() == [1990., 1991., 1992.]
@@ -0,0 +1,77 @@
+import FINE as fn
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def getFixedDesignEsM(withStorage=False):
+    numberOfTimeSteps = 24
+    locations = ['loc1', 'loc2']
+    esM = fn.EnergySystemModel(locations=set(locations), commodities={'electricity'},
+                               numberOfTimeSteps=numberOfTimeSteps, commodityUnitsDict={'electricity': r'kW$_{el}$'},
+                               hoursPerTimeStep=1, costUnit='1 Euro', lengthUnit='km', verboseLogLevel=2)
+
+    costs = pd.DataFrame({'loc1': [0.1, 0.1, 0.3, 0.3, 0.2, 0.4] * 4, 'loc2': [0.2, 0.3, 0.1, 0.4, 0.4, 0.1] * 4})
+    esM.add(fn.Source(esM=esM, name='Electricity market', commodity='electricity', hasCapacityVariable=False,
+                      commodityCostTimeSeries=costs))
+    esM.add(fn.Source(esM=esM, name='PV', commodity='electricity', hasCapacityVariable=True,
+                      capacityFix=pd.Series(2., index=locations), opexPerCapacity=0.1,
+                      operationRateMax=pd.DataFrame({loc: [0., .5, 1., .5, 0., 0.] * 4 for loc in locations})))
+    if withStorage:
+        esM.add(fn.Storage(esM=esM, name='Battery', commodity='electricity', hasCapacityVariable=True,
+                           capacityFix=pd.Series(4., index=locations), chargeEfficiency=0.9,
+                           dischargeEfficiency=0.9, opexPerChargeOperation=0.001))
+    esM.add(fn.Transmission(esM=esM, name='Cables', commodity='electricity', hasCapacityVariable=True,
+                            capacityFix=pd.DataFrame([[0., 1.], [1., 0.]], index=locations, columns=locations),
+                            opexPerOperation=0.001))
+    demand = pd.DataFrame({'loc1': [1., 2., 3., 2., 1., 2.] * 4, 'loc2': [2., 1., 1., 3., 2., 1.] * 4})
+    esM.add(fn.Sink(esM=esM, name='Demand', commodity='electricity', hasCapacityVariable=False,
+                    operationRateFix=demand))
+    return esM
+
+
+def test_parallelPeriodsTSA():
+    '''
+    Check that the parallel optimization of blocks of typical periods yields the results of the full optimization.
+    '''
+    esM = getFixedDesignEsM()
+    esM.cluster(numberOfTypicalPeriods=4, numberOfTimeStepsPerPeriod=6)
+    esM.optimize(timeSeriesAggregation=True, solver='glpk')
+    objectiveValue = esM.objectiveValue
+    opVal = esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum.copy()
+
+    summary = fn.optimizeParallelPeriods(esM, numberOfBlocks=3, maxWorkers=2, timeSeriesAggregation=True,
+                                         solver='glpk')
+    assert [list(periods) for periods in summary['periods']] == [[0, 1], [2], [3]]
+    assert np.isclose(esM.objectiveValue, objectiveValue)
+    assert np.allclose(esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum.values, opVal.values)
+    assert list(esM.typicalPeriods) == [0, 1, 2, 3]
+
+
+def test_parallelTimeSteps():
+    '''
+    Check that the parallel optimization of blocks of time steps yields the results of the full optimization.
+    '''
+    esM = getFixedDesignEsM()
+    esM.optimize(solver='glpk')
+    objectiveValue = esM.objectiveValue
+    opVal = esM.componentModelingDict['TransmissionModel'].operationVariablesOptimum.copy()
+
+    summary = fn.optimizeParallelPeriods(esM, numberOfBlocks=4, maxWorkers=1, solver='glpk')
+    assert list(summary['start']) == [0, 6, 12, 18] and list(summary['end']) == [5, 11, 17, 23]
+    assert np.isclose(esM.objectiveValue, objectiveValue)
+    optVal = esM.componentModelingDict['TransmissionModel'].operationVariablesOptimum
+    assert list(optVal.columns) == list(range(24))
+    assert np.allclose(optVal.values, opVal.values)
+    assert esM.numberOfTimeSteps == 24
+
+
+def test_parallelPeriodsRequiresSeparability(minimal_test_esM):
+    with pytest.raises(ValueError):
+        fn.optimizeParallelPeriods(minimal_test_esM, solver='glpk')
+    with pytest.raises(ValueError):
+        fn.optimizeParallelPeriods(getFixedDesignEsM(withStorage=True), solver='glpk')
+    esM = getFixedDesignEsM(withStorage=True)
+    esM.cluster(numberOfTypicalPeriods=4, numberOfTimeStepsPerPeriod=6)
+    with pytest.raises(ValueError):
+        fn.optimizeParallelPeriods(esM, timeSeriesAggregation=True, solver='glpk')
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from pyomo.opt import SolverFactory
+
+@pytest.mark.skipif(not SolverFactory('appsi_highs').available(), reason="appsi_highs solver required")
+def test_persistentSolver(minimal_test_esM):
+    '''
+    Get the minimal test system, and check that a persistent solver leads to the same results as a non-persistent
+    one and that parameter updates are pushed to the persistent solver without handing over the model again.
+    '''
+    esM = minimal_test_esM
+
+    esM.optimize(solver='glpk')
+    objReference = esM.pyM.Obj()
+    assert esM.solverSpecs['loadtime'] is None
+
+    esM.optimize(solver='appsi_highs', mutableParameters=True)
+    assert np.isclose(esM.pyM.Obj(), objReference)
+    assert esM.persistentSolver['pyM'] is esM.pyM
+    optimizer = esM.persistentSolver['optimizer']
+
+    esM.updateParameters('Electrolyzers', {'investPerCapacity': 400}, solver='appsi_highs')
+    assert esM.persistentSolver['optimizer'] is optimizer
+    assert esM.solverSpecs['loadtime'] is not None
+    objUpdated = esM.pyM.Obj()
+
+    esM.optimize(solver='glpk', mutableParameters=True)
+    esM.updateParameters('Electrolyzers', {'investPerCapacity': 400}, solver='glpk')
+    assert np.isclose(esM.pyM.Obj(), objUpdated, rtol=1e-6)
@@ -0,0 +1,36 @@
+import FINE as fn
+import json
+import os
+
+
+def test_profile(minimal_test_esM, tmpdir):
+    '''
+    Get the minimal test system, optimize it with profiling and check that the profile covers the build, solve and
+    postprocess phases and that it can be exported to a JSON file.
+    '''
+    esM = minimal_test_esM
+
+    esM.optimize(solver='glpk', profile=True)
+    profile = esM.solverSpecs['profile']
+
+    build = profile['build']
+    assert {entry['name'] for entry in build if entry['modelingClass'] is None} == \
+        {'declareTimeSets', 'declareSharedPotentialConstraints', 'declareComponentLinkedQuantityConstraints',
+         'declareCommodityBalanceConstraints', 'declareBalanceLimitConstraint', 'declareObjective'}
+    assert {entry['modelingClass'] for entry in build if entry['name'] == 'declareComponentConstraints'} == \
+        set(esM.componentModelingDict.keys())
+    assert sum(entry['variables'] for entry in build) == esM.pyM.nvariables()
+    assert sum(entry['constraints'] for entry in build) == esM.pyM.nconstraints()
+    assert sum(entry['nonzeros'] for entry in build if entry['name'] == 'declareCommodityBalanceConstraints') > 0
+
+    assert 'solve' in [entry['name'] for entry in profile['solve']]
+    assert len(profile['postprocess']) == len(esM.componentModelingDict)
+
+    fileName = os.path.join(str(tmpdir), 'profile')
+    fn.writeProfileToJSON(esM, fileName)
+    with open(fileName + '.json') as f:
+        data = json.load(f)
+    assert data['profile'] == json.loads(json.dumps(profile))
+
+    esM.optimize(solver='glpk')
+    assert all(entry['nonzeros'] is None for entry in esM.solverSpecs['profile']['build'])
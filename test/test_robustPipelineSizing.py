@@ -0,0 +1,184 @@
+from FINE.expansionModules import robustPipelineSizing
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def getTreeNetwork():
+    distances = pd.Series([10., 20., 15., 5., 30.], index=[('w1', 'w2'), ('w2', 'w3'), ('w2', 'w4'), ('w4', 'w5'),
+                                                          ('w6', 'w4')])
+    graph, distances = robustPipelineSizing.createNetwork(distances)
+    injectionWithdrawalRates = pd.DataFrame({'w1': [-5., -10., 0.], 'w3': [2., 4., -3.], 'w5': [3., -1., 1.],
+                                             'w6': [0., 7., 2.]})
+    dic_node_minPress = {node: 50. for node in graph.nodes}
+    dic_node_maxPress = {node: 100. for node in graph.nodes}
+    return graph, distances, injectionWithdrawalRates, dic_node_minPress, dic_node_maxPress
+
+
+def getPathValue(graph, flows, startNode, endNode):
+    pathNodes = nx.shortest_path(graph, source=startNode, target=endNode)
+    return sum(flows[(u, v)] if (u, v) in flows else -flows[(v, u)] for u, v in zip(pathNodes[:-1], pathNodes[1:]))
+
+
+def test_computeTimeStepFlowsTree():
+    '''
+    Check that the closed-form flows of a tree-shaped network equal the flows computed by the LPs.
+    '''
+    graph, distances, injectionWithdrawalRates, _, _ = getTreeNetwork()
+    flowsNumpy = robustPipelineSizing.computeTimeStepFlows(injectionWithdrawalRates, distances, graph, ['w1'],
+                                                           ['w3', 'w5', 'w6'], method='numpy')
+    flowsPyomo = robustPipelineSizing.computeTimeStepFlows(injectionWithdrawalRates, distances, graph, ['w1'],
+                                                           ['w3', 'w5', 'w6'], method='pyomo', solver='glpk')
+    assert flowsNumpy.keys() == flowsPyomo.keys()
+    for timeStep in flowsPyomo:
+        for arc in distances.index:
+            assert np.isclose(flowsNumpy[timeStep][arc], flowsPyomo[timeStep][arc])
+
+    # unbalanced time steps yield no flows
+    unbalanced = injectionWithdrawalRates.copy()
+    unbalanced.loc[1, 'w1'] = 0.
+    assert robustPipelineSizing.computeTimeStepFlows(unbalanced, distances, graph, ['w1'], ['w3', 'w5', 'w6'])[1] == {}
+
+
+def test_generateRobustScenariosTree():
+    '''
+    Check that the closed-form special scenarios of a tree-shaped network are optimal solutions of the LPs.
+    '''
+    graph, distances, injectionWithdrawalRates, dic_node_minPress, dic_node_maxPress = getTreeNetwork()
+    scenariosNumpy, entries, exits = robustPipelineSizing.generateRobustScenarios(
+        injectionWithdrawalRates, graph, distances, dic_node_minPress, dic_node_maxPress, method='numpy')
+    scenariosPyomo, _, _ = robustPipelineSizing.generateRobustScenarios(
+        injectionWithdrawalRates, graph, distances, dic_node_minPress, dic_node_maxPress, method='pyomo',
+        solver='glpk')
+    assert scenariosNumpy.keys() == scenariosPyomo.keys()
+    incidenceMatrix = robustPipelineSizing.getIncidenceMatrix(graph, distances)[2]
+    for (startNode, endNode), flows in scenariosNumpy.items():
+        assert np.isclose(getPathValue(graph, flows, startNode, endNode),
+                          getPathValue(graph, scenariosPyomo[(startNode, endNode)], startNode, endNode))
+        # the flows are balanced at every node
+        demands = incidenceMatrix.dot([flows[arc] for arc in distances.index])
+        assert np.isclose(demands.sum(), 0)
+
+    # the closed-form computation requires a tree-shaped network
+    graph.add_edge('w1', 'w3')
+    with pytest.raises(ValueError):
+        robustPipelineSizing.computeTimeStepFlows(injectionWithdrawalRates, distances, graph, entries, exits,
+                                                  method='numpy')
+
+
+def test_determinePressureDropCoef():
+    '''
+    Check the pressure drop coefficients computed on arrays of shape (scenario, arc, diameter).
+    '''
+    graph, distances, injectionWithdrawalRates, dic_node_minPress, dic_node_maxPress = getTreeNetwork()
+    distances = distances * 1000
+    dic_timeStep_flows = robustPipelineSizing.computeTimeStepFlows(injectionWithdrawalRates, distances, graph, ['w1'],
+                                                                   ['w3', 'w5', 'w6'])
+    dic_timeStep_flows['reversed'] = {arc: -flow for arc, flow in dic_timeStep_flows[0].items()}
+    diameters = [0.1, 0.2, 0.5]
+    dic_pressureDropCoef, pressureDropCoef = robustPipelineSizing.determinePressureDropCoef(
+        dic_timeStep_flows, distances, dic_node_minPress, dic_node_maxPress, diameters, returnArray=True)
+
+    assert pressureDropCoef.shape == (len(dic_timeStep_flows), len(distances), len(diameters))
+    for k, diameter in enumerate(diameters):
+        for i, timeStep in enumerate(dic_timeStep_flows):
+            for j, arc in enumerate(distances.index):
+                assert dic_pressureDropCoef[(diameter, timeStep)][arc] == pressureDropCoef[i, j, k]
+                flow = dic_timeStep_flows[timeStep][arc]
+                # the pressure drop has the sign of the flow
+                assert np.sign(pressureDropCoef[i, j, k]) == np.sign(flow)
+    # with equal pressure bounds, the pressure drop is antisymmetric in the flow
+    assert np.allclose(pressureDropCoef[-1], -pressureDropCoef[0])
+    # larger diameters have smaller pressure drops
+    assert (np.abs(pressureDropCoef[:, :, 1:]) <= np.abs(pressureDropCoef[:, :, :-1])).all()
+
+
+def test_postprocessing():
+    '''
+    Check the batched computation of the pressure levels of all scenarios against the scalar pressure computations.
+    '''
+    graph, distances, injectionWithdrawalRates, dic_node_minPress, dic_node_maxPress = getTreeNetwork()
+    distances = distances * 1000
+    dic_arc_diam = {arc: diam for arc, diam in zip(distances.index, [0.4, 0.3, 0.3, 0.2, 0.3])}
+    dic_timeStep_flows = robustPipelineSizing.computeTimeStepFlows(injectionWithdrawalRates, distances, graph, ['w1'],
+                                                                   ['w3', 'w5', 'w6'])
+
+    for arc in distances.index:
+        for pressure in [50., 70., 90.]:
+            for flow in [-8., 0., 3.]:
+                dic_flows = {arc: flow}
+                endPressure = robustPipelineSizing.computePressureEndnodeArcs(
+                    np.array([pressure]), np.array([flow]), np.array([dic_arc_diam[arc]]), np.array([distances[arc]]))
+                assert np.isclose(endPressure[0], robustPipelineSizing.computePressureEndnodeArc(
+                    arc, pressure, dic_flows, dic_arc_diam, distances))
+                startPressure = robustPipelineSizing.computePressureStartnodeArcs(
+                    np.array([pressure]), np.array([flow]), np.array([dic_arc_diam[arc]]), np.array([distances[arc]]),
+                    tol=1e-6)
+                assert np.isclose(startPressure[0], robustPipelineSizing.computePressureStartnodeArc(
+                    arc, pressure, dic_flows, dic_arc_diam, distances, tol=1e-6))
+
+    dic_scen_PressLevels, dic_scen_MaxViolPress = robustPipelineSizing.postprocessing(
+        graph, distances, dic_arc_diam, dic_timeStep_flows, dic_node_minPress, dic_node_maxPress, verbose=1)
+    assert dic_scen_PressLevels == robustPipelineSizing.postprocessing(
+        graph, distances, dic_arc_diam, dic_timeStep_flows, dic_node_minPress, dic_node_maxPress, threads=2,
+        verbose=1)[0]
+    for timeStep, pressures in dic_scen_PressLevels.items():
+        assert dic_scen_MaxViolPress[timeStep] == 0
+        assert any(pressures[node] == dic_node_maxPress[node] for node in graph.nodes)
+        for arc in distances.index:
+            flow = dic_timeStep_flows[timeStep][arc]
+            startNode, endNode = arc if flow >= 0 else (arc[1], arc[0])
+            assert np.isclose(pressures[endNode], robustPipelineSizing.computePressureEndnodeArcs(
+                pressures[startNode], abs(flow), dic_arc_diam[arc], distances[arc]), atol=1e-6)
+
+
+def test_uniqueTimeSteps():
+    '''
+    Check that the flows are computed once per unique time step and assigned to all time steps.
+    '''
+    graph, distances, injectionWithdrawalRates, _, _ = getTreeNetwork()
+    repeatedRates = pd.concat([injectionWithdrawalRates] * 4, ignore_index=True)
+    repeatedRates.iloc[3, 0] += 1e-9
+    uniqueRates, dic_timeStep_uniqueTimeStep = robustPipelineSizing.getUniqueTimeSteps(repeatedRates, nDigits=6)
+    assert list(uniqueRates.index) == [0, 1, 2]
+    assert [dic_timeStep_uniqueTimeStep[timeStep] for timeStep in repeatedRates.index] == [0, 1, 2] * 4
+
+    flows = robustPipelineSizing.computeTimeStepFlows(injectionWithdrawalRates, distances, graph, ['w1'],
+                                                      ['w3', 'w5', 'w6'])
+    repeatedFlows = robustPipelineSizing.computeTimeStepFlows(repeatedRates, distances, graph, ['w1'],
+                                                              ['w3', 'w5', 'w6'])
+    assert list(repeatedFlows.keys()) == list(repeatedRates.index)
+    for timeStep in repeatedRates.index:
+        assert repeatedFlows[timeStep] == flows[timeStep % 3]
+    assert repeatedFlows[0] is not repeatedFlows[3]
+
+
+def test_workerPool():
+    '''
+    Check that the stages of the pipeline sizing yield the same results with a shared pool of worker processes.
+    '''
+    graph, distances, injectionWithdrawalRates, dic_node_minPress, dic_node_maxPress = getTreeNetwork()
+    flows = robustPipelineSizing.computeTimeStepFlows(injectionWithdrawalRates, distances, graph, ['w1'],
+                                                      ['w3', 'w5', 'w6'], method='pyomo', solver='glpk')
+    with robustPipelineSizing.WorkerPool(2, graph=graph, distances=distances,
+                                         injectionWithdrawalRates=injectionWithdrawalRates) as pool:
+        assert flows == robustPipelineSizing.computeTimeStepFlows(
+            injectionWithdrawalRates, distances, graph, ['w1'], ['w3', 'w5', 'w6'], method='pyomo', solver='glpk',
+            verbose=1, pool=pool)
+        scenarios = robustPipelineSizing.generateRobustScenarios(
+            injectionWithdrawalRates, graph, distances, dic_node_minPress, dic_node_maxPress, method='pyomo',
+            solver='glpk', verbose=1, pool=pool)[0]
+    assert pool.pool is None
+    # the worker processes are stopped if an exception is raised in one of the stages
+    with pytest.raises(ValueError):
+        with robustPipelineSizing.WorkerPool(2, graph=graph) as pool:
+            robustPipelineSizing.computeTimeStepFlows(injectionWithdrawalRates, distances, graph, ['w1'],
+                                                      ['w3', 'w5', 'w6'], method='numpy', pool=pool)
+            graph.add_edge('w1', 'w3')
+            robustPipelineSizing.computeTimeStepFlows(injectionWithdrawalRates, distances, graph, ['w1'],
+                                                      ['w3', 'w5', 'w6'], method='numpy', pool=pool)
+    assert pool.pool is None
+    graph.remove_edge('w1', 'w3')
+    assert scenarios.keys() == robustPipelineSizing.generateRobustScenarios(
+        injectionWithdrawalRates, graph, distances, dic_node_minPress, dic_node_maxPress, method='numpy')[0].keys()
@@ -0,0 +1,107 @@
+import FINE as fn
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def getFixedCapacityEsM():
+    numberOfTimeSteps = 12
+    locations = ['loc1', 'loc2']
+    esM = fn.EnergySystemModel(locations=set(locations), commodities={'electricity'},
+                               numberOfTimeSteps=numberOfTimeSteps, commodityUnitsDict={'electricity': r'kW$_{el}$'},
+                               hoursPerTimeStep=1, costUnit='1 Euro', lengthUnit='km', verboseLogLevel=2)
+
+    costs = pd.DataFrame({loc: [0.1, 0.1, 0.3, 0.3] * 3 for loc in locations})
+    esM.add(fn.Source(esM=esM, name='Electricity market', commodity='electricity', hasCapacityVariable=False,
+                      commodityCostTimeSeries=costs))
+    esM.add(fn.Storage(esM=esM, name='Battery', commodity='electricity', hasCapacityVariable=True,
+                       capacityFix=pd.Series(4., index=locations), chargeEfficiency=0.9, dischargeEfficiency=0.9,
+                       opexPerChargeOperation=0.001))
+    esM.add(fn.Transmission(esM=esM, name='Cables', commodity='electricity', hasCapacityVariable=True,
+                            capacityFix=pd.DataFrame([[0., 1.], [1., 0.]], index=locations, columns=locations),
+                            opexPerOperation=0.001))
+    demand = pd.DataFrame({'loc1': [1., 2., 3., 2.] * 3, 'loc2': [2., 1., 1., 3.] * 3})
+    esM.add(fn.Sink(esM=esM, name='Demand', commodity='electricity', hasCapacityVariable=False,
+                    operationRateFix=demand))
+    return esM
+
+
+def test_rollingHorizonSingleWindow():
+    '''
+    Check that a rolling horizon optimization with a single window yields the results of the full optimization.
+    '''
+    esM = getFixedCapacityEsM()
+    esM.optimize(solver='glpk')
+    objectiveValue = esM.objectiveValue
+    opVal = esM.componentModelingDict['StorageModel'].chargeOperationVariablesOptimum.copy()
+    socVal = esM.componentModelingDict['StorageModel'].stateOfChargeOperationVariablesOptimum.copy()
+
+    summary = fn.optimizeRollingHorizon(esM, windowLength=12, solver='glpk')
+    assert len(summary) == 1
+    assert np.isclose(esM.objectiveValue, objectiveValue)
+    assert np.allclose(esM.componentModelingDict['StorageModel'].chargeOperationVariablesOptimum.values, opVal.values)
+    assert np.allclose(esM.componentModelingDict['StorageModel'].stateOfChargeOperationVariablesOptimum.values,
+                       socVal.values)
+
+
+@pytest.mark.parametrize('overlap', [0, 2])
+def test_rollingHorizonMultipleWindows(overlap):
+    '''
+    Check that the results of several windows are stitched to results of the full time horizon with a continuous
+    state of charge of the storage component.
+    '''
+    esM = getFixedCapacityEsM()
+    esM.optimize(solver='glpk')
+    objectiveValue = esM.objectiveValue
+
+    summary = fn.optimizeRollingHorizon(esM, windowLength=4, overlap=overlap, solver='glpk')
+    assert list(summary['start']) == [0, 4, 8] and list(summary['end']) == [3, 7, 11]
+    assert list(summary['numberOfTimeSteps']) == [min(4 + overlap, 12 - start) for start in [0, 4, 8]]
+    assert esM.numberOfTimeSteps == 12 and esM.totalTimeSteps == list(range(12))
+
+    mdl = esM.componentModelingDict['StorageModel']
+    for optVal in [mdl.chargeOperationVariablesOptimum, mdl.dischargeOperationVariablesOptimum,
+                   esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum]:
+        assert list(optVal.columns) == list(range(12))
+    soc, charge = mdl.stateOfChargeOperationVariablesOptimum, mdl.chargeOperationVariablesOptimum
+    discharge = mdl.dischargeOperationVariablesOptimum
+    for loc in ['loc1', 'loc2']:
+        socLoc = soc.loc[('Battery', loc)].values
+        assert np.allclose(socLoc[1:], socLoc[:-1] + 0.9 * charge.loc[('Battery', loc)].values[:-1] -
+                           discharge.loc[('Battery', loc)].values[:-1] / 0.9, atol=1e-6)
+        assert np.isclose(socLoc[-1] + 0.9 * charge.loc[('Battery', loc)].values[-1] -
+                          discharge.loc[('Battery', loc)].values[-1] / 0.9, socLoc[0], atol=1e-6)
+    assert esM.objectiveValue >= objectiveValue - 1e-6
+
+
+def test_rollingHorizonConversionDynamic():
+    '''
+    Check that the minimum down time of a ConversionDynamic component is considered across the window boundaries.
+    '''
+    esM = fn.EnergySystemModel(locations={'loc1'}, commodities={'electricity', 'methane'}, numberOfTimeSteps=12,
+                               commodityUnitsDict={'electricity': r'GW$_{el}$', 'methane': r'GW$_{th}$'},
+                               hoursPerTimeStep=1, verboseLogLevel=2)
+    esM.add(fn.Source(esM=esM, name='Natural gas', commodity='methane', hasCapacityVariable=False,
+                      commodityCost=0.01))
+    esM.add(fn.Source(esM=esM, name='Electricity market', commodity='electricity', hasCapacityVariable=False,
+                      commodityCost=1.))
+    esM.add(fn.ConversionDynamic(esM=esM, name='Gas plant', physicalUnit=r'GW$_{el}$',
+                                 commodityConversionFactors={'electricity': 1, 'methane': -2},
+                                 capacityFix=pd.Series(10., index=['loc1']), partLoadMin=0.3, bigM=100,
+                                 downTimeMin=3, opexPerOperation=0.5))
+    esM.add(fn.Sink(esM=esM, name='Demand', commodity='electricity', hasCapacityVariable=False,
+                    operationRateFix=pd.DataFrame({'loc1': [0., 0., 8., 8., 8., 0., 0., 0., 8., 8., 8., 0.]})))
+    esM.optimize(solver='glpk')
+    objectiveValue = esM.objectiveValue
+    opVal = esM.componentModelingDict['ConversionDynamicModel'].operationVariablesOptimum.copy()
+
+    fn.optimizeRollingHorizon(esM, windowLength=4, overlap=1, solver='glpk')
+    assert np.isclose(esM.objectiveValue, objectiveValue)
+    assert np.allclose(esM.componentModelingDict['ConversionDynamicModel'].operationVariablesOptimum.values,
+                       opVal.values)
+    assert esM.componentModelingDict['ConversionDynamicModel'].initialOperationStates is None
+
+
+def test_rollingHorizonRequiresFixedCapacities(minimal_test_esM):
+    with pytest.raises(ValueError):
+        fn.optimizeRollingHorizon(minimal_test_esM, windowLength=2, solver='glpk')
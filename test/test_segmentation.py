@@ -43,3 +43,30 @@ def test_segmentation(minimal_test_esM):
     # and thus size-determining constraints of the model are coincidentally not affected by the aggregation and the
     # optimal solutions of the third and fourth model are identical.
     assert esM3.pyM.Obj() == esM4.pyM.Obj()
+
+
+def test_segmentArrays(minimal_test_esM):
+    '''
+    Check the dense (period, segment) arrays of the segment durations and start times which are looked up by the
+    constraint rules of segmented models.
+    '''
+    esM = minimal_test_esM
+    esM.cluster(numberOfTypicalPeriods=1, numberOfTimeStepsPerPeriod=4, storeTSAinstance=False,
+                segmentation=True, numberOfSegmentsPerPeriod=3, clusterMethod='hierarchical',
+                sortValues=False, rescaleClusterPeriods=False)
+    esM.declareOptimizationProblem(timeSeriesAggregation=True, segmentation=True)
+    pyM = esM.pyM
+    assert pyM.hoursPerSegment.shape == (1, 3) and pyM.segmentStartTime.shape == (1, 4)
+    for (p, t) in pyM.timeSet:
+        assert pyM.timeStepsPerSegment[p, t] == esM.timeStepsPerSegment[p, t]
+        assert pyM.hoursPerSegment[p, t] == esM.hoursPerSegment[p, t]
+    for (p, t) in pyM.interTimeStepsSet:
+        assert pyM.segmentStartTime[p, t] == esM.segmentStartTime[p, t]
+    assert pyM.hoursPerSegment.sum() == 4 * esM.hoursPerTimeStep
+
+    storageModel = esM.componentModelingDict['StorageModel']
+    factors = storageModel.getSelfDischargeFactors(pyM, esM)
+    assert np.allclose(factors['Pressure tank'], 1)
+
+    esM.declareOptimizationProblem()
+    assert esM.pyM.hoursPerSegment is None and storageModel.getSelfDischargeFactors(esM.pyM, esM) == {}
@@ -0,0 +1,122 @@
+import FINE as fn
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def multiRegionalEsM():
+    locations = ['A', 'B', 'C', 'D']
+    numberOfTimeSteps = 8
+    esM = fn.EnergySystemModel(locations=set(locations), commodities={'electricity'},
+                               numberOfTimeSteps=numberOfTimeSteps, commodityUnitsDict={'electricity': r'GW$_{el}$'},
+                               hoursPerTimeStep=1, costUnit='1 Euro', lengthUnit='km', verboseLogLevel=2)
+
+    operationRateMax = pd.DataFrame({'A': [1., .8, .2, 0., .5, .9, 1., .3], 'B': [.9, .7, .3, .1, .4, .8, 1., .2],
+                                     'C': [0., .2, .8, 1., .5, .1, 0., .6], 'D': [.1, .3, .9, .8, .6, .2, .1, .5]})
+    esM.add(fn.Source(esM=esM, name='Wind turbines', commodity='electricity', hasCapacityVariable=True,
+                      operationRateMax=operationRateMax,
+                      capacityMax=pd.Series({'A': 10., 'B': 5., 'C': 8., 'D': 2.}),
+                      investPerCapacity=pd.Series({'A': 1., 'B': 2., 'C': 1., 'D': 3.}), interestRate=0.08,
+                      economicLifetime=20))
+    esM.add(fn.Source(esM=esM, name='Backup', commodity='electricity', hasCapacityVariable=False,
+                      commodityCost=0.5))
+    esM.add(fn.Storage(esM=esM, name='Batteries', commodity='electricity', hasCapacityVariable=True,
+                       investPerCapacity=0.1))
+
+    distances = pd.DataFrame(0., index=locations, columns=locations)
+    for loc1, loc2, distance in [('A', 'B', 10.), ('B', 'C', 20.), ('C', 'D', 15.)]:
+        distances.loc[loc1, loc2] = distances.loc[loc2, loc1] = distance
+    esM.add(fn.Transmission(esM=esM, name='AC cables', commodity='electricity', hasCapacityVariable=True,
+                            locationalEligibility=(distances > 0).astype(int), distances=distances, losses=0.001,
+                            investPerCapacity=0.01))
+
+    esM.add(fn.Sink(esM=esM, name='Demand', commodity='electricity', hasCapacityVariable=False,
+                    operationRateFix=pd.DataFrame({loc: [3.] * numberOfTimeSteps for loc in locations})))
+    return esM
+
+
+def test_spatialAggregationGroups(multiRegionalEsM):
+    '''
+    Check that connected locations with similar time series are grouped.
+    '''
+    regionGroups = fn.getSpatialAggregationGroups(multiRegionalEsM, 2)
+    assert regionGroups == {'region0': ['A', 'B'], 'region1': ['C', 'D']}
+
+    connectivity = pd.DataFrame(0, index=['A', 'B', 'C', 'D'], columns=['A', 'B', 'C', 'D'])
+    connectivity.loc['A', 'C'] = connectivity.loc['B', 'D'] = 1
+    regionGroups = fn.getSpatialAggregationGroups(multiRegionalEsM, 2, connectivity=connectivity)
+    assert regionGroups == {'region0': ['A', 'C'], 'region1': ['B', 'D']}
+    with pytest.raises(ValueError):
+        fn.getSpatialAggregationGroups(multiRegionalEsM, 1, connectivity=connectivity)
+
+
+def test_spatialAggregationIdentity(multiRegionalEsM):
+    '''
+    Check that an aggregation in which each region consists of one location yields the same optimization result.
+    '''
+    esM = multiRegionalEsM
+    esM.optimize(solver='glpk')
+    aggregatedEsM, regionGroups = fn.aggregateSpatially(esM, regionGroups={'r' + loc: [loc] for loc in esM.locations})
+    aggregatedEsM.optimize(solver='glpk')
+    assert np.isclose(aggregatedEsM.objectiveValue, esM.objectiveValue)
+
+
+def test_spatialAggregation(multiRegionalEsM):
+    '''
+    Check the aggregated parameters and the disaggregated optimization output.
+    '''
+    esM = multiRegionalEsM
+    aggregatedEsM, regionGroups = fn.aggregateSpatially(esM, numberOfRegions=2)
+    assert aggregatedEsM.locations == {'region0', 'region1'}
+
+    comp = aggregatedEsM.getComponent('Wind turbines')
+    assert comp.capacityMax.to_dict() == {'region0': 15., 'region1': 10.}
+    assert np.isclose(comp.investPerCapacity['region0'], (10. * 1. + 5. * 2.) / 15.)
+    assert np.isclose(comp.fullOperationRateMax['region0'].iloc[0], (10. * 1. + 5. * .9) / 15.)
+    assert (aggregatedEsM.getComponent('Demand').fullOperationRateFix.values == 6.).all()
+
+    comp = aggregatedEsM.getComponent('AC cables')
+    assert list(comp.distances.index) == ['region0_region1', 'region1_region0']
+    assert (comp.distances == 20.).all()
+    assert np.isclose(comp.investPerCapacity['region0_region1'], 0.01 * 20. * 0.5)
+
+    aggregatedEsM.optimize(solver='glpk')
+    output = fn.disaggregateOptimizationOutput(esM, aggregatedEsM, regionGroups)
+    capacities = output['SourceSinkModel']['capacityVariablesOptimum']
+    aggregatedCapacities = aggregatedEsM.componentModelingDict['SourceSinkModel'].capacityVariablesOptimum
+    assert np.isclose(capacities.loc['Wind turbines', ['A', 'B']].sum(),
+                      aggregatedCapacities.loc['Wind turbines', 'region0'])
+    assert (capacities.loc['Wind turbines'] <= esM.getComponent('Wind turbines').capacityMax + 1e-6).all()
+
+    operation = output['TransmissionModel']['operationVariablesOptimum']
+    assert list(operation.index) == [('AC cables', 'B', 'C'), ('AC cables', 'C', 'B')]
+    assert np.allclose(operation.values,
+                       aggregatedEsM.componentModelingDict['TransmissionModel'].operationVariablesOptimum.values)
+
+    aggregatedEsM, regionGroups = fn.aggregateSpatially(esM, numberOfRegions=1)
+    assert 'TransmissionModel' not in aggregatedEsM.componentModelingDict
+
+
+def test_spatialAggregationIneligibleLocations(multiRegionalEsM):
+    '''
+    Check that the disaggregated output of a component is NaN (design variables) or missing (operation variables) in
+    the locations in which it is not eligible, also for binary design variables.
+    '''
+    esM = multiRegionalEsM
+    esM.add(fn.Source(esM=esM, name='Gen', commodity='electricity', hasCapacityVariable=True,
+                      hasIsBuiltBinaryVariable=True, bigM=10., investIfBuilt=0.1, investPerCapacity=0.01,
+                      capacityMax=pd.Series({'A': 10., 'B': 10., 'C': 10., 'D': 0.}), interestRate=0.08,
+                      economicLifetime=20))
+    aggregatedEsM, regionGroups = fn.aggregateSpatially(esM, regionGroups={'region0': ['A', 'B'],
+                                                                           'region1': ['C', 'D']})
+    aggregatedEsM.optimize(solver='glpk')
+    output = fn.disaggregateOptimizationOutput(esM, aggregatedEsM, regionGroups)
+
+    isBuilt = output['SourceSinkModel']['isBuiltVariablesOptimum']
+    assert list(isBuilt.columns) == ['A', 'B', 'C', 'D']
+    assert isBuilt.loc['Gen', 'C'] == 1. and np.isnan(isBuilt.loc['Gen', 'D'])
+    capacities = output['SourceSinkModel']['capacityVariablesOptimum']
+    assert capacities.loc['Gen', 'C'] > 0 and np.isnan(capacities.loc['Gen', 'D'])
+    operation = output['SourceSinkModel']['operationVariablesOptimum']
+    assert ('Gen', 'C') in operation.index and ('Gen', 'D') not in operation.index
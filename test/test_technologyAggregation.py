@@ -0,0 +1,81 @@
+import FINE as fn
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def multiTechnologyEsM():
+    locations = ['A', 'B']
+    numberOfTimeSteps = 6
+    esM = fn.EnergySystemModel(locations=set(locations), commodities={'electricity', 'methane'},
+                               numberOfTimeSteps=numberOfTimeSteps,
+                               commodityUnitsDict={'electricity': r'GW$_{el}$', 'methane': r'GW$_{th}$'},
+                               hoursPerTimeStep=1, costUnit='1 Euro', lengthUnit='km', verboseLogLevel=2)
+
+    profiles = {'Wind turbines 1': [1., .8, .2, 0., .5, .9], 'Wind turbines 2': [.95, .8, .25, 0., .5, .85],
+                'Wind turbines 3': [0., .2, .8, 1., .5, .1]}
+    for i, (name, profile) in enumerate(profiles.items()):
+        esM.add(fn.Source(esM=esM, name=name, commodity='electricity', hasCapacityVariable=True,
+                          operationRateMax=pd.DataFrame({loc: profile for loc in locations}),
+                          capacityMax=pd.Series({'A': 4. + i, 'B': 2.}),
+                          investPerCapacity=pd.Series({'A': 1. + 0.02 * i, 'B': 1.}), interestRate=0.08,
+                          economicLifetime=20))
+    esM.add(fn.Source(esM=esM, name='Natural gas', commodity='methane', hasCapacityVariable=False,
+                      commodityCost=0.05))
+    for i in range(2):
+        esM.add(fn.Conversion(esM=esM, name='CCGT ' + str(i + 1), physicalUnit=r'GW$_{el}$',
+                              commodityConversionFactors={'electricity': 1, 'methane': -1 / 0.6},
+                              hasCapacityVariable=True, investPerCapacity=0.5 + 0.01 * i, interestRate=0.08,
+                              economicLifetime=30))
+    esM.add(fn.Sink(esM=esM, name='Demand', commodity='electricity', hasCapacityVariable=False,
+                    operationRateFix=pd.DataFrame({loc: [3.] * numberOfTimeSteps for loc in locations})))
+    return esM
+
+
+def test_technologyAggregationGroups(multiTechnologyEsM):
+    '''
+    Check that only compatible components with similar costs and profiles are grouped.
+    '''
+    groups = fn.getTechnologyAggregationGroups(multiTechnologyEsM)
+    assert groups == {'CCGT 1 (aggregated)': ['CCGT 1', 'CCGT 2'],
+                      'Wind turbines 1 (aggregated)': ['Wind turbines 1', 'Wind turbines 2']}
+    assert fn.getTechnologyAggregationGroups(multiTechnologyEsM, threshold=0) == {}
+    with pytest.raises(ValueError):
+        fn.aggregateTechnologies(multiTechnologyEsM, componentGroups={'Group': ['CCGT 1', 'Wind turbines 3']})
+
+
+def test_technologyAggregation(multiTechnologyEsM):
+    '''
+    Check the representative components and that the disaggregated output satisfies the limits of the original
+    components.
+    '''
+    esM = multiTechnologyEsM
+    aggregatedEsM, groups = fn.aggregateTechnologies(esM)
+    assert sorted(aggregatedEsM.componentNames) == ['CCGT 1 (aggregated)', 'Demand', 'Natural gas',
+                                                    'Wind turbines 1 (aggregated)', 'Wind turbines 3']
+    assert len(esM.componentNames) == 7
+
+    comp = aggregatedEsM.getComponent('Wind turbines 1 (aggregated)')
+    assert comp.capacityMax.to_dict() == {'A': 9., 'B': 4.}
+    assert np.isclose(comp.investPerCapacity['A'], (4. * 1. + 5. * 1.02) / 9.)
+    assert np.isclose(comp.fullOperationRateMax['A'].iloc[0], (4. * 1. + 5. * .95) / 9.)
+
+    esM.optimize(solver='glpk')
+    aggregatedEsM.optimize(solver='glpk')
+    assert np.isclose(aggregatedEsM.objectiveValue, esM.objectiveValue, rtol=1e-2)
+
+    output = fn.disaggregateTechnologyOutput(esM, aggregatedEsM, groups)
+    capacities = output['SourceSinkModel']['capacityVariablesOptimum']
+    operation = output['SourceSinkModel']['operationVariablesOptimum']
+    aggregatedCapacities = aggregatedEsM.componentModelingDict['SourceSinkModel'].capacityVariablesOptimum
+    assert np.allclose(capacities.loc[['Wind turbines 1', 'Wind turbines 2']].sum().values,
+                       aggregatedCapacities.loc['Wind turbines 1 (aggregated)'].values)
+    for compName in ['Wind turbines 1', 'Wind turbines 2']:
+        comp = esM.getComponent(compName)
+        assert (capacities.loc[compName] <= comp.capacityMax + 1e-6).all()
+        for loc in ['A', 'B']:
+            assert (operation.loc[(compName, loc)].values <=
+                    capacities.loc[compName, loc] * comp.fullOperationRateMax[loc].values + 1e-6).all()
+    assert set(output['ConversionModel']['operationVariablesOptimum'].index.get_level_values(0)) == \
+        {'CCGT 1', 'CCGT 2'}
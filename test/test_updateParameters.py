@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def test_updateParameters(minimal_test_esM):
+    '''
+    Get the minimal test system, declare it with mutable cost parameters and check that updating the parameters
+    leads to the same objective values as rebuilding the model.
+    '''
+    esM = minimal_test_esM
+
+    esM.optimize(solver='glpk', mutableParameters=True)
+    objMutable = esM.pyM.Obj()
+    esM.optimize(solver='glpk')
+    assert np.isclose(esM.pyM.Obj(), objMutable)
+
+    esM.optimize(solver='glpk', mutableParameters=True)
+    pyM = esM.pyM
+
+    costs = pd.DataFrame([np.array([0.06, 0.01, 0.1, 0.061]), np.array([0., 0., 0., 0.])],
+                         index=['ElectrolyzerLocation', 'IndustryLocation']).T
+    esM.updateParameters('Electrolyzers', {'investPerCapacity': 400, 'interestRate': 0.05}, solver='glpk')
+    esM.updateParameters('Pipelines', {'investPerCapacity': 0.2}, solver='glpk')
+    esM.updateParameters('Electricity market', {'commodityCostTimeSeries': costs}, solver='glpk')
+    assert esM.pyM is pyM
+    objUpdated = esM.pyM.Obj()
+
+    esM.optimize(solver='glpk')
+    assert np.isclose(esM.pyM.Obj(), objUpdated)
+    assert not np.isclose(objUpdated, objMutable)
+
+    with pytest.raises(ValueError):
+        esM.updateParameters('Electrolyzers', {'investPerCapacity': 400}, solver='glpk')
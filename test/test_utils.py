@@ -68,4 +68,28 @@ def test_functionality_checkSimultaneousChargeDischarge():
     tsDischarge["Region1"] = 2 * [0] + 2 * [1]
     simultaneousChargeDischarge = utils.checkSimultaneousChargeDischarge(tsCharge, tsDischarge)
 
-    assert simultaneousChargeDischarge, "Check for simultaneous charge & discharge should have returned True"
\ No newline at end of file
+    assert simultaneousChargeDischarge, "Check for simultaneous charge & discharge should have returned True"
+
+def test_timeSeriesArray(minimal_test_esM):
+    """
+    Test that the array-backed time series yield the values and the DataFrame of the original time series.
+    """
+    index = pd.MultiIndex.from_product([[0, 2], range(3)], names=['Period', 'TimeStep'])
+    data = pd.DataFrame({'loc1': range(6), 'loc2': np.arange(6) * 0.5}, index=index)
+    timeSeries = utils.setTimeSeriesArray(data)
+    assert timeSeries.values.shape == (2, 3, 2) and timeSeries.values.flags['C_CONTIGUOUS']
+    for (p, t) in index:
+        for loc in data.columns:
+            assert timeSeries[loc][p, t] == data.loc[(p, t), loc]
+    pd.testing.assert_frame_equal(timeSeries.frame, data.astype(float))
+    assert utils.setTimeSeriesArray(timeSeries) is timeSeries and utils.setTimeSeriesArray(None) is None
+
+    esM = minimal_test_esM
+    esM.optimize(timeSeriesAggregation=False, solver='glpk')
+    pyM = esM.pyM
+    source = esM.getComponent('Electricity market')
+    assert isinstance(source.processedCommodityCostTimeSeries, utils.TimeSeriesArray)
+    for loc in source.processedCommodityCostTimeSeries.columns:
+        np.testing.assert_array_equal(
+            utils.getTimeSetArray(pyM, source.processedCommodityCostTimeSeries[loc]),
+            utils.getTimeSetArray(pyM, source.fullCommodityCostTimeSeries[loc]))